@@ -114,8 +114,13 @@ namespace tracktable {
  * @param [in] search_box_half_span  Distance defining "nearby" in all dimensions
  * @param [in] minimum_cluster_size  Minimum number of neighbors for core points
  * @param [out] output_sink  (Vertex ID, Cluster ID) for each point
+ * @param [in] num_threads   Threads for neighbor queries (0 means one per core)
+ * @param [in] engine        Search structure for neighbor queries (see DBSCANEngine)
  * @return Number of clusters discovered
  *
+ * The labels do not depend on `num_threads` or `engine`: every
+ * combination produces the same clusters with the same cluster IDs.
+ *
  * You can also pass in points as a `std::pair<MyPoint, Foo>` where Foo
  * is your own arbitrary ID. In that case, the returned labels will
  * be (Foo, int).
@@ -127,7 +132,9 @@ int cluster_with_dbscan(
   PointIteratorT input_end,
   SearchBoxT search_box_half_span,
   int minimum_cluster_size,
-  OutputIteratorT output_sink
+  OutputIteratorT output_sink,
+  int num_threads=1,
+  DBSCANEngine engine=DBSCANEngine::AUTO
   )
 {
   typedef typename PointIteratorT::value_type input_point_type;
@@ -141,7 +148,9 @@ int cluster_with_dbscan(
     input_end,
     search_box_half_span,
     minimum_cluster_size,
-    output_sink
+    output_sink,
+    num_threads,
+    engine
     );
 
   return num_clusters;
@@ -163,7 +163,9 @@ public:
    *
    * If you have a container of points you can use this constructor to
    * create and populate the tree in one swell foop instead of adding
-   * elements one at a time.
+   * elements one at a time.  The tree is built with Boost.Geometry's
+   * packing (bulk-loading) algorithm, which is much faster than
+   * repeated insertion and produces a tree that is faster to query.
    *
    * @param [in] range_begin  Iterator pointing to beginning of input points
    * @param [in] range_end    Iterator pointing past end of input points
@@ -171,8 +173,25 @@ public:
   template<typename value_iterator_type>
   RTree(value_iterator_type range_begin,
         value_iterator_type range_end)
+    : _RTree(range_begin, range_end)
+    { }
+
+  /** Replace the contents of an RTree with a range of elements.
+   *
+   * Any elements already in the tree are discarded.  As with the range
+   * constructor, the new tree is built with the packing algorithm.
+   * Use this instead of clear() followed by insert() when you have
+   * all of the elements up front.
+   *
+   * @param [in] range_begin  Iterator pointing to beginning of input points
+   * @param [in] range_end    Iterator pointing past end of input points
+   */
+  template<typename value_iterator_type>
+  void assign(value_iterator_type range_begin,
+              value_iterator_type range_end)
     {
-      this->_RTree.insert(range_begin, range_end);
+      rtree_type packed_tree(range_begin, range_end);
+      this->_RTree.swap(packed_tree);
     }
 
   /** Insert a single element into an RTree
@@ -0,0 +1,209 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above
+ * copyright notice, this list of conditions and the following
+ * disclaimer in the documentation and/or other materials provided
+ * with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT,
+ * INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+ * (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+ * SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+ * STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ * ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED
+ * OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+
+// The grid engine must give exactly the same labels as the R-tree.
+// We try random points, points on a lattice whose spacing matches the
+// search box (so that neighbors sit exactly on box and cell
+// boundaries), higher-dimensional points where only part of the point
+// is used for the grid and search boxes the grid can't use at all.
+
+#include <tracktable/Analysis/ComputeDBSCANClustering.h>
+#include <tracktable/Core/PointCartesian.h>
+
+#define BOOST_ALLOW_DEPRECATED_HEADERS
+#include <boost/random/mersenne_twister.hpp>
+#include <boost/random/uniform_real_distribution.hpp>
+#undef BOOST_ALLOW_DEPRECATED_HEADERS
+
+#include <iostream>
+#include <string>
+#include <vector>
+
+// ----------------------------------------------------------------------
+
+boost::random::mt19937 random_generator;
+
+template<int dim>
+std::vector< tracktable::PointCartesian<dim> > random_points(std::size_t how_many,
+                                                             double min_coord=0,
+                                                             double max_coord=10)
+{
+  typedef tracktable::PointCartesian<dim> point_type;
+  boost::random::uniform_real_distribution<> coordinate(min_coord, max_coord);
+  std::vector<point_type> result;
+
+  for (std::size_t i = 0; i < how_many; ++i)
+    {
+    point_type point;
+    for (int d = 0; d < dim; ++d)
+      {
+      point[d] = coordinate(random_generator);
+      }
+    result.push_back(point);
+    }
+  return result;
+}
+
+// ----------------------------------------------------------------------
+
+std::vector< tracktable::PointCartesian<2> > lattice_points(int points_per_side, double spacing)
+{
+  std::vector< tracktable::PointCartesian<2> > result;
+  for (int i = 0; i < points_per_side; ++i)
+    {
+    for (int j = 0; j < points_per_side; ++j)
+      {
+      tracktable::PointCartesian<2> point;
+      point[0] = -5 + i * spacing;
+      point[1] = -5 + j * spacing;
+      result.push_back(point);
+      }
+    }
+  return result;
+}
+
+// ----------------------------------------------------------------------
+
+template<int dim>
+int compare_engines(std::string const& description,
+                    std::vector< tracktable::PointCartesian<dim> > const& points,
+                    tracktable::PointCartesian<dim> const& search_box,
+                    int min_cluster_size,
+                    bool L2,
+                    int num_threads)
+{
+  typedef tracktable::PointCartesian<dim> point_type;
+  typedef tracktable::analysis::detail::implementation::DBSCAN<point_type> dbscan_type;
+
+  dbscan_type rtree_dbscan;
+  int rtree_clusters = rtree_dbscan.learn_clusters(
+    points.begin(), points.end(), search_box, min_cluster_size, L2, 1,
+    tracktable::DBSCANEngine::RTREE);
+  std::vector<int> rtree_labels;
+  rtree_dbscan.point_cluster_labels(rtree_labels);
+
+  dbscan_type grid_dbscan;
+  int grid_clusters = grid_dbscan.learn_clusters(
+    points.begin(), points.end(), search_box, min_cluster_size, L2, num_threads,
+    tracktable::DBSCANEngine::GRID);
+  std::vector<int> grid_labels;
+  grid_dbscan.point_cluster_labels(grid_labels);
+
+  std::vector<int> rtree_core_flags, grid_core_flags;
+  rtree_dbscan.point_core_flags(rtree_core_flags);
+  grid_dbscan.point_core_flags(grid_core_flags);
+
+  int error_count = 0;
+  if (rtree_clusters != grid_clusters)
+    {
+    std::cout << "ERROR: " << description << ": R-tree found "
+              << rtree_clusters << " clusters but grid found "
+              << grid_clusters << "\n";
+    ++error_count;
+    }
+
+  for (std::size_t i = 0; i < rtree_labels.size(); ++i)
+    {
+    if (rtree_labels[i] != grid_labels[i])
+      {
+      std::cout << "ERROR: " << description << ": point " << i
+                << " has label " << rtree_labels[i] << " with the R-tree but "
+                << grid_labels[i] << " with the grid\n";
+      ++error_count;
+      }
+    }
+
+  if (rtree_core_flags != grid_core_flags)
+    {
+    std::cout << "ERROR: " << description << ": R-tree and grid disagree about core points\n";
+    ++error_count;
+    }
+
+  std::cout << "TEST: " << description << ", " << num_threads << " threads: "
+            << grid_clusters << " clusters, " << error_count << " mismatches\n";
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+template<int dim>
+tracktable::PointCartesian<dim> uniform_box(double half_span)
+{
+  tracktable::PointCartesian<dim> box;
+  for (int d = 0; d < dim; ++d)
+    {
+    box[d] = half_span;
+    }
+  return box;
+}
+
+// ----------------------------------------------------------------------
+
+int main(int, char**)
+{
+  int error_count = 0;
+
+  std::vector< tracktable::PointCartesian<2> > points_2d(random_points<2>(5000));
+  std::vector< tracktable::PointCartesian<3> > points_3d(random_points<3>(5000));
+  std::vector< tracktable::PointCartesian<4> > points_4d(random_points<4>(5000, 0, 3));
+  std::vector< tracktable::PointCartesian<6> > points_6d(random_points<6>(3000, 0, 2));
+  std::vector< tracktable::PointCartesian<2> > lattice(lattice_points(40, 0.25));
+  std::vector< tracktable::PointCartesian<2> > far_away(random_points<2>(1000, 1e6, 1e6 + 10));
+
+  tracktable::PointCartesian<3> uneven_box;
+  uneven_box[0] = 0.3;
+  uneven_box[1] = 0.05;
+  uneven_box[2] = 0.4;
+
+  tracktable::PointCartesian<2> flat_box;
+  flat_box[0] = 0.2;
+  flat_box[1] = 0;
+
+  int thread_counts[] = { 1, 3 };
+  for (int t = 0; t < 2; ++t)
+    {
+    int num_threads = thread_counts[t];
+    error_count += compare_engines<2>("2D random", points_2d, uniform_box<2>(0.1), 4, false, num_threads);
+    error_count += compare_engines<2>("2D random, L2", points_2d, uniform_box<2>(0.1), 4, true, num_threads);
+    error_count += compare_engines<2>("2D dense", points_2d, uniform_box<2>(0.25), 5, false, num_threads);
+    error_count += compare_engines<3>("3D uneven box", points_3d, uneven_box, 3, false, num_threads);
+    error_count += compare_engines<4>("4D random", points_4d, uniform_box<4>(0.3), 3, false, num_threads);
+    error_count += compare_engines<6>("6D random", points_6d, uniform_box<6>(0.4), 3, false, num_threads);
+    error_count += compare_engines<2>("2D lattice on box edges", lattice, uniform_box<2>(0.25), 3, false, num_threads);
+    error_count += compare_engines<2>("2D lattice inside box", lattice, uniform_box<2>(0.2500001), 5, false, num_threads);
+    error_count += compare_engines<2>("2D far from origin", far_away, uniform_box<2>(0.3), 3, false, num_threads);
+    error_count += compare_engines<2>("2D zero span in one dimension", points_2d, flat_box, 2, false, num_threads);
+    }
+
+  return error_count;
+}
@@ -0,0 +1,184 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above
+ * copyright notice, this list of conditions and the following
+ * disclaimer in the documentation and/or other materials provided
+ * with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT,
+ * INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+ * (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+ * SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+ * STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ * ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED
+ * OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+// Make sure that multithreaded DBSCAN gives exactly the same labels
+// as the single-threaded version, including for border points that
+// are within reach of more than one cluster.
+
+#include <tracktable/Analysis/ComputeDBSCANClustering.h>
+#include <tracktable/Core/PointCartesian.h>
+
+#define BOOST_ALLOW_DEPRECATED_HEADERS
+#include <boost/random/mersenne_twister.hpp>
+#include <boost/random/uniform_real_distribution.hpp>
+#undef BOOST_ALLOW_DEPRECATED_HEADERS
+
+#include <iostream>
+#include <utility>
+#include <vector>
+
+// ----------------------------------------------------------------------
+
+boost::random::mt19937 random_generator;
+
+template<int dim>
+std::vector< tracktable::PointCartesian<dim> > random_points(std::size_t how_many)
+{
+  typedef tracktable::PointCartesian<dim> point_type;
+  boost::random::uniform_real_distribution<> coordinate(0, 10);
+  std::vector<point_type> result;
+
+  for (std::size_t i = 0; i < how_many; ++i)
+    {
+    point_type point;
+    for (int d = 0; d < dim; ++d)
+      {
+      point[d] = coordinate(random_generator);
+      }
+    result.push_back(point);
+    }
+  return result;
+}
+
+// ----------------------------------------------------------------------
+
+template<int dim>
+int compare_labels(std::vector< tracktable::PointCartesian<dim> > const& points,
+                   double half_span,
+                   int min_cluster_size,
+                   bool L2,
+                   int num_threads)
+{
+  typedef tracktable::PointCartesian<dim> point_type;
+  typedef tracktable::analysis::detail::implementation::DBSCAN<point_type> dbscan_type;
+
+  point_type search_box;
+  for (int d = 0; d < dim; ++d)
+    {
+    search_box[d] = half_span;
+    }
+
+  dbscan_type serial_dbscan;
+  int serial_clusters = serial_dbscan.learn_clusters(
+    points.begin(), points.end(), search_box, min_cluster_size, L2, 1,
+    tracktable::DBSCANEngine::RTREE);
+  std::vector<int> serial_labels;
+  serial_dbscan.point_cluster_labels(serial_labels);
+
+  dbscan_type parallel_dbscan;
+  int parallel_clusters = parallel_dbscan.learn_clusters(
+    points.begin(), points.end(), search_box, min_cluster_size, L2, num_threads,
+    tracktable::DBSCANEngine::RTREE);
+  std::vector<int> parallel_labels;
+  parallel_dbscan.point_cluster_labels(parallel_labels);
+
+  int error_count = 0;
+  if (serial_clusters != parallel_clusters)
+    {
+    std::cout << "ERROR: " << dim << "D, L2=" << L2 << ", "
+              << num_threads << " threads: expected "
+              << serial_clusters << " clusters but got "
+              << parallel_clusters << "\n";
+    ++error_count;
+    }
+
+  for (std::size_t i = 0; i < serial_labels.size(); ++i)
+    {
+    if (serial_labels[i] != parallel_labels[i])
+      {
+      std::cout << "ERROR: " << dim << "D, L2=" << L2 << ", "
+                << num_threads << " threads: point " << i
+                << " expected label " << serial_labels[i]
+                << " but got " << parallel_labels[i] << "\n";
+      ++error_count;
+      }
+    }
+
+  std::cout << "TEST: " << dim << "D, L2=" << L2 << ", " << num_threads
+            << " threads: " << parallel_clusters << " clusters, "
+            << error_count << " mismatches\n";
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int test_cluster_with_dbscan_threads()
+{
+  typedef tracktable::PointCartesian<2> point_type;
+  std::vector<point_type> points(random_points<2>(2000));
+  std::vector< std::pair<int, int> > serial_labels, parallel_labels;
+  point_type search_box;
+  search_box[0] = 0.2;
+  search_box[1] = 0.2;
+
+  int serial_clusters = tracktable::cluster_with_dbscan<point_type>(
+    points.begin(), points.end(), search_box, 4,
+    std::back_inserter(serial_labels), 1, tracktable::DBSCANEngine::RTREE);
+  int parallel_clusters = tracktable::cluster_with_dbscan<point_type>(
+    points.begin(), points.end(), search_box, 4,
+    std::back_inserter(parallel_labels), 0, tracktable::DBSCANEngine::RTREE);
+
+  if (serial_clusters != parallel_clusters || serial_labels != parallel_labels)
+    {
+    std::cout << "ERROR: cluster_with_dbscan gave different labels with "
+              << "one thread and with one thread per core\n";
+    return 1;
+    }
+  return 0;
+}
+
+// ----------------------------------------------------------------------
+
+int main(int, char**)
+{
+  int error_count = 0;
+
+  std::vector< tracktable::PointCartesian<2> > points_2d(random_points<2>(5000));
+  std::vector< tracktable::PointCartesian<3> > points_3d(random_points<3>(5000));
+
+  int thread_counts[] = { 2, 4, 7 };
+  for (int t = 0; t < 3; ++t)
+    {
+    int num_threads = thread_counts[t];
+    // Sparse data: many small clusters, lots of noise and border points
+    error_count += compare_labels<2>(points_2d, 0.1, 4, false, num_threads);
+    error_count += compare_labels<2>(points_2d, 0.1, 4, true, num_threads);
+    // Dense data: a few large clusters that merge across threads
+    error_count += compare_labels<2>(points_2d, 0.25, 5, false, num_threads);
+    error_count += compare_labels<3>(points_3d, 0.5, 6, false, num_threads);
+    error_count += compare_labels<3>(points_3d, 0.5, 6, true, num_threads);
+    }
+
+  error_count += test_cluster_with_dbscan_threads();
+
+  return error_count;
+}
@@ -803,6 +803,53 @@ int test_find_nearest_neighbors_all_value_types()
 
 // ----------------------------------------------------------------------
 
+template<typename point_type>
+int test_assign_replaces_contents()
+{
+  int error_count = 0;
+
+  std::vector<point_type> small_grid, large_grid;
+  create_point_grid<point_type>(1, 3, std::back_inserter(small_grid));
+  create_point_grid<point_type>(9, 9, std::back_inserter(large_grid));
+
+  tracktable::RTree<point_type> rtree;
+  rtree.insert(small_grid.begin(), small_grid.end());
+  rtree.assign(large_grid.begin(), large_grid.end());
+
+  if (rtree.size() != large_grid.size())
+    {
+    std::cout << "ERROR: assign<"
+              << typeid(point_type).name()
+              << ">: Expected "
+              << large_grid.size()
+              << " points after bulk load, got "
+              << rtree.size()
+              << "\n";
+    ++error_count;
+    }
+
+  point_type min_corner(large_grid.front()), max_corner(large_grid.back());
+  std::vector<point_type> query_results;
+  rtree.find_points_inside_box(min_corner, max_corner,
+                               std::back_inserter(query_results));
+
+  if (query_results.size() != large_grid.size())
+    {
+    std::cout << "ERROR: assign<"
+              << typeid(point_type).name()
+              << ">: Expected box query on packed tree to return "
+              << large_grid.size()
+              << " points, got "
+              << query_results.size()
+              << "\n";
+    ++error_count;
+    }
+
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
 int
 main(int , char**)
 {
@@ -846,5 +893,11 @@ main(int , char**)
   error_count += test_find_nearest_neighbors_all_value_types< tracktable::domain::cartesian2d::trajectory_point_type >();
   error_count += test_find_nearest_neighbors_all_value_types< tracktable::domain::cartesian3d::trajectory_point_type >();
 
+  std::cout << "\n\n\n";
+
+  error_count += test_assign_replaces_contents< tracktable::domain::terrestrial::base_point_type >();
+  error_count += test_assign_replaces_contents< tracktable::domain::cartesian2d::base_point_type >();
+  error_count += test_assign_replaces_contents< tracktable::domain::cartesian3d::base_point_type >();
+
   return (error_count != 0);
 }
@@ -0,0 +1,366 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above
+ * copyright notice, this list of conditions and the following
+ * disclaimer in the documentation and/or other materials provided
+ * with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT,
+ * INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+ * (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+ * SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+ * STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ * ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED
+ * OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+
+// TrajectoryAssembler must produce the same trajectories as the
+// iterator-based AssembleTrajectories whether the points arrive all
+// at once or in small batches with watermarks in between.  It must
+// also follow the Python rule that a gap exactly equal to the
+// separation time does not split a trajectory.  With a reorder
+// window it must recover the same trajectories from points that
+// arrive out of order.
+
+#include <tracktable/Analysis/AssembleTrajectories.h>
+#include <tracktable/Analysis/TrajectoryAssembler.h>
+#include <tracktable/Domain/Terrestrial.h>
+
+#include <algorithm>
+#include <iostream>
+#include <sstream>
+#include <string>
+#include <tuple>
+#include <utility>
+#include <vector>
+
+typedef tracktable::domain::terrestrial::trajectory_point_type point_type;
+typedef tracktable::domain::terrestrial::trajectory_type trajectory_type;
+typedef std::tuple<std::string, std::size_t, tracktable::Timestamp, tracktable::Timestamp> signature_type;
+
+// ----------------------------------------------------------------------
+
+std::vector<point_type> make_points()
+{
+  tracktable::Timestamp start_time = tracktable::time_from_string("2010-01-01 12:00:00");
+  std::vector<point_type> points;
+
+  for (int minute = 0; minute < 300; minute += 2)
+    {
+    for (int plane = 0; plane < 20; ++plane)
+      {
+      // Every plane takes a break of 40 + plane minutes somewhere in
+      // the middle, and every fifth plane jumps far away once.
+      int break_start = 60 + 5 * plane;
+      if (minute >= break_start && minute < break_start + 40 + plane)
+        {
+        continue;
+        }
+      double longitude = -100 + 0.01 * minute;
+      if (plane % 5 == 0 && minute >= 250)
+        {
+        longitude += 20;
+        }
+
+      std::ostringstream object_id;
+      object_id << "plane" << plane;
+
+      point_type point(longitude, 20 + plane);
+      point.set_object_id(object_id.str());
+      point.set_timestamp(start_time + tracktable::minutes(minute));
+      points.push_back(point);
+      }
+    }
+  return points;
+}
+
+// ----------------------------------------------------------------------
+
+signature_type signature(trajectory_type const& trajectory)
+{
+  return signature_type(trajectory.object_id(), trajectory.size(),
+                        trajectory.front().timestamp(),
+                        trajectory.back().timestamp());
+}
+
+// ----------------------------------------------------------------------
+
+void configure(tracktable::TrajectoryAssembler<trajectory_type>& assembler)
+{
+  assembler.set_separation_time(tracktable::minutes(30));
+  assembler.set_separation_distance(500);
+  assembler.set_minimum_trajectory_length(10);
+}
+
+// ----------------------------------------------------------------------
+
+int test_matches_iterator_assembly()
+{
+  typedef std::vector<point_type>::const_iterator point_iterator;
+  typedef tracktable::AssembleTrajectories<trajectory_type, point_iterator> assembler_type;
+
+  std::vector<point_type> points(make_points());
+
+  assembler_type iterator_assembler;
+  iterator_assembler.set_separation_time(tracktable::minutes(30));
+  iterator_assembler.set_separation_distance(500);
+  iterator_assembler.set_minimum_trajectory_length(10);
+  iterator_assembler.set_input(points.begin(), points.end());
+
+  std::vector<signature_type> expected;
+  for (assembler_type::iterator iter = iterator_assembler.begin();
+       iter != iterator_assembler.end();
+       ++iter)
+    {
+    expected.push_back(signature(*iter));
+    }
+  std::sort(expected.begin(), expected.end());
+
+  int error_count = 0;
+  std::size_t batch_sizes[] = { points.size(), 37, 1 };
+  for (std::size_t batch_size : batch_sizes)
+    {
+    tracktable::TrajectoryAssembler<trajectory_type> assembler;
+    configure(assembler);
+    std::vector<signature_type> actual;
+
+    for (std::size_t batch_start = 0; batch_start < points.size(); batch_start += batch_size)
+      {
+      std::size_t batch_end = std::min(points.size(), batch_start + batch_size);
+      assembler.add_points(points.begin() + batch_start, points.begin() + batch_end);
+      assembler.advance_watermark(points[batch_end - 1].timestamp());
+      while (assembler.has_finished_trajectories())
+        {
+        actual.push_back(signature(assembler.pop_finished_trajectory()));
+        }
+      }
+
+    if (assembler.num_trajectories_in_progress() != 20)
+      {
+      std::cout << "ERROR: Batch size " << batch_size << ": Expected 20 trajectories in progress before flush but found "
+                << assembler.num_trajectories_in_progress() << "\n";
+      ++error_count;
+      }
+
+    assembler.flush();
+    tracktable::Timestamp previous_end;
+    while (assembler.has_finished_trajectories())
+      {
+      trajectory_type trajectory(assembler.pop_finished_trajectory());
+      if (!previous_end.is_special() && trajectory.back().timestamp() < previous_end)
+        {
+        std::cout << "ERROR: Batch size " << batch_size << ": flush() returned trajectories out of end-time order\n";
+        ++error_count;
+        }
+      previous_end = trajectory.back().timestamp();
+      actual.push_back(signature(trajectory));
+      }
+    std::sort(actual.begin(), actual.end());
+
+    if (actual != expected)
+      {
+      std::cout << "ERROR: Batch size " << batch_size << ": Expected "
+                << expected.size() << " trajectories from the iterator assembler but got "
+                << actual.size() << " that do not all match\n";
+      ++error_count;
+      }
+
+    if (assembler.points_processed_count() != points.size()
+        || assembler.valid_trajectory_count() != expected.size())
+      {
+      std::cout << "ERROR: Batch size " << batch_size << ": Counters say "
+                << assembler.points_processed_count() << " points and "
+                << assembler.valid_trajectory_count() << " valid trajectories but expected "
+                << points.size() << " and " << expected.size() << "\n";
+      ++error_count;
+      }
+    }
+
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int test_separation_boundaries()
+{
+  tracktable::Timestamp start_time = tracktable::time_from_string("2010-01-01 12:00:00");
+  std::vector<point_type> points;
+  // Gaps of exactly 30 minutes and then 31 minutes
+  int minutes[] = { 0, 30, 60, 91, 95 };
+  for (int minute : minutes)
+    {
+    point_type point(-100, 30);
+    point.set_object_id("plane");
+    point.set_timestamp(start_time + tracktable::minutes(minute));
+    points.push_back(point);
+    }
+
+  int error_count = 0;
+
+  tracktable::TrajectoryAssembler<trajectory_type> assembler;
+  assembler.set_minimum_trajectory_length(1);
+  assembler.add_points(points.begin(), points.end());
+  assembler.flush();
+  std::vector<std::size_t> sizes;
+  while (assembler.has_finished_trajectories())
+    {
+    sizes.push_back(assembler.pop_finished_trajectory().size());
+    }
+  if (sizes != std::vector<std::size_t>({3, 2}))
+    {
+    std::cout << "ERROR: Expected trajectories of 3 and 2 points with a 30-minute separation time but got "
+              << sizes.size() << " trajectories\n";
+    ++error_count;
+    }
+
+  // Without a time limit everything is one trajectory, and the
+  // default minimum length of 2 throws away a single point.
+  tracktable::TrajectoryAssembler<trajectory_type> unlimited;
+  unlimited.set_separation_time(tracktable::seconds(0));
+  unlimited.add_points(points.begin(), points.end());
+  point_type loner(0, 0);
+  loner.set_object_id("loner");
+  loner.set_timestamp(start_time + tracktable::minutes(100));
+  unlimited.add_point(loner);
+  unlimited.advance_watermark(start_time + tracktable::days(100));
+  if (unlimited.has_finished_trajectories())
+    {
+    std::cout << "ERROR: Watermark finished a trajectory even though there is no separation time\n";
+    ++error_count;
+    }
+  unlimited.flush();
+  if (unlimited.num_finished_trajectories() != 1
+      || unlimited.pop_finished_trajectory().size() != points.size()
+      || unlimited.invalid_trajectory_count() != 1)
+    {
+    std::cout << "ERROR: Expected one trajectory with every point and one rejected trajectory without a separation time\n";
+    ++error_count;
+    }
+
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+std::vector<signature_type> take_signatures(tracktable::TrajectoryAssembler<trajectory_type>& assembler)
+{
+  std::vector<signature_type> result;
+  while (assembler.has_finished_trajectories())
+    {
+    result.push_back(signature(assembler.pop_finished_trajectory()));
+    }
+  return result;
+}
+
+// ----------------------------------------------------------------------
+
+int test_reorder_window()
+{
+  std::vector<point_type> points(make_points());
+
+  tracktable::TrajectoryAssembler<trajectory_type> sorted_assembler;
+  configure(sorted_assembler);
+  sorted_assembler.add_points(points.begin(), points.end());
+  sorted_assembler.flush();
+  std::vector<signature_type> expected(take_signatures(sorted_assembler));
+  std::sort(expected.begin(), expected.end());
+
+  // Delay every point by up to 5 minutes and deliver them in
+  // order of arrival.
+  std::vector<std::pair<tracktable::Timestamp, std::size_t> > arrivals;
+  for (std::size_t i = 0; i < points.size(); ++i)
+    {
+    arrivals.push_back(std::make_pair(points[i].timestamp() + tracktable::seconds((i * 7919) % 300), i));
+    }
+  std::sort(arrivals.begin(), arrivals.end());
+
+  int error_count = 0;
+  tracktable::TrajectoryAssembler<trajectory_type> assembler;
+  configure(assembler);
+  assembler.set_reorder_window(tracktable::minutes(6));
+
+  std::vector<signature_type> actual;
+  std::size_t max_buffered = 0;
+  for (std::size_t i = 0; i < arrivals.size(); ++i)
+    {
+    assembler.add_point(points[arrivals[i].second]);
+    max_buffered = std::max(max_buffered, assembler.num_buffered_points());
+    std::vector<signature_type> finished(take_signatures(assembler));
+    actual.insert(actual.end(), finished.begin(), finished.end());
+    }
+
+  // 20 planes reporting every 2 minutes put at most 80 points in a
+  // 6-minute window.  Allow for the spread in arrival times.
+  if (max_buffered == 0 || max_buffered > 100)
+    {
+    std::cout << "ERROR: Reorder buffer held up to " << max_buffered
+              << " points, expected between 1 and 100\n";
+    ++error_count;
+    }
+
+  // A point from the distant past is too late to use
+  assembler.add_point(points.front());
+  if (assembler.late_point_count() != 1)
+    {
+    std::cout << "ERROR: Expected 1 late point but counted " << assembler.late_point_count() << "\n";
+    ++error_count;
+    }
+
+  assembler.advance_watermark(points.back().timestamp());
+  if (assembler.num_buffered_points() != 0)
+    {
+    std::cout << "ERROR: advance_watermark() left " << assembler.num_buffered_points()
+              << " points in the reorder buffer\n";
+    ++error_count;
+    }
+
+  assembler.flush();
+  std::vector<signature_type> finished(take_signatures(assembler));
+  actual.insert(actual.end(), finished.begin(), finished.end());
+  std::sort(actual.begin(), actual.end());
+
+  if (actual != expected)
+    {
+    std::cout << "ERROR: Reordered assembly produced " << actual.size()
+              << " trajectories but sorted assembly produced " << expected.size()
+              << " and they do not all match\n";
+    ++error_count;
+    }
+
+  if (assembler.points_processed_count() != points.size())
+    {
+    std::cout << "ERROR: Expected " << points.size() << " points processed with a reorder window but counted "
+              << assembler.points_processed_count() << "\n";
+    ++error_count;
+    }
+
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int main(int, char**)
+{
+  int error_count = 0;
+  error_count += test_matches_iterator_assembly();
+  error_count += test_separation_boundaries();
+  error_count += test_reorder_window();
+  return error_count;
+}
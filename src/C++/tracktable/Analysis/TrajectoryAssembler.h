@@ -0,0 +1,557 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#ifndef __tracktable_TrajectoryAssembler_h
+#define __tracktable_TrajectoryAssembler_h
+
+#include <tracktable/Core/TracktableCommon.h>
+#include <tracktable/Core/Timestamp.h>
+
+#include <boost/unordered_map.hpp>
+
+#include <algorithm>
+#include <cassert>
+#include <cmath>
+#include <deque>
+#include <functional>
+#include <queue>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace tracktable {
+
+/** Assemble points into trajectories one batch at a time
+ *
+ * This class does the same job as AssembleTrajectories but is driven
+ * from the outside: you hand it points with add_point() or
+ * add_points() as they arrive and collect finished trajectories with
+ * pop_finished_trajectory().  That makes it suitable for live feeds
+ * and for callers (such as the Python bindings) that cannot offer a
+ * C++ iterator range over their input.
+ *
+ * Its rules match the Python AssembleTrajectoryFromPoints exactly:
+ *
+ * - Points must arrive sorted by increasing timestamp unless a
+ *   reorder window is set.
+ *
+ * - A new trajectory begins when the time between a point and the
+ *   previous point with the same object ID is strictly greater than
+ *   the separation time, or when the distance between them is
+ *   strictly greater than the separation distance.  A non-positive
+ *   separation time or distance means that there is no limit.
+ *
+ * - Trajectories with fewer than minimum_trajectory_length points
+ *   are discarded and counted as invalid.
+ *
+ * Trajectories that have not seen a point for longer than the
+ * separation time can never grow again.  They are finished every
+ * cleanup_interval points, whenever you call advance_watermark()
+ * and, along with everything else, when you call flush() at the end
+ * of the input.
+ *
+ * Live feeds seldom arrive in perfect timestamp order.  If you set a
+ * positive reorder window, incoming points are held in a heap keyed
+ * by timestamp until the newest timestamp seen is more than the
+ * reorder window past them.  Only then are they assembled.  A point
+ * that arrives after that has happened is discarded and counted in
+ * late_point_count().  advance_watermark() releases the buffered
+ * points up to the watermark and flush() releases all of them.
+ */
+
+template<typename TrajectoryT>
+class TrajectoryAssembler
+{
+public:
+  typedef TrajectoryT trajectory_type;
+  typedef typename trajectory_type::point_type point_type;
+
+  /** Instantiate a TrajectoryAssembler using the default configuration.
+   *
+   * @copydoc TrajectoryAssembler::set_default_configuration()
+   */
+  TrajectoryAssembler()
+    {
+      this->set_default_configuration();
+      this->reset();
+    }
+
+  /// Destructor
+  virtual ~TrajectoryAssembler() { }
+
+  /** Set the maximum time between adjacent points in a trajectory
+   *
+   * @param [in] d Separation time.  Zero or negative means no limit.
+   */
+  void set_separation_time(Duration const& d)
+    {
+      this->SeparationTime = d;
+    }
+
+  /** Set the maximum distance between adjacent points in a trajectory
+   *
+   * @param [in] d Separation distance in the domain's distance units.
+   *               Zero or negative means no limit.
+   */
+  void set_separation_distance(double d)
+    {
+      this->SeparationDistance = d;
+    }
+
+  /** Set the number of points a trajectory needs in order to be kept
+   *
+   * @param [in] len Minimum number of points
+   */
+  void set_minimum_trajectory_length(std::size_t len)
+    {
+      this->MinimumTrajectoryLength = len;
+    }
+
+  /** Set how often to look for idle trajectories
+   *
+   * @param [in] points_between_cleanup Number of points between
+   *             cleanups.  Zero or negative disables periodic cleanup.
+   */
+  void set_cleanup_interval(int points_between_cleanup)
+    {
+      this->CleanupInterval = points_between_cleanup;
+    }
+
+  /** Set how far out of timestamp order points may arrive
+   *
+   * @param [in] d Reorder window.  Zero or negative means that
+   *               points must arrive in order and are never buffered.
+   */
+  void set_reorder_window(Duration const& d)
+    {
+      this->ReorderWindow = d;
+    }
+
+  /// @return Maximum time between adjacent points
+  Duration separation_time() const
+    {
+      return this->SeparationTime;
+    }
+
+  /// @return Maximum distance between adjacent points
+  double separation_distance() const
+    {
+      return this->SeparationDistance;
+    }
+
+  /// @return Minimum number of points in a trajectory
+  std::size_t minimum_trajectory_length() const
+    {
+      return this->MinimumTrajectoryLength;
+    }
+
+  /// @return Number of points between periodic cleanups
+  int cleanup_interval() const
+    {
+      return this->CleanupInterval;
+    }
+
+  /// @return How far out of timestamp order points may arrive
+  Duration reorder_window() const
+    {
+      return this->ReorderWindow;
+    }
+
+  /// @return Whether a time limit is in effect
+  bool has_separation_time() const
+    {
+      return (!this->SeparationTime.is_special()
+              && this->SeparationTime > Duration(0, 0, 0, 0));
+    }
+
+  /// @return Whether a distance limit is in effect
+  bool has_separation_distance() const
+    {
+      return (this->SeparationDistance > 0
+              && std::isfinite(this->SeparationDistance));
+    }
+
+  /// @return Whether points are buffered and reordered
+  bool has_reorder_window() const
+    {
+      return (!this->ReorderWindow.is_special()
+              && this->ReorderWindow > Duration(0, 0, 0, 0));
+    }
+
+  /** Discard all state and zero the counters
+   *
+   * The configuration is left alone.
+   */
+  void reset()
+    {
+      this->TrajectoriesInProgress.clear();
+      this->FinishedTrajectories.clear();
+      this->ReorderBuffer = reorder_buffer_type();
+      this->ReorderSequence = 0;
+      this->HaveReleaseTime = false;
+      this->PointsProcessedCount = 0;
+      this->ValidTrajectoryCount = 0;
+      this->InvalidTrajectoryCount = 0;
+      this->LatePointCount = 0;
+    }
+
+  /** Add a single point
+   *
+   * If this point completes a trajectory (because of a time or
+   * distance gap), that trajectory goes onto the list of finished
+   * trajectories.  With a reorder window the point goes into the
+   * reorder buffer instead and is assembled once it is old enough.
+   *
+   * @param [in] point Next point in timestamp order
+   */
+  void add_point(point_type const& point)
+    {
+      if (!this->has_reorder_window())
+        {
+        this->assemble_point(point);
+        return;
+        }
+
+      Timestamp const& timestamp(point.timestamp());
+      if (this->HaveReleaseTime && timestamp < this->ReleaseTime)
+        {
+        ++ this->LatePointCount;
+        return;
+        }
+
+      this->ReorderBuffer.push(buffered_point(timestamp, this->ReorderSequence++, point));
+      Timestamp release_time(timestamp - this->ReorderWindow);
+      if (!this->HaveReleaseTime || release_time > this->ReleaseTime)
+        {
+        this->ReleaseTime = release_time;
+        this->HaveReleaseTime = true;
+        this->release_buffered_points(release_time);
+        }
+    }
+
+  /** Add a sequence of points
+   *
+   * @param [in] begin Iterator pointing to the first point
+   * @param [in] end   Iterator pointing past the last point
+   */
+  template<typename PointIteratorT>
+  void add_points(PointIteratorT begin, PointIteratorT end)
+    {
+      for (; begin != end; ++begin)
+        {
+        this->add_point(*begin);
+        }
+    }
+
+  /** Finish trajectories that have been idle for too long
+   *
+   * The watermark promises that every point with an earlier
+   * timestamp has already been added.  Trajectories whose last point
+   * is more than the separation time before the watermark can never
+   * be extended, so they are finished now.  Buffered points up to the
+   * watermark are assembled first.  No trajectories are finished if
+   * there is no separation time.
+   *
+   * @param [in] watermark Time up to which the input is complete
+   */
+  void advance_watermark(Timestamp const& watermark)
+    {
+      if (!this->HaveReleaseTime || watermark > this->ReleaseTime)
+        {
+        this->ReleaseTime = watermark;
+        this->HaveReleaseTime = true;
+        }
+      this->release_buffered_points(watermark);
+
+      if (this->has_separation_time())
+        {
+        this->finish_idle_trajectories(watermark);
+        }
+    }
+
+  /** Finish every trajectory still in progress
+   *
+   * Call this at the end of the input.  Points still in the reorder
+   * buffer are assembled first.  Trajectories are finished in order
+   * of the timestamp of their last point.
+   */
+  void flush()
+    {
+      while (!this->ReorderBuffer.empty())
+        {
+        this->assemble_point(this->ReorderBuffer.top().point);
+        this->ReorderBuffer.pop();
+        }
+
+      std::vector<typename trajectory_map_type::iterator> all_trajectories;
+      for (typename trajectory_map_type::iterator iter = this->TrajectoriesInProgress.begin();
+           iter != this->TrajectoriesInProgress.end();
+           ++iter)
+        {
+        all_trajectories.push_back(iter);
+        }
+      this->finish_in_end_time_order(all_trajectories);
+    }
+
+  /// @return Whether any finished trajectories are waiting
+  bool has_finished_trajectories() const
+    {
+      return (this->FinishedTrajectories.empty() == false);
+    }
+
+  /// @return Number of finished trajectories waiting
+  std::size_t num_finished_trajectories() const
+    {
+      return this->FinishedTrajectories.size();
+    }
+
+  /** Remove and return the oldest finished trajectory
+   *
+   * Only call this when has_finished_trajectories() is true.
+   *
+   * @return Finished trajectory
+   */
+  trajectory_type pop_finished_trajectory()
+    {
+      assert(this->FinishedTrajectories.empty() == false);
+      trajectory_type result(std::move(this->FinishedTrajectories.front()));
+      this->FinishedTrajectories.pop_front();
+      return result;
+    }
+
+  /// @return Number of object IDs with a trajectory being built
+  std::size_t num_trajectories_in_progress() const
+    {
+      return this->TrajectoriesInProgress.size();
+    }
+
+  /// @return Number of points waiting in the reorder buffer
+  std::size_t num_buffered_points() const
+    {
+      return this->ReorderBuffer.size();
+    }
+
+  /// @return Number of points assembled since the last reset
+  std::size_t points_processed_count() const
+    {
+      return this->PointsProcessedCount;
+    }
+
+  /// @return Number of trajectories finished and kept
+  std::size_t valid_trajectory_count() const
+    {
+      return this->ValidTrajectoryCount;
+    }
+
+  /// @return Number of trajectories discarded for being too short
+  std::size_t invalid_trajectory_count() const
+    {
+      return this->InvalidTrajectoryCount;
+    }
+
+  /// @return Number of points discarded for arriving after the reorder window closed
+  std::size_t late_point_count() const
+    {
+      return this->LatePointCount;
+    }
+
+protected:
+  /** Set the default values for the configuration
+   *
+   * These match the Python AssembleTrajectoryFromPoints:
+   *    - SeparationTime = Duration(minutes(30))
+   *    - SeparationDistance = 0 (no limit)
+   *    - MinimumTrajectoryLength = 2
+   *    - CleanupInterval = 10000
+   *    - ReorderWindow = 0 (points must arrive in order)
+   */
+  virtual void set_default_configuration()
+    {
+      this->SeparationTime = minutes(30);
+      this->SeparationDistance = 0;
+      this->MinimumTrajectoryLength = 2;
+      this->CleanupInterval = 10000;
+      this->ReorderWindow = Duration(0, 0, 0, 0);
+    }
+
+private:
+  typedef boost::unordered_map<std::string, trajectory_type> trajectory_map_type;
+
+  // Points in the reorder buffer are ordered by timestamp and then by
+  // arrival so that simultaneous points keep their input order.
+  struct buffered_point
+  {
+    Timestamp timestamp;
+    std::size_t sequence;
+    point_type point;
+
+    buffered_point(Timestamp const& t, std::size_t s, point_type const& p)
+      : timestamp(t), sequence(s), point(p)
+      { }
+
+    bool operator>(buffered_point const& other) const
+      {
+        if (this->timestamp != other.timestamp)
+          {
+          return this->timestamp > other.timestamp;
+          }
+        return this->sequence > other.sequence;
+      }
+  };
+
+  typedef std::priority_queue<buffered_point,
+                              std::vector<buffered_point>,
+                              std::greater<buffered_point> > reorder_buffer_type;
+
+  trajectory_map_type TrajectoriesInProgress;
+  std::deque<trajectory_type> FinishedTrajectories;
+  reorder_buffer_type ReorderBuffer;
+  std::size_t ReorderSequence;
+  Timestamp ReleaseTime;
+  bool HaveReleaseTime;
+
+  Duration SeparationTime;
+  double SeparationDistance;
+  std::size_t MinimumTrajectoryLength;
+  int CleanupInterval;
+  Duration ReorderWindow;
+
+  std::size_t PointsProcessedCount;
+  std::size_t ValidTrajectoryCount;
+  std::size_t InvalidTrajectoryCount;
+  std::size_t LatePointCount;
+
+  void assemble_point(point_type const& point)
+    {
+      ++ this->PointsProcessedCount;
+
+      std::string const& object_id(point.object_id());
+      typename trajectory_map_type::iterator find_iter = this->TrajectoriesInProgress.find(object_id);
+
+      if (find_iter == this->TrajectoriesInProgress.end())
+        {
+        this->TrajectoriesInProgress[object_id].push_back(point);
+        }
+      else if (this->points_are_separated((*find_iter).second.back(), point))
+        {
+        this->finish_trajectory((*find_iter).second);
+        (*find_iter).second = trajectory_type();
+        (*find_iter).second.push_back(point);
+        }
+      else
+        {
+        (*find_iter).second.push_back(point);
+        }
+
+      if (this->CleanupInterval > 0
+          && this->PointsProcessedCount % this->CleanupInterval == 0
+          && this->has_separation_time())
+        {
+        this->finish_idle_trajectories(point.timestamp());
+        }
+    }
+
+  // Assemble every buffered point with a timestamp no later than 'until'.
+  void release_buffered_points(Timestamp const& until)
+    {
+      while (!this->ReorderBuffer.empty()
+             && this->ReorderBuffer.top().timestamp <= until)
+        {
+        this->assemble_point(this->ReorderBuffer.top().point);
+        this->ReorderBuffer.pop();
+        }
+    }
+
+  bool points_are_separated(point_type const& last_point,
+                            point_type const& next_point) const
+    {
+      if (this->has_separation_time()
+          && (next_point.timestamp() - last_point.timestamp()) > this->SeparationTime)
+        {
+        return true;
+        }
+      if (this->has_separation_distance()
+          && distance(next_point, last_point) > this->SeparationDistance)
+        {
+        return true;
+        }
+      return false;
+    }
+
+  void finish_trajectory(trajectory_type& trajectory)
+    {
+      if (trajectory.size() >= this->MinimumTrajectoryLength)
+        {
+        this->FinishedTrajectories.push_back(std::move(trajectory));
+        ++ this->ValidTrajectoryCount;
+        }
+      else
+        {
+        ++ this->InvalidTrajectoryCount;
+        }
+    }
+
+  void finish_idle_trajectories(Timestamp const& now)
+    {
+      std::vector<typename trajectory_map_type::iterator> idle_trajectories;
+      for (typename trajectory_map_type::iterator iter = this->TrajectoriesInProgress.begin();
+           iter != this->TrajectoriesInProgress.end();
+           ++iter)
+        {
+        if ((now - (*iter).second.back().timestamp()) > this->SeparationTime)
+          {
+          idle_trajectories.push_back(iter);
+          }
+        }
+      this->finish_in_end_time_order(idle_trajectories);
+    }
+
+  // Finish the given trajectories, oldest last point first, so that
+  // a trajectory that ended earlier always comes out earlier.
+  void finish_in_end_time_order(std::vector<typename trajectory_map_type::iterator>& trajectories)
+    {
+      std::stable_sort(trajectories.begin(), trajectories.end(),
+                       [](typename trajectory_map_type::iterator const& a,
+                          typename trajectory_map_type::iterator const& b)
+                       {
+                         return (*a).second.back().timestamp() < (*b).second.back().timestamp();
+                       });
+
+      for (std::size_t i = 0; i < trajectories.size(); ++i)
+        {
+        this->finish_trajectory((*trajectories[i]).second);
+        this->TrajectoriesInProgress.erase(trajectories[i]);
+        }
+    }
+};
+
+} // close namespace tracktable
+
+#endif
@@ -99,7 +99,9 @@ struct DBSCAN_Driver
     PointInputIteratorT input_end,
     SearchBoxPointT search_box_half_span,
     int minimum_cluster_size,
-    LabelOutputIteratorT output_sink
+    LabelOutputIteratorT output_sink,
+    int num_threads=1,
+    DBSCANEngine engine=DBSCANEngine::AUTO
   )
   {
     typedef typename PointInputIteratorT::value_type input_point_type;
@@ -118,7 +120,10 @@ struct DBSCAN_Driver
     int num_clusters = dbscan.learn_clusters(
       input_begin, input_end,
       actual_search_box,
-      minimum_cluster_size
+      minimum_cluster_size,
+      false,
+      num_threads,
+      engine
     );
 
 
@@ -148,7 +153,9 @@ struct DBSCAN_Driver<
     PointInputIteratorT input_end,
     SearchBoxPointT search_box_half_span,
     int minimum_cluster_size,
-    OutputIteratorT output_sink
+    OutputIteratorT output_sink,
+    int num_threads=1,
+    DBSCANEngine engine=DBSCANEngine::AUTO
   )
   {
     typedef std::pair<PointT, MetadataT> dispatch_point_type;
@@ -193,7 +200,9 @@ struct DBSCAN_Driver<
       boost::make_transform_iterator(input_end, point_extractor_type()),
       search_box_half_span,
       minimum_cluster_size,
-      std::back_inserter(raw_labels)
+      std::back_inserter(raw_labels),
+      num_threads,
+      engine
     );
 
     typedef std::vector<input_metadata_type> metadata_vector_t;
@@ -0,0 +1,368 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above
+ * copyright notice, this list of conditions and the following
+ * disclaimer in the documentation and/or other materials provided
+ * with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT,
+ * INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+ * (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+ * SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+ * HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+ * STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ * ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED
+ * OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+/*
+ * dbscan_grid_index.h - Uniform grid for DBSCAN neighbor queries
+ *
+ * DBSCAN spends nearly all of its time asking "which points are in
+ * the search box around this one?"  When the search box is the same
+ * for every point we can answer that without a tree: cut space into
+ * cells one search-box half-span wide and any neighbor must be in
+ * the point's own cell or one of the cells next to it.
+ *
+ * The grid only uses the first few dimensions with a usable search
+ * span.  Points in higher dimensions are still fine -- the grid just
+ * returns candidates that the caller must check against the whole
+ * search box.
+ */
+
+#ifndef __tracktable_dbscan_grid_index_h
+#define __tracktable_dbscan_grid_index_h
+
+#include <boost/geometry/core/access.hpp>
+#include <boost/geometry/core/coordinate_dimension.hpp>
+
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <limits>
+#include <utility>
+#include <vector>
+
+namespace tracktable { namespace analysis { namespace detail {
+
+/** Coordinate accessor that works with a run-time dimension index.
+ *
+ * boost::geometry only lets us ask for coordinates with a
+ * compile-time index, so we unroll the dimensions here.
+ */
+template<class PointT, std::size_t Dimension, std::size_t NumDimensions>
+struct DynamicCoordinate
+{
+  static double get(PointT const& point, std::size_t which)
+    {
+      if (which == Dimension)
+        {
+        return static_cast<double>(boost::geometry::get<Dimension>(point));
+        }
+      return DynamicCoordinate<PointT, Dimension+1, NumDimensions>::get(point, which);
+    }
+};
+
+template<class PointT, std::size_t NumDimensions>
+struct DynamicCoordinate<PointT, NumDimensions, NumDimensions>
+{
+  static double get(PointT const& /*point*/, std::size_t /*which*/)
+    {
+      return 0;
+    }
+};
+
+// ----------------------------------------------------------------------
+
+/** Bucket points into a uniform grid of search-box-sized cells.
+ *
+ * Only occupied cells take up space.  Points are sorted by cell so
+ * that each cell is one contiguous run of point indices, and each
+ * cell keeps a list of its occupied neighbors so that a query is
+ * just a few array scans.
+ */
+template<class PointT>
+class DBSCAN_GridIndex
+{
+public:
+  typedef PointT point_type;
+
+  /// Most dimensions that the grid will use.  Each cell has up to 3^N neighbors.
+  static const std::size_t MAX_GRID_DIMENSIONS = 4;
+
+  typedef std::array<std::int64_t, MAX_GRID_DIMENSIONS> cell_type;
+
+  DBSCAN_GridIndex()
+    : NumGridDimensions(0)
+    { }
+
+  /** Put points into the grid.
+   *
+   * @param [in] num_points             How many points there are
+   * @param [in] point_at               Callable: point_at(i) returns point i
+   * @param [in] epsilon_box_half_span  Search range in each direction
+   * @return Whether the grid could be built.  This fails when no
+   *         dimension has a positive, finite span or when a coordinate
+   *         is too far from the origin for its cell number to fit in
+   *         64 bits.
+   */
+  template<class PointAccessorT>
+  bool build(std::size_t num_points,
+             PointAccessorT const& point_at,
+             point_type const& epsilon_box_half_span)
+    {
+      typedef DynamicCoordinate<point_type, 0, point_dimension> coordinate;
+
+      this->NumGridDimensions = 0;
+      this->SortedPointIndices.clear();
+      this->SortedPoints.clear();
+
+      for (std::size_t d = 0;
+           d < point_dimension && this->NumGridDimensions < MAX_GRID_DIMENSIONS;
+           ++d)
+        {
+        double span = coordinate::get(epsilon_box_half_span, d);
+        if (std::isfinite(span) && span > 0)
+          {
+          // Widen the cells a hair so that rounding in the division
+          // can never put two neighbors two cells apart.
+          this->GridDimension[this->NumGridDimensions] = d;
+          this->CellWidth[this->NumGridDimensions] = span * (1 + 1e-9);
+          ++this->NumGridDimensions;
+          }
+        }
+      if (this->NumGridDimensions == 0)
+        {
+        return false;
+        }
+
+      std::vector< std::pair<cell_type, std::size_t> > cell_for_point;
+      cell_for_point.reserve(num_points);
+      for (std::size_t i = 0; i < num_points; ++i)
+        {
+        cell_type cell;
+        if (!this->compute_cell(point_at(i), cell))
+          {
+          return false;
+          }
+        cell_for_point.push_back(std::make_pair(cell, i));
+        }
+
+      std::sort(cell_for_point.begin(), cell_for_point.end());
+
+      // Each occupied cell becomes one contiguous run of sorted point
+      // indices.
+      std::vector<cell_type> cell_coordinates;
+      this->SortedPointIndices.reserve(num_points);
+      this->SortedPoints.reserve(num_points);
+      this->CellForPoint.resize(num_points);
+      this->PositionForPoint.resize(num_points);
+      this->CellStart.clear();
+      for (std::size_t i = 0; i < cell_for_point.size(); ++i)
+        {
+        if (i == 0 || cell_for_point[i].first != cell_for_point[i-1].first)
+          {
+          cell_coordinates.push_back(cell_for_point[i].first);
+          this->CellStart.push_back(i);
+          }
+        this->SortedPointIndices.push_back(cell_for_point[i].second);
+        this->SortedPoints.push_back(point_at(cell_for_point[i].second));
+        this->CellForPoint[cell_for_point[i].second] = cell_coordinates.size() - 1;
+        this->PositionForPoint[cell_for_point[i].second] = i;
+        }
+      this->CellStart.push_back(cell_for_point.size());
+
+      // Find each cell's occupied neighbors once here instead of once
+      // per query.  The cells are sorted, and adding the same offset
+      // to every cell keeps them sorted, so for each offset we can
+      // walk a single cursor forward through the list instead of
+      // doing a lookup per cell.  The offsets are in sorted order too,
+      // so each cell's neighbor list comes out sorted.
+      std::vector<cell_type> offsets(this->neighbor_offsets());
+      std::vector<std::size_t> cursor(offsets.size(), 0);
+      std::size_t num_cells = cell_coordinates.size();
+      this->NeighborStart.clear();
+      this->NeighborCells.clear();
+      this->SelfNeighbor.clear();
+      for (std::size_t c = 0; c < num_cells; ++c)
+        {
+        this->NeighborStart.push_back(this->NeighborCells.size());
+        for (std::size_t i = 0; i < offsets.size(); ++i)
+          {
+          cell_type target(cell_coordinates[c]);
+          for (std::size_t d = 0; d < this->NumGridDimensions; ++d)
+            {
+            target[d] += offsets[i][d];
+            }
+          std::size_t& here = cursor[i];
+          while (here < num_cells && cell_coordinates[here] < target)
+            {
+            ++here;
+            }
+          if (here < num_cells && cell_coordinates[here] == target)
+            {
+            if (here == c)
+              {
+              this->SelfNeighbor.push_back(this->NeighborCells.size());
+              }
+            this->NeighborCells.push_back(here);
+            }
+          }
+        }
+      this->NeighborStart.push_back(this->NeighborCells.size());
+
+      return true;
+    }
+
+  /** Call a function with the index of every point that might be
+   * near one of the points in the grid.
+   *
+   * The candidates are all the points in the query point's cell and
+   * the cells next to it, including the query point itself.  The
+   * caller is responsible for checking each candidate against the
+   * actual search box.
+   *
+   * With `forward_only` set we skip every candidate that comes before
+   * the query point in cell order.  Since "is a candidate of" is
+   * symmetric, visiting every point this way still sees each pair of
+   * candidates exactly once, in half the time.
+   *
+   * @param [in] point_index   Index of the query point as given to build()
+   * @param [in] visitor       Callable taking a std::size_t point index
+   *                           and the point itself.  Return false to stop.
+   * @param [in] forward_only  Only visit candidates after the query point
+   */
+  template<class VisitorT>
+  void visit_candidates(std::size_t point_index,
+                        VisitorT const& visitor,
+                        bool forward_only=false) const
+    {
+      std::size_t cell = this->CellForPoint[point_index];
+      std::size_t first_neighbor = (forward_only
+                                    ? this->SelfNeighbor[cell]
+                                    : this->NeighborStart[cell]);
+
+      for (std::size_t n = first_neighbor; n < this->NeighborStart[cell+1]; ++n)
+        {
+        std::size_t neighbor_cell = this->NeighborCells[n];
+        std::size_t first_point = this->CellStart[neighbor_cell];
+        if (forward_only && neighbor_cell == cell)
+          {
+          first_point = this->PositionForPoint[point_index] + 1;
+          }
+        for (std::size_t j = first_point; j < this->CellStart[neighbor_cell+1]; ++j)
+          {
+          if (!visitor(this->SortedPointIndices[j], this->SortedPoints[j]))
+            {
+            return;
+            }
+          }
+        }
+    }
+
+  /// Number of dimensions used for the grid
+  std::size_t num_grid_dimensions() const
+    {
+      return this->NumGridDimensions;
+    }
+
+  /// Number of non-empty cells
+  std::size_t num_cells() const
+    {
+      return (this->CellStart.empty() ? 0 : this->CellStart.size() - 1);
+    }
+
+private:
+  static const std::size_t point_dimension = boost::geometry::dimension<point_type>::value;
+
+  bool compute_cell(point_type const& point, cell_type& cell) const
+    {
+      typedef DynamicCoordinate<point_type, 0, point_dimension> coordinate;
+
+      // Cell numbers must stay well inside the 64-bit range so that
+      // adding neighbor offsets can't overflow.
+      const double max_cell = 4.0e18;
+
+      cell.fill(0);
+      for (std::size_t d = 0; d < this->NumGridDimensions; ++d)
+        {
+        double cell_number = std::floor(
+          coordinate::get(point, this->GridDimension[d]) / this->CellWidth[d]
+          );
+        if (!(std::fabs(cell_number) < max_cell))
+          {
+          return false;
+          }
+        cell[d] = static_cast<std::int64_t>(cell_number);
+        }
+      return true;
+    }
+
+  std::vector<cell_type> neighbor_offsets() const
+    {
+      std::vector<cell_type> result;
+      std::size_t num_offsets = 1;
+      for (std::size_t d = 0; d < this->NumGridDimensions; ++d)
+        {
+        num_offsets *= 3;
+        }
+
+      for (std::size_t i = 0; i < num_offsets; ++i)
+        {
+        cell_type offset;
+        offset.fill(0);
+        // Count in base 3 with the first dimension as the most
+        // significant digit so that the offsets come out sorted.
+        std::size_t digits = i;
+        for (std::size_t d = this->NumGridDimensions; d > 0; --d)
+          {
+          offset[d-1] = static_cast<std::int64_t>(digits % 3) - 1;
+          digits /= 3;
+          }
+        result.push_back(offset);
+        }
+      return result;
+    }
+
+  std::size_t NumGridDimensions;
+  std::array<std::size_t, MAX_GRID_DIMENSIONS> GridDimension;
+  std::array<double, MAX_GRID_DIMENSIONS> CellWidth;
+  /// Point indices sorted by cell
+  std::vector<std::size_t> SortedPointIndices;
+  /// Copies of the points in the same order so that scanning a cell
+  /// reads memory sequentially
+  std::vector<point_type> SortedPoints;
+  /// Cell number for each point
+  std::vector<std::size_t> CellForPoint;
+  /// Where each point is in SortedPointIndices
+  std::vector<std::size_t> PositionForPoint;
+  /// Where each cell's run starts in SortedPointIndices (plus one past the end)
+  std::vector<std::size_t> CellStart;
+  /// Occupied neighbors of each cell, including itself
+  std::vector<std::size_t> NeighborCells;
+  /// Where each cell's neighbors start in NeighborCells (plus one past the end)
+  std::vector<std::size_t> NeighborStart;
+  /// Where each cell appears in its own neighbor list
+  std::vector<std::size_t> SelfNeighbor;
+};
+
+} } } // close namespace tracktable::analysis::detail
+
+#endif
@@ -46,14 +46,18 @@
 #undef TIME_CLUSTERING_STEPS
 
 #include <tracktable/Core/TracktableCommon.h>
+#include <tracktable/Core/ParallelFor.h>
 
+#include <atomic>
 #include <list>
+#include <limits>
 #include <utility>
 #include <vector>
 #include <fstream>
 #include <iomanip>
 
 #include <boost/bind/bind.hpp>
+#include <boost/iterator/function_output_iterator.hpp>
 #include <boost/mpl/assert.hpp>
 #include <boost/tuple/tuple.hpp>
 
@@ -76,12 +80,31 @@
 #endif
 
 #include <tracktable/Analysis/detail/dbscan_points.h>
+#include <tracktable/Analysis/detail/dbscan_grid_index.h>
 #include <tracktable/Core/PointArithmetic.h>
 
 namespace bgi = boost::geometry::index;
 namespace bg = boost::geometry;
 
-namespace tracktable { namespace analysis { namespace detail { namespace implementation {
+namespace tracktable {
+
+/** Search structures that DBSCAN can use to find neighbors.
+ *
+ * All of these produce the same clusters.  They differ only in speed.
+ *
+ * - AUTO: Use GRID for 2- to 4-dimensional points and RTREE otherwise.
+ * - RTREE: Boost R-tree.  Works well for any data.
+ * - GRID: Sort points into cells the size of the search box.  Usually
+ *   much faster in low dimensions.  In higher dimensions only the
+ *   first four dimensions are used for the grid.
+ */
+enum class DBSCANEngine {
+  AUTO = 0,
+  RTREE = 1,
+  GRID = 2
+};
+
+namespace analysis { namespace detail { namespace implementation {
 
 /** Cluster points using the DBSCAN algorithm.
  *
@@ -112,6 +135,17 @@ namespace tracktable { namespace analysis { namespace detail { namespace impleme
  * please refer to the functions in
  * `Analysis/ComputeDBSCANClustering.h`.
  *
+ * With more than one thread, learn_clusters() finds core points and
+ * connects them with a concurrent union-find instead of growing one
+ * cluster at a time.  Clusters are numbered in order of their
+ * lowest-numbered core point and each border point joins the
+ * lowest-numbered cluster that reaches it, which gives the same
+ * labels as the single-threaded search.
+ *
+ * Neighbor queries normally go through an R-tree.  For points with
+ * two to four dimensions learn_clusters() uses a uniform grid of
+ * search-box-sized cells instead; see DBSCANEngine.
+ *
  *
  * For more information about the DBSCAN algorithm please refer to the
  * original paper: Ester, Martin; Kriegel, Hans-Peter; Sander, Jörg;
@@ -187,6 +221,9 @@ public:
    * @param [in] point_end              Iterator past end of input points
    * @param [in] epsilon_box_half_span  "Nearby" distance in each dimension
    * @param [in] min_cluster_size       Minimum number of points for a cluster
+   * @param [in] L2                     Use the ellipsoid inside the box instead of the whole box
+   * @param [in] num_threads            Threads for neighbor queries (0 means one per core)
+   * @param [in] engine                 Search structure for neighbor queries
    * @return    Number of clusters detected (cluster 0 is noise)
    */
 
@@ -194,7 +231,9 @@ public:
   int learn_clusters(IteratorT point_begin, IteratorT point_end,
                      point_type const& epsilon_box_half_span,
                      unsigned int min_cluster_size,
-                     bool L2=false)
+                     bool L2=false,
+                     int num_threads=1,
+                     DBSCANEngine engine=DBSCANEngine::AUTO)
     {
       // Convert the points into a format that we can use in the R-tree
       indexed_point_vector_type indexed_points;
@@ -207,33 +246,66 @@ public:
         }
 
       this->InputPointCount = indexed_points.size();
-      rtree_parameter_type params;
-      rtree_type rtree(params, indexable_getter_type(indexed_points));
-      if (1)
+      this->CorePointFlags.assign(indexed_points.size(), 0);
+      this->num_range_queries = 0;
+
+      if (this->use_grid(engine)
+          && this->learn_clusters_with_grid(indexed_points,
+                                            epsilon_box_half_span,
+                                            min_cluster_size,
+                                            L2,
+                                            num_threads))
         {
-#if defined(TIME_CLUSTERING_STEPS)
-        boost::timer::auto_cpu_timer t;
-#endif
-        for (rtree_value_type iter = indexed_points.begin();
-             iter != indexed_points.end();
-             ++iter)
-          {
-          rtree.insert(iter);
-          }
+        return boost::numeric_cast<int>(this->ClusterMembership.size());
         }
 
-      this->num_range_queries = 0;
+      // Build the tree in one pass with the packing algorithm.  This
+      // is much faster than inserting points one at a time and
+      // produces a better-balanced tree for the queries.
+      std::vector<rtree_value_type> rtree_values;
+      rtree_values.reserve(indexed_points.size());
+      for (rtree_value_type iter = indexed_points.begin();
+           iter != indexed_points.end();
+           ++iter)
+        {
+        rtree_values.push_back(iter);
+        }
+
+      rtree_parameter_type params;
+      rtree_type rtree(rtree_values.begin(), rtree_values.end(),
+                       params, indexable_getter_type(indexed_points));
 
       if (1)
         {
 #if defined(TIME_CLUSTERING_STEPS)
         boost::timer::auto_cpu_timer t;
 #endif
-        this->compute_cluster_membership(indexed_points,
-                                         min_cluster_size,
-                                         epsilon_box_half_span,
-                                         rtree,
-                                         L2);
+        if (resolve_thread_count(num_threads) > 1)
+          {
+          rtree_value_type first_point = indexed_points.begin();
+          this->compute_cluster_membership_parallel(
+            indexed_points,
+            min_cluster_size,
+            [&](std::size_t i, auto const& visitor, bool /*once*/)
+            {
+              // The tree can't stop a query early or skip half of the
+              // neighbors, so we always report all of them.
+              this->visit_neighbors(rtree, indexed_points[i].point(), epsilon_box_half_span, L2,
+                                    [&](rtree_value_type const& neighbor)
+                                    {
+                                      visitor(static_cast<std::size_t>(neighbor - first_point));
+                                    });
+            },
+            num_threads);
+          }
+        else
+          {
+          this->compute_cluster_membership(indexed_points,
+                                           min_cluster_size,
+                                           epsilon_box_half_span,
+                                           rtree,
+                                           L2);
+          }
         }
 
       return boost::numeric_cast<int>(this->ClusterMembership.size());
@@ -293,6 +365,23 @@ public:
         }
     }
 
+  /** Return whether each point is a core point.
+   *
+   * A core point has at least the minimum cluster size of points
+   * (counting itself) in its search box.  Every other point in a
+   * cluster is there because it is near a core point.  This is
+   * useful when combining clusters found in separate runs: two
+   * clusters that share a core point are really one cluster, while
+   * two clusters that share a border point are not.
+   *
+   * @param [out] out_flags   1 for core points, 0 for all others
+   */
+
+  void point_core_flags(int_vector_type& out_flags)
+    {
+      out_flags.assign(this->CorePointFlags.begin(), this->CorePointFlags.end());
+    }
+
 
 private:
   /** Internal method.
@@ -429,6 +518,313 @@ protected:
 #endif
     }
 
+// ----------------------------------------------------------------------
+
+  /** Decide whether to try the grid for neighbor queries.
+   *
+   * The automatic choice takes the grid for 2-, 3- and 4-dimensional
+   * points: the cells next to a point cover little more than its
+   * search box.  In more dimensions the R-tree usually does better.
+   */
+  static bool use_grid(DBSCANEngine engine)
+    {
+      if (engine == DBSCANEngine::GRID)
+        {
+        return true;
+        }
+      if (engine == DBSCANEngine::RTREE)
+        {
+        return false;
+        }
+      std::size_t dimension = boost::geometry::dimension<point_type>::value;
+      return (dimension >= 2 && dimension <= 4);
+    }
+
+  /** Learn clusters using a uniform grid for neighbor queries.
+   *
+   * @return False if the grid could not be built (see
+   *         DBSCAN_GridIndex::build()).  Nothing has been computed in
+   *         that case and the caller should use the R-tree instead.
+   */
+  bool learn_clusters_with_grid(indexed_point_vector_type& points,
+                                point_type const& epsilon_box_half_span,
+                                unsigned int min_cluster_size,
+                                bool L2,
+                                int num_threads)
+    {
+      DBSCAN_GridIndex<point_type> grid;
+      if (!grid.build(points.size(),
+                      [&](std::size_t i) -> point_type const& { return points[i].point(); },
+                      epsilon_box_half_span))
+        {
+        TRACKTABLE_LOG(log::debug)
+          << "DBSCAN: Could not build a grid for these points.  Using the R-tree instead.";
+        return false;
+        }
+
+#if defined(TIME_CLUSTERING_STEPS)
+      boost::timer::auto_cpu_timer t;
+#endif
+      this->compute_cluster_membership_parallel(
+        points,
+        min_cluster_size,
+        [&](std::size_t i, auto const& visitor, bool once)
+        {
+          point_type const& center(points[i].point());
+          box_type epsilon_box(make_box(center, epsilon_box_half_span));
+          grid.visit_candidates(i,
+                                [&](std::size_t j, point_type const& candidate)
+                                {
+                                  // Same test the R-tree uses: strictly inside the box
+                                  if (boost::geometry::within(candidate, epsilon_box)
+                                      && (!L2 || inside_ellipsoid(candidate, center, epsilon_box_half_span)))
+                                    {
+                                    return visitor(j);
+                                    }
+                                  return true;
+                                },
+                                once);
+        },
+        num_threads);
+      return true;
+    }
+
+  // ----------------------------------------------------------------------
+
+  /** Learn cluster assignments for all points using several threads.
+   *
+   * This produces the same clusters as compute_cluster_membership()
+   * in three passes of neighbor queries, each spread across threads:
+   *
+   * 1. Count each point's neighbors to find the core points.
+   * 2. Join each core point to its core neighbors with a lock-free
+   *    union-find.  Links always point from the larger index to the
+   *    smaller, so the root of each set is its lowest-numbered core
+   *    point.
+   * 3. Give each remaining point the lowest-rooted cluster among its
+   *    core neighbors, or leave it as noise.
+   *
+   * The neighbor search is up to the caller so that the same passes
+   * work with the R-tree and with the grid.
+   *
+   * @param [in] points                Points with indices attached
+   * @param [in] min_cluster_size      Minimum number of points in neighborhood
+   *                                  required to define a core point
+   * @param [in] visit_neighbors       Callable: visit_neighbors(i, f, once)
+   *                                  calls f(j) for every neighbor j of
+   *                                  point i, including i itself, until
+   *                                  f returns false.  When `once` is
+   *                                  true it may skip neighbors as long as
+   *                                  every pair of neighbors is still
+   *                                  seen from one end or the other.
+   * @param [in] num_threads           Number of threads for the queries
+   */
+
+  template<typename neighbor_finder_type>
+  void compute_cluster_membership_parallel(indexed_point_vector_type& points,
+                                           unsigned int min_cluster_size,
+                                           neighbor_finder_type const& visit_neighbors,
+                                           int num_threads)
+    {
+      typedef std::vector< std::atomic<std::size_t> > parent_vector_type;
+      const std::size_t no_cluster = std::numeric_limits<std::size_t>::max();
+      std::size_t num_points = points.size();
+
+      std::vector<char> is_core(num_points, 0);
+      parent_vector_type parent(num_points);
+      for (std::size_t i = 0; i < num_points; ++i)
+        {
+        parent[i].store(i, std::memory_order_relaxed);
+        }
+
+      // Pass 1: which points are core points?
+      parallel_for(num_points,
+        [&](std::size_t i)
+        {
+          std::size_t num_neighbors = 0;
+          visit_neighbors(i,
+                          [&](std::size_t)
+                          {
+                            ++num_neighbors;
+                            return (num_neighbors < min_cluster_size);
+                          },
+                          false);
+          is_core[i] = (num_neighbors >= min_cluster_size);
+        },
+        num_threads);
+
+      for (std::size_t i = 0; i < num_points; ++i)
+        {
+        this->CorePointFlags[points[i].point_id()] = is_core[i];
+        }
+
+      // Pass 2: connect core points that are neighbors.  Linking is
+      // symmetric so each pair only needs to be seen once.
+      parallel_for(num_points,
+        [&](std::size_t i)
+        {
+          if (!is_core[i]) return;
+          visit_neighbors(i,
+                          [&](std::size_t j)
+                          {
+                            if (j != i && is_core[j])
+                              {
+                              union_sets(parent, i, j);
+                              }
+                            return true;
+                          },
+                          true);
+        },
+        num_threads);
+
+      std::vector<std::size_t> root(num_points, no_cluster);
+      for (std::size_t i = 0; i < num_points; ++i)
+        {
+        if (is_core[i])
+          {
+          root[i] = find_set(parent, i);
+          }
+        }
+
+      // Pass 3: attach border points to the earliest cluster that
+      // reaches them
+      parallel_for(num_points,
+        [&](std::size_t i)
+        {
+          if (is_core[i]) return;
+          std::size_t best_root = no_cluster;
+          visit_neighbors(i,
+                          [&](std::size_t j)
+                          {
+                            if (is_core[j] && root[j] < best_root)
+                              {
+                              best_root = root[j];
+                              }
+                            return true;
+                          },
+                          false);
+          root[i] = best_root;
+        },
+        num_threads);
+
+      // Every point is queried once to classify it and once more to
+      // link it (core points) or attach it (everything else).
+      this->num_range_queries = boost::numeric_cast<int>(2 * num_points);
+
+      // Number the clusters in order of their lowest core point.
+      // Each root is that point, so one ascending sweep suffices.
+      std::vector<unsigned int> cluster_id_for_root(num_points, 0);
+      unsigned int next_cluster_id = 1;
+      for (std::size_t i = 0; i < num_points; ++i)
+        {
+        if (is_core[i] && root[i] == i)
+          {
+          cluster_id_for_root[i] = next_cluster_id++;
+          }
+        }
+
+      for (std::size_t i = 0; i < num_points; ++i)
+        {
+        points[i].set_visited(true);
+        points[i].set_cluster_id(root[i] == no_cluster ? 0 : cluster_id_for_root[root[i]]);
+        }
+
+      this->build_cluster_membership_lists(points, next_cluster_id);
+    }
+
+  // ----------------------------------------------------------------------
+
+  /** Call a function for every point near a query point.
+   *
+   * The neighborhood is the search box around `center`, trimmed to
+   * the inscribed ellipsoid when L2 is set.  Only const operations
+   * are used on the tree so several threads can call this at once.
+   */
+
+  template<typename visitor_type>
+  void visit_neighbors(rtree_type const& rtree,
+                       point_type const& center,
+                       point_type const& epsilon_box_half_span,
+                       bool L2,
+                       visitor_type visitor) const
+    {
+      box_type epsilon_box(make_box(center, epsilon_box_half_span));
+      rtree.query(boost::geometry::index::within(epsilon_box),
+                  boost::make_function_output_iterator(
+                    [&](rtree_value_type const& neighbor)
+                    {
+                      if (!L2 || inside_ellipsoid(neighbor->point(), center, epsilon_box_half_span))
+                        {
+                        visitor(neighbor);
+                        }
+                    }));
+    }
+
+  /** Is a point inside the ellipsoid inscribed in a search box? */
+  static bool inside_ellipsoid(point_type const& point,
+                               point_type const& center,
+                               point_type const& epsilon_box_half_span)
+    {
+      return (tracktable::arithmetic::norm_squared(
+                tracktable::arithmetic::divide(
+                  tracktable::arithmetic::subtract(point, center),
+                  epsilon_box_half_span)) <= 1.0);
+    }
+
+  // ----------------------------------------------------------------------
+
+  /** Find the root of a union-find set, halving the path as we go. */
+  static std::size_t find_set(std::vector< std::atomic<std::size_t> >& parent,
+                              std::size_t element)
+    {
+      while (true)
+        {
+        std::size_t up = parent[element].load();
+        if (up == element)
+          {
+          return element;
+          }
+        std::size_t grandparent = parent[up].load();
+        if (grandparent != up)
+          {
+          // Losing this race is harmless: someone else already
+          // moved the pointer further up the same path.
+          parent[element].compare_exchange_weak(up, grandparent);
+          }
+        element = grandparent;
+        }
+    }
+
+  /** Merge the union-find sets containing two elements.
+   *
+   * The root with the larger index always goes under the one with the
+   * smaller index.  The compare-and-swap only succeeds while the root
+   * is still a root, so concurrent merges retry instead of losing
+   * links.
+   */
+  static void union_sets(std::vector< std::atomic<std::size_t> >& parent,
+                         std::size_t a, std::size_t b)
+    {
+      while (true)
+        {
+        a = find_set(parent, a);
+        b = find_set(parent, b);
+        if (a == b)
+          {
+          return;
+          }
+        if (a < b)
+          {
+          std::swap(a, b);
+          }
+        std::size_t expected = a;
+        if (parent[a].compare_exchange_strong(expected, b))
+          {
+          return;
+          }
+        }
+    }
+
 // ----------------------------------------------------------------------
 
   /** Discover a single cluster.
@@ -496,6 +892,7 @@ protected:
         if (points_in_neighborhood.size() >= min_cluster_size)
           {
           core_point_found = true;
+          this->CorePointFlags[(*query_point)->point_id()] = 1;
 
           // Remove all the points that already belong to another cluster
           points_in_neighborhood.erase(
@@ -616,8 +1013,12 @@ protected:
   int_vector_type core_point_avg_num_neighbors;
   int_vector_type total_num_neighbors;
   std::size_t InputPointCount;
+  /// Whether each point (by input index) is a core point
+  std::vector<char> CorePointFlags;
 };
 
-} } } } // namespace tracktable::analysis::detail::implementation
+} } } // namespace analysis::detail::implementation
+
+} // namespace tracktable
 
 #endif
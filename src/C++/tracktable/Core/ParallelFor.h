@@ -0,0 +1,158 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+/*
+ * tracktable/Core/ParallelFor.h - Run independent loop iterations on
+ * several threads
+ *
+ * This is a deliberately small tool for the embarrassingly parallel
+ * loops that show up in batch queries: every iteration writes only to
+ * its own output slot and reads shared data that nobody modifies.
+ * Iterations are handed out in small chunks so that threads stay busy
+ * even when some iterations take much longer than others.
+ */
+
+#ifndef __tracktable_ParallelFor_h
+#define __tracktable_ParallelFor_h
+
+#include <algorithm>
+#include <atomic>
+#include <cstddef>
+#include <exception>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace tracktable {
+
+/** Decide how many threads to use for a parallel loop.
+ *
+ * @param [in] requested  Number of threads the caller asked for.  Zero
+ *                        or a negative number means "one per hardware
+ *                        thread".
+ * @return Number of threads to use (always at least 1)
+ */
+inline std::size_t resolve_thread_count(int requested)
+{
+  if (requested > 0)
+    {
+    return static_cast<std::size_t>(requested);
+    }
+  std::size_t hardware_threads = std::thread::hardware_concurrency();
+  return (hardware_threads > 0 ? hardware_threads : 1);
+}
+
+/** Call a function once for every index in [0, count).
+ *
+ * With one thread (or a tiny loop) this is an ordinary for loop run
+ * on the calling thread.  Otherwise worker threads claim chunks of
+ * indices until there are none left.  If any call throws, the
+ * remaining work is abandoned and the first exception is rethrown on
+ * the calling thread after all workers have finished.
+ *
+ * @param [in] count        Number of iterations
+ * @param [in] body         Callable taking a std::size_t index
+ * @param [in] num_threads  Number of threads to use (see resolve_thread_count)
+ * @param [in] chunk_size   Number of consecutive indices claimed at once
+ */
+template<typename function_type>
+void parallel_for(std::size_t count,
+                  function_type const& body,
+                  int num_threads,
+                  std::size_t chunk_size=64)
+{
+  std::size_t thread_count = std::min(resolve_thread_count(num_threads),
+                                      (count + chunk_size - 1) / std::max<std::size_t>(chunk_size, 1));
+
+  if (thread_count <= 1)
+    {
+    for (std::size_t i = 0; i < count; ++i)
+      {
+      body(i);
+      }
+    return;
+    }
+
+  std::atomic<std::size_t> next_index(0);
+  std::atomic<bool> failed(false);
+  std::exception_ptr first_error;
+  std::mutex error_mutex;
+
+  auto worker = [&]()
+    {
+      while (!failed)
+        {
+        std::size_t start = next_index.fetch_add(chunk_size);
+        if (start >= count)
+          {
+          return;
+          }
+        std::size_t end = std::min(start + chunk_size, count);
+        try
+          {
+          for (std::size_t i = start; i < end; ++i)
+            {
+            body(i);
+            }
+          }
+        catch (...)
+          {
+          std::lock_guard<std::mutex> lock(error_mutex);
+          if (!first_error)
+            {
+            first_error = std::current_exception();
+            }
+          failed = true;
+          return;
+          }
+        }
+    };
+
+  std::vector<std::thread> threads;
+  threads.reserve(thread_count - 1);
+  for (std::size_t t = 1; t < thread_count; ++t)
+    {
+    threads.emplace_back(worker);
+    }
+  worker();
+  for (std::size_t t = 0; t < threads.size(); ++t)
+    {
+    threads[t].join();
+    }
+
+  if (first_error)
+    {
+    std::rethrow_exception(first_error);
+    }
+}
+
+} // exit namespace tracktable
+
+#endif
@@ -0,0 +1,144 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+// Check the integer epoch-microsecond timestamp accessors on
+// TrajectoryPoint and Trajectory.
+
+#include <tracktable/Core/PointCartesian.h>
+#include <tracktable/Core/Timestamp.h>
+#include <tracktable/Core/Trajectory.h>
+#include <tracktable/Core/TrajectoryPoint.h>
+
+#include <cstdint>
+#include <iostream>
+#include <limits>
+
+typedef tracktable::PointCartesian<2> Point2D;
+typedef tracktable::TrajectoryPoint<Point2D> TrajectoryPoint2D;
+typedef tracktable::Trajectory<TrajectoryPoint2D> Trajectory2D;
+
+// ----------------------------------------------------------------------
+
+int test_point_accessors()
+{
+  int error_count = 0;
+  TrajectoryPoint2D point;
+
+  // 2014-04-05 12:34:56.789 UTC
+  const int64_t expected_usec = 1396701296789000LL;
+  tracktable::Timestamp expected(tracktable::Date(2014, 4, 5),
+                                 tracktable::hours(12)
+                                 + tracktable::minutes(34)
+                                 + tracktable::seconds(56)
+                                 + tracktable::milliseconds(789));
+
+  point.set_timestamp(expected);
+  if (point.timestamp_epoch_microseconds() != expected_usec)
+    {
+    std::cout << "ERROR: timestamp_epoch_microseconds() returned "
+              << point.timestamp_epoch_microseconds()
+              << ", expected " << expected_usec << ".\n";
+    ++error_count;
+    }
+
+  point.set_timestamp(tracktable::no_such_timestamp());
+  point.set_timestamp_epoch_microseconds(expected_usec);
+  if (point.timestamp() != expected)
+    {
+    std::cout << "ERROR: set_timestamp_epoch_microseconds() produced "
+              << point.timestamp() << ", expected " << expected << ".\n";
+    ++error_count;
+    }
+
+  point.set_timestamp(tracktable::no_such_timestamp());
+  if (point.timestamp_epoch_microseconds() != std::numeric_limits<int64_t>::min())
+    {
+    std::cout << "ERROR: Invalid timestamp became "
+              << point.timestamp_epoch_microseconds()
+              << " instead of the smallest 64-bit integer.\n";
+    ++error_count;
+    }
+
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int test_trajectory_accessors()
+{
+  int error_count = 0;
+  Trajectory2D trajectory;
+
+  if (trajectory.start_time_epoch_microseconds() != std::numeric_limits<int64_t>::min()
+      || trajectory.end_time_epoch_microseconds() != std::numeric_limits<int64_t>::min())
+    {
+    std::cout << "ERROR: Empty trajectory has start/end times "
+              << trajectory.start_time_epoch_microseconds() << " / "
+              << trajectory.end_time_epoch_microseconds()
+              << ", expected the smallest 64-bit integer.\n";
+    ++error_count;
+    }
+
+  TrajectoryPoint2D point;
+  point.set_timestamp_epoch_microseconds(1000000);
+  trajectory.push_back(point);
+  point.set_timestamp_epoch_microseconds(5000000);
+  trajectory.push_back(point);
+
+  if (trajectory.start_time_epoch_microseconds() != 1000000
+      || trajectory.end_time_epoch_microseconds() != 5000000)
+    {
+    std::cout << "ERROR: Trajectory start/end times are "
+              << trajectory.start_time_epoch_microseconds() << " / "
+              << trajectory.end_time_epoch_microseconds()
+              << ", expected 1000000 / 5000000.\n";
+    ++error_count;
+    }
+
+  if (trajectory.start_time() != tracktable::Timestamp(tracktable::Date(1970, 1, 1),
+                                                       tracktable::seconds(1)))
+    {
+    std::cout << "ERROR: Trajectory start time is "
+              << trajectory.start_time() << ", expected 1970-01-01 00:00:01.\n";
+    ++error_count;
+    }
+
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int main(int /*argc*/, char* /*argv*/[])
+{
+  int error_count = 0;
+  error_count += test_point_accessors();
+  error_count += test_trajectory_accessors();
+  return error_count;
+}
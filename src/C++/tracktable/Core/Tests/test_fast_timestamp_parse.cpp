@@ -0,0 +1,159 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+// Check that the fixed-layout timestamp parser agrees with Boost's
+// stream parser and that TimestampConverter only uses it when it
+// gives the same answer.
+
+#include <tracktable/Core/Timestamp.h>
+#include <tracktable/Core/TimestampConverter.h>
+
+#include <boost/date_time/posix_time/posix_time.hpp>
+
+#include <cstdlib>
+#include <iostream>
+#include <string>
+#include <vector>
+
+int test_matches_stream_parser()
+{
+  int error_count = 0;
+  tracktable::TimestampConverter stream_converter;
+  // Same meaning as the default format but not eligible for the fast path
+  stream_converter.set_input_format("%Y-%m-%d %H:%M:%S%F");
+
+  std::srand(12345);
+  tracktable::Timestamp start(tracktable::Date(1900, 1, 1));
+  for (int i = 0; i < 10000; ++i)
+    {
+    tracktable::Timestamp expected = start
+      + tracktable::days(std::rand() % (200 * 365))
+      + tracktable::seconds(std::rand() % 86400);
+    std::string text(boost::posix_time::to_iso_extended_string(expected));
+    text[10] = ' ';
+
+    tracktable::Timestamp parsed;
+    if (!tracktable::parse_fixed_layout_timestamp(text.data(), text.data() + text.size(), ' ', parsed))
+      {
+      std::cout << "ERROR: Fast parser rejected '" << text << "'.\n";
+      ++error_count;
+      }
+    else if (parsed != expected)
+      {
+      std::cout << "ERROR: Fast parser read '" << text << "' as " << parsed
+                << ", expected " << expected << ".\n";
+      ++error_count;
+      }
+    else if (stream_converter.timestamp_from_string(text) != expected)
+      {
+      std::cout << "ERROR: Stream parser read '" << text << "' as "
+                << stream_converter.timestamp_from_string(text)
+                << ", expected " << expected << ".\n";
+      ++error_count;
+      }
+    }
+
+  return error_count;
+}
+
+int test_rejects_other_layouts()
+{
+  int error_count = 0;
+  std::vector<std::string> bad_inputs = {
+    "",
+    "2014-04-05",
+    "2014-04-05 12:34:5",
+    "2014-04-05 12:34:56.5",
+    "2014-04-05T12:34:56",
+    "2014/04/05 12:34:56",
+    "2014-04-05 12:34:5x",
+    "2014-02-30 12:34:56",
+    "2014-13-05 12:34:56",
+    "2014-04-05 24:00:00",
+    "1399-04-05 12:34:56"
+  };
+
+  for (std::string const& text : bad_inputs)
+    {
+    tracktable::Timestamp parsed;
+    if (tracktable::parse_fixed_layout_timestamp(text.data(), text.data() + text.size(), ' ', parsed))
+      {
+      std::cout << "ERROR: Fast parser accepted '" << text << "' as " << parsed << ".\n";
+      ++error_count;
+      }
+    }
+
+  return error_count;
+}
+
+int test_converter()
+{
+  int error_count = 0;
+  tracktable::Timestamp expected(tracktable::Date(2014, 4, 5), tracktable::Duration(12, 34, 56));
+
+  tracktable::TimestampConverter converter;
+  converter.set_input_format("%Y-%m-%dT%H:%M:%S");
+  if (converter.timestamp_from_string("2014-04-05T12:34:56") != expected)
+    {
+    std::cout << "ERROR: Converter with ISO format read "
+              << converter.timestamp_from_string("2014-04-05T12:34:56")
+              << ", expected " << expected << ".\n";
+    ++error_count;
+    }
+
+  // A copy made before the format changes must keep the old format.
+  tracktable::TimestampConverter copy(converter);
+  converter.set_input_format("%Y:%m:%d::%H:%M:%S");
+  if (converter.timestamp_from_string("2014:04:05::12:34:56") != expected)
+    {
+    std::cout << "ERROR: Converter with custom format read "
+              << converter.timestamp_from_string("2014:04:05::12:34:56")
+              << ", expected " << expected << ".\n";
+    ++error_count;
+    }
+  if (copy.timestamp_from_string("2014-04-05T12:34:56") != expected)
+    {
+    std::cout << "ERROR: Copied converter read "
+              << copy.timestamp_from_string("2014-04-05T12:34:56")
+              << ", expected " << expected << ".\n";
+    ++error_count;
+    }
+
+  return error_count;
+}
+
+int main(int /*argc*/, char* /*argv*/[])
+{
+  int error_count = 0;
+  error_count += test_matches_stream_parser();
+  error_count += test_rejects_other_layouts();
+  error_count += test_converter();
+  return error_count;
+}
@@ -0,0 +1,98 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include <tracktable/Core/ParallelFor.h>
+
+#include <iostream>
+#include <stdexcept>
+#include <vector>
+
+int test_every_index_visited(int num_threads)
+{
+  int error_count = 0;
+  const std::size_t count = 10007;
+  std::vector<int> visits(count, 0);
+
+  tracktable::parallel_for(count,
+                           [&visits](std::size_t i) { visits[i] += 1; },
+                           num_threads,
+                           16);
+
+  for (std::size_t i = 0; i < count; ++i)
+    {
+    if (visits[i] != 1)
+      {
+      std::cout << "ERROR: parallel_for with "
+                << num_threads
+                << " threads visited index "
+                << i << " " << visits[i]
+                << " times instead of once.\n";
+      ++error_count;
+      break;
+      }
+    }
+  return error_count;
+}
+
+int test_exception_propagates()
+{
+  try
+    {
+    tracktable::parallel_for(1000,
+                             [](std::size_t i)
+                             {
+                               if (i == 500)
+                                 {
+                                 throw std::runtime_error("expected failure");
+                                 }
+                             },
+                             4,
+                             8);
+    }
+  catch (std::runtime_error const&)
+    {
+    return 0;
+    }
+
+  std::cout << "ERROR: Exception thrown inside parallel_for did not reach the caller.\n";
+  return 1;
+}
+
+int main(int , char**)
+{
+  int error_count = 0;
+
+  error_count += test_every_index_visited(1);
+  error_count += test_every_index_visited(4);
+  error_count += test_every_index_visited(0);
+  error_count += test_exception_propagates();
+
+  return error_count;
+}
@@ -34,6 +34,7 @@
 
 #include <boost/date_time/time_facet.hpp>
 
+#include <limits>
 #include <locale>
 
 
@@ -109,6 +110,86 @@ Duration days(int d)
   return Duration(24 * d, 0, 0);
 }
 
+int64_t timestamp_to_epoch_microseconds(Timestamp const& ts)
+{
+  static const Timestamp epoch(Date(1970, boost::date_time::Jan, 1));
+
+  if (ts.is_special())
+    {
+    return std::numeric_limits<int64_t>::min();
+    }
+  return (ts - epoch).total_microseconds();
+}
+
+Timestamp timestamp_from_epoch_microseconds(int64_t usec)
+{
+  static const Timestamp epoch(Date(1970, boost::date_time::Jan, 1));
+
+  if (usec == std::numeric_limits<int64_t>::min())
+    {
+    return no_such_timestamp();
+    }
+  return epoch + boost::posix_time::microseconds(usec);
+}
+
+namespace {
+
+inline bool read_digits(char const* text, int count, int& value)
+{
+  value = 0;
+  for (int i = 0; i < count; ++i)
+    {
+    if (text[i] < '0' || text[i] > '9')
+      {
+      return false;
+      }
+    value = 10 * value + (text[i] - '0');
+    }
+  return true;
+}
+
+} // anonymous namespace
+
+bool parse_fixed_layout_timestamp(char const* begin, char const* end,
+                                  char separator, Timestamp& result)
+{
+  // YYYY-MM-DD HH:MM:SS
+  // 0123456789012345678
+  if (end - begin != 19
+      || begin[4] != '-' || begin[7] != '-' || begin[10] != separator
+      || begin[13] != ':' || begin[16] != ':')
+    {
+    return false;
+    }
+
+  int year, month, day, hour, minute, second;
+  if (!(read_digits(begin, 4, year)
+        && read_digits(begin + 5, 2, month)
+        && read_digits(begin + 8, 2, day)
+        && read_digits(begin + 11, 2, hour)
+        && read_digits(begin + 14, 2, minute)
+        && read_digits(begin + 17, 2, second)))
+    {
+    return false;
+    }
+
+  // Boost dates start in 1400.  Leave anything out of range to the
+  // general parser so that errors are reported the same way.
+  if (year < 1400 || month < 1 || month > 12 || day < 1
+      || day > boost::gregorian::gregorian_calendar::end_of_month_day(
+        static_cast<unsigned short>(year), static_cast<unsigned short>(month))
+      || hour > 23 || minute > 59 || second > 59)
+    {
+    return false;
+    }
+
+  result = Timestamp(Date(static_cast<unsigned short>(year),
+                          static_cast<unsigned short>(month),
+                          static_cast<unsigned short>(day)),
+                     Duration(hour, minute, second));
+  return true;
+}
+
 void set_default_timestamp_output_format(string_type const& new_format)
 {
   detail::DefaultTimestampOutputFormat = new_format;
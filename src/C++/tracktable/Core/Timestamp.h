@@ -258,6 +258,57 @@ TRACKTABLE_CORE_EXPORT Duration microseconds(int64_t num_microseconds);
 
 TRACKTABLE_CORE_EXPORT Duration days(int num_days);
 
+/*! @brief Convert a timestamp to microseconds since the Unix epoch
+ *
+ * This is the representation used by NumPy's `datetime64[us]` type
+ * and is convenient when moving large numbers of timestamps in and
+ * out of arrays.
+ *
+ * Invalid timestamps (see is_timestamp_valid()) are converted to
+ * the smallest representable 64-bit integer. NumPy interprets that
+ * value as `NaT` (not a time).
+ *
+ * @param [in] ts Timestamp to convert
+ * @return Number of microseconds since 1970-01-01 00:00:00
+ */
+
+TRACKTABLE_CORE_EXPORT int64_t timestamp_to_epoch_microseconds(Timestamp const& ts);
+
+/*! @brief Convert microseconds since the Unix epoch to a timestamp
+ *
+ * This is the inverse of timestamp_to_epoch_microseconds(). The
+ * smallest representable 64-bit integer (NumPy's `NaT`) is
+ * converted to an invalid timestamp.
+ *
+ * @param [in] usec Number of microseconds since 1970-01-01 00:00:00
+ * @return Timestamp corresponding to that instant
+ */
+
+TRACKTABLE_CORE_EXPORT Timestamp timestamp_from_epoch_microseconds(int64_t usec);
+
+/*! @brief Parse a timestamp laid out as `YYYY-MM-DD HH:MM:SS`
+ *
+ * This reads the digits straight out of the text instead of going
+ * through a stream and a Boost time input facet, which is many times
+ * faster.  It only accepts text that is exactly 19 characters long
+ * with `-` between the date fields, `:` between the time fields and
+ * `separator` between the date and the time.  Anything else,
+ * including dates that do not exist, makes it return false without
+ * throwing so that the caller can fall back to a general parser.
+ *
+ * TimestampConverter uses this automatically when its input format
+ * is `%Y-%m-%d %H:%M:%S` or `%Y-%m-%dT%H:%M:%S`.
+ *
+ * @param [in] begin First character of the text
+ * @param [in] end One past the last character of the text
+ * @param [in] separator Character between the date and the time
+ * @param [out] result Parsed timestamp.  Unchanged if parsing fails.
+ * @return True if the text was parsed
+ */
+
+TRACKTABLE_CORE_EXPORT bool parse_fixed_layout_timestamp(char const* begin, char const* end,
+                                                         char separator, Timestamp& result);
+
 /*! @brief Change the string format for timestamp parsing
  *
  * This function will change the format used to parse
@@ -37,6 +37,7 @@
 namespace tracktable {
 
 TimestampConverter::TimestampConverter()
+  : FastPathSeparator('\0')
 {
   this->set_input_format(default_timestamp_input_format());
   this->set_output_format(default_timestamp_output_format());
@@ -49,6 +50,7 @@ TimestampConverter::~TimestampConverter()
 TimestampConverter::TimestampConverter(TimestampConverter const& other)
   : InputFormat(other.InputFormat)
   , OutputFormat(other.OutputFormat)
+  , FastPathSeparator(other.FastPathSeparator)
 {
   this->InputBuf.imbue(other.InputBuf.getloc());
   this->OutputBuf.imbue(other.OutputBuf.getloc());
@@ -58,6 +60,7 @@ TimestampConverter::TimestampConverter(TimestampConverter const& other)
 {
   this->InputFormat = other.InputFormat;
   this->OutputFormat = other.OutputFormat;
+  this->FastPathSeparator = other.FastPathSeparator;
   this->InputBuf.imbue(other.InputBuf.getloc());
   this->OutputBuf.imbue(other.OutputBuf.getloc());
 
@@ -86,6 +89,16 @@ bool TimestampConverter::operator!=(TimestampConverter const& other) const
 
   Timestamp TimestampConverter::timestamp_from_string(string_type const& in_string) const
   {
+    Timestamp fast_result;
+    if (this->FastPathSeparator != '\0'
+        && parse_fixed_layout_timestamp(in_string.data(),
+                                        in_string.data() + in_string.size(),
+                                        this->FastPathSeparator,
+                                        fast_result))
+      {
+      return fast_result;
+      }
+
     this->InputBuf.str(in_string);
     Timestamp ts;
     this->InputBuf >> ts;
@@ -95,6 +108,18 @@ bool TimestampConverter::operator!=(TimestampConverter const& other) const
   void TimestampConverter::set_input_format(string_type const& format)
   {
     this->InputFormat = format;
+    if (format == "%Y-%m-%d %H:%M:%S")
+      {
+      this->FastPathSeparator = ' ';
+      }
+    else if (format == "%Y-%m-%dT%H:%M:%S")
+      {
+      this->FastPathSeparator = 'T';
+      }
+    else
+      {
+      this->FastPathSeparator = '\0';
+      }
 
     typedef boost::posix_time::time_input_facet input_facet_t;
     input_facet_t* facet = new input_facet_t(format.c_str());
@@ -116,7 +116,9 @@ class TRACKTABLE_CORE_EXPORT TimestampConverter
   /** Convert a string to a timestamp
    *
    * Parse a string to create a timestamp according to the current
-   * input format.
+   * input format.  When the input format is `%Y-%m-%d %H:%M:%S` or
+   * `%Y-%m-%dT%H:%M:%S`, strings that match it exactly are parsed
+   * by parse_fixed_layout_timestamp() without touching the stream.
    *
    * @param [in] time_string  Timestamp represented as string
    * @return Timestamp parsed from string
@@ -127,6 +129,10 @@ class TRACKTABLE_CORE_EXPORT TimestampConverter
   string_type InputFormat;
   string_type OutputFormat;
 
+  // Date/time separator for parse_fixed_layout_timestamp(), or '\0'
+  // if the input format cannot use it
+  char FastPathSeparator;
+
   mutable std::ostringstream OutputBuf;
   mutable std::istringstream InputBuf;
 
@@ -221,6 +221,26 @@ Trajectory(const Trajectory& other) :
         }
     }
 
+  /** Return the start time as microseconds since the Unix epoch.
+   *
+   * This is the same instant as start_time() without building a
+   * Timestamp.  Empty trajectories return the smallest 64-bit integer,
+   * just like an invalid timestamp.
+   */
+  int64_t start_time_epoch_microseconds() const
+    {
+      return timestamp_to_epoch_microseconds(this->start_time());
+    }
+
+  /** Return the end time as microseconds since the Unix epoch.
+   *
+   * Empty trajectories return the smallest 64-bit integer.
+   */
+  int64_t end_time_epoch_microseconds() const
+    {
+      return timestamp_to_epoch_microseconds(this->end_time());
+    }
+
   /** Return the duration, if available.
   *
   * If there are any points in the trajectory, this method will return
@@ -202,6 +202,20 @@ public:
    */
   Timestamp timestamp() const { return this->UpdateTime; }
 
+  /** Get this point's timestamp as a plain integer
+   *
+   * This is cheaper than timestamp() for callers that only need to
+   * compare or sort times, especially from Python where every
+   * Timestamp becomes a new timezone-aware datetime.
+   *
+   * @return Microseconds since 1970-01-01 00:00:00 UTC, or the smallest
+   *         64-bit integer if the timestamp is invalid
+   */
+  int64_t timestamp_epoch_microseconds() const
+    {
+      return timestamp_to_epoch_microseconds(this->UpdateTime);
+    }
+
   /** Set this point's object ID
    *
    * @param [in] new_id  ID to assign to object
@@ -214,6 +228,15 @@ public:
    */
   void set_timestamp(Timestamp const& ts) { this->UpdateTime = ts; }
 
+  /** Set this point's timestamp from a plain integer
+   *
+   * @param [in] usec  Microseconds since 1970-01-01 00:00:00 UTC
+   */
+  void set_timestamp_epoch_microseconds(int64_t usec)
+    {
+      this->UpdateTime = timestamp_from_epoch_microseconds(usec);
+    }
+
   /** Set a named property with a variant value (let the caller handle the type)
    *
    * @param [in] name  Name of property
@@ -0,0 +1,353 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+/** Python wrappers for the binary trajectory reader and writer.
+ *
+ * Both accept either a path (str, bytes or os.PathLike) or a Python
+ * file-like object opened in binary mode.  Paths are the fast route:
+ * the reader memory-maps them and the writer uses a C++ file stream.
+ */
+
+#ifndef __tracktable_PythonWrapping_BinaryTrajectoryWrappers_h
+#define __tracktable_PythonWrapping_BinaryTrajectoryWrappers_h
+
+#include <tracktable/Core/TracktableCommon.h>
+#include <tracktable/RW/BinaryTrajectoryReader.h>
+#include <tracktable/RW/BinaryTrajectoryWriter.h>
+#include <tracktable/PythonWrapping/GuardedBoostPythonHeaders.h>
+#include <tracktable/PythonWrapping/PythonFileLikeObjectStreams.h>
+
+#include <boost/python/stl_iterator.hpp>
+#include <boost/shared_ptr.hpp>
+
+#include <cassert>
+#include <fstream>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace tracktable {
+
+template<class TrajectoryT>
+class PythonAwareBinaryTrajectoryReader : public BinaryTrajectoryReader<TrajectoryT>
+{
+private:
+  typedef BinaryTrajectoryReader<TrajectoryT> Superclass;
+  typedef boost::iostreams::stream<PythonReadSource> WrappedPythonStream;
+
+public:
+  typedef TrajectoryT trajectory_type;
+  typedef typename Superclass::box_type box_type;
+  typedef typename Superclass::iterator iterator;
+
+  PythonAwareBinaryTrajectoryReader()
+    { }
+
+  PythonAwareBinaryTrajectoryReader(boost::python::object source)
+    {
+      this->set_input_from_python_object(source);
+    }
+
+  virtual ~PythonAwareBinaryTrajectoryReader()
+    { }
+
+  void set_input_from_python_object(boost::python::object& thing)
+    {
+      if (python_object_is_path(thing))
+        {
+        std::string filename(path_from_python_object(thing));
+        try
+          {
+          this->open(filename);
+          }
+        catch (std::runtime_error const& e)
+          {
+          PyErr_SetString(PyExc_OSError, e.what());
+          boost::python::throw_error_already_set();
+          }
+        }
+      else
+        {
+        WrappedPythonStream instream((PythonReadSource(thing)));
+        this->set_input(instream);
+        }
+      this->SourceObject = thing;
+    }
+
+  boost::python::object input_as_python_object()
+    {
+      return this->SourceObject;
+    }
+
+  /** Python-style indexing: negative indices count from the end. */
+  trajectory_type getitem(long i) const
+    {
+      if (i < 0)
+        {
+        i += static_cast<long>(this->size());
+        }
+      if (i < 0)
+        {
+        throw std::out_of_range("BinaryTrajectoryReader: Trajectory index out of range.");
+        }
+      return this->read(static_cast<std::size_t>(i));
+    }
+
+  boost::python::list find_object_id_as_list(std::string const& object_id) const
+    {
+      return to_python_list(this->find_object_id(object_id));
+    }
+
+  boost::python::list find_in_time_range_as_list(Timestamp const& start, Timestamp const& end) const
+    {
+      return to_python_list(this->find_in_time_range(start, end));
+    }
+
+  boost::python::list find_in_box_as_list(box_type const& box) const
+    {
+      return to_python_list(this->find_in_box(box));
+    }
+
+private:
+  boost::python::object SourceObject;
+
+  static boost::python::list to_python_list(std::vector<std::size_t> const& indices)
+    {
+      boost::python::list result;
+      for (std::size_t i = 0; i < indices.size(); ++i)
+        {
+        result.append(indices[i]);
+        }
+      return result;
+    }
+
+public:
+  // These should never be called but Boost insists on being able to
+  // instantiate them.
+  PythonAwareBinaryTrajectoryReader(PythonAwareBinaryTrajectoryReader const& /*other*/)
+    {
+      assert(1==0);
+    }
+
+  PythonAwareBinaryTrajectoryReader& operator=(PythonAwareBinaryTrajectoryReader const& /*other*/)
+    {
+      assert(1==0);
+      return *this;
+    }
+};
+
+// ----------------------------------------------------------------------
+
+template<class TrajectoryT>
+class PythonAwareBinaryTrajectoryWriter : public BinaryTrajectoryWriter
+{
+private:
+  typedef BinaryTrajectoryWriter Superclass;
+  typedef boost::iostreams::stream<PythonWriteSink> WrappedPythonOutputStream;
+
+public:
+  typedef TrajectoryT trajectory_type;
+
+  PythonAwareBinaryTrajectoryWriter()
+    { }
+
+  PythonAwareBinaryTrajectoryWriter(boost::python::object destination)
+    {
+      this->set_output_from_python_object(destination);
+    }
+
+  virtual ~PythonAwareBinaryTrajectoryWriter()
+    {
+      // Finish the file while our streams still exist.
+      try
+        {
+        this->close();
+        }
+      catch (...)
+        {
+        }
+    }
+
+  void set_output_from_python_object(boost::python::object destination)
+    {
+      this->close();
+      this->WrappedOutputStream.reset();
+      this->FileOutputStream.reset();
+
+      if (python_object_is_path(destination))
+        {
+        std::string filename(path_from_python_object(destination));
+        this->FileOutputStream.reset(new std::ofstream(filename.c_str(), std::ios::out | std::ios::binary | std::ios::trunc));
+        if (!(*this->FileOutputStream))
+          {
+          PyErr_SetString(PyExc_OSError, ("Could not open file '" + filename + "' for writing.").c_str());
+          boost::python::throw_error_already_set();
+          }
+        this->set_output(*this->FileOutputStream);
+        }
+      else
+        {
+        this->WrappedOutputStream.reset(new WrappedPythonOutputStream(PythonWriteSink(destination)));
+        this->set_output(*this->WrappedOutputStream);
+        }
+      this->SinkObject = destination;
+    }
+
+  boost::python::object output_as_python_object()
+    {
+      return this->SinkObject;
+    }
+
+  /** Write one trajectory or any iterable of trajectories. */
+  void write_python_object(boost::python::object& things_to_write)
+    {
+      boost::python::extract<trajectory_type const&> single_trajectory(things_to_write);
+      if (single_trajectory.check())
+        {
+        this->write(single_trajectory());
+        }
+      else
+        {
+        boost::python::stl_input_iterator<trajectory_type> begin(things_to_write), end;
+        this->Superclass::write(begin, end);
+        }
+    }
+
+  /** Write the index and flush everything out to the destination. */
+  void close_output()
+    {
+      this->close();
+      if (this->FileOutputStream)
+        {
+        this->FileOutputStream->close();
+        }
+      if (this->WrappedOutputStream)
+        {
+        this->WrappedOutputStream->flush();
+        }
+    }
+
+private:
+  boost::python::object SinkObject;
+  boost::shared_ptr<WrappedPythonOutputStream> WrappedOutputStream;
+  boost::shared_ptr<std::ofstream> FileOutputStream;
+
+public:
+  // These should never be called but Boost insists on being able to
+  // instantiate them.
+  PythonAwareBinaryTrajectoryWriter(PythonAwareBinaryTrajectoryWriter const& /*other*/)
+    {
+      assert(1==0);
+    }
+
+  PythonAwareBinaryTrajectoryWriter& operator=(PythonAwareBinaryTrajectoryWriter const& /*other*/)
+    {
+      assert(1==0);
+      return *this;
+    }
+};
+
+// ----------------------------------------------------------------------
+
+namespace python_wrapping {
+
+template<class writer_type>
+boost::python::object binary_writer_enter(boost::python::object self)
+{
+  return self;
+}
+
+template<class writer_type>
+bool binary_writer_exit(writer_type& writer,
+                        boost::python::object const& /*exc_type*/,
+                        boost::python::object const& /*exc_value*/,
+                        boost::python::object const& /*traceback*/)
+{
+  writer.close_output();
+  return false;
+}
+
+class binary_trajectory_reader_methods : public boost::python::def_visitor<binary_trajectory_reader_methods>
+{
+  friend class boost::python::def_visitor_access;
+
+  template<class ClassT>
+  void visit(ClassT& c) const
+    {
+      typedef typename ClassT::wrapped_type reader_type;
+      using namespace boost::python;
+
+      c
+        .def(init<>())
+        .def(init<object>())
+        .add_property("input", &reader_type::input_as_python_object, &reader_type::set_input_from_python_object)
+        .def("__len__", &reader_type::size)
+        .def("__getitem__", &reader_type::getitem)
+        .def("__iter__", iterator<reader_type, return_value_policy<copy_const_reference> >())
+        .def("object_id", &reader_type::object_id)
+        .def("num_points", &reader_type::num_points)
+        .def("start_time", &reader_type::start_time)
+        .def("end_time", &reader_type::end_time)
+        .def("bounding_box", &reader_type::bounding_box)
+        .def("find_object_id", &reader_type::find_object_id_as_list)
+        .def("find_in_time_range", &reader_type::find_in_time_range_as_list)
+        .def("find_in_box", &reader_type::find_in_box_as_list)
+        ;
+    }
+};
+
+class binary_trajectory_writer_methods : public boost::python::def_visitor<binary_trajectory_writer_methods>
+{
+  friend class boost::python::def_visitor_access;
+
+  template<class ClassT>
+  void visit(ClassT& c) const
+    {
+      typedef typename ClassT::wrapped_type writer_type;
+      using namespace boost::python;
+
+      c
+        .def(init<>())
+        .def(init<object>())
+        .add_property("output", &writer_type::output_as_python_object, &writer_type::set_output_from_python_object)
+        .add_property("num_trajectories", &writer_type::num_trajectories)
+        .def("write", &writer_type::write_python_object)
+        .def("close", &writer_type::close_output)
+        .def("__enter__", &binary_writer_enter<writer_type>)
+        .def("__exit__", &binary_writer_exit<writer_type>)
+        ;
+    }
+};
+
+} // close namespace python_wrapping
+
+} // close namespace tracktable
+
+#endif
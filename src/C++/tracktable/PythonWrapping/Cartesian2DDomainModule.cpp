@@ -46,17 +46,23 @@
 
 #include <tracktable/PythonWrapping/GuardedBoostPythonHeaders.h>
 #include <tracktable/PythonWrapping/BasePointToString.h>
+#include <tracktable/PythonWrapping/BinaryTrajectoryWrappers.h>
 #include <tracktable/PythonWrapping/PythonFileLikeObjectStreams.h>
 #include <tracktable/PythonWrapping/DomainWrapperTemplates.h>
 #include <tracktable/PythonWrapping/PythonAwarePointReader.h>
 #include <tracktable/PythonWrapping/PythonAwareTrajectoryReader.h>
 #include <tracktable/PythonWrapping/PythonTypedObjectWriter.h>
 #include <tracktable/PythonWrapping/TrajectoryIndexingSuite.h>
+#include <tracktable/PythonWrapping/TrajectoryArrayMethods.h>
+#include <tracktable/PythonWrapping/TrajectoryAssemblerWrappers.h>
 
 #include <tracktable/PythonWrapping/DocStrings/GenericBasePointDocs.h>
 #include <tracktable/PythonWrapping/DocStrings/GenericBasePointReaderDocs.h>
 #include <tracktable/PythonWrapping/DocStrings/GenericBasePointWriterDocs.h>
+#include <tracktable/PythonWrapping/DocStrings/GenericBinaryTrajectoryReaderDocs.h>
+#include <tracktable/PythonWrapping/DocStrings/GenericBinaryTrajectoryWriterDocs.h>
 #include <tracktable/PythonWrapping/DocStrings/GenericBoundingBoxDocs.h>
+#include <tracktable/PythonWrapping/DocStrings/GenericTrajectoryAssemblerDocs.h>
 #include <tracktable/PythonWrapping/DocStrings/GenericTrajectoryDocs.h>
 #include <tracktable/PythonWrapping/DocStrings/GenericTrajectoryPointDocs.h>
 #include <tracktable/PythonWrapping/DocStrings/GenericTrajectoryPointReaderDocs.h>
@@ -276,6 +282,38 @@ void install_cartesian2d_trajectory_wrappers()
     .def(self==self)
     .def(self!=self)
     .def(tracktable::python_wrapping::trajectory_indexing_suite<trajectory_type>())
+    .def(tracktable::python_wrapping::trajectory_array_methods())
+    ;
+}
+
+// ----------------------------------------------------------------------
+
+void install_binary_trajectory_io_wrappers()
+{
+  using namespace boost::python;
+
+  typedef tracktable::PythonAwareBinaryTrajectoryReader<trajectory_type> binary_trajectory_reader_t;
+  typedef tracktable::PythonAwareBinaryTrajectoryWriter<trajectory_type> binary_trajectory_writer_t;
+
+  class_< binary_trajectory_reader_t >("BinaryTrajectoryReaderCartesian2D", tracktable::python_wrapping::docstrings::GenericBinaryTrajectoryReaderDocString)
+    .def(tracktable::python_wrapping::binary_trajectory_reader_methods())
+    ;
+
+  class_< binary_trajectory_writer_t >("BinaryTrajectoryWriterCartesian2D", tracktable::python_wrapping::docstrings::GenericBinaryTrajectoryWriterDocString)
+    .def(tracktable::python_wrapping::binary_trajectory_writer_methods())
+    ;
+}
+
+// ----------------------------------------------------------------------
+
+void install_trajectory_assembler_wrappers()
+{
+  using namespace boost::python;
+
+  typedef tracktable::PythonAwareTrajectoryAssembler<trajectory_type> trajectory_assembler_t;
+
+  class_< trajectory_assembler_t >("TrajectoryAssemblerCartesian2D", tracktable::python_wrapping::docstrings::GenericTrajectoryAssemblerDocString)
+    .def(tracktable::python_wrapping::trajectory_assembler_methods())
     ;
 }
 
@@ -296,6 +334,8 @@ void install_cartesian2d_domain_wrappers()
   install_cartesian2d_box_wrappers();
   install_point_writer_wrappers();
   install_trajectory_writer_wrappers();
+  install_binary_trajectory_io_wrappers();
+  install_trajectory_assembler_wrappers();
 }
 
 BOOST_PYTHON_MODULE(_cartesian2d)
@@ -0,0 +1,61 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+// Python documentation string for tracktable.domain.<domain>.BinaryTrajectoryReader
+
+namespace tracktable {
+namespace python_wrapping {
+namespace docstrings {
+
+const char* GenericBinaryTrajectoryReaderDocString =
+    "Class for reading trajectories from binary columnar files. \n"
+    "\n"
+    "Reads files written by BinaryTrajectoryWriter.  Only the index at the \n"
+    "end of the file is read up front.  Use len(reader) and reader[i] to \n"
+    "get at individual trajectories, the find_* methods to search the \n"
+    "index, or iterate over the reader to get every trajectory in order. \n"
+    "\n"
+    "Attributes: \n"
+    "   input (file-like object or path): File to read.  Paths are memory-mapped. \n"
+    "       File-like objects must be opened in binary mode and are read into memory. \n"
+    "\n"
+    "Methods: \n"
+    "   object_id (int i): Object ID of trajectory i \n"
+    "   num_points (int i): Number of points in trajectory i \n"
+    "   start_time (int i): Timestamp of the first point of trajectory i \n"
+    "   end_time (int i): Timestamp of the last point of trajectory i \n"
+    "   bounding_box (int i): Bounding box of trajectory i \n"
+    "   find_object_id (str object_id): Indices of trajectories with this object ID \n"
+    "   find_in_time_range (datetime start, datetime end): Indices of trajectories that overlap [start, end] \n"
+    "   find_in_box (BoundingBox box): Indices of trajectories whose bounding boxes intersect box \n"
+    ;
+
+}}}
+
@@ -0,0 +1,57 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+// Python documentation string for tracktable.domain.<domain>.BinaryTrajectoryWriter
+
+namespace tracktable {
+namespace python_wrapping {
+namespace docstrings {
+
+const char* GenericBinaryTrajectoryWriterDocString =
+    "Class for writing trajectories to binary columnar files. \n"
+    "\n"
+    "Each trajectory is stored as binary columns (timestamps, coordinates, \n"
+    "point properties) and the file ends with an index of trajectory \n"
+    "offsets, object IDs, time spans and bounding boxes.  The index is \n"
+    "written by close(), which also runs when the writer is used as a \n"
+    "context manager.  A file that was never closed cannot be read. \n"
+    "\n"
+    "Attributes: \n"
+    "   output (file-like object or path): Destination.  File-like objects \n"
+    "       must be opened in binary mode. \n"
+    "   num_trajectories (int): Number of trajectories written so far \n"
+    "\n"
+    "Methods: \n"
+    "   write (Trajectory or iterable of Trajectory): Write trajectories \n"
+    "   close (): Write the index and flush the output \n"
+    ;
+
+}}}
+
@@ -0,0 +1,73 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+// Python documentation string for tracktable.domain.<domain>.BinaryTrajectoryWriter
+
+// Python documentation string for tracktable.domain.<domain>.TrajectoryAssembler
+
+namespace tracktable {
+namespace python_wrapping {
+namespace docstrings {
+
+const char* GenericTrajectoryAssemblerDocString =
+    "Assemble time-sorted points into trajectories in compiled code. \n"
+    "\n"
+    "This follows the same rules as \n"
+    "tracktable.applications.assemble_trajectories.AssembleTrajectoryFromPoints, \n"
+    "which uses it automatically for its trajectories() method.  Points \n"
+    "are added in batches and finished trajectories come back as lists. \n"
+    "A new trajectory starts when the gap between two points with the \n"
+    "same object ID is longer than separation_time or farther than \n"
+    "separation_distance. \n"
+    "\n"
+    "Attributes: \n"
+    "   separation_time (datetime.timedelta or None): Maximum time between \n"
+    "       adjacent points.  None means no limit.  Defaults to 30 minutes. \n"
+    "   separation_distance (float or None): Maximum distance between \n"
+    "       adjacent points.  None (the default) means no limit. \n"
+    "   minimum_length (int): Shorter trajectories are discarded. \n"
+    "       Defaults to 2. \n"
+    "   cleanup_interval (int): Look for idle trajectories every this many \n"
+    "       points.  Defaults to 10000. \n"
+    "   points_processed_count (int): Points added so far \n"
+    "   valid_trajectory_count (int): Trajectories finished so far \n"
+    "   invalid_trajectory_count (int): Trajectories discarded so far \n"
+    "   num_trajectories_in_progress (int): Open trajectories \n"
+    "\n"
+    "Methods: \n"
+    "   add_points (iterable of TrajectoryPoint): Add points sorted by \n"
+    "       timestamp.  Returns the trajectories they finish. \n"
+    "   advance_watermark (datetime): Declare the input complete up to a \n"
+    "       time.  Returns trajectories idle for longer than separation_time. \n"
+    "   flush (): Return every remaining trajectory. \n"
+    "   reset (): Discard all state and zero the counters. \n"
+    ;
+
+}}}
@@ -52,8 +52,12 @@ const char* GenericTrajectoryDocString =
     "   has_property (str name): Check whether a property is present \n"
     "   property (str name): Retrieve a named property\n"
     "   from_position_list (list points): Create a list of trajectories from a list of iterables\n"
+    "   from_arrays (str object_id, timestamps, *coordinates, **properties): Create a trajectory from column arrays\n"
     "   insert (int indea, point value): Insert a single element into the trajectory at an arbitrary index\n"
     "   clone (): Make this trajectory a clone of another \n"
+    "   coordinates_as_array (): NumPy array of point coordinates, shape (N, dimension)\n"
+    "   timestamps_as_array (): NumPy datetime64[us] array of point timestamps (UTC)\n"
+    "   real_property_as_array (str name): NumPy array of a real-valued point property, NaN where missing\n"
     ;
 
 }}}
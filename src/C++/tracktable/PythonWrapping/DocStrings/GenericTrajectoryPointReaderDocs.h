@@ -49,7 +49,9 @@ const char* GenericTrajectoryPointReaderDocString =
     "   field_delimiter (str): Designated character for delimiting fields (Default: whitespace) \n"
     "   null_value (str): Value indicating null value \n"
     "   coordinates (<domain>Point): Long-lat point for the given domain \n"
-    "   input (str): File to read \n"
+    "   input (file-like object or path): File to read. Paths are memory-mapped \n"
+    "   parser_threads (int): Threads used to parse the input (Default: 1). 0 means one per CPU \n"
+    "   parser_chunk_size (int): Bytes read at a time when parser_threads is not 1 \n"
     "   object_id_column (str): The column that will be used for object IDs \n"
     "   timestamp_column (str): The column that will be used for timestamps \n"
     "   timestamp_format (str): The format of the timestamp \n"
@@ -48,7 +48,7 @@ const char* GenericTrajectoryReaderDocString =
     "   comment_character (str): Designated character for commented lines (Default: '#') \n"
     "   field_delimiter (str): Designated character for delimiting fields (Default: whitespace) \n"
     "   null_value (str): Value indicating null value \n"
-    "   input (str): File to read \n"
+    "   input (file-like object or path): File to read. Paths are memory-mapped \n"
     "   warnings_enabled (bool): Flag to enable warning messages during parsing \n"
     ;
 
@@ -29,6 +29,8 @@
 */
 
 #include <tracktable/PythonWrapping/GuardedBoostPythonHeaders.h>
+#include <tracktable/PythonWrapping/NumPyArrayHelpers.h>
+#include <tracktable/PythonWrapping/ScopedGILRelease.h>
 
 #include <tracktable/Core/Geometry.h>
 #include <tracktable/Core/GeometricMean.h>
@@ -38,6 +40,8 @@
 #include <tracktable/Domain/Cartesian2D.h>
 #include <tracktable/Domain/Cartesian3D.h>
 
+#include <limits>
+#include <string>
 #include <vector>
 #include <typeinfo>
 
@@ -76,6 +80,171 @@ point_type wrap_geometric_mean(point_type const& /*first_point*/, boost::python:
     );
 }
 
+// Batch versions of trajectory measurements.  These use the same
+// trick as geometric_mean: the first argument is the first trajectory
+// in the sequence so that Boost.Python can pick the overload for the
+// right domain.  Once the trajectories have been extracted we release
+// the GIL and do all of the work in one C++ loop, writing straight
+// into a NumPy array.
+//
+// The caller must pass a sequence that can be iterated more than once
+// (such as a list).  We hold references to each trajectory object
+// while we work on the underlying C++ data.
+
+template<typename trajectory_type>
+void extract_trajectories(boost::python::object trajectories,
+                          std::vector<boost::python::object>& references,
+                          std::vector<trajectory_type*>& pointers)
+{
+    using namespace boost::python;
+
+    stl_input_iterator<object> begin(trajectories), end;
+    references.assign(begin, end);
+
+    pointers.reserve(references.size());
+    for (std::size_t i = 0; i < references.size(); ++i)
+    {
+        pointers.push_back(&(extract<trajectory_type&>(references[i])()));
+    }
+}
+
+template<
+    typename trajectory_type,
+    double (*measure)(trajectory_type const&)
+>
+boost::python::object wrap_batch_measurement(trajectory_type const& /*first_trajectory*/, boost::python::object trajectories)
+{
+    using namespace tracktable::python_wrapping;
+
+    std::vector<boost::python::object> references;
+    std::vector<trajectory_type*> pointers;
+    extract_trajectories(trajectories, references, pointers);
+
+    boost::python::object result(
+        make_numpy_array(pointers.size(), buffer_format<double>::dtype())
+    );
+    ContiguousBuffer<double> buffer(result, true);
+    double* out = buffer.data();
+
+    {
+        ScopedGILRelease unlock;
+        for (std::size_t i = 0; i < pointers.size(); ++i)
+        {
+            out[i] = measure(*pointers[i]);
+        }
+    }
+    return result;
+}
+
+template<typename trajectory_type>
+boost::python::object wrap_batch_point_at_time_fraction(trajectory_type const& /*first_trajectory*/, boost::python::object trajectories, boost::python::object fractions)
+{
+    using namespace tracktable::python_wrapping;
+    typedef typename trajectory_type::point_type point_type;
+    const std::size_t dimension = tracktable::traits::dimension<point_type>::value;
+
+    std::vector<boost::python::object> references;
+    std::vector<trajectory_type*> pointers;
+    extract_trajectories(trajectories, references, pointers);
+
+    boost::python::object fraction_array(as_contiguous_array(fractions, buffer_format<double>::dtype()));
+    ContiguousBuffer<double> fraction_buffer(fraction_array);
+    if (fraction_buffer.size() != pointers.size())
+    {
+        PyErr_SetString(PyExc_ValueError, "Need exactly one time fraction per trajectory");
+        boost::python::throw_error_already_set();
+    }
+
+    boost::python::object coordinates(
+        make_numpy_array(pointers.size(), dimension, buffer_format<double>::dtype())
+    );
+    boost::python::object timestamps(
+        make_numpy_array(pointers.size(), buffer_format<boost::int64_t>::dtype())
+    );
+    ContiguousBuffer<double> coordinate_buffer(coordinates, true);
+    ContiguousBuffer<boost::int64_t> timestamp_buffer(timestamps, true);
+
+    {
+        ScopedGILRelease unlock;
+        double* coordinate_out = coordinate_buffer.data();
+        for (std::size_t i = 0; i < pointers.size(); ++i)
+        {
+            if (pointers[i]->empty())
+            {
+                for (std::size_t d = 0; d < dimension; ++d)
+                {
+                    *coordinate_out++ = std::numeric_limits<double>::quiet_NaN();
+                }
+                timestamp_buffer[i] = std::numeric_limits<boost::int64_t>::min();
+            }
+            else
+            {
+                point_type point(tracktable::point_at_time_fraction(*pointers[i], fraction_buffer[i]));
+                for (std::size_t d = 0; d < dimension; ++d)
+                {
+                    *coordinate_out++ = point[d];
+                }
+                timestamp_buffer[i] = tracktable::timestamp_to_epoch_microseconds(point.timestamp());
+            }
+        }
+    }
+    return boost::python::make_tuple(coordinates, timestamps.attr("view")("datetime64[us]"));
+}
+
+template<typename trajectory_type>
+void wrap_batch_recompute_speed(trajectory_type const& /*first_trajectory*/, boost::python::object trajectories, std::string const& target_attribute_name)
+{
+    using tracktable::python_wrapping::ScopedGILRelease;
+
+    std::vector<boost::python::object> references;
+    std::vector<trajectory_type*> pointers;
+    extract_trajectories(trajectories, references, pointers);
+
+    ScopedGILRelease unlock;
+    for (std::size_t i = 0; i < pointers.size(); ++i)
+    {
+        trajectory_type& trajectory(*pointers[i]);
+        if (trajectory.size() == 1)
+        {
+            trajectory[0].set_property(target_attribute_name, 0.0);
+        }
+        else if (trajectory.size() > 1)
+        {
+            for (std::size_t j = 1; j < trajectory.size(); ++j)
+            {
+                trajectory[j].set_property(
+                    target_attribute_name,
+                    tracktable::speed_between(trajectory[j - 1], trajectory[j])
+                );
+            }
+            trajectory[0].set_property(
+                target_attribute_name,
+                trajectory[1].real_property(target_attribute_name)
+            );
+        }
+    }
+}
+
+template<typename trajectory_type>
+void register_batch_trajectory_functions()
+{
+    using boost::python::def;
+
+    def("batch_length", &(wrap_batch_measurement<trajectory_type, &tracktable::length<trajectory_type> >));
+    def("batch_end_to_end_distance", &(wrap_batch_measurement<trajectory_type, &tracktable::end_to_end_distance<trajectory_type> >));
+    def("batch_point_at_time_fraction", &(wrap_batch_point_at_time_fraction<trajectory_type>));
+    def("batch_recompute_speed", &(wrap_batch_recompute_speed<trajectory_type>));
+}
+
+template<typename trajectory_type>
+void register_batch_shape_functions()
+{
+    using boost::python::def;
+
+    def("batch_convex_hull_area", &(wrap_batch_measurement<trajectory_type, &tracktable::convex_hull_area<trajectory_type> >));
+    def("batch_radius_of_gyration", &(wrap_batch_measurement<trajectory_type, &tracktable::radius_of_gyration<trajectory_type> >));
+}
+
 template<
     typename base_point_type,
     typename trajectory_point_type
@@ -226,6 +395,9 @@ BOOST_PYTHON_MODULE(_domain_algorithm_overloads) {
     def("radius_of_gyration", &(tracktable::radius_of_gyration<TrajectoryTerrestrial>));
     def("convex_hull_centroid", &(tracktable::convex_hull_centroid<TrajectoryTerrestrial>));
 
+    register_batch_trajectory_functions<TrajectoryTerrestrial>();
+    register_batch_shape_functions<TrajectoryTerrestrial>();
+
 
     register_distance_functions<
         BasePointTerrestrial,
@@ -293,6 +465,9 @@ BOOST_PYTHON_MODULE(_domain_algorithm_overloads) {
     def("radius_of_gyration", &(tracktable::radius_of_gyration<TrajectoryCartesian2D>));
     def("convex_hull_centroid", &(tracktable::convex_hull_centroid<TrajectoryCartesian2D>));
 
+    register_batch_trajectory_functions<TrajectoryCartesian2D>();
+    register_batch_shape_functions<TrajectoryCartesian2D>();
+
     register_distance_functions<
         BasePointCartesian2D,
         LineStringCartesian2D,
@@ -343,6 +518,8 @@ BOOST_PYTHON_MODULE(_domain_algorithm_overloads) {
     def("geometric_median", &(wrap_geometric_median<BasePointCartesian3D>));
     def("geometric_median", &(wrap_geometric_median<TrajectoryPointCartesian3D>));
 
+    register_batch_trajectory_functions<TrajectoryCartesian3D>();
+
 
     // We register these manually instead of calling
     // register_intersection_functions because line/line intersections
@@ -441,6 +441,7 @@ class trajectory_point_methods : public boost::python::def_visitor<trajectory_po
       c
         .add_property("object_id", &wrapped_type::object_id, &wrapped_type::set_object_id)
         .add_property("timestamp", &wrapped_type::timestamp, &wrapped_type::set_timestamp)
+        .add_property("timestamp_epoch_microseconds", &wrapped_type::timestamp_epoch_microseconds, &wrapped_type::set_timestamp_epoch_microseconds)
         .add_property("current_length", &wrapped_type::current_length)
         .def(self == self)
         .def(self != self)
@@ -465,6 +466,8 @@ class trajectory_methods : public boost::python::def_visitor<trajectory_methods>
                   .add_property("domain", point_domain_name<wrapped_type>)
                   .add_property("trajectory_id", &wrapped_type::trajectory_id)
                   .add_property("object_id", &wrapped_type::object_id)
+                  .def("start_time_epoch_microseconds", &wrapped_type::start_time_epoch_microseconds)
+                  .def("end_time_epoch_microseconds", &wrapped_type::end_time_epoch_microseconds)
                   .def("insert", insert)
                   .def("clone", &wrapped_type::clone, return_value_policy<return_by_value>())
                   .def(self == self)
@@ -608,6 +611,8 @@ class basic_point_reader_methods : public boost::python::def_visitor<basic_point
          .def("clear_coordinate_assignments", &reader_type::clear_coordinate_assignments)
          .add_property("coordinates", make_function(&reader_type::__coordinate_assignments, return_internal_reference<>()), &reader_type::__set_coordinate_assignments)
          .add_property("input", &reader_type::input_as_python_object, &reader_type::set_input_from_python_object)
+         .add_property("parser_threads", &reader_type::num_parser_threads, &reader_type::set_num_parser_threads)
+         .add_property("parser_chunk_size", &reader_type::parser_chunk_size, &reader_type::set_parser_chunk_size)
          .def("__iter__", iterator<reader_type, return_value_policy<copy_const_reference> >())
          ;
     }
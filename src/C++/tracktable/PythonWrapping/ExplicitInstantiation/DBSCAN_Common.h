@@ -41,17 +41,26 @@
 
 
 #include <tracktable/PythonWrapping/GuardedBoostPythonHeaders.h>
+#include <tracktable/PythonWrapping/ScopedGILRelease.h>
+
+#include <vector>
 
 #define xstr(s) str(s)
 #define str(s) #s
 
 #define DBSCAN_FUNCTION_NAME(dim) "dbscan_learn_cluster_ids_" xstr(dim)
+#define DBSCAN_CORE_FLAGS_FUNCTION_NAME(dim) "dbscan_learn_cluster_ids_and_core_flags_" xstr(dim)
 
 using namespace tracktable::domain::feature_vectors;
 using namespace boost::python;
 
 #define WRAP_DBSCAN(dim) \
-  def( DBSCAN_FUNCTION_NAME(dim), dbscan_learn_cluster_ids< FeatureVector<dim> > )
+  def( DBSCAN_FUNCTION_NAME(dim), dbscan_learn_cluster_ids< FeatureVector<dim> >, \
+       (arg("points"), arg("search_box_half_span"), arg("min_cluster_size"), \
+        arg("num_threads")=1, arg("engine")=0) ); \
+  def( DBSCAN_CORE_FLAGS_FUNCTION_NAME(dim), dbscan_learn_cluster_ids_and_core_flags< FeatureVector<dim> >, \
+       (arg("points"), arg("search_box_half_span"), arg("min_cluster_size"), \
+        arg("num_threads")=1, arg("engine")=0) )
 
 
 /*
@@ -60,24 +69,48 @@ using namespace boost::python;
  * handle it in Python-land.
  */
 
+inline tracktable::DBSCANEngine dbscan_engine_from_number(int engine)
+{
+  if (engine < static_cast<int>(tracktable::DBSCANEngine::AUTO)
+      || engine > static_cast<int>(tracktable::DBSCANEngine::GRID))
+    {
+    PyErr_SetString(PyExc_ValueError, "Unknown DBSCAN engine number.");
+    boost::python::throw_error_already_set();
+    }
+  return static_cast<tracktable::DBSCANEngine>(engine);
+}
+
 template<typename point_type>
 boost::python::object
 dbscan_learn_cluster_ids(boost::python::object points,
                          boost::python::object _search_box_half_span,
-                         int min_cluster_size)
+                         int min_cluster_size,
+                         int num_threads=1,
+                         int engine=0)
 {
   namespace bp = boost::python;
 
   point_type search_box_half_span = boost::python::extract<point_type>(_search_box_half_span);
+  tracktable::DBSCANEngine which_engine = dbscan_engine_from_number(engine);
 
   typedef std::pair<int, int> cluster_label_type;
   std::vector<cluster_label_type> result_cluster_labels;
 
-  tracktable::cluster_with_dbscan(bp::stl_input_iterator<point_type>(points),
-                                  bp::stl_input_iterator<point_type>(),
-                                  search_box_half_span,
-                                  min_cluster_size,
-                                  std::back_inserter(result_cluster_labels));
+  // Copy the points out of Python first so that the clustering
+  // itself can run without holding the GIL.
+  bp::stl_input_iterator<point_type> points_begin(points), points_end;
+  std::vector<point_type> cpp_points(points_begin, points_end);
+
+  {
+    tracktable::python_wrapping::ScopedGILRelease unlock;
+    tracktable::cluster_with_dbscan(cpp_points.begin(),
+                                    cpp_points.end(),
+                                    search_box_half_span,
+                                    min_cluster_size,
+                                    std::back_inserter(result_cluster_labels),
+                                    num_threads,
+                                    which_engine);
+  }
 
   bp::list result;
   for (typename std::vector<cluster_label_type>::const_iterator iter = result_cluster_labels.begin();
@@ -89,6 +122,54 @@ dbscan_learn_cluster_ids(boost::python::object points,
   return std::move(result);
 }
 
+/*
+ * Same as above but returns (labels, core_flags): one cluster ID and
+ * one boolean per input point, in input order.  Callers that combine
+ * clusters from several runs need to know which points are core
+ * points.
+ */
+
+template<typename point_type>
+boost::python::object
+dbscan_learn_cluster_ids_and_core_flags(boost::python::object points,
+                                        boost::python::object _search_box_half_span,
+                                        int min_cluster_size,
+                                        int num_threads=1,
+                                        int engine=0)
+{
+  namespace bp = boost::python;
+
+  point_type search_box_half_span = boost::python::extract<point_type>(_search_box_half_span);
+  tracktable::DBSCANEngine which_engine = dbscan_engine_from_number(engine);
+
+  bp::stl_input_iterator<point_type> points_begin(points), points_end;
+  std::vector<point_type> cpp_points(points_begin, points_end);
+
+  std::vector<int> labels;
+  std::vector<int> core_flags;
+  {
+    tracktable::python_wrapping::ScopedGILRelease unlock;
+    tracktable::analysis::detail::implementation::DBSCAN<point_type> dbscan;
+    dbscan.learn_clusters(cpp_points.begin(), cpp_points.end(),
+                          search_box_half_span,
+                          min_cluster_size,
+                          false,
+                          num_threads,
+                          which_engine);
+    dbscan.point_cluster_labels(labels);
+    dbscan.point_core_flags(core_flags);
+  }
+
+  bp::list result_labels;
+  bp::list result_core_flags;
+  for (std::size_t i = 0; i < labels.size(); ++i)
+    {
+    result_labels.append(labels[i]);
+    result_core_flags.append(core_flags[i] != 0);
+    }
+  return bp::make_tuple(result_labels, result_core_flags);
+}
+
 
 void install_dbscan_wrappers_1_3();
 void install_dbscan_wrappers_4_6();
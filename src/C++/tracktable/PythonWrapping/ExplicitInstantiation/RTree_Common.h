@@ -59,8 +59,11 @@ void wrap_rtree()
     .def(init<>())
     .def("insert_point", &rtree_type::insert_point)
     .def("insert_points", &rtree_type::insert_points)
+    .def("bulk_load", &rtree_type::bulk_load)
     .def("find_points_in_box", &rtree_type::find_points_in_box)
     .def("find_nearest_neighbors", &rtree_type::find_nearest_neighbors)
+    .def("find_points_in_boxes", &rtree_type::find_points_in_boxes)
+    .def("find_nearest_neighbors_batch", &rtree_type::find_nearest_neighbors_batch)
     .def("__len__", &rtree_type::size)
     ;
 }
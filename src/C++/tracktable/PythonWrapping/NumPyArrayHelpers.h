@@ -0,0 +1,198 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+// Tracktable Trajectory Library
+//
+// NumPyArrayHelpers - Move bulk data between C++ containers and NumPy
+// arrays without going through Python objects one value at a time.
+//
+// We deliberately do not compile against the NumPy C API.  Arrays are
+// allocated by calling into the numpy module through Boost.Python and
+// their memory is then read or written through the Python buffer
+// protocol.  This keeps the extension modules free of any build-time
+// dependency on NumPy while still letting us fill (or consume) an
+// array of millions of values in a single C++ loop.
+
+#ifndef __tracktable_NumPyArrayHelpers_h
+#define __tracktable_NumPyArrayHelpers_h
+
+#include <tracktable/PythonWrapping/GuardedBoostPythonHeaders.h>
+
+#include <boost/cstdint.hpp>
+#include <boost/noncopyable.hpp>
+
+#include <cstddef>
+
+namespace tracktable { namespace python_wrapping {
+
+/// Import and return the numpy module
+inline boost::python::object numpy_module()
+{
+  return boost::python::import("numpy");
+}
+
+/// Allocate an uninitialized NumPy array with the given shape and dtype
+inline boost::python::object
+make_numpy_array(boost::python::tuple const& shape, const char* dtype)
+{
+  return numpy_module().attr("empty")(shape, dtype);
+}
+
+/// Allocate an uninitialized 1-D NumPy array
+inline boost::python::object
+make_numpy_array(std::size_t length, const char* dtype)
+{
+  return make_numpy_array(boost::python::make_tuple(length), dtype);
+}
+
+/// Allocate an uninitialized 2-D NumPy array
+inline boost::python::object
+make_numpy_array(std::size_t rows, std::size_t columns, const char* dtype)
+{
+  return make_numpy_array(boost::python::make_tuple(rows, columns), dtype);
+}
+
+/// Convert any array-like object into a C-contiguous NumPy array
+//
+// If the input is already a contiguous array of the requested dtype
+// NumPy returns it unchanged and no copy is made.
+inline boost::python::object
+as_contiguous_array(boost::python::object const& array_like, const char* dtype)
+{
+  return numpy_module().attr("ascontiguousarray")(array_like, dtype);
+}
+
+// ----------------------------------------------------------------------
+
+/// Map a C++ value type to its NumPy dtype and buffer format codes
+template<typename value_type>
+struct buffer_format;
+
+template<>
+struct buffer_format<double>
+{
+  static const char* dtype() { return "float64"; }
+  static bool matches(char code) { return code == 'd'; }
+};
+
+template<>
+struct buffer_format<boost::int64_t>
+{
+  static const char* dtype() { return "int64"; }
+  // 'l' is a 64-bit long on LP64 platforms and 'q' is long long
+  // everywhere.  The item size is checked separately.
+  static bool matches(char code) { return (code == 'q' || code == 'l'); }
+};
+
+// ----------------------------------------------------------------------
+
+/// Direct access to the memory behind a contiguous Python buffer
+//
+// This acquires a buffer view on construction and releases it on
+// destruction.  The buffer must be C-contiguous and its elements must
+// match value_type exactly; a TypeError is raised otherwise.  Use
+// as_contiguous_array() first if you need to coerce arbitrary input.
+//
+// A buffer of shape (N, M) is presented as N*M consecutive values in
+// row-major order.
+
+template<typename value_type>
+class ContiguousBuffer : private boost::noncopyable
+{
+public:
+  ContiguousBuffer(boost::python::object const& source, bool writable=false)
+    {
+      int flags = PyBUF_C_CONTIGUOUS | PyBUF_FORMAT;
+      if (writable)
+        {
+        flags |= PyBUF_WRITABLE;
+        }
+
+      if (PyObject_GetBuffer(source.ptr(), &this->Buffer, flags) != 0)
+        {
+        boost::python::throw_error_already_set();
+        }
+
+      const char* format = (this->Buffer.format ? this->Buffer.format : "B");
+      char code = format[0];
+      // Skip byte-order and alignment prefixes such as '<', '=' or '@'
+      while (code == '<' || code == '>' || code == '=' || code == '@' || code == '!')
+        {
+        code = *(++format);
+        }
+
+      if (this->Buffer.itemsize != static_cast<Py_ssize_t>(sizeof(value_type))
+          || !buffer_format<value_type>::matches(code))
+        {
+        PyBuffer_Release(&this->Buffer);
+        PyErr_Format(PyExc_TypeError,
+                     "Expected a contiguous buffer of %s",
+                     buffer_format<value_type>::dtype());
+        boost::python::throw_error_already_set();
+        }
+    }
+
+  ~ContiguousBuffer()
+    {
+      PyBuffer_Release(&this->Buffer);
+    }
+
+  value_type* data() { return static_cast<value_type*>(this->Buffer.buf); }
+  value_type const* data() const { return static_cast<value_type const*>(this->Buffer.buf); }
+
+  /// Total number of values in the buffer
+  std::size_t size() const
+    {
+      return static_cast<std::size_t>(this->Buffer.len / this->Buffer.itemsize);
+    }
+
+  /// Number of dimensions of the underlying array
+  int ndim() const { return this->Buffer.ndim; }
+
+  /// Extent along one dimension
+  std::size_t shape(int which) const
+    {
+      if (this->Buffer.shape == 0 || which >= this->Buffer.ndim)
+        {
+        return (which == 0 ? this->size() : 1);
+        }
+      return static_cast<std::size_t>(this->Buffer.shape[which]);
+    }
+
+  value_type& operator[](std::size_t i) { return this->data()[i]; }
+  value_type const& operator[](std::size_t i) const { return this->data()[i]; }
+
+private:
+  Py_buffer Buffer;
+};
+
+} } // exit namespace tracktable::python_wrapping
+
+#endif
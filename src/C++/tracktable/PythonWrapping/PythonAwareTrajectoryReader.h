@@ -42,6 +42,7 @@
 
 #include <tracktable/Core/TracktableCommon.h>
 #include <tracktable/RW/TrajectoryReader.h>
+#include <tracktable/RW/MappedFileInput.h>
 #include <tracktable/PythonWrapping/PythonFileLikeObjectStreams.h>
 #include <boost/iostreams/stream.hpp>
 #include <boost/shared_ptr.hpp>
@@ -58,6 +59,7 @@ private:
   typedef base_reader_type Superclass;
   typedef boost::iostreams::stream<PythonReadSource> WrappedPythonStream;
   typedef boost::shared_ptr<WrappedPythonStream> WrappedStreamSmartPointer;
+  typedef boost::shared_ptr<MappedFileInput> MappedInputSmartPointer;
 
 public:
   typedef typename base_reader_type::iterator iterator;
@@ -85,11 +87,42 @@ public:
       this->set_input_from_python_object(file_like_object);
     }
 
+  /** Read from a Python file-like object or from a file name.
+   *
+   * File-like objects are read through their read() method.  If
+   * 'thing' is a str, bytes or os.PathLike object instead, we map
+   * that file into memory and read it directly without going through
+   * Python at all.
+   */
   void set_input_from_python_object(boost::python::object& thing)
     {
+      // Open the new input before touching the current one so that a
+      // failure leaves the reader as it was.
+      if (python_object_is_path(thing))
+        {
+        std::string filename(path_from_python_object(thing));
+        MappedInputSmartPointer mapped_input;
+        try
+          {
+          mapped_input = MappedInputSmartPointer(new MappedFileInput(filename));
+          }
+        catch (std::runtime_error const& e)
+          {
+          PyErr_SetString(PyExc_OSError, e.what());
+          boost::python::throw_error_already_set();
+          }
+        this->set_input(mapped_input->stream());
+        this->MappedInput = mapped_input;
+        this->WrappedInputStream.reset();
+        }
+      else
+        {
+        WrappedStreamSmartPointer wrapped_input(new WrappedPythonStream(PythonReadSource(thing)));
+        this->set_input(*wrapped_input);
+        this->WrappedInputStream = wrapped_input;
+        this->MappedInput.reset();
+        }
       this->SourceObject = thing;
-      this->WrappedInputStream = WrappedStreamSmartPointer(new WrappedPythonStream(PythonReadSource(thing)));
-      this->set_input(*(this->WrappedInputStream));
     }
 
   boost::python::object input_as_python_object()
@@ -100,6 +133,7 @@ public:
 private:
   boost::python::object SourceObject;
   WrappedStreamSmartPointer WrappedInputStream;
+  MappedInputSmartPointer MappedInput;
 
 
 public:
@@ -282,6 +282,40 @@ private:
   }
 };
 
+// ----------------------------------------------------------------------
+
+/** Check whether a Python object names a file rather than being one.
+ *
+ * Strings, bytes and os.PathLike objects such as pathlib.Path are
+ * treated as file names.  Anything else is assumed to be a file-like
+ * object that we will read through PythonReadSource.
+ */
+inline bool python_object_is_path(boost::python::object const& thing)
+{
+  PyObject* ptr = thing.ptr();
+  return (PyUnicode_Check(ptr)
+          || PyBytes_Check(ptr)
+          || PyObject_HasAttrString(ptr, "__fspath__"));
+}
+
+/** Convert a Python path object to a file name in the filesystem encoding.
+ *
+ * @param [in] thing str, bytes or os.PathLike object
+ * @return File name suitable for passing to the operating system
+ */
+inline std::string path_from_python_object(boost::python::object const& thing)
+{
+  boost::python::handle<> fs_path(PyOS_FSPath(thing.ptr()));
+  if (PyBytes_Check(fs_path.get()))
+    {
+    return std::string(PyBytes_AS_STRING(fs_path.get()),
+                       PyBytes_GET_SIZE(fs_path.get()));
+    }
+  boost::python::handle<> encoded(PyUnicode_EncodeFSDefault(fs_path.get()));
+  return std::string(PyBytes_AS_STRING(encoded.get()),
+                     PyBytes_GET_SIZE(encoded.get()));
+}
+
 } // close namespace tracktable
 
 #endif
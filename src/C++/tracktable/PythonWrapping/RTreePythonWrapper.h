@@ -32,13 +32,18 @@
 #define __tracktable_python_rtree_wrapper_h
 
 #include <tracktable/PythonWrapping/GuardedBoostPythonHeaders.h>
+#include <tracktable/PythonWrapping/NumPyArrayHelpers.h>
+#include <tracktable/PythonWrapping/ScopedGILRelease.h>
 
 // possible hotfix for compile errors in 1.65.0 and 1.65.1
 #include <boost/geometry/strategies/strategies.hpp>
 
 #include <tracktable/Analysis/RTree.h>
+#include <tracktable/Core/ParallelFor.h>
 #include <tracktable/Domain/FeatureVectors.h>
 
+#include <vector>
+
 template<typename PointT>
 class RTreePythonWrapper
 {
@@ -95,7 +100,56 @@ public:
         );
       indexed_points.push_back(next_point);
       }
-    this->Tree.insert(indexed_points.begin(), indexed_points.end());
+
+    // An empty tree can be bulk-loaded, which is much faster than
+    // inserting points one at a time.
+    if (this->Tree.empty())
+      {
+      tracktable::python_wrapping::ScopedGILRelease unlock;
+      this->Tree.assign(indexed_points.begin(), indexed_points.end());
+      }
+    else
+      {
+      this->Tree.insert(indexed_points.begin(), indexed_points.end());
+      }
+  }
+
+  // ---------------------------------------------------------------------
+
+  // Replace the contents of the tree with the rows of an (N, dimension)
+  // array.  The point IDs are the row indices.  The tree is built with
+  // the packing algorithm and the array is not retained.
+  void bulk_load(boost::python::object const& array_like)
+  {
+    using namespace tracktable::python_wrapping;
+    const std::size_t dimension = point_type().size();
+
+    boost::python::object array(
+      as_contiguous_array(array_like, buffer_format<double>::dtype())
+      );
+    ContiguousBuffer<double> buffer(array);
+    if (buffer.size() > 0 && (buffer.ndim() != 2 || buffer.shape(1) != dimension))
+      {
+      PyErr_Format(PyExc_ValueError,
+                   "Expected an array of shape (N, %lu) for an R-tree of %lu-dimensional points",
+                   static_cast<unsigned long>(dimension),
+                   static_cast<unsigned long>(dimension));
+      boost::python::throw_error_already_set();
+      }
+
+    ScopedGILRelease unlock;
+    const std::size_t num_points = buffer.size() / dimension;
+    std::vector<indexed_point_type> indexed_points(num_points);
+    double const* in = buffer.data();
+    for (std::size_t i = 0; i < num_points; ++i)
+      {
+      for (std::size_t d = 0; d < dimension; ++d)
+        {
+        indexed_points[i].first[d] = *in++;
+        }
+      indexed_points[i].second = static_cast<int>(i);
+      }
+    this->Tree.assign(indexed_points.begin(), indexed_points.end());
   }
 
 
@@ -171,7 +225,157 @@ public:
       return std::move(result);
     }
 
+  // ----------------------------------------------------------------------
+
+  // Batch queries.  Each takes an (N, dimension) array of query points
+  // and answers all N queries in C++ with the GIL released, optionally
+  // spread across several threads.  The result is a pair of int64
+  // arrays (offsets, indices) in compressed sparse row layout: the
+  // results for query i are indices[offsets[i]:offsets[i+1]].
+
+  boost::python::object find_points_in_boxes(boost::python::object const& min_corners,
+                                             boost::python::object const& max_corners,
+                                             int num_threads)
+    {
+      using namespace tracktable::python_wrapping;
+
+      boost::python::object min_array(this->query_array(min_corners));
+      boost::python::object max_array(this->query_array(max_corners));
+      ContiguousBuffer<double> min_buffer(min_array);
+      ContiguousBuffer<double> max_buffer(max_array);
+      if (min_buffer.size() != max_buffer.size())
+        {
+        PyErr_SetString(PyExc_ValueError, "min_corners and max_corners must have the same shape");
+        boost::python::throw_error_already_set();
+        }
+
+      const std::size_t num_queries = min_buffer.size() / point_type().size();
+      std::vector<std::vector<int> > results(num_queries);
+      {
+        ScopedGILRelease unlock;
+        double const* min_data = min_buffer.data();
+        double const* max_data = max_buffer.data();
+        tracktable::parallel_for(
+          num_queries,
+          [&](std::size_t i)
+          {
+            std::vector<indexed_point_type> points_in_box;
+            this->Tree.find_points_inside_box(
+              this->point_from_row(min_data, i),
+              this->point_from_row(max_data, i),
+              std::back_inserter(points_in_box)
+              );
+            results[i].reserve(points_in_box.size());
+            for (std::size_t j = 0; j < points_in_box.size(); ++j)
+              {
+              results[i].push_back(points_in_box[j].second);
+              }
+          },
+          num_threads
+          );
+      }
+      return this->results_as_csr(results);
+    }
+
+  boost::python::object find_nearest_neighbors_batch(boost::python::object const& seeds,
+                                                     std::size_t num_neighbors,
+                                                     int num_threads)
+    {
+      using namespace tracktable::python_wrapping;
+
+      boost::python::object seed_array(this->query_array(seeds));
+      ContiguousBuffer<double> seed_buffer(seed_array);
+
+      const std::size_t num_queries = seed_buffer.size() / point_type().size();
+      const int k = boost::numeric_cast<int>(num_neighbors);
+      std::vector<std::vector<int> > results(num_queries);
+      {
+        ScopedGILRelease unlock;
+        double const* seed_data = seed_buffer.data();
+        tracktable::parallel_for(
+          num_queries,
+          [&](std::size_t i)
+          {
+            indexed_point_type query_point(this->point_from_row(seed_data, i), -1);
+            std::vector<indexed_point_type> neighbors;
+            this->Tree.find_nearest_neighbors(query_point, k, std::back_inserter(neighbors));
+            results[i].reserve(neighbors.size());
+            for (std::size_t j = 0; j < neighbors.size(); ++j)
+              {
+              results[i].push_back(neighbors[j].second);
+              }
+          },
+          num_threads
+          );
+      }
+      return this->results_as_csr(results);
+    }
+
 private:
+  // Coerce query points to a contiguous (N, dimension) float64 array
+  boost::python::object query_array(boost::python::object const& points) const
+    {
+      using namespace tracktable::python_wrapping;
+      const std::size_t dimension = point_type().size();
+
+      boost::python::object array(
+        as_contiguous_array(points, buffer_format<double>::dtype())
+        );
+      ContiguousBuffer<double> buffer(array);
+      if (buffer.size() > 0 && (buffer.ndim() != 2 || buffer.shape(1) != dimension))
+        {
+        PyErr_Format(PyExc_ValueError,
+                     "Expected query points as an array of shape (N, %lu)",
+                     static_cast<unsigned long>(dimension));
+        boost::python::throw_error_already_set();
+        }
+      return array;
+    }
+
+  static point_type point_from_row(double const* data, std::size_t row)
+    {
+      point_type point;
+      const std::size_t dimension = point.size();
+      for (std::size_t d = 0; d < dimension; ++d)
+        {
+        point[d] = data[row * dimension + d];
+        }
+      return point;
+    }
+
+  static boost::python::object results_as_csr(std::vector<std::vector<int> > const& results)
+    {
+      using namespace tracktable::python_wrapping;
+
+      std::size_t total = 0;
+      for (std::size_t i = 0; i < results.size(); ++i)
+        {
+        total += results[i].size();
+        }
+
+      boost::python::object offsets(
+        make_numpy_array(results.size() + 1, buffer_format<boost::int64_t>::dtype())
+        );
+      boost::python::object indices(
+        make_numpy_array(total, buffer_format<boost::int64_t>::dtype())
+        );
+      ContiguousBuffer<boost::int64_t> offset_buffer(offsets, true);
+      ContiguousBuffer<boost::int64_t> index_buffer(indices, true);
+
+      boost::int64_t position = 0;
+      for (std::size_t i = 0; i < results.size(); ++i)
+        {
+        offset_buffer[i] = position;
+        for (std::size_t j = 0; j < results[i].size(); ++j)
+          {
+          index_buffer[position++] = results[i][j];
+          }
+        }
+      offset_buffer[results.size()] = position;
+
+      return boost::python::make_tuple(offsets, indices);
+    }
+
   rtree_type Tree;
 };
 
@@ -0,0 +1,70 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+// Tracktable Trajectory Library
+//
+// ScopedGILRelease - Let other Python threads run during long C++ loops
+//
+// Construct one of these once every Python object you need has been
+// converted to C++ and you are about to do a long stretch of work that
+// does not touch the interpreter.  The GIL is reacquired when the
+// object goes out of scope, including when an exception propagates.
+//
+// Nothing that touches a Python object -- including Boost.Python
+// extract<> and object -- may be used while the GIL is released.
+
+#ifndef __tracktable_ScopedGILRelease_h
+#define __tracktable_ScopedGILRelease_h
+
+#include <tracktable/PythonWrapping/GuardedBoostPythonHeaders.h>
+
+#include <boost/noncopyable.hpp>
+
+namespace tracktable { namespace python_wrapping {
+
+class ScopedGILRelease : private boost::noncopyable
+{
+public:
+  ScopedGILRelease()
+    : ThreadState(PyEval_SaveThread())
+    { }
+
+  ~ScopedGILRelease()
+    {
+      PyEval_RestoreThread(this->ThreadState);
+    }
+
+private:
+  PyThreadState* ThreadState;
+};
+
+} } // exit namespace tracktable::python_wrapping
+
+#endif
@@ -0,0 +1,395 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+// Tracktable Trajectory Library
+//
+// TrajectoryArrayMethods - Columnar access to trajectories from Python
+//
+// These methods copy the coordinates, timestamps or a numeric property
+// of every point in a trajectory into a NumPy array with a single C++
+// loop.  Points are stored as an array of structures in C++ (each
+// TrajectoryPoint carries its own ID, timestamp and property map) so
+// the columns cannot be exposed without a copy, but doing the copy
+// here avoids creating one Python wrapper object per point.
+//
+// Trajectory.from_arrays() goes the other way: it builds an entire
+// trajectory from column arrays in one call.
+
+#ifndef __tracktable_TrajectoryArrayMethods_h
+#define __tracktable_TrajectoryArrayMethods_h
+
+#include <tracktable/PythonWrapping/GuardedBoostPythonHeaders.h>
+#include <tracktable/PythonWrapping/NumPyArrayHelpers.h>
+
+#include <tracktable/Core/PointTraits.h>
+#include <tracktable/Core/PropertyMap.h>
+#include <tracktable/Core/Timestamp.h>
+
+#include <limits>
+#include <sstream>
+#include <string>
+#include <vector>
+
+namespace tracktable { namespace python_wrapping {
+
+/// Copy point coordinates into an (N, D) array of float64
+template<typename trajectory_type>
+boost::python::object
+trajectory_coordinates_as_array(trajectory_type const& trajectory)
+{
+  typedef typename trajectory_type::point_type point_type;
+  const std::size_t dimension = tracktable::traits::dimension<point_type>::value;
+
+  boost::python::object result(
+    make_numpy_array(trajectory.size(), dimension, buffer_format<double>::dtype())
+    );
+  ContiguousBuffer<double> buffer(result, true);
+  double* out = buffer.data();
+
+  for (typename trajectory_type::const_iterator iter = trajectory.begin();
+       iter != trajectory.end();
+       ++iter)
+    {
+    for (std::size_t d = 0; d < dimension; ++d)
+      {
+      *out++ = (*iter)[d];
+      }
+    }
+  return result;
+}
+
+/// Copy point timestamps into a length-N array of datetime64[us]
+//
+// Timestamps in C++ are always UTC so the resulting values are UTC
+// as well.  Invalid timestamps become NaT.
+template<typename trajectory_type>
+boost::python::object
+trajectory_timestamps_as_array(trajectory_type const& trajectory)
+{
+  boost::python::object result(
+    make_numpy_array(trajectory.size(), buffer_format<boost::int64_t>::dtype())
+    );
+  ContiguousBuffer<boost::int64_t> buffer(result, true);
+  boost::int64_t* out = buffer.data();
+
+  for (typename trajectory_type::const_iterator iter = trajectory.begin();
+       iter != trajectory.end();
+       ++iter)
+    {
+    *out++ = tracktable::timestamp_to_epoch_microseconds((*iter).timestamp());
+    }
+  return result.attr("view")("datetime64[us]");
+}
+
+/// Copy a real-valued point property into a length-N array of float64
+//
+// Points where the property is missing or is not real-valued get NaN.
+template<typename trajectory_type>
+boost::python::object
+trajectory_real_property_as_array(trajectory_type const& trajectory,
+                                  std::string const& name)
+{
+  boost::python::object result(
+    make_numpy_array(trajectory.size(), buffer_format<double>::dtype())
+    );
+  ContiguousBuffer<double> buffer(result, true);
+  double* out = buffer.data();
+
+  for (typename trajectory_type::const_iterator iter = trajectory.begin();
+       iter != trajectory.end();
+       ++iter)
+    {
+    tracktable::PropertyMap const& properties((*iter).__properties());
+    tracktable::PropertyMap::const_iterator property = properties.find(name);
+    double const* value = 0;
+    if (property != properties.end())
+      {
+      value = boost::get<double>(&(property->second));
+      }
+    *out++ = (value ? *value : std::numeric_limits<double>::quiet_NaN());
+    }
+  return result;
+}
+
+// ----------------------------------------------------------------------
+
+/// Convert an array of timestamps into int64 microseconds since the epoch
+//
+// Accepts datetime64 arrays of any unit, integer arrays (interpreted as
+// microseconds since 1970-01-01 UTC) and sequences of Python datetime
+// objects.  Timezone-aware datetimes are converted to UTC.  NaT and
+// None become std::numeric_limits<int64_t>::min().
+inline boost::python::object
+epoch_microseconds_array(boost::python::object const& timestamps)
+{
+  using namespace boost::python;
+
+  object numpy(numpy_module());
+  object array(numpy.attr("asarray")(timestamps));
+  std::string kind = extract<std::string>(array.attr("dtype").attr("kind"));
+
+  if (kind == "M")
+    {
+    return as_contiguous_array(
+      array.attr("astype")("datetime64[us]").attr("view")("int64"),
+      buffer_format<boost::int64_t>::dtype()
+      );
+    }
+  else if (kind == "i" || kind == "u")
+    {
+    return as_contiguous_array(array, buffer_format<boost::int64_t>::dtype());
+    }
+  else if (kind == "O")
+    {
+    object result(make_numpy_array(len(array), buffer_format<boost::int64_t>::dtype()));
+    ContiguousBuffer<boost::int64_t> buffer(result, true);
+    boost::int64_t* out = buffer.data();
+
+    stl_input_iterator<object> iter(array), end;
+    for (; iter != end; ++iter)
+      {
+      if (iter->is_none())
+        {
+        *out++ = std::numeric_limits<boost::int64_t>::min();
+        }
+      else
+        {
+        *out++ = tracktable::timestamp_to_epoch_microseconds(
+          extract<tracktable::Timestamp>(*iter)
+          );
+        }
+      }
+    return result;
+    }
+  else
+    {
+    PyErr_SetString(PyExc_TypeError,
+                    "Timestamps must be datetime64 values, integer microseconds since the epoch or datetime objects");
+    throw_error_already_set();
+    }
+  return object();
+}
+
+namespace detail {
+
+inline void
+check_column_length(std::string const& name, std::size_t actual, std::size_t expected)
+{
+  if (actual != expected)
+    {
+    PyErr_Format(PyExc_ValueError,
+                 "Column '%s' has %lu entries but timestamps has %lu",
+                 name.c_str(),
+                 static_cast<unsigned long>(actual),
+                 static_cast<unsigned long>(expected));
+    boost::python::throw_error_already_set();
+    }
+}
+
+/// Copy one property column into a list of points
+//
+// The column's dtype decides the property type: datetime64 and
+// datetime objects become timestamp properties, strings become string
+// properties and everything else is converted to float64.  NaN, NaT
+// and None leave the property unset on that point.
+template<typename point_type>
+void
+assign_property_column(std::string const& name,
+                       boost::python::object const& column,
+                       std::vector<point_type>& points)
+{
+  using namespace boost::python;
+
+  object array(numpy_module().attr("asarray")(column));
+  std::string kind = extract<std::string>(array.attr("dtype").attr("kind"));
+  check_column_length(name, len(array), points.size());
+
+  if (kind == "M")
+    {
+    object values(epoch_microseconds_array(array));
+    ContiguousBuffer<boost::int64_t> buffer(values);
+    for (std::size_t i = 0; i < points.size(); ++i)
+      {
+      if (buffer[i] != std::numeric_limits<boost::int64_t>::min())
+        {
+        points[i].set_property(name, tracktable::timestamp_from_epoch_microseconds(buffer[i]));
+        }
+      }
+    }
+  else if (kind == "U" || kind == "S" || kind == "O")
+    {
+    // A numeric column with a missing value (None) arrives here with
+    // dtype object.  Python and NumPy numbers are all registered as
+    // numbers.Real, so those still become real-valued properties.
+    object real_number_type(import("numbers").attr("Real"));
+    stl_input_iterator<object> iter(array), end;
+    for (std::size_t i = 0; iter != end; ++iter, ++i)
+      {
+      object value(*iter);
+      if (value.is_none())
+        {
+        continue;
+        }
+      if (kind == "S")
+        {
+        value = value.attr("decode")("utf-8");
+        }
+
+      extract<std::string> as_string(value);
+      extract<tracktable::Timestamp> as_timestamp(value);
+      if (as_string.check())
+        {
+        points[i].set_property(name, std::string(as_string()));
+        }
+      else if (as_timestamp.check())
+        {
+        points[i].set_property(name, tracktable::Timestamp(as_timestamp()));
+        }
+      else if (PyObject_IsInstance(value.ptr(), real_number_type.ptr()) == 1)
+        {
+        double real_value = extract<double>(value.attr("__float__")());
+        if (real_value == real_value)
+          {
+          points[i].set_property(name, real_value);
+          }
+        }
+      else
+        {
+        points[i].set_property(name, std::string(extract<std::string>(str(value))));
+        }
+      }
+    }
+  else
+    {
+    object values(as_contiguous_array(array, buffer_format<double>::dtype()));
+    ContiguousBuffer<double> buffer(values);
+    for (std::size_t i = 0; i < points.size(); ++i)
+      {
+      if (buffer[i] == buffer[i])
+        {
+        points[i].set_property(name, buffer[i]);
+        }
+      }
+    }
+}
+
+} // exit namespace detail
+
+/// Build a trajectory from column arrays in a single call
+//
+// Python signature:
+//
+//   Trajectory.from_arrays(object_id, timestamps, c0, c1[, c2], **properties)
+//
+// The coordinate columns are longitude/latitude for the terrestrial
+// domain and x/y(/z) for the Cartesian domains.  Every column must
+// have the same length as timestamps.  The trajectory is populated with
+// assign() so its per-point features are computed once.
+template<typename trajectory_type>
+boost::python::object
+trajectory_from_arrays(boost::python::tuple args, boost::python::dict kwargs)
+{
+  using namespace boost::python;
+  typedef typename trajectory_type::point_type point_type;
+  const std::size_t dimension = tracktable::traits::dimension<point_type>::value;
+
+  if (static_cast<std::size_t>(len(args)) != dimension + 2)
+    {
+    PyErr_Format(PyExc_TypeError,
+                 "from_arrays() takes an object ID, an array of timestamps and %lu coordinate arrays",
+                 static_cast<unsigned long>(dimension));
+    throw_error_already_set();
+    }
+
+  std::string object_id = extract<std::string>(args[0]);
+
+  object timestamp_array(epoch_microseconds_array(args[1]));
+  ContiguousBuffer<boost::int64_t> timestamps(timestamp_array);
+  const std::size_t num_points = timestamps.size();
+
+  std::vector<point_type> points(num_points);
+  for (std::size_t i = 0; i < num_points; ++i)
+    {
+    points[i].set_object_id(object_id);
+    points[i].set_timestamp(tracktable::timestamp_from_epoch_microseconds(timestamps[i]));
+    }
+
+  for (std::size_t d = 0; d < dimension; ++d)
+    {
+    object column(as_contiguous_array(args[d + 2], buffer_format<double>::dtype()));
+    ContiguousBuffer<double> values(column);
+    std::ostringstream name;
+    name << "coordinate " << d;
+    detail::check_column_length(name.str(), values.size(), num_points);
+    for (std::size_t i = 0; i < num_points; ++i)
+      {
+      points[i][d] = values[i];
+      }
+    }
+
+  list property_names(kwargs.keys());
+  for (std::size_t p = 0; p < static_cast<std::size_t>(len(property_names)); ++p)
+    {
+    std::string name = extract<std::string>(property_names[p]);
+    detail::assign_property_column(name, kwargs[property_names[p]], points);
+    }
+
+  trajectory_type* trajectory = new trajectory_type;
+  trajectory->assign(points.begin(), points.end());
+
+  typename manage_new_object::apply<trajectory_type*>::type converter;
+  return object(handle<>(converter(trajectory)));
+}
+
+// ----------------------------------------------------------------------
+
+class trajectory_array_methods : public boost::python::def_visitor<trajectory_array_methods>
+{
+  friend class boost::python::def_visitor_access;
+
+  template<class ClassT>
+  void visit(ClassT& c) const
+    {
+      typedef typename ClassT::wrapped_type wrapped_type;
+      using namespace boost::python;
+
+      c
+        .def("coordinates_as_array", &trajectory_coordinates_as_array<wrapped_type>)
+        .def("timestamps_as_array", &trajectory_timestamps_as_array<wrapped_type>)
+        .def("real_property_as_array", &trajectory_real_property_as_array<wrapped_type>)
+        .def("from_arrays", raw_function(&trajectory_from_arrays<wrapped_type>, 2))
+        .staticmethod("from_arrays")
+        ;
+    }
+};
+
+} } // exit namespace tracktable::python_wrapping
+
+#endif
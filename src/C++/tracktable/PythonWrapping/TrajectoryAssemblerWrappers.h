@@ -0,0 +1,217 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+/** Python wrapper for the incremental trajectory assembler.
+ *
+ * The wrapper speaks the same language as the Python
+ * AssembleTrajectoryFromPoints: separation_time,
+ * separation_distance and reorder_window can be None, and
+ * add_points(), advance_watermark() and flush() return lists of
+ * finished trajectories.
+ */
+
+#ifndef __tracktable_PythonWrapping_TrajectoryAssemblerWrappers_h
+#define __tracktable_PythonWrapping_TrajectoryAssemblerWrappers_h
+
+#include <tracktable/Core/TracktableCommon.h>
+#include <tracktable/Analysis/TrajectoryAssembler.h>
+#include <tracktable/PythonWrapping/GuardedBoostPythonHeaders.h>
+
+#include <boost/python/stl_iterator.hpp>
+
+namespace tracktable {
+
+template<class TrajectoryT>
+class PythonAwareTrajectoryAssembler : public TrajectoryAssembler<TrajectoryT>
+{
+private:
+  typedef TrajectoryAssembler<TrajectoryT> Superclass;
+
+public:
+  typedef TrajectoryT trajectory_type;
+  typedef typename Superclass::point_type point_type;
+
+  PythonAwareTrajectoryAssembler()
+    { }
+
+  virtual ~PythonAwareTrajectoryAssembler()
+    { }
+
+  /// Separation time as a timedelta or None for no limit
+  boost::python::object separation_time_as_python_object() const
+    {
+      if (this->has_separation_time())
+        {
+        return boost::python::object(this->separation_time());
+        }
+      return boost::python::object();
+    }
+
+  void set_separation_time_from_python_object(boost::python::object const& thing)
+    {
+      if (thing.is_none())
+        {
+        this->set_separation_time(Duration(0, 0, 0, 0));
+        }
+      else
+        {
+        this->set_separation_time(boost::python::extract<Duration>(thing)());
+        }
+    }
+
+  /// Separation distance as a float or None for no limit
+  boost::python::object separation_distance_as_python_object() const
+    {
+      if (this->has_separation_distance())
+        {
+        return boost::python::object(this->separation_distance());
+        }
+      return boost::python::object();
+    }
+
+  void set_separation_distance_from_python_object(boost::python::object const& thing)
+    {
+      if (thing.is_none())
+        {
+        this->set_separation_distance(0);
+        }
+      else
+        {
+        this->set_separation_distance(boost::python::extract<double>(thing)());
+        }
+    }
+
+  /// Reorder window as a timedelta or None if points must arrive in order
+  boost::python::object reorder_window_as_python_object() const
+    {
+      if (this->has_reorder_window())
+        {
+        return boost::python::object(this->reorder_window());
+        }
+      return boost::python::object();
+    }
+
+  void set_reorder_window_from_python_object(boost::python::object const& thing)
+    {
+      if (thing.is_none())
+        {
+        this->set_reorder_window(Duration(0, 0, 0, 0));
+        }
+      else
+        {
+        this->set_reorder_window(boost::python::extract<Duration>(thing)());
+        }
+    }
+
+  /** Add an iterable of points and return the trajectories they finish. */
+  boost::python::list add_points_from_python(boost::python::object const& points)
+    {
+      boost::python::stl_input_iterator<point_type> begin(points), end;
+      for (; begin != end; ++begin)
+        {
+        this->add_point(*begin);
+        }
+      return this->take_finished_trajectories();
+    }
+
+  boost::python::list advance_watermark_from_python(Timestamp const& watermark)
+    {
+      this->advance_watermark(watermark);
+      return this->take_finished_trajectories();
+    }
+
+  boost::python::list flush_from_python()
+    {
+      this->flush();
+      return this->take_finished_trajectories();
+    }
+
+private:
+  boost::python::list take_finished_trajectories()
+    {
+      boost::python::list result;
+      while (this->has_finished_trajectories())
+        {
+        result.append(this->pop_finished_trajectory());
+        }
+      return result;
+    }
+};
+
+// ----------------------------------------------------------------------
+
+namespace python_wrapping {
+
+class trajectory_assembler_methods : public boost::python::def_visitor<trajectory_assembler_methods>
+{
+  friend class boost::python::def_visitor_access;
+
+  template<class ClassT>
+  void visit(ClassT& c) const
+    {
+      typedef typename ClassT::wrapped_type assembler_type;
+      using namespace boost::python;
+
+      c
+        .def(init<>())
+        .add_property("separation_time",
+                      &assembler_type::separation_time_as_python_object,
+                      &assembler_type::set_separation_time_from_python_object)
+        .add_property("separation_distance",
+                      &assembler_type::separation_distance_as_python_object,
+                      &assembler_type::set_separation_distance_from_python_object)
+        .add_property("minimum_length",
+                      &assembler_type::minimum_trajectory_length,
+                      &assembler_type::set_minimum_trajectory_length)
+        .add_property("cleanup_interval",
+                      &assembler_type::cleanup_interval,
+                      &assembler_type::set_cleanup_interval)
+        .add_property("reorder_window",
+                      &assembler_type::reorder_window_as_python_object,
+                      &assembler_type::set_reorder_window_from_python_object)
+        .add_property("points_processed_count", &assembler_type::points_processed_count)
+        .add_property("valid_trajectory_count", &assembler_type::valid_trajectory_count)
+        .add_property("invalid_trajectory_count", &assembler_type::invalid_trajectory_count)
+        .add_property("late_point_count", &assembler_type::late_point_count)
+        .add_property("num_trajectories_in_progress", &assembler_type::num_trajectories_in_progress)
+        .add_property("num_buffered_points", &assembler_type::num_buffered_points)
+        .def("add_points", &assembler_type::add_points_from_python)
+        .def("advance_watermark", &assembler_type::advance_watermark_from_python)
+        .def("flush", &assembler_type::flush_from_python)
+        .def("reset", &assembler_type::reset)
+        ;
+    }
+};
+
+} // close namespace python_wrapping
+
+} // close namespace tracktable
+
+#endif
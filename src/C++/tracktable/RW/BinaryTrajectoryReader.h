@@ -0,0 +1,508 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#ifndef __tracktable_BinaryTrajectoryReader_h
+#define __tracktable_BinaryTrajectoryReader_h
+
+#include <tracktable/Core/TracktableCommon.h>
+#include <tracktable/Core/PointTraits.h>
+#include <tracktable/Core/Timestamp.h>
+#include <tracktable/Core/TrajectoryPoint.h>
+#include <tracktable/Core/UUID.h>
+
+#include <tracktable/RW/GenericReader.h>
+#include <tracktable/RW/MappedFileInput.h>
+#include <tracktable/RW/detail/BinaryTrajectoryFormat.h>
+
+#include <tracktable/Core/WarningGuards/PushWarningState.h>
+#include <tracktable/Core/WarningGuards/CommonBoostWarnings.h>
+#include <boost/geometry/geometries/box.hpp>
+#include <tracktable/Core/WarningGuards/PopWarningState.h>
+
+#include <boost/shared_ptr.hpp>
+
+#include <algorithm>
+#include <iostream>
+#include <iterator>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace tracktable {
+
+namespace rw { namespace detail {
+
+// Recover BasePointT from TrajectoryPoint<BasePointT> or from a
+// domain class derived from it such as TerrestrialTrajectoryPoint.
+// Using point_type::Superclass directly stops one level too early for
+// the domain classes.
+template<typename BasePointT>
+BasePointT base_point_of(TrajectoryPoint<BasePointT> const*);
+
+} } // close namespace tracktable::rw::detail
+
+/** Read trajectories from a binary, column-oriented file
+ *
+ * This reader loads files written by BinaryTrajectoryWriter.  When
+ * it opens a file it reads only the index at the end of the file.
+ * After that you can ask how many trajectories there are, look up
+ * their object IDs, time spans and bounding boxes, find the ones you
+ * want and decode just those with `read(i)`.  You can also iterate
+ * over all of them in order like any other reader.
+ *
+ * `open(filename)` maps the file into memory so that only the parts
+ * you actually read are ever loaded.  `set_input(stream)` works with
+ * any `std::istream` but has to copy the whole stream into memory
+ * first.
+ *
+ * Example:
+ *
+ * @code
+ *
+ * tracktable::BinaryTrajectoryReader<trajectory_type> reader("trajectories.trajbin");
+ * std::vector<std::size_t> matches(reader.find_object_id("FLIGHT123"));
+ * for (std::size_t i : matches)
+ *   {
+ *   trajectory_type trajectory(reader.read(i));
+ *   ...
+ *   }
+ *
+ * @endcode
+ */
+
+template<typename TrajectoryT>
+class BinaryTrajectoryReader : public GenericReader<TrajectoryT>
+{
+public:
+  typedef GenericReader<TrajectoryT> Superclass;
+  typedef TrajectoryT trajectory_type;
+  typedef typename trajectory_type::point_type point_type;
+  typedef decltype(rw::detail::base_point_of(static_cast<point_type const*>(0))) base_point_type;
+  typedef boost::geometry::model::box<base_point_type> box_type;
+  typedef boost::shared_ptr<trajectory_type> trajectory_shared_ptr_type;
+  typedef typename Superclass::iterator iterator;
+
+  /// Instantiate a reader with no input
+  BinaryTrajectoryReader()
+    : Data(0)
+    , DataSize(0)
+    , NextIndex(0)
+    { }
+
+  /** Instantiate a reader and open a file
+   *
+   * @param [in] filename Path to a file written by BinaryTrajectoryWriter
+   */
+  explicit BinaryTrajectoryReader(std::string const& filename)
+    : Data(0)
+    , DataSize(0)
+    , NextIndex(0)
+    {
+      this->open(filename);
+    }
+
+  /** Instantiate a reader that reads from a stream
+   *
+   * @param [in] infile Stream containing a binary trajectory file
+   */
+  BinaryTrajectoryReader(std::istream& infile)
+    : Data(0)
+    , DataSize(0)
+    , NextIndex(0)
+    {
+      this->set_input(infile);
+    }
+
+  /// Destructor
+  virtual ~BinaryTrajectoryReader()
+    { }
+
+  /** Open a file through a memory mapping
+   *
+   * @param [in] filename Path to the file to read
+   * @throw std::runtime_error if the file cannot be opened or is not a valid binary trajectory file
+   */
+  void open(std::string const& filename)
+    {
+      this->StreamContents.clear();
+      this->MappedInput.reset(new MappedFileInput(filename));
+      this->load_index(this->MappedInput->data(), this->MappedInput->size());
+    }
+
+  /** Read from a stream
+   *
+   * The entire stream is read into memory.  Use open() for large files.
+   *
+   * @param [in] infile Stream containing a binary trajectory file
+   * @throw std::runtime_error if the stream does not contain a valid binary trajectory file
+   */
+  void set_input(std::istream& infile)
+    {
+      this->MappedInput.reset();
+      this->StreamContents.assign(std::istreambuf_iterator<char>(infile),
+                                  std::istreambuf_iterator<char>());
+      this->load_index(this->StreamContents.data(), this->StreamContents.size());
+    }
+
+  /** Get the number of trajectories in the file
+   *
+   * @return Number of trajectories
+   */
+  std::size_t size() const
+    {
+      return this->Index.size();
+    }
+
+  /** Decode one trajectory
+   *
+   * @param [in] i Index of the trajectory in the file
+   * @return The trajectory
+   * @throw std::out_of_range if `i` is not less than size()
+   */
+  trajectory_type read(std::size_t i) const
+    {
+      rw::detail::BinaryTrajectoryIndexEntry const& entry(this->entry(i));
+      rw::detail::BinaryDecoder decoder(this->Data, this->Data + this->DataSize);
+      decoder.seek(static_cast<std::size_t>(entry.Offset));
+
+      const std::size_t num_points = static_cast<std::size_t>(decoder.read<uint64_t>());
+      trajectory_type trajectory(num_points, point_type(), false);
+
+      string_type object_id(decoder.read_string());
+      uuid_type uuid;
+      const char* uuid_bytes = decoder.read_bytes(uuid.size());
+      std::copy(uuid_bytes, uuid_bytes + uuid.size(), uuid.begin());
+      trajectory.set_uuid(uuid);
+
+      const uint32_t num_trajectory_properties = decoder.read<uint32_t>();
+      for (uint32_t p = 0; p < num_trajectory_properties; ++p)
+        {
+        string_type name(decoder.read_string());
+        trajectory.set_property(name, decoder.read_tagged_property());
+        }
+
+      const bool per_point_object_ids = (decoder.read<uint8_t>() != 0);
+      for (std::size_t i = 0; i < num_points; ++i)
+        {
+        trajectory[i].set_object_id(per_point_object_ids ? decoder.read_string() : object_id);
+        }
+
+      for (std::size_t i = 0; i < num_points; ++i)
+        {
+        trajectory[i].set_timestamp(decoder.read_timestamp());
+        }
+
+      for (std::size_t d = 0; d < this->Dimension; ++d)
+        {
+        for (std::size_t i = 0; i < num_points; ++i)
+          {
+          trajectory[i][d] = decoder.read<double>();
+          }
+        }
+
+      this->read_point_property_columns(decoder, trajectory);
+
+      trajectory.compute_current_features(0);
+      return trajectory;
+    }
+
+  /** Get the object ID of a trajectory without decoding it
+   *
+   * @param [in] i Index of the trajectory in the file
+   * @return Object ID
+   */
+  string_type object_id(std::size_t i) const
+    {
+      return this->entry(i).ObjectId;
+    }
+
+  /** Get the number of points in a trajectory without decoding it
+   *
+   * @param [in] i Index of the trajectory in the file
+   * @return Number of points
+   */
+  std::size_t num_points(std::size_t i) const
+    {
+      return static_cast<std::size_t>(this->entry(i).NumPoints);
+    }
+
+  /** Get the timestamp of the first point in a trajectory
+   *
+   * @param [in] i Index of the trajectory in the file
+   * @return Start time, or an invalid timestamp if the trajectory is empty
+   */
+  Timestamp start_time(std::size_t i) const
+    {
+      return timestamp_from_epoch_microseconds(this->entry(i).StartTime);
+    }
+
+  /** Get the timestamp of the last point in a trajectory
+   *
+   * @param [in] i Index of the trajectory in the file
+   * @return End time, or an invalid timestamp if the trajectory is empty
+   */
+  Timestamp end_time(std::size_t i) const
+    {
+      return timestamp_from_epoch_microseconds(this->entry(i).EndTime);
+    }
+
+  /** Get the bounding box of a trajectory's coordinates
+   *
+   * This is the plain coordinate-wise minimum and maximum.  For
+   * terrestrial trajectories that cross the 180th meridian it spans
+   * most of the globe.
+   *
+   * @param [in] i Index of the trajectory in the file
+   * @return Bounding box
+   */
+  box_type bounding_box(std::size_t i) const
+    {
+      rw::detail::BinaryTrajectoryIndexEntry const& entry(this->entry(i));
+      base_point_type min_corner, max_corner;
+      for (std::size_t d = 0; d < this->Dimension; ++d)
+        {
+        min_corner[d] = entry.MinCorner[d];
+        max_corner[d] = entry.MaxCorner[d];
+        }
+      return box_type(min_corner, max_corner);
+    }
+
+  /** Find all trajectories with a given object ID
+   *
+   * @param [in] object_id Object ID to look for
+   * @return Indices of matching trajectories in file order
+   */
+  std::vector<std::size_t> find_object_id(string_type const& object_id) const
+    {
+      std::vector<std::size_t> result;
+      for (std::size_t i = 0; i < this->Index.size(); ++i)
+        {
+        if (this->Index[i].ObjectId == object_id)
+          {
+          result.push_back(i);
+          }
+        }
+      return result;
+    }
+
+  /** Find all trajectories that overlap a time interval
+   *
+   * @param [in] start Start of the interval
+   * @param [in] end   End of the interval
+   * @return Indices of trajectories whose time span intersects [start, end]
+   */
+  std::vector<std::size_t> find_in_time_range(Timestamp const& start,
+                                              Timestamp const& end) const
+    {
+      const int64_t start_usec = timestamp_to_epoch_microseconds(start);
+      const int64_t end_usec = timestamp_to_epoch_microseconds(end);
+      std::vector<std::size_t> result;
+      for (std::size_t i = 0; i < this->Index.size(); ++i)
+        {
+        rw::detail::BinaryTrajectoryIndexEntry const& entry(this->Index[i]);
+        if (entry.NumPoints > 0
+            && entry.StartTime <= end_usec
+            && entry.EndTime >= start_usec)
+          {
+          result.push_back(i);
+          }
+        }
+      return result;
+    }
+
+  /** Find all trajectories whose bounding box intersects a box
+   *
+   * @param [in] box Query box
+   * @return Indices of matching trajectories in file order
+   */
+  std::vector<std::size_t> find_in_box(box_type const& box) const
+    {
+      std::vector<std::size_t> result;
+      for (std::size_t i = 0; i < this->Index.size(); ++i)
+        {
+        rw::detail::BinaryTrajectoryIndexEntry const& entry(this->Index[i]);
+        if (entry.NumPoints == 0)
+          {
+          continue;
+          }
+        bool overlaps = true;
+        for (std::size_t d = 0; d < this->Dimension && overlaps; ++d)
+          {
+          overlaps = (entry.MinCorner[d] <= box.max_corner()[d]
+                      && entry.MaxCorner[d] >= box.min_corner()[d]);
+          }
+        if (overlaps)
+          {
+          result.push_back(i);
+          }
+        }
+      return result;
+    }
+
+  /** Get an iterator pointing to the first trajectory
+   *
+   * Unlike most readers, calling this again starts over from the
+   * beginning of the file.
+   *
+   * @return Iterator pointing to the first trajectory
+   */
+  iterator begin()
+    {
+      this->NextIndex = 0;
+      return this->Superclass::begin();
+    }
+
+protected:
+  trajectory_shared_ptr_type next_item()
+    {
+      if (this->NextIndex >= this->Index.size())
+        {
+        return trajectory_shared_ptr_type();
+        }
+      return trajectory_shared_ptr_type(new trajectory_type(this->read(this->NextIndex++)));
+    }
+
+private:
+  std::unique_ptr<MappedFileInput>                     MappedInput;
+  std::string                                          StreamContents;
+  const char*                                          Data;
+  std::size_t                                          DataSize;
+  std::size_t                                          Dimension;
+  std::vector<rw::detail::BinaryTrajectoryIndexEntry>  Index;
+  std::size_t                                          NextIndex;
+
+  rw::detail::BinaryTrajectoryIndexEntry const& entry(std::size_t i) const
+    {
+      if (i >= this->Index.size())
+        {
+        throw std::out_of_range("BinaryTrajectoryReader: Trajectory index out of range.");
+        }
+      return this->Index[i];
+    }
+
+  /** Check the file header and load the trajectory index. */
+  void load_index(const char* data, std::size_t data_size)
+    {
+      this->Data = data;
+      this->DataSize = data_size;
+      this->Index.clear();
+      this->NextIndex = 0;
+
+      rw::detail::BinaryDecoder decoder(data, data + data_size);
+      if (std::string(decoder.read_bytes(rw::detail::BinaryTrajectoryMagicLength),
+                      rw::detail::BinaryTrajectoryMagicLength)
+          != rw::detail::BinaryTrajectoryFileMagic)
+        {
+        throw std::runtime_error("BinaryTrajectoryReader: Input is not a binary trajectory file.");
+        }
+      const uint32_t version = decoder.read<uint32_t>();
+      if (version > rw::detail::BinaryTrajectoryFormatVersion)
+        {
+        throw std::runtime_error("BinaryTrajectoryReader: File was written by a newer version of the format.");
+        }
+      if (decoder.read<uint32_t>() != rw::detail::BinaryTrajectoryByteOrderMark)
+        {
+        throw std::runtime_error("BinaryTrajectoryReader: File was written on a machine with a different byte order.");
+        }
+      this->Dimension = decoder.read<uint32_t>();
+      string_type domain(decoder.read_string());
+      if (this->Dimension != 0
+          && (this->Dimension != traits::dimension<point_type>::value
+              || domain != traits::point_domain_name<point_type>::apply()))
+        {
+        throw std::runtime_error("BinaryTrajectoryReader: File contains trajectories in domain '"
+                                 + domain + "', not '"
+                                 + traits::point_domain_name<point_type>::apply() + "'.");
+        }
+
+      if (data_size < rw::detail::BinaryTrajectoryTrailerLength)
+        {
+        throw std::runtime_error("BinaryTrajectoryReader: File is truncated.");
+        }
+      decoder.seek(data_size - rw::detail::BinaryTrajectoryTrailerLength);
+      const uint64_t footer_offset = decoder.read<uint64_t>();
+      if (std::string(decoder.read_bytes(rw::detail::BinaryTrajectoryMagicLength),
+                      rw::detail::BinaryTrajectoryMagicLength)
+          != rw::detail::BinaryTrajectoryIndexMagic)
+        {
+        throw std::runtime_error("BinaryTrajectoryReader: File has no trajectory index.  Was the writer closed?");
+        }
+
+      decoder.seek(static_cast<std::size_t>(footer_offset));
+      const uint64_t num_trajectories = decoder.read<uint64_t>();
+      this->Index.resize(static_cast<std::size_t>(num_trajectories));
+      for (std::size_t i = 0; i < this->Index.size(); ++i)
+        {
+        this->Index[i].read(decoder, this->Dimension);
+        }
+    }
+
+  /** Decode the point property columns of one trajectory. */
+  void read_point_property_columns(rw::detail::BinaryDecoder& decoder,
+                                   trajectory_type& trajectory) const
+    {
+      const uint8_t value_tags[] = {
+        rw::detail::BinaryPropertyReal,
+        rw::detail::BinaryPropertyTimestamp,
+        rw::detail::BinaryPropertyString
+      };
+
+      const uint32_t num_columns = decoder.read<uint32_t>();
+      for (uint32_t c = 0; c < num_columns; ++c)
+        {
+        string_type name(decoder.read_string());
+        const uint8_t* tags = reinterpret_cast<const uint8_t*>(decoder.read_bytes(trajectory.size()));
+
+        // Nulls carry no value bytes
+        for (std::size_t i = 0; i < trajectory.size(); ++i)
+          {
+          if (tags[i] & rw::detail::BinaryPropertyNullFlag)
+            {
+            trajectory[i].set_property(name, decoder.read_property_value(tags[i]));
+            }
+          }
+        for (std::size_t t = 0; t < sizeof(value_tags); ++t)
+          {
+          for (std::size_t i = 0; i < trajectory.size(); ++i)
+            {
+            if (tags[i] == value_tags[t])
+              {
+              trajectory[i].set_property(name, decoder.read_property_value(tags[i]));
+              }
+            }
+          }
+        }
+    }
+};
+
+} // close namespace tracktable
+
+#endif
@@ -0,0 +1,417 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#ifndef __tracktable_BinaryTrajectoryWriter_h
+#define __tracktable_BinaryTrajectoryWriter_h
+
+#include <tracktable/Core/TracktableCommon.h>
+#include <tracktable/Core/PointTraits.h>
+#include <tracktable/Core/Timestamp.h>
+
+#include <tracktable/RW/detail/BinaryTrajectoryFormat.h>
+
+#include <algorithm>
+#include <iostream>
+#include <map>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace tracktable {
+
+/** Write trajectories to a binary, column-oriented file
+ *
+ * TrajectoryWriter produces delimited text that has to be parsed
+ * all over again every time it is loaded.  This writer stores each
+ * trajectory as a block of binary columns (timestamps, one column per
+ * coordinate, one column per point property) and finishes the file
+ * with an index of where every trajectory starts along with its
+ * object ID, time span and bounding box.  BinaryTrajectoryReader uses
+ * that index to jump straight to any trajectory.
+ *
+ * The index is written by `close()`.  The destructor calls it for you
+ * if you forget, but a file whose writer never finished cannot be
+ * read.  See rw/detail/BinaryTrajectoryFormat.h for the layout.
+ *
+ * Example:
+ *
+ * @code
+ *
+ * std::ofstream outfile("trajectories.trajbin", std::ios::binary);
+ * tracktable::BinaryTrajectoryWriter writer(outfile);
+ * writer.write(trajectories.begin(), trajectories.end());
+ * writer.close();
+ *
+ * @endcode
+ */
+
+class BinaryTrajectoryWriter
+{
+public:
+  /// Instantiate a writer with no output stream
+  BinaryTrajectoryWriter()
+    : OutputStream(0)
+    , BytesWritten(0)
+    , Dimension(0)
+    , HeaderWritten(false)
+    , Closed(false)
+    { }
+
+  /** Instantiate a writer that sends its output to a stream
+   *
+   * Open file streams in binary mode.
+   *
+   * @param [in] _output Stream to write to
+   */
+  BinaryTrajectoryWriter(std::ostream& _output)
+    : OutputStream(&_output)
+    , BytesWritten(0)
+    , Dimension(0)
+    , HeaderWritten(false)
+    , Closed(false)
+    { }
+
+  /// Destructor.  Finishes the file if close() was not called.
+  virtual ~BinaryTrajectoryWriter()
+    {
+      try
+        {
+        this->close();
+        }
+      catch (std::exception const& e)
+        {
+        TRACKTABLE_LOG(log::error) << "BinaryTrajectoryWriter: Error while finishing file: "
+                                   << e.what();
+        }
+    }
+
+  /** Set the stream where trajectories will be written
+   *
+   * This starts a new file.  The stream should be empty and, if it is
+   * a file, opened in binary mode.
+   *
+   * @param [in] out Stream where trajectories will be written
+   */
+  void set_output(std::ostream& out)
+    {
+      this->OutputStream = &out;
+      this->BytesWritten = 0;
+      this->HeaderWritten = false;
+      this->Closed = false;
+      this->Index.clear();
+    }
+
+  /** Return the stream where trajectories will be written
+   *
+   * @return output stream
+   */
+  std::ostream& output() const
+    {
+      return *(this->OutputStream);
+    }
+
+  /** Return the number of trajectories written so far
+   *
+   * @return Number of trajectories in the file
+   */
+  std::size_t num_trajectories() const
+    {
+      return this->Index.size();
+    }
+
+  /** Write a single trajectory
+   *
+   * All trajectories in one file must come from the same point domain.
+   *
+   * @param [in] trajectory Trajectory to write
+   * @throw std::runtime_error if the file is closed or the domain changes
+   */
+  template<typename trajectory_type>
+  void write(trajectory_type const& trajectory)
+    {
+      typedef typename trajectory_type::point_type point_type;
+      const std::size_t dimension = traits::dimension<point_type>::value;
+
+      if (this->Closed)
+        {
+        throw std::runtime_error("BinaryTrajectoryWriter: Cannot write after close().");
+        }
+      if (!this->HeaderWritten)
+        {
+        this->write_header(traits::point_domain_name<point_type>::apply(), dimension);
+        }
+      else if (this->Domain != traits::point_domain_name<point_type>::apply())
+        {
+        throw std::runtime_error("BinaryTrajectoryWriter: All trajectories in a file must be in the same domain.");
+        }
+
+      rw::detail::BinaryTrajectoryIndexEntry entry;
+      entry.Offset = this->BytesWritten;
+      entry.NumPoints = trajectory.size();
+      entry.ObjectId = trajectory.object_id();
+      entry.MinCorner.assign(dimension, 0);
+      entry.MaxCorner.assign(dimension, 0);
+
+      std::string block;
+      rw::detail::BinaryEncoder encoder(block);
+
+      encoder.write(static_cast<uint64_t>(trajectory.size()));
+      encoder.write_string(entry.ObjectId);
+      encoder.write_bytes(reinterpret_cast<const char*>(&*trajectory.uuid().begin()),
+                          trajectory.uuid().size());
+
+      PropertyMap const& trajectory_properties(trajectory.__properties());
+      encoder.write(static_cast<uint32_t>(trajectory_properties.size()));
+      for (PropertyMap::const_iterator iter = trajectory_properties.begin();
+           iter != trajectory_properties.end();
+           ++iter)
+        {
+        encoder.write_string(iter->first);
+        encoder.write_tagged_property(iter->second);
+        }
+
+      // Object IDs: only written point by point when they differ
+      bool uniform_object_id = true;
+      for (typename trajectory_type::const_iterator point = trajectory.begin();
+           point != trajectory.end();
+           ++point)
+        {
+        if (point->object_id() != entry.ObjectId)
+          {
+          uniform_object_id = false;
+          break;
+          }
+        }
+      encoder.write(static_cast<uint8_t>(uniform_object_id ? 0 : 1));
+      if (!uniform_object_id)
+        {
+        for (typename trajectory_type::const_iterator point = trajectory.begin();
+             point != trajectory.end();
+             ++point)
+          {
+          encoder.write_string(point->object_id());
+          }
+        }
+
+      // Timestamps
+      for (typename trajectory_type::const_iterator point = trajectory.begin();
+           point != trajectory.end();
+           ++point)
+        {
+        encoder.write_timestamp(point->timestamp());
+        }
+      if (!trajectory.empty())
+        {
+        entry.StartTime = timestamp_to_epoch_microseconds(trajectory.front().timestamp());
+        entry.EndTime = timestamp_to_epoch_microseconds(trajectory.back().timestamp());
+        }
+
+      // Coordinates, one column per dimension
+      for (std::size_t d = 0; d < dimension; ++d)
+        {
+        for (std::size_t i = 0; i < trajectory.size(); ++i)
+          {
+          double coordinate = trajectory[i][d];
+          encoder.write(coordinate);
+          if (i == 0 || coordinate < entry.MinCorner[d])
+            {
+            entry.MinCorner[d] = coordinate;
+            }
+          if (i == 0 || coordinate > entry.MaxCorner[d])
+            {
+            entry.MaxCorner[d] = coordinate;
+            }
+          }
+        }
+
+      this->write_point_property_columns(trajectory, encoder);
+
+      this->write_bytes(block);
+      this->Index.push_back(entry);
+    }
+
+  /** Write many trajectories
+   *
+   * @param [in] traj_begin Start of trajectories to write out
+   * @param [in] traj_end End of trajectories to write out
+   */
+  template<typename source_iter_type>
+  void write(source_iter_type traj_begin, source_iter_type traj_end)
+    {
+      for ( ; traj_begin != traj_end; ++traj_begin)
+        {
+        this->write(*traj_begin);
+        }
+    }
+
+  /** Write the trajectory index and finish the file
+   *
+   * Nothing more can be written until `set_output()` is called again.
+   * Calling this more than once does nothing.
+   */
+  void close()
+    {
+      if (this->Closed || this->OutputStream == 0)
+        {
+        return;
+        }
+      if (!this->HeaderWritten)
+        {
+        this->write_header("unknown", 0);
+        }
+
+      std::string footer;
+      rw::detail::BinaryEncoder encoder(footer);
+      uint64_t footer_offset = this->BytesWritten;
+
+      encoder.write(static_cast<uint64_t>(this->Index.size()));
+      for (std::size_t i = 0; i < this->Index.size(); ++i)
+        {
+        this->Index[i].write(encoder);
+        }
+      encoder.write(footer_offset);
+      encoder.write_bytes(rw::detail::BinaryTrajectoryIndexMagic,
+                          rw::detail::BinaryTrajectoryMagicLength);
+
+      this->write_bytes(footer);
+      this->OutputStream->flush();
+      this->Closed = true;
+    }
+
+private:
+  std::ostream* OutputStream;
+  uint64_t      BytesWritten;
+  string_type   Domain;
+  std::size_t   Dimension;
+  bool          HeaderWritten;
+  bool          Closed;
+  std::vector<rw::detail::BinaryTrajectoryIndexEntry> Index;
+
+  void write_bytes(std::string const& bytes)
+    {
+      if (this->OutputStream == 0)
+        {
+        throw std::runtime_error("BinaryTrajectoryWriter: No output stream.");
+        }
+      this->OutputStream->write(bytes.data(), static_cast<std::streamsize>(bytes.size()));
+      if (!(*this->OutputStream))
+        {
+        throw std::runtime_error("BinaryTrajectoryWriter: Error writing to output stream.");
+        }
+      this->BytesWritten += bytes.size();
+    }
+
+  void write_header(string_type const& domain, std::size_t dimension)
+    {
+      std::string header;
+      rw::detail::BinaryEncoder encoder(header);
+      encoder.write_bytes(rw::detail::BinaryTrajectoryFileMagic,
+                          rw::detail::BinaryTrajectoryMagicLength);
+      encoder.write(rw::detail::BinaryTrajectoryFormatVersion);
+      encoder.write(rw::detail::BinaryTrajectoryByteOrderMark);
+      encoder.write(static_cast<uint32_t>(dimension));
+      encoder.write_string(domain);
+      this->write_bytes(header);
+
+      this->Domain = domain;
+      this->Dimension = dimension;
+      this->HeaderWritten = true;
+    }
+
+  /** Write one column per point property name.
+   *
+   * Each column starts with a tag per point saying whether the point
+   * has that property and what type it is, followed by the values
+   * grouped by type.  Points that lack the property cost one byte.
+   */
+  template<typename trajectory_type>
+  void write_point_property_columns(trajectory_type const& trajectory,
+                                    rw::detail::BinaryEncoder& encoder)
+    {
+      std::vector<string_type> column_names;
+      for (typename trajectory_type::const_iterator point = trajectory.begin();
+           point != trajectory.end();
+           ++point)
+        {
+        PropertyMap const& properties(point->__properties());
+        for (PropertyMap::const_iterator iter = properties.begin();
+             iter != properties.end();
+             ++iter)
+          {
+          column_names.push_back(iter->first);
+          }
+        }
+      std::sort(column_names.begin(), column_names.end());
+      column_names.erase(std::unique(column_names.begin(), column_names.end()),
+                         column_names.end());
+
+      encoder.write(static_cast<uint32_t>(column_names.size()));
+
+      std::vector<uint8_t> tags(trajectory.size());
+      const uint8_t value_tags[] = {
+        rw::detail::BinaryPropertyReal,
+        rw::detail::BinaryPropertyTimestamp,
+        rw::detail::BinaryPropertyString
+      };
+
+      for (std::size_t c = 0; c < column_names.size(); ++c)
+        {
+        encoder.write_string(column_names[c]);
+        for (std::size_t i = 0; i < trajectory.size(); ++i)
+          {
+          PropertyMap const& properties(trajectory[i].__properties());
+          PropertyMap::const_iterator iter = properties.find(column_names[c]);
+          tags[i] = (iter == properties.end()
+                     ? rw::detail::BinaryPropertyAbsent
+                     : rw::detail::BinaryEncoder::property_tag(iter->second));
+          }
+        if (!tags.empty())
+          {
+          encoder.write_bytes(reinterpret_cast<const char*>(&tags[0]), tags.size());
+          }
+
+        for (std::size_t t = 0; t < sizeof(value_tags); ++t)
+          {
+          for (std::size_t i = 0; i < trajectory.size(); ++i)
+            {
+            if (tags[i] == value_tags[t])
+              {
+              encoder.write_property_value(tags[i],
+                                           trajectory[i].__properties().find(column_names[c])->second);
+              }
+            }
+          }
+        }
+    }
+};
+
+} // close namespace tracktable
+
+#endif
@@ -0,0 +1,432 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#ifndef __tracktable_ChunkedPointReader_h
+#define __tracktable_ChunkedPointReader_h
+
+#include <tracktable/Core/TracktableCommon.h>
+#include <tracktable/Core/ParallelFor.h>
+
+#include <tracktable/RW/GenericReader.h>
+#include <tracktable/RW/PointFromTokensReader.h>
+#include <tracktable/RW/SkipCommentsReader.h>
+#include <tracktable/RW/StringTokenizingReader.h>
+#include <tracktable/RW/detail/HeaderStrings.h>
+
+#include <boost/shared_ptr.hpp>
+
+#include <algorithm>
+#include <deque>
+#include <istream>
+#include <string>
+#include <vector>
+
+namespace tracktable {
+
+/** Read points from a stream by parsing large chunks on several threads.
+ *
+ * This reader produces the same points as the PointReader pipeline
+ * (LineReader -> SkipCommentsReader -> StringTokenizingReader ->
+ * PointFromTokensReader) but works on a block of input at a time.
+ * Each block is read from the stream, cut at its last newline and
+ * split into lines.  The lines are divided into slices and every
+ * slice goes through its own copy of the comment-skipping,
+ * tokenizing and point-parsing pipeline on a worker thread.  Points
+ * come out in the same order as they appear in the input.
+ *
+ * Point headers (lines that start with `*P*`) change the parser
+ * configuration for all of the lines after them.  We parse them on
+ * the calling thread in between slices so that later lines see the
+ * new configuration.
+ *
+ * You will not usually instantiate this class directly.  Call
+ * `PointReader::set_num_parser_threads()` instead.
+ */
+
+template<typename PointT>
+class ChunkedPointReader : public GenericReader<PointT>
+{
+public:
+  typedef PointT                                  point_type;
+  typedef boost::shared_ptr<point_type>           point_shared_ptr_type;
+  typedef std::vector<std::string>                line_vector_type;
+  typedef line_vector_type::const_iterator        line_iterator_type;
+  typedef SkipCommentsReader<line_iterator_type>  skip_comments_reader_type;
+  typedef StringTokenizingReader<typename skip_comments_reader_type::iterator> string_tokenizer_type;
+  typedef PointFromTokensReader<point_type, typename string_tokenizer_type::iterator> point_reader_type;
+
+  /// Instantiate a reader with no input
+  ChunkedPointReader()
+    : Stream(nullptr)
+    , NumThreads(0)
+    , ChunkSize(16 * 1024 * 1024)
+    , CommentCharacter("#")
+    , FieldDelimiter(",")
+    , EscapeCharacter("\\")
+    , QuoteCharacter("\"")
+    , InputFinished(true)
+    , NumPoints(0)
+    , NumParseErrors(0)
+    {
+    }
+
+  /** Copy contructor, create a reader with a copy of another
+   *
+   * Only the configuration is copied.  The new reader has no input.
+   *
+   * @param [in] other ChunkedPointReader to copy from
+   */
+  ChunkedPointReader(ChunkedPointReader const& other)
+    : Stream(nullptr)
+    , NumThreads(other.NumThreads)
+    , ChunkSize(other.ChunkSize)
+    , CommentCharacter(other.CommentCharacter)
+    , FieldDelimiter(other.FieldDelimiter)
+    , EscapeCharacter(other.EscapeCharacter)
+    , QuoteCharacter(other.QuoteCharacter)
+    , Parser(other.Parser)
+    , InputFinished(true)
+    , NumPoints(0)
+    , NumParseErrors(0)
+    {
+    }
+
+  /// Destructor
+  virtual ~ChunkedPointReader()
+    {
+    }
+
+  /** Supply the input stream.
+   *
+   * This discards any partially-read input from a previous stream.
+   *
+   * @param [in] input Stream from which we will read points
+   */
+  void set_input(std::istream& input)
+    {
+      this->Stream = &input;
+      this->Remainder.clear();
+      this->ReadyPoints.clear();
+      this->InputFinished = false;
+      this->NumPoints = 0;
+      this->NumParseErrors = 0;
+    }
+
+  /** Set the number of threads used for parsing.
+   *
+   * @param [in] num_threads Number of threads.  Zero or a negative number means one per CPU.
+   */
+  void set_num_threads(int num_threads)
+    {
+      this->NumThreads = num_threads;
+    }
+
+  /** Get the number of threads used for parsing.
+   *
+   * @return Number of threads.  Zero means one per CPU.
+   */
+  int num_threads() const
+    {
+      return this->NumThreads;
+    }
+
+  /** Set the number of bytes to read from the stream at once.
+   *
+   * Larger chunks give the worker threads more to do between reads
+   * at the cost of more memory.
+   *
+   * @param [in] chunk_size Size of each block in bytes
+   */
+  void set_chunk_size(std::size_t chunk_size)
+    {
+      this->ChunkSize = (chunk_size > 0 ? chunk_size : 1);
+    }
+
+  /** Get the number of bytes read from the stream at once.
+   *
+   * @return Size of each block in bytes
+   */
+  std::size_t chunk_size() const
+    {
+      return this->ChunkSize;
+    }
+
+  /** Copy comment, tokenizer and point parsing settings from a PointReader pipeline.
+   *
+   * @param [in] comment_character  Comment character for skipping lines
+   * @param [in] tokenizer          Tokenizer whose delimiter, escape and quote characters we copy
+   * @param [in] point_parser       Point parser whose column assignments we copy
+   */
+  template<typename tokenizer_type, typename point_parser_type>
+  void configure(std::string const& comment_character,
+                 tokenizer_type const& tokenizer,
+                 point_parser_type const& point_parser)
+    {
+      this->CommentCharacter = comment_character;
+      this->FieldDelimiter = tokenizer.field_delimiter();
+      this->EscapeCharacter = tokenizer.escape_character();
+      this->QuoteCharacter = tokenizer.quote_character();
+      this->Parser.copy_configuration_from(point_parser);
+    }
+
+protected:
+  point_shared_ptr_type next_item()
+    {
+      while (this->ReadyPoints.empty())
+        {
+        if (!this->parse_next_chunk())
+          {
+          if (this->Parser.point_count_log_enabled())
+            {
+            TRACKTABLE_LOG(log::info) << "Done reading points. "
+                                      << "Generated " << this->NumPoints << " points correctly and "
+                                      << "discarded " << this->NumParseErrors << " due to parse errors.\n";
+            }
+          return point_shared_ptr_type();
+          }
+        }
+
+      point_shared_ptr_type next_point(this->ReadyPoints.front());
+      this->ReadyPoints.pop_front();
+      return next_point;
+    }
+
+private:
+  std::istream*         Stream;
+  int                   NumThreads;
+  std::size_t           ChunkSize;
+  std::string           CommentCharacter;
+  std::string           FieldDelimiter;
+  std::string           EscapeCharacter;
+  std::string           QuoteCharacter;
+  point_reader_type     Parser;
+
+  std::string           Remainder;
+  std::deque<point_shared_ptr_type> ReadyPoints;
+  bool                  InputFinished;
+  int                   NumPoints;
+  int                   NumParseErrors;
+
+  /** Read one block of input and parse all of the complete lines in it.
+   *
+   * @return False if there was no input left to read
+   */
+  bool parse_next_chunk()
+    {
+      if (this->InputFinished || this->Stream == nullptr)
+        {
+        return false;
+        }
+
+      std::string buffer;
+      buffer.swap(this->Remainder);
+      std::size_t previous_size = buffer.size();
+      buffer.resize(previous_size + this->ChunkSize);
+      this->Stream->read(&buffer[previous_size], static_cast<std::streamsize>(this->ChunkSize));
+      buffer.resize(previous_size + static_cast<std::size_t>(this->Stream->gcount()));
+
+      if (!(*this->Stream))
+        {
+        this->InputFinished = true;
+        }
+      else
+        {
+        // Keep the partial line at the end for the next block.
+        std::size_t last_newline = buffer.rfind('\n');
+        if (last_newline == std::string::npos)
+          {
+          this->Remainder.swap(buffer);
+          return true;
+          }
+        this->Remainder.assign(buffer, last_newline + 1, std::string::npos);
+        buffer.resize(last_newline + 1);
+        }
+
+      line_vector_type lines;
+      this->split_lines(buffer, lines);
+      this->parse_lines(lines);
+      return true;
+    }
+
+  // ----------------------------------------------------------------------
+
+  /// Split a buffer into lines the same way std::getline() would
+  static void split_lines(std::string const& buffer, line_vector_type& lines)
+    {
+      std::size_t line_start = 0;
+      while (line_start < buffer.size())
+        {
+        std::size_t line_end = buffer.find('\n', line_start);
+        if (line_end == std::string::npos)
+          {
+          lines.push_back(buffer.substr(line_start));
+          break;
+          }
+        lines.push_back(buffer.substr(line_start, line_end - line_start));
+        line_start = line_end + 1;
+        }
+    }
+
+  // ----------------------------------------------------------------------
+
+  /** Parse a block of lines, honoring any point headers among them.
+   *
+   * @param [in] lines All of the complete lines in one block of input
+   */
+  void parse_lines(line_vector_type const& lines)
+    {
+      std::size_t segment_start = 0;
+      if (!this->Parser.ignore_header())
+        {
+        for (std::size_t i = 0; i < lines.size(); ++i)
+          {
+          if (this->might_be_header(lines[i]))
+            {
+            this->parse_segment_in_parallel(lines, segment_start, i);
+
+            // Parse the header by itself and keep the configuration
+            // that results.
+            point_reader_type header_parser(this->Parser);
+            std::vector<point_shared_ptr_type> points;
+            this->parse_slice(lines, i, i+1, header_parser, points);
+            this->NumPoints += static_cast<int>(points.size());
+            this->NumParseErrors += header_parser.NumParseErrors;
+            this->ReadyPoints.insert(this->ReadyPoints.end(), points.begin(), points.end());
+            this->Parser.copy_configuration_from(header_parser);
+
+            segment_start = i + 1;
+            }
+          }
+        }
+      this->parse_segment_in_parallel(lines, segment_start, lines.size());
+    }
+
+  // ----------------------------------------------------------------------
+
+  bool might_be_header(std::string const& line) const
+    {
+      std::size_t first = line.find_first_not_of(" \t");
+      return (first != std::string::npos
+              && line.compare(first, rw::detail::PointFileMagicString.size(),
+                              rw::detail::PointFileMagicString) == 0);
+    }
+
+  // ----------------------------------------------------------------------
+
+  /** Parse lines [begin, end) on the worker threads.
+   *
+   * The range is divided into a few slices per thread so that the
+   * threads stay busy even if some slices parse more slowly.
+   * Results are appended to ReadyPoints in input order.
+   */
+  void parse_segment_in_parallel(line_vector_type const& lines,
+                                 std::size_t begin,
+                                 std::size_t end)
+    {
+      if (begin >= end)
+        {
+        return;
+        }
+
+      const std::size_t num_lines = end - begin;
+      const std::size_t slices_per_thread = 4;
+      const std::size_t min_lines_per_slice = 256;
+      std::size_t num_slices = resolve_thread_count(this->NumThreads) * slices_per_thread;
+      num_slices = std::max<std::size_t>(1, std::min(num_slices, num_lines / min_lines_per_slice));
+
+      std::vector<std::vector<point_shared_ptr_type> > slice_points(num_slices);
+      std::vector<int> slice_parse_errors(num_slices, 0);
+      parallel_for(
+        num_slices,
+        [&](std::size_t slice)
+        {
+          point_reader_type slice_parser(this->Parser);
+          this->parse_slice(lines,
+                            begin + (num_lines * slice) / num_slices,
+                            begin + (num_lines * (slice + 1)) / num_slices,
+                            slice_parser,
+                            slice_points[slice]);
+          slice_parse_errors[slice] = slice_parser.NumParseErrors;
+        },
+        this->NumThreads,
+        1
+        );
+
+      for (std::size_t slice = 0; slice < num_slices; ++slice)
+        {
+        this->NumPoints += static_cast<int>(slice_points[slice].size());
+        this->NumParseErrors += slice_parse_errors[slice];
+        this->ReadyPoints.insert(this->ReadyPoints.end(),
+                                 slice_points[slice].begin(),
+                                 slice_points[slice].end());
+        }
+    }
+
+  // ----------------------------------------------------------------------
+
+  /** Run lines [begin, end) through the point reader pipeline.
+   *
+   * @param [in]  lines   Lines from the current block
+   * @param [in]  begin   First line to parse
+   * @param [in]  end     One past the last line to parse
+   * @param [in]  parser  Point parser to use.  It is not shared with any other thread.
+   * @param [out] points  Points parsed from the lines
+   */
+  void parse_slice(line_vector_type const& lines,
+                   std::size_t begin,
+                   std::size_t end,
+                   point_reader_type& parser,
+                   std::vector<point_shared_ptr_type>& points)
+    {
+      skip_comments_reader_type skip_comments(lines.begin() + begin,
+                                              lines.begin() + end,
+                                              this->CommentCharacter);
+      string_tokenizer_type tokenizer(skip_comments.begin(),
+                                      skip_comments.end(),
+                                      this->FieldDelimiter);
+      tokenizer.set_escape_character(this->EscapeCharacter);
+      tokenizer.set_quote_character(this->QuoteCharacter);
+
+      parser.set_input_range(tokenizer.begin(), tokenizer.end());
+      parser.NumPoints = 0;
+      parser.NumParseErrors = 0;
+      parser.set_point_count_log_enabled(false);
+
+      points.reserve(end - begin);
+      for (point_shared_ptr_type point = parser.next_item(); point; point = parser.next_item())
+        {
+        points.push_back(point);
+        }
+    }
+};
+
+} // close namespace tracktable
+
+#endif
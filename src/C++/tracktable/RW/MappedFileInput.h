@@ -0,0 +1,220 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#ifndef __tracktable_rw_MappedFileInput_h
+#define __tracktable_rw_MappedFileInput_h
+
+#include <tracktable/Core/TracktableCommon.h>
+
+#include <tracktable/Core/WarningGuards/PushWarningState.h>
+#include <tracktable/Core/WarningGuards/CommonBoostWarnings.h>
+#include <boost/interprocess/file_mapping.hpp>
+#include <boost/interprocess/mapped_region.hpp>
+#include <boost/iostreams/device/array.hpp>
+#include <boost/iostreams/stream.hpp>
+#include <tracktable/Core/WarningGuards/PopWarningState.h>
+
+#include <fstream>
+#include <iostream>
+#include <memory>
+#include <stdexcept>
+#include <string>
+
+namespace tracktable {
+
+/** Read a file through a memory mapping.
+ *
+ * This class maps an entire file into memory read-only and presents
+ * it as a `std::istream` so that it can be handed to any of the
+ * readers (PointReader, TrajectoryReader) in place of an
+ * `std::ifstream`.  The operating system pages the file in as the
+ * reader touches it and can serve repeated reads of the same file
+ * straight out of the page cache.  No extra copy of the data is made
+ * until the line reader pulls out individual lines.
+ *
+ * The mapping and the stream live as long as this object.  Don't
+ * destroy it while a reader is still using `stream()`.
+ *
+ * Example:
+ *
+ * @code
+ *
+ * tracktable::MappedFileInput infile("points.csv");
+ * tracktable::PointReader<point_type> reader(infile.stream());
+ *
+ * @endcode
+ */
+
+class MappedFileInput
+{
+public:
+  /// Create an input with no file.  Call open() before using it.
+  MappedFileInput()
+    : Size(0)
+    { }
+
+  /** Map a file into memory.
+   *
+   * @param [in] filename Path to the file to read
+   * @throw std::runtime_error if the file cannot be opened
+   */
+  explicit MappedFileInput(std::string const& filename)
+    : Size(0)
+    {
+      this->open(filename);
+    }
+
+  /// Destructor
+  virtual ~MappedFileInput()
+    {
+    }
+
+  /** Map a file into memory.
+   *
+   * Any file that was already open is released first.
+   *
+   * @param [in] filename Path to the file to read
+   * @throw std::runtime_error if the file cannot be opened
+   */
+  void open(std::string const& filename)
+    {
+      this->close();
+
+      // boost::interprocess refuses to map an empty file, so find out
+      // how big it is before we try.
+      std::ifstream probe(filename.c_str(), std::ios::in | std::ios::binary | std::ios::ate);
+      if (!probe)
+        {
+        throw std::runtime_error("Could not open file '" + filename + "' for reading.");
+        }
+      std::streamoff file_size = probe.tellg();
+      probe.close();
+
+      if (file_size > 0)
+        {
+        try
+          {
+          this->Mapping = boost::interprocess::file_mapping(filename.c_str(),
+                                                            boost::interprocess::read_only);
+          this->Region = boost::interprocess::mapped_region(this->Mapping,
+                                                            boost::interprocess::read_only);
+          }
+        catch (boost::interprocess::interprocess_exception const& e)
+          {
+          throw std::runtime_error("Could not memory-map file '" + filename + "': " + e.what());
+          }
+        this->Region.advise(boost::interprocess::mapped_region::advice_sequential);
+        this->Size = this->Region.get_size();
+        }
+
+      this->Filename = filename;
+      this->Stream.reset(new array_stream_type(this->data(), this->Size));
+    }
+
+  /// Release the mapping and the stream.
+  void close()
+    {
+      this->Stream.reset();
+      this->Region = boost::interprocess::mapped_region();
+      this->Mapping = boost::interprocess::file_mapping();
+      this->Filename.clear();
+      this->Size = 0;
+    }
+
+  /** Check whether a file is open.
+   *
+   * @return True if open() has succeeded and close() has not been called
+   */
+  bool is_open() const
+    {
+      return bool(this->Stream);
+    }
+
+  /** Get the name of the file that is mapped.
+   *
+   * @return Path passed to open()
+   */
+  std::string const& filename() const
+    {
+      return this->Filename;
+    }
+
+  /** Get the size of the mapped file.
+   *
+   * @return Size in bytes
+   */
+  std::size_t size() const
+    {
+      return this->Size;
+    }
+
+  /** Get a pointer to the start of the mapped file.
+   *
+   * @return Pointer to the file contents.  The contents are not null-terminated.
+   */
+  const char* data() const
+    {
+      if (this->Size == 0)
+        {
+        return "";
+        }
+      return static_cast<const char*>(this->Region.get_address());
+    }
+
+  /** Get a stream over the mapped file.
+   *
+   * @return Input stream positioned wherever the last reader left it
+   * @throw std::runtime_error if no file is open
+   */
+  std::istream& stream()
+    {
+      if (!this->Stream)
+        {
+        throw std::runtime_error("MappedFileInput: No file is open.");
+        }
+      return *(this->Stream);
+    }
+
+private:
+  typedef boost::iostreams::stream<boost::iostreams::array_source> array_stream_type;
+
+  std::string Filename;
+  std::size_t Size;
+  boost::interprocess::file_mapping Mapping;
+  boost::interprocess::mapped_region Region;
+  std::unique_ptr<array_stream_type> Stream;
+
+  MappedFileInput(MappedFileInput const&) = delete;
+  MappedFileInput& operator=(MappedFileInput const&) = delete;
+};
+
+} // namespace tracktable
+
+#endif
@@ -104,8 +104,9 @@ public:
     , ObjectIdColumn(other.ObjectIdColumn)
     , TimestampColumn(other.TimestampColumn)
     , IgnoreHeader(other.IgnoreHeader)
-    , WarningsEnabled(true)
-    , PointCountLogEnabled(other.PointLogEnabled)
+    , WarningsEnabled(other.WarningsEnabled)
+    , PointCountLogEnabled(other.PointCountLogEnabled)
+    , PropertyReadWrite(other.PropertyReadWrite)
     , NumPoints(other.NumPoints)
     , NumParseErrors(other.NumParseErrors)
     { }
@@ -156,6 +157,28 @@ public:
       return *this;
     }
 
+  /** Copy the parsing configuration from a reader with a different source.
+   *
+   * This copies the column assignments, header handling, timestamp
+   * format and null value but leaves the input range and the point
+   * counts alone.  ChunkedPointReader uses this to hand the settings
+   * from a PointReader to the readers that parse each chunk.
+   *
+   * @param [in] other Reader to copy configuration from
+   */
+  template<typename OtherSourceIterT>
+  void copy_configuration_from(PointFromTokensReader<PointT, OtherSourceIterT> const& other)
+    {
+      this->CoordinateMap   = other.CoordinateMap;
+      this->FieldMap        = other.FieldMap;
+      this->ObjectIdColumn  = other.ObjectIdColumn;
+      this->TimestampColumn = other.TimestampColumn;
+      this->IgnoreHeader    = other.IgnoreHeader;
+      this->WarningsEnabled = other.WarningsEnabled;
+      this->PointCountLogEnabled = other.PointCountLogEnabled;
+      this->PropertyReadWrite = other.PropertyReadWrite;
+    }
+
   /** Check whether one reader is equal to another by comparing all the properties.
    *
    * Two readers are equal if all of their properties are equal.
@@ -646,6 +669,9 @@ public:
   }
 
 protected:
+  template<typename, typename> friend class PointFromTokensReader;
+  template<typename> friend class ChunkedPointReader;
+
   typedef rw::detail::PropertyAssignmentMap PropertyAssignmentMap;
   typedef std::vector<settings::string_type> string_vector_type;
 
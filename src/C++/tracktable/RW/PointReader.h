@@ -34,6 +34,7 @@
 #include <tracktable/Core/TracktableCommon.h>
 #include <tracktable/Core/PointBase.h>
 
+#include <tracktable/RW/ChunkedPointReader.h>
 #include <tracktable/RW/LineReader.h>
 #include <tracktable/RW/SkipCommentsReader.h>
 #include <tracktable/RW/StringTokenizingReader.h>
@@ -75,6 +76,12 @@ namespace tracktable {
  * Take a look at the test case for this class (in
  * C++/RW/Tests/test_integrated_trajectory_point_reader.cpp) for an
  * example of how to use it.
+ *
+ * By default the whole pipeline runs one line at a time on the
+ * calling thread.  Call `set_num_parser_threads()` with anything
+ * other than 1 to read the input in large blocks and parse each block
+ * on several threads instead (see ChunkedPointReader).  The points
+ * come out in the same order either way.
  */
 
 template<typename PointT>
@@ -86,6 +93,7 @@ private:
   typedef tracktable::SkipCommentsReader<line_reader_type::iterator> skip_comments_reader_type;
   typedef tracktable::StringTokenizingReader<skip_comments_reader_type::iterator> string_tokenizer_type;
   typedef tracktable::PointFromTokensReader<point_type, string_tokenizer_type::iterator> point_reader_type;
+  typedef tracktable::ChunkedPointReader<point_type> chunked_reader_type;
 
 public:
   typedef typename point_reader_type::iterator iterator;
@@ -95,6 +103,8 @@ public:
    * @copydoc PointReader::set_default_configuration()
    */
   PointReader()
+    : NumParserThreads(1),
+      PipelineConnected(false)
     {
       this->set_default_configuration();
     }
@@ -106,6 +116,8 @@ public:
    * @param [in] infile File to read points from
    */
   PointReader(std::istream& infile)
+    : NumParserThreads(1),
+      PipelineConnected(false)
     {
       this->set_input(infile);
       this->set_default_configuration();
@@ -119,7 +131,10 @@ public:
     : LineReader(other.LineReader),
       SkipCommentsReader(other.SkipCommentsReader),
       StringTokenizer(other.StringTokenizer),
-      PointTokenReader(other.PointTokenReader)
+      PointTokenReader(other.PointTokenReader),
+      ChunkedReader(other.ChunkedReader),
+      NumParserThreads(other.NumParserThreads),
+      PipelineConnected(other.PipelineConnected)
     {
     }
 
@@ -191,12 +206,7 @@ public:
   void set_input(std::istream& _input)
     {
       this->LineReader.set_input(_input);
-      this->SkipCommentsReader.set_input_range(this->LineReader.begin(),
-                                               this->LineReader.end());
-      this->StringTokenizer.set_input_range(this->SkipCommentsReader.begin(),
-                                            this->SkipCommentsReader.end());
-      this->PointTokenReader.set_input_range(this->StringTokenizer.begin(),
-                                             this->StringTokenizer.end());
+      this->PipelineConnected = false;
     }
 
   /** Retrieve the current input stream.
@@ -599,7 +609,24 @@ public:
    */
   iterator begin()
     {
-      return this->PointTokenReader.begin();
+      if (this->NumParserThreads == 1)
+        {
+        if (!this->PipelineConnected)
+          {
+          this->connect_pipeline();
+          this->PipelineConnected = true;
+          }
+        return this->PointTokenReader.begin();
+        }
+      else
+        {
+        this->ChunkedReader.set_input(this->input());
+        this->ChunkedReader.set_num_threads(this->NumParserThreads);
+        this->ChunkedReader.configure(this->SkipCommentsReader.comment_character(),
+                                      this->StringTokenizer,
+                                      this->PointTokenReader);
+        return this->ChunkedReader.begin();
+        }
     }
 
   /** Return an iterator to detect when parsing has ended.
@@ -615,6 +642,52 @@ public:
       return this->PointTokenReader.end();
     }
 
+  /** Set the number of threads used to parse the input.
+   *
+   * With 1 thread (the default) lines are read and parsed one at a
+   * time.  Any other value switches to chunked parsing: the input is
+   * read in blocks of `parser_chunk_size()` bytes and the lines in
+   * each block are parsed on this many threads.  Zero or a negative
+   * number means one thread per CPU.
+   *
+   * This function invalidates any outstanding iterators.
+   *
+   * @param [in] num_threads Number of parser threads
+   */
+  void set_num_parser_threads(int num_threads)
+    {
+      this->NumParserThreads = num_threads;
+    }
+
+  /** Get the number of threads used to parse the input.
+   *
+   * @return Number of parser threads
+   */
+  int num_parser_threads() const
+    {
+      return this->NumParserThreads;
+    }
+
+  /** Set the size of the blocks read by the chunked parser.
+   *
+   * This only matters when more than one parser thread is in use.
+   *
+   * @param [in] chunk_size Block size in bytes
+   */
+  void set_parser_chunk_size(std::size_t chunk_size)
+    {
+      this->ChunkedReader.set_chunk_size(chunk_size);
+    }
+
+  /** Get the size of the blocks read by the chunked parser.
+   *
+   * @return Block size in bytes
+   */
+  std::size_t parser_chunk_size() const
+    {
+      return this->ChunkedReader.chunk_size();
+    }
+
   /** Set the format of the timestamp
    *
    * @param [in] format String containing the format of the time stamp
@@ -676,10 +749,31 @@ public:
 
 
 private:
+  /** Hook the stages of the serial pipeline up to the input stream.
+   *
+   * The line reader starts consuming the stream as soon as we ask
+   * it for an iterator.  We wait until begin() to do that so that
+   * the chunked reader can still see the whole stream.  This must
+   * happen only once per input stream: connecting again would ask
+   * for another line and drop the one already read.
+   */
+  void connect_pipeline()
+    {
+      this->SkipCommentsReader.set_input_range(this->LineReader.begin(),
+                                               this->LineReader.end());
+      this->StringTokenizer.set_input_range(this->SkipCommentsReader.begin(),
+                                            this->SkipCommentsReader.end());
+      this->PointTokenReader.set_input_range(this->StringTokenizer.begin(),
+                                             this->StringTokenizer.end());
+    }
+
   line_reader_type LineReader;
   skip_comments_reader_type SkipCommentsReader;
   string_tokenizer_type StringTokenizer;
   point_reader_type PointTokenReader;
+  chunked_reader_type ChunkedReader;
+  int NumParserThreads;
+  bool PipelineConnected;
 };
 
 } // close namespace tracktable
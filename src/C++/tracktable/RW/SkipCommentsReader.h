@@ -376,13 +376,12 @@ protected:
     */
     void _advance_to_valid_string()
       {
-        value_type next_string = this->operator*();
-        while (this->_string_is_comment(next_string) &&
-               this->InnerIterator != this->InnerEnd)
+        // Check for the end before dereferencing: not every inner
+        // iterator can be dereferenced once it reaches the end.
+        while (this->InnerIterator != this->InnerEnd &&
+               this->_string_is_comment(*(this->InnerIterator)))
           {
-
           ++(this->InnerIterator);
-          next_string = this->operator*();
           }
       }
 
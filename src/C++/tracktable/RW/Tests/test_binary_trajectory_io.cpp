@@ -0,0 +1,301 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include <tracktable/RW/BinaryTrajectoryReader.h>
+#include <tracktable/RW/BinaryTrajectoryWriter.h>
+
+#include <tracktable/Core/PointCartesian.h>
+#include <tracktable/Core/PointLonLat.h>
+#include <tracktable/Core/Trajectory.h>
+#include <tracktable/Core/TrajectoryPoint.h>
+
+#include <iostream>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+typedef tracktable::TrajectoryPoint<tracktable::PointLonLat> point_type;
+typedef tracktable::Trajectory<point_type> trajectory_type;
+typedef std::vector<trajectory_type> trajectory_vector_type;
+typedef tracktable::BinaryTrajectoryReader<trajectory_type> reader_type;
+
+// ----------------------------------------------------------------------
+
+trajectory_vector_type make_trajectories()
+{
+  trajectory_vector_type trajectories;
+  tracktable::Timestamp start(tracktable::time_from_string("2020-05-01 08:00:00"));
+
+  for (int t = 0; t < 20; ++t)
+    {
+    trajectory_type trajectory;
+    std::ostringstream namebuf;
+    namebuf << "object_" << t;
+
+    for (int i = 0; i < 10 + t; ++i)
+      {
+      point_type point;
+      point.set_object_id(namebuf.str());
+      point.set_timestamp(start + tracktable::hours(t) + tracktable::minutes(i));
+      point.set_longitude(-100 + t + 0.1 * i);
+      point.set_latitude(30 + 0.05 * i);
+      point.set_property("speed", 100.0 + i);
+      if (i % 3 == 0)
+        {
+        // Sparse and mixed-type properties must round-trip too
+        point.set_property("note", std::string("every third point"));
+        point.set_property("seen", start + tracktable::seconds(i));
+        }
+      if (i == 1)
+        {
+        point.set_property("speed", tracktable::make_null(tracktable::TYPE_REAL));
+        }
+      trajectory.push_back(point);
+      }
+    trajectory.set_property("source", std::string("test"));
+    trajectory.set_property("index", static_cast<double>(t));
+    trajectories.push_back(trajectory);
+    }
+
+  // One trajectory whose points carry differing object IDs
+  trajectories[5][3].set_object_id("someone_else");
+  return trajectories;
+}
+
+// ----------------------------------------------------------------------
+
+int compare_trajectories(trajectory_type const& expected,
+                         trajectory_type const& actual,
+                         std::size_t index)
+{
+  if (expected != actual || expected.uuid() != actual.uuid())
+    {
+    std::cout << "ERROR: Trajectory " << index << " did not survive the round trip.\n";
+    return 1;
+    }
+  for (std::size_t i = 0; i < expected.size(); ++i)
+    {
+    if (expected[i].object_id() != actual[i].object_id()
+        || expected[i].current_length() != actual[i].current_length())
+      {
+      std::cout << "ERROR: Trajectory " << index << ", point " << i
+                << ": object ID or current length differs.\n";
+      return 1;
+      }
+    }
+  return 0;
+}
+
+// ----------------------------------------------------------------------
+
+int test_round_trip()
+{
+  int error_count = 0;
+  trajectory_vector_type trajectories(make_trajectories());
+
+  std::ostringstream outbuf;
+  tracktable::BinaryTrajectoryWriter writer(outbuf);
+  writer.write(trajectories.begin(), trajectories.end());
+  writer.close();
+
+  std::istringstream inbuf(outbuf.str());
+  reader_type reader(inbuf);
+
+  if (reader.size() != trajectories.size())
+    {
+    std::cout << "ERROR: Expected " << trajectories.size()
+              << " trajectories but reader found " << reader.size() << ".\n";
+    return 1;
+    }
+
+  // Random access, back to front
+  for (std::size_t i = reader.size(); i > 0; --i)
+    {
+    error_count += compare_trajectories(trajectories[i-1], reader.read(i-1), i-1);
+    }
+
+  // Sequential iteration, twice
+  for (int pass = 0; pass < 2; ++pass)
+    {
+    std::size_t i = 0;
+    for (reader_type::iterator iter = reader.begin(); iter != reader.end(); ++iter, ++i)
+      {
+      error_count += compare_trajectories(trajectories[i], *iter, i);
+      }
+    if (i != trajectories.size())
+      {
+      std::cout << "ERROR: Iteration pass " << pass << " produced "
+                << i << " trajectories.\n";
+      ++error_count;
+      }
+    }
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int test_index_queries()
+{
+  int error_count = 0;
+  trajectory_vector_type trajectories(make_trajectories());
+
+  std::ostringstream outbuf;
+  tracktable::BinaryTrajectoryWriter writer(outbuf);
+  writer.write(trajectories.begin(), trajectories.end());
+  writer.close();
+
+  std::istringstream inbuf(outbuf.str());
+  reader_type reader(inbuf);
+
+  if (reader.object_id(7) != "object_7" || reader.num_points(7) != 17)
+    {
+    std::cout << "ERROR: Index entry 7 has object ID " << reader.object_id(7)
+              << " and " << reader.num_points(7) << " points.\n";
+    ++error_count;
+    }
+  if (reader.start_time(7) != trajectories[7].start_time()
+      || reader.end_time(7) != trajectories[7].end_time())
+    {
+    std::cout << "ERROR: Index entry 7 has the wrong time span.\n";
+    ++error_count;
+    }
+
+  std::vector<std::size_t> by_id(reader.find_object_id("object_12"));
+  if (by_id.size() != 1 || by_id[0] != 12)
+    {
+    std::cout << "ERROR: find_object_id did not find trajectory 12.\n";
+    ++error_count;
+    }
+
+  // Trajectories start an hour apart and last 9 to 28 minutes.
+  // Trajectory t spans longitudes [-100 + t, -99.1 + 1.1 t].
+  tracktable::Timestamp query_start(tracktable::time_from_string("2020-05-01 10:05:00"));
+  tracktable::Timestamp query_end(tracktable::time_from_string("2020-05-01 11:00:00"));
+  std::vector<std::size_t> by_time(reader.find_in_time_range(query_start, query_end));
+  if (by_time.size() != 2 || by_time[0] != 2 || by_time[1] != 3)
+    {
+    std::cout << "ERROR: find_in_time_range returned " << by_time.size()
+              << " trajectories.  Expected 2 and 3.\n";
+    ++error_count;
+    }
+
+  tracktable::PointLonLat low(-90.5, 29), high(-89.5, 31);
+  std::vector<std::size_t> by_box(reader.find_in_box(reader_type::box_type(low, high)));
+  if (by_box.size() != 3 || by_box[0] != 8 || by_box[2] != 10)
+    {
+    std::cout << "ERROR: find_in_box returned " << by_box.size()
+              << " trajectories.  Expected 8, 9 and 10.\n";
+    ++error_count;
+    }
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int test_bad_input()
+{
+  int error_count = 0;
+
+  // Wrong domain
+  {
+  typedef tracktable::TrajectoryPoint<tracktable::PointCartesian<2> > cartesian_point_type;
+  typedef tracktable::Trajectory<cartesian_point_type> cartesian_trajectory_type;
+
+  trajectory_vector_type trajectories(make_trajectories());
+  std::ostringstream outbuf;
+  tracktable::BinaryTrajectoryWriter writer(outbuf);
+  writer.write(trajectories[0]);
+  writer.close();
+
+  std::istringstream inbuf(outbuf.str());
+  try
+    {
+    tracktable::BinaryTrajectoryReader<cartesian_trajectory_type> reader(inbuf);
+    std::cout << "ERROR: Reading lon/lat trajectories as Cartesian did not throw.\n";
+    ++error_count;
+    }
+  catch (std::runtime_error const&)
+    {
+    }
+  }
+
+  // Writer never closed, so there is no index
+  {
+  trajectory_vector_type trajectories(make_trajectories());
+  std::ostringstream outbuf;
+  std::string contents;
+    {
+    tracktable::BinaryTrajectoryWriter writer(outbuf);
+    writer.write(trajectories[0]);
+    contents = outbuf.str();
+    }
+  std::istringstream inbuf(contents);
+  try
+    {
+    reader_type reader(inbuf);
+    std::cout << "ERROR: Reading an unfinished file did not throw.\n";
+    ++error_count;
+    }
+  catch (std::runtime_error const&)
+    {
+    }
+  }
+
+  // An empty but finished file is fine
+  {
+  std::ostringstream outbuf;
+  tracktable::BinaryTrajectoryWriter writer(outbuf);
+  writer.close();
+  std::istringstream inbuf(outbuf.str());
+  reader_type reader(inbuf);
+  if (reader.size() != 0 || reader.begin() != reader.end())
+    {
+    std::cout << "ERROR: Empty file should contain no trajectories.\n";
+    ++error_count;
+    }
+  }
+
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int main(int, char**)
+{
+  int error_count = 0;
+
+  error_count += test_round_trip();
+  error_count += test_index_queries();
+  error_count += test_bad_input();
+
+  std::cout << "Returning exit code " << error_count << "\n";
+  return error_count;
+}
@@ -0,0 +1,211 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include <tracktable/Core/PointLonLat.h>
+#include <tracktable/Core/TrajectoryPoint.h>
+
+#include <tracktable/RW/PointReader.h>
+#include <tracktable/RW/PointWriter.h>
+
+#include <iomanip>
+#include <iostream>
+#include <sstream>
+#include <string>
+#include <vector>
+
+typedef tracktable::TrajectoryPoint<tracktable::PointLonLat> point_type;
+typedef std::vector<point_type> point_vector_type;
+
+// ----------------------------------------------------------------------
+
+std::string make_point_file(int num_lines)
+{
+  std::ostringstream outbuf;
+  outbuf << "# object_id,timestamp,longitude,latitude,speed\n";
+  for (int i = 0; i < num_lines; ++i)
+    {
+    if (i % 97 == 0)
+      {
+      outbuf << "   # comment line " << i << "\n";
+      }
+    if (i % 101 == 0)
+      {
+      // Too few tokens: this line is a parse error
+      outbuf << "broken_line_" << i << "\n";
+      }
+    outbuf << "object_" << (i % 13) << ","
+           << "2020-01-01 " << std::setw(2) << std::setfill('0') << (i / 3600) % 24 << ":"
+           << std::setw(2) << std::setfill('0') << (i / 60) % 60 << ":"
+           << std::setw(2) << std::setfill('0') << i % 60 << ","
+           << -100.0 + 0.001 * i << ","
+           << 35.0 + 0.0005 * i << ","
+           << i * 0.5 << "\n";
+    }
+  // The last line has no trailing newline
+  outbuf << "last_object,2020-01-02 00:00:00,10,20,30";
+  return outbuf.str();
+}
+
+// ----------------------------------------------------------------------
+
+point_vector_type read_points(std::string const& contents,
+                              int num_threads,
+                              std::size_t chunk_size,
+                              bool csv_columns)
+{
+  std::istringstream inbuf(contents);
+  tracktable::PointReader<point_type> reader(inbuf);
+  if (csv_columns)
+    {
+    reader.set_object_id_column(0);
+    reader.set_timestamp_column(1);
+    reader.set_longitude_column(2);
+    reader.set_latitude_column(3);
+    reader.set_real_field_column("speed", 4);
+    }
+  reader.set_num_parser_threads(num_threads);
+  reader.set_parser_chunk_size(chunk_size);
+  return point_vector_type(reader.begin(), reader.end());
+}
+
+// ----------------------------------------------------------------------
+
+int compare_point_lists(point_vector_type const& expected,
+                        point_vector_type const& actual,
+                        std::string const& label)
+{
+  if (expected.size() != actual.size())
+    {
+    std::cout << "ERROR: " << label << ": expected "
+              << expected.size() << " points but read "
+              << actual.size() << ".\n";
+    return 1;
+    }
+
+  for (std::size_t i = 0; i < expected.size(); ++i)
+    {
+    if (expected[i] != actual[i])
+      {
+      std::cout << "ERROR: " << label << ": point " << i
+                << " differs.  Expected:\n" << expected[i]
+                << "\nActual:\n" << actual[i] << "\n";
+      return 1;
+      }
+    }
+  return 0;
+}
+
+// ----------------------------------------------------------------------
+
+int test_matches_serial_reader()
+{
+  int error_count = 0;
+  std::string contents(make_point_file(5000));
+  point_vector_type serial_points(read_points(contents, 1, 0, true));
+
+  if (serial_points.size() != 5001)
+    {
+    std::cout << "ERROR: Serial reader produced " << serial_points.size()
+              << " points.  Expected 5001.\n";
+    ++error_count;
+    }
+
+  // Small chunks make sure that lines get split across block boundaries.
+  error_count += compare_point_lists(serial_points, read_points(contents, 4, 1000, true),
+                                     "4 threads, 1000-byte chunks");
+  error_count += compare_point_lists(serial_points, read_points(contents, 0, 64 * 1024, true),
+                                     "all CPUs, 64K chunks");
+  error_count += compare_point_lists(serial_points, read_points(contents, 3, 7, true),
+                                     "3 threads, 7-byte chunks");
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int test_header_configures_reader()
+{
+  point_vector_type points;
+  for (int i = 0; i < 2000; ++i)
+    {
+    point_type point;
+    point.set_object_id("header_test");
+    point.set_longitude(-120 + 0.01 * i);
+    point.set_latitude(40 - 0.01 * i);
+    point.set_timestamp(tracktable::time_from_string("2019-06-01 12:00:00"));
+    point.set_property("index", static_cast<double>(i));
+    points.push_back(point);
+    }
+
+  std::ostringstream outbuf;
+  tracktable::PointWriter writer(outbuf);
+  writer.write(points.begin(), points.end());
+
+  // The header line sets up all of the columns.  No manual
+  // configuration is needed.
+  return compare_point_lists(points, read_points(outbuf.str(), 4, 4096, false),
+                             "header-configured chunked read");
+}
+
+// ----------------------------------------------------------------------
+
+int test_begin_twice()
+{
+  // Like any GenericReader, each call to begin() moves on to the next
+  // point.  A second call must not lose any input beyond that: the
+  // first iterator's point followed by everything from the second
+  // iterator is the whole file.
+  std::string contents(make_point_file(500));
+  point_vector_type expected(read_points(contents, 1, 0, true));
+
+  std::istringstream inbuf(contents);
+  tracktable::PointReader<point_type> reader(inbuf);
+  reader.set_object_id_column(0);
+  reader.set_timestamp_column(1);
+  reader.set_longitude_column(2);
+  reader.set_latitude_column(3);
+  reader.set_real_field_column("speed", 4);
+  point_vector_type actual(1, *reader.begin());
+  actual.insert(actual.end(), reader.begin(), reader.end());
+
+  return compare_point_lists(expected, actual, "second call to begin()");
+}
+
+// ----------------------------------------------------------------------
+
+int main(int, char**)
+{
+  int error_count = 0;
+
+  error_count += test_matches_serial_reader();
+  error_count += test_header_configures_reader();
+  error_count += test_begin_twice();
+
+  return error_count;
+}
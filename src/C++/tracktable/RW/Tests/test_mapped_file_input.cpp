@@ -0,0 +1,148 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include <tracktable/RW/MappedFileInput.h>
+#include <tracktable/RW/PointReader.h>
+
+#include <tracktable/Core/PointLonLat.h>
+#include <tracktable/Core/TrajectoryPoint.h>
+
+#include <cstdlib>
+#include <fstream>
+#include <iostream>
+#include <stdexcept>
+#include <vector>
+
+typedef tracktable::TrajectoryPoint< tracktable::PointLonLat > point_type;
+typedef tracktable::PointReader<point_type> point_reader_type;
+typedef std::vector<point_type> point_vector_type;
+
+// ----------------------------------------------------------------------
+
+point_vector_type read_points(std::istream& infile, int num_threads)
+{
+  point_reader_type reader(infile);
+  reader.set_object_id_column(0);
+  reader.set_timestamp_column(1);
+  reader.set_longitude_column(2);
+  reader.set_latitude_column(3);
+  reader.set_num_parser_threads(num_threads);
+  return point_vector_type(reader.begin(), reader.end());
+}
+
+// ----------------------------------------------------------------------
+
+int compare_points(point_vector_type const& expected,
+                   point_vector_type const& actual,
+                   const char* label)
+{
+  if (expected.size() != actual.size())
+    {
+    std::cout << "ERROR: " << label << ": Expected "
+              << expected.size() << " points but got "
+              << actual.size() << ".\n";
+    return 1;
+    }
+  for (std::size_t i = 0; i < expected.size(); ++i)
+    {
+    if (expected[i] != actual[i])
+      {
+      std::cout << "ERROR: " << label << ": Point " << i << " differs. "
+                << "Expected " << expected[i] << ", got " << actual[i] << ".\n";
+      return 1;
+      }
+    }
+  return 0;
+}
+
+// ----------------------------------------------------------------------
+
+int test_mapped_input(int expected_num_points, const char* filename)
+{
+  int error_count = 0;
+
+  std::ifstream infile(filename);
+  point_vector_type stream_points(read_points(infile, 1));
+
+  if (static_cast<int>(stream_points.size()) != expected_num_points)
+    {
+    std::cout << "ERROR: Expected " << expected_num_points
+              << " points from std::ifstream but got "
+              << stream_points.size() << ".\n";
+    ++error_count;
+    }
+
+  tracktable::MappedFileInput mapped_file(filename);
+  error_count += compare_points(stream_points,
+                                read_points(mapped_file.stream(), 1),
+                                "mapped file, 1 thread");
+
+  // Reopening the file starts over at the beginning.
+  mapped_file.open(filename);
+  error_count += compare_points(stream_points,
+                                read_points(mapped_file.stream(), 4),
+                                "mapped file, 4 threads");
+  return error_count;
+}
+
+// ----------------------------------------------------------------------
+
+int test_missing_file()
+{
+  try
+    {
+    tracktable::MappedFileInput mapped_file("this_file_does_not_exist.csv");
+    }
+  catch (std::runtime_error const&)
+    {
+    return 0;
+    }
+  std::cout << "ERROR: Opening a missing file did not throw.\n";
+  return 1;
+}
+
+// ----------------------------------------------------------------------
+
+int main(int argc, char* argv[])
+{
+  if (argc != 3)
+    {
+    std::cerr << "usage: "
+              << argv[0] << " expected_num_points file_to_read.txt\n";
+    return 1;
+    }
+
+  int error_count = 0;
+  error_count += test_mapped_input(atoi(argv[1]), argv[2]);
+  error_count += test_missing_file();
+
+  std::cout << "Returning exit code " << error_count << "\n";
+  return error_count;
+}
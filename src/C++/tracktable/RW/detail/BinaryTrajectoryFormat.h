@@ -0,0 +1,331 @@
+/*
+ * Copyright (c) 2014-2023 National Technology and Engineering
+ * Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+ * with National Technology and Engineering Solutions of Sandia, LLC,
+ * the U.S. Government retains certain rights in this software.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#ifndef __tracktable_rw_detail_BinaryTrajectoryFormat_h
+#define __tracktable_rw_detail_BinaryTrajectoryFormat_h
+
+#include <tracktable/Core/TracktableCommon.h>
+#include <tracktable/Core/PropertyMap.h>
+#include <tracktable/Core/Timestamp.h>
+
+#include <cstdint>
+#include <cstring>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+// Layout of a binary trajectory file.  All integers and floats are
+// stored in the byte order of the machine that wrote the file; the
+// header carries a byte-order mark so that a reader on a machine with
+// the other byte order can refuse the file instead of misreading it.
+//
+// File header:
+//     8 bytes     BinaryTrajectoryFileMagic ("TTBINTRJ")
+//     uint32      format version
+//     uint32      byte-order mark (0x01020304)
+//     uint32      point dimension
+//     string      point domain name
+//
+// One block per trajectory, columns stored one after another:
+//     uint64      number of points N
+//     string      object ID of the trajectory
+//     16 bytes    trajectory UUID
+//     properties  trajectory properties (uint32 count, then name and
+//                 tagged value for each)
+//     uint8       1 if the points have their own object IDs (N strings
+//                 follow), 0 if they all share the trajectory's
+//     N x int64   timestamps in microseconds since the Unix epoch
+//     D x N x f64 coordinates, one column per dimension
+//     uint32      number of point property columns, then per column:
+//                 string name, N x uint8 value tags, then the real,
+//                 timestamp and string values for the points that
+//                 have them, in that order
+//
+// Footer, so that readers can seek straight to any trajectory:
+//     uint64      number of trajectories
+//     per trajectory: uint64 block offset, uint64 number of points,
+//                 string object ID, int64 start time, int64 end time,
+//                 D x f64 minimum corner, D x f64 maximum corner
+//
+// Trailer (last 16 bytes of the file):
+//     uint64      offset of the footer
+//     8 bytes     BinaryTrajectoryIndexMagic ("TTBINIDX")
+//
+// Strings are a uint32 byte count followed by the bytes.
+
+namespace tracktable { namespace rw { namespace detail {
+
+const char BinaryTrajectoryFileMagic[] = "TTBINTRJ";
+const char BinaryTrajectoryIndexMagic[] = "TTBINIDX";
+const std::size_t BinaryTrajectoryMagicLength = 8;
+const uint32_t BinaryTrajectoryFormatVersion = 1;
+const uint32_t BinaryTrajectoryByteOrderMark = 0x01020304;
+const std::size_t BinaryTrajectoryTrailerLength = sizeof(uint64_t) + BinaryTrajectoryMagicLength;
+
+// Tags that say what kind of value a property holds.  Nulls keep the
+// type they were expecting in the low bits.
+const uint8_t BinaryPropertyAbsent    = 0;
+const uint8_t BinaryPropertyReal      = TYPE_REAL;
+const uint8_t BinaryPropertyString    = TYPE_STRING;
+const uint8_t BinaryPropertyTimestamp = TYPE_TIMESTAMP;
+const uint8_t BinaryPropertyNullFlag  = 0x80;
+
+// ----------------------------------------------------------------------
+
+/** Append fixed-width values and strings to a byte buffer. */
+class BinaryEncoder
+{
+public:
+  explicit BinaryEncoder(std::string& buffer)
+    : Buffer(buffer)
+    { }
+
+  template<typename value_type>
+  void write(value_type const& value)
+    {
+      this->Buffer.append(reinterpret_cast<const char*>(&value), sizeof(value_type));
+    }
+
+  void write_bytes(const char* bytes, std::size_t num_bytes)
+    {
+      this->Buffer.append(bytes, num_bytes);
+    }
+
+  void write_string(std::string const& value)
+    {
+      this->write(static_cast<uint32_t>(value.size()));
+      this->Buffer.append(value);
+    }
+
+  void write_timestamp(Timestamp const& value)
+    {
+      this->write(static_cast<int64_t>(timestamp_to_epoch_microseconds(value)));
+    }
+
+  /** Write a property value preceded by its tag. */
+  void write_tagged_property(PropertyValueT const& value)
+    {
+      uint8_t tag = property_tag(value);
+      this->write(tag);
+      this->write_property_value(tag, value);
+    }
+
+  /** Write just the value of a property.  Nulls take no space. */
+  void write_property_value(uint8_t tag, PropertyValueT const& value)
+    {
+      switch (tag)
+        {
+        case BinaryPropertyReal:
+          this->write(boost::get<double>(value));
+          break;
+        case BinaryPropertyString:
+          this->write_string(boost::get<string_type>(value));
+          break;
+        case BinaryPropertyTimestamp:
+          this->write_timestamp(boost::get<Timestamp>(value));
+          break;
+        default:
+          break;
+        }
+    }
+
+  static uint8_t property_tag(PropertyValueT const& value)
+    {
+      if (is_property_null(value))
+        {
+        return static_cast<uint8_t>(BinaryPropertyNullFlag
+                                    | boost::get<NullValue>(value).ExpectedType);
+        }
+      return static_cast<uint8_t>(property_underlying_type(value));
+    }
+
+private:
+  std::string& Buffer;
+};
+
+// ----------------------------------------------------------------------
+
+/** Read fixed-width values and strings from a byte buffer.
+ *
+ * Every read is bounds-checked: running off the end of the buffer
+ * means the file is truncated or corrupt, and we throw
+ * std::runtime_error rather than read past it.
+ */
+class BinaryDecoder
+{
+public:
+  BinaryDecoder(const char* begin, const char* end)
+    : Begin(begin)
+    , Current(begin)
+    , End(end)
+    { }
+
+  template<typename value_type>
+  value_type read()
+    {
+      value_type value;
+      std::memcpy(&value, this->take(sizeof(value_type)), sizeof(value_type));
+      return value;
+    }
+
+  const char* read_bytes(std::size_t num_bytes)
+    {
+      return this->take(num_bytes);
+    }
+
+  std::string read_string()
+    {
+      uint32_t length = this->read<uint32_t>();
+      const char* bytes = this->take(length);
+      return std::string(bytes, length);
+    }
+
+  Timestamp read_timestamp()
+    {
+      return timestamp_from_epoch_microseconds(this->read<int64_t>());
+    }
+
+  PropertyValueT read_tagged_property()
+    {
+      uint8_t tag = this->read<uint8_t>();
+      return this->read_property_value(tag);
+    }
+
+  PropertyValueT read_property_value(uint8_t tag)
+    {
+      switch (tag)
+        {
+        case BinaryPropertyReal:
+          return PropertyValueT(this->read<double>());
+        case BinaryPropertyString:
+          return PropertyValueT(this->read_string());
+        case BinaryPropertyTimestamp:
+          return PropertyValueT(this->read_timestamp());
+        default:
+          if (tag & BinaryPropertyNullFlag)
+            {
+            return make_null(static_cast<PropertyUnderlyingType>(tag & ~BinaryPropertyNullFlag));
+            }
+          throw std::runtime_error("Binary trajectory file contains an unknown property tag.");
+        }
+    }
+
+  std::size_t position() const
+    {
+      return static_cast<std::size_t>(this->Current - this->Begin);
+    }
+
+  void seek(std::size_t offset)
+    {
+      if (offset > static_cast<std::size_t>(this->End - this->Begin))
+        {
+        throw std::runtime_error("Binary trajectory file: offset is past the end of the file.");
+        }
+      this->Current = this->Begin + offset;
+    }
+
+private:
+  const char* take(std::size_t num_bytes)
+    {
+      if (num_bytes > static_cast<std::size_t>(this->End - this->Current))
+        {
+        throw std::runtime_error("Binary trajectory file is truncated or corrupt.");
+        }
+      const char* result = this->Current;
+      this->Current += num_bytes;
+      return result;
+    }
+
+  const char* Begin;
+  const char* Current;
+  const char* End;
+};
+
+// ----------------------------------------------------------------------
+
+/** Footer record describing one trajectory. */
+struct BinaryTrajectoryIndexEntry
+{
+  uint64_t            Offset;
+  uint64_t            NumPoints;
+  string_type         ObjectId;
+  int64_t             StartTime;
+  int64_t             EndTime;
+  std::vector<double> MinCorner;
+  std::vector<double> MaxCorner;
+
+  BinaryTrajectoryIndexEntry()
+    : Offset(0)
+    , NumPoints(0)
+    , StartTime(std::numeric_limits<int64_t>::min())
+    , EndTime(std::numeric_limits<int64_t>::min())
+    { }
+
+  void write(BinaryEncoder& encoder) const
+    {
+      encoder.write(this->Offset);
+      encoder.write(this->NumPoints);
+      encoder.write_string(this->ObjectId);
+      encoder.write(this->StartTime);
+      encoder.write(this->EndTime);
+      for (std::size_t d = 0; d < this->MinCorner.size(); ++d)
+        {
+        encoder.write(this->MinCorner[d]);
+        }
+      for (std::size_t d = 0; d < this->MaxCorner.size(); ++d)
+        {
+        encoder.write(this->MaxCorner[d]);
+        }
+    }
+
+  void read(BinaryDecoder& decoder, std::size_t dimension)
+    {
+      this->Offset = decoder.read<uint64_t>();
+      this->NumPoints = decoder.read<uint64_t>();
+      this->ObjectId = decoder.read_string();
+      this->StartTime = decoder.read<int64_t>();
+      this->EndTime = decoder.read<int64_t>();
+      this->MinCorner.resize(dimension);
+      this->MaxCorner.resize(dimension);
+      for (std::size_t d = 0; d < dimension; ++d)
+        {
+        this->MinCorner[d] = decoder.read<double>();
+        }
+      for (std::size_t d = 0; d < dimension; ++d)
+        {
+        this->MaxCorner[d] = decoder.read<double>();
+        }
+    }
+};
+
+} } } // close namespace tracktable::rw::detail
+
+#endif
@@ -38,6 +38,14 @@ from tracktable.lib import _dbscan_clustering
 from tracktable.domain.feature_vectors import convert_to_feature_vector
 import logging
 
+#: Neighbor search engines for :func:`compute_cluster_labels`.  The
+#: numbers must match tracktable::DBSCANEngine in C++.
+DBSCAN_ENGINES = {
+    'auto': 0,
+    'rtree': 1,
+    'grid': 2
+}
+
 def is_decorated(point):
     """Returns True if point is decorated
 
@@ -71,7 +79,8 @@ def is_decorated(point):
     return False
 
 
-def compute_cluster_labels(feature_vectors, search_box_half_span, min_cluster_size):
+def compute_cluster_labels(feature_vectors, search_box_half_span, min_cluster_size,
+                           n_threads=1, engine='auto'):
     """Use DBSCAN to compute clusters for a set of points.
 
     DBSCAN is a clustering algorithm that looks for regions of high
@@ -85,6 +94,17 @@ def compute_cluster_labels(feature_vectors, search_box_half_span, min_cluster_si
             two parameters: the search box size (defining "nearby" points)
         min_cluster_size (int): The minimum number of points that you're willing to call a
             cluster.
+        n_threads (int): Number of threads to use for the neighbor
+            searches. Use 0 or None for one thread per CPU core.
+            The labels are the same regardless of this setting.
+            Defaults to 1.
+        engine (str): How to find each point's neighbors. 'rtree'
+            uses an R-tree. 'grid' sorts points into cells the size
+            of the search box, which is usually much faster for 2 to
+            4 dimensions; with more dimensions only the first four are
+            used for the grid. 'auto' picks 'grid' for 2 to 4
+            dimensions and 'rtree' otherwise. All engines produce the
+            same labels. Defaults to 'auto'.
 
     Returns:
         You will get back a list of (vertex_id, cluster_id) pairs. If you
@@ -92,9 +112,17 @@ def compute_cluster_labels(feature_vectors, search_box_half_span, min_cluster_si
         into that list. If you supplied pairs of (my_vertex_id, point)
         instead, the vertex IDs will be whatever you supplied.
 
+    Raises:
+        ValueError: engine is not one of 'auto', 'rtree' or 'grid'
+
     """
     logger = logging.getLogger(__name__)
 
+    if engine not in DBSCAN_ENGINES:
+        raise ValueError(
+            'compute_cluster_labels: Unknown engine {}.  Choose one of {}.'.format(
+                repr(engine), ', '.join(sorted(DBSCAN_ENGINES.keys()))))
+
     # Are we dealing with decorated points?
     first_point = feature_vectors[0]
     decorated_points = is_decorated(first_point)
@@ -120,10 +148,14 @@ def compute_cluster_labels(feature_vectors, search_box_half_span, min_cluster_si
 
     cluster_engine_name = 'dbscan_learn_cluster_ids_{}'.format(point_size)
     dbscan_learn_cluster_labels = getattr(_dbscan_clustering, cluster_engine_name)
+    if n_threads is None:
+        n_threads = 0
     integer_labels = dbscan_learn_cluster_labels(
         native_feature_vectors,
         native_box_half_span,
-        min_cluster_size
+        min_cluster_size,
+        int(n_threads),
+        DBSCAN_ENGINES[engine]
         )
 
     final_labels = []
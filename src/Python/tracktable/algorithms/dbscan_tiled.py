@@ -0,0 +1,423 @@
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+tracktable.algorithms.dbscan_tiled - DBSCAN for point sets larger than memory.
+
+:func:`compute_cluster_labels_tiled` cuts space into tiles along the
+first few dimensions and writes each tile's points to disk.  Every
+tile also gets copies of the points near its edges (the *halo*).
+Each tile is then clustered on its own, optionally in separate
+processes.  Finally, clusters that share a core point across a tile
+boundary are merged.  Only one tile's feature vectors are ever held
+in memory at once.
+
+The result is the same set of clusters that
+:func:`tracktable.algorithms.dbscan.compute_cluster_labels` would find
+on the whole data set.  The only possible difference is a border point
+(a non-core point near more than one cluster).  DBSCAN may put such a
+point in any of those clusters, so the choice can differ.
+"""
+
+from __future__ import division, absolute_import, print_function
+
+import array
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from tracktable.algorithms.dbscan import DBSCAN_ENGINES
+from tracktable.domain.feature_vectors import convert_to_feature_vector
+from tracktable.lib import _dbscan_clustering
+
+logger = logging.getLogger(__name__)
+
+# Point kinds stored in the tile files.  A halo point is "inner" if it
+# is within one search box of the tile.  Those points (and owned points
+# that are inner halo points somewhere else) are the ones that can tie
+# clusters in different tiles together.
+_OWNED = 0
+_OWNED_BOUNDARY = 1
+_INNER_HALO = 2
+_OUTER_HALO = 3
+
+# Guard against rounding when deciding whether a point is near a tile
+# edge.  Taking in a few extra halo points is harmless.
+_EDGE_SLACK = 1e-9
+
+
+def compute_cluster_labels_tiled(feature_vectors,
+                                 search_box_half_span,
+                                 min_cluster_size,
+                                 tile_span,
+                                 processes=1,
+                                 n_threads=1,
+                                 engine='auto',
+                                 working_directory=None,
+                                 max_buffered_points=100000):
+    """Use DBSCAN on a set of points too large to fit in memory.
+
+    Space is cut into tiles along the first ``len(tile_span)``
+    dimensions.  Each tile holds the points inside it plus every point
+    within two search boxes of its edges.  That is enough for each
+    tile to decide exactly which of its own points are core points
+    and which clusters they belong to.
+
+    The points are read once, from any iterable, so they can come
+    straight from a file or a generator.
+
+    Arguments:
+        feature_vectors (iterable): The points to cluster.  Each point
+            is a sequence of numbers; all points must have the same
+            length.  Unlike compute_cluster_labels, decorated
+            (point, id) pairs are not supported: vertex IDs are
+            positions in the input.
+        search_box_half_span (sequence of float): Distance that
+            defines "nearby" in each dimension.
+        min_cluster_size (int): The minimum number of points that
+            you're willing to call a cluster.
+        tile_span (sequence of float): Width of the tiles in each of
+            the first ``len(tile_span)`` dimensions.  Each width must be
+            more than twice the search box half-span in that dimension.
+            Bigger tiles mean fewer, larger tiles; pick a size where
+            one tile's points fit comfortably in memory.
+
+    Keyword Arguments:
+        processes (int): How many tiles to cluster at once, each in its
+            own process.  Use 0 or None for one per CPU core.  With 1
+            (the default) everything runs in this process.
+        n_threads (int): Threads to use within each tile.  (Default: 1)
+        engine (str): Neighbor search engine; see
+            compute_cluster_labels.  (Default: 'auto')
+        working_directory (str): Where to put the tile files.  A
+            temporary directory is created inside it and removed when
+            we're done.  (Default: the system temporary directory)
+        max_buffered_points (int): How many points to hold in memory
+            while sorting them into tiles before writing them to disk.
+            (Default: 100000)
+
+    Returns:
+        An iterator over (vertex_id, cluster_id) pairs in input order.
+        Cluster 0 is noise.  All the work is finished before this
+        function returns; only the output is produced lazily.
+
+    Raises:
+        ValueError: The tile span, search box or points are not
+            consistent with one another, or engine is unknown.
+    """
+
+    if engine not in DBSCAN_ENGINES:
+        raise ValueError(
+            'compute_cluster_labels_tiled: Unknown engine {}.  Choose one of {}.'.format(
+                repr(engine), ', '.join(sorted(DBSCAN_ENGINES.keys()))))
+
+    half_span = [float(value) for value in search_box_half_span]
+    tile_span = [float(value) for value in tile_span]
+    if len(tile_span) == 0 or len(tile_span) > len(half_span):
+        raise ValueError(
+            'compute_cluster_labels_tiled: tile_span must have between 1 '
+            'and {} entries.'.format(len(half_span)))
+    for (dimension, (width, span)) in enumerate(zip(tile_span, half_span)):
+        if not (math.isfinite(width) and math.isfinite(span) and span > 0):
+            raise ValueError(
+                'compute_cluster_labels_tiled: Search box and tile span must be '
+                'positive and finite in tiled dimension {}.'.format(dimension))
+        if width <= 2 * span:
+            raise ValueError(
+                'compute_cluster_labels_tiled: Tile span {} in dimension {} must '
+                'be more than twice the search box half-span ({}).'.format(
+                    width, dimension, span))
+
+    if processes is None:
+        processes = 0
+    if processes <= 0:
+        processes = multiprocessing.cpu_count()
+
+    tile_root = tempfile.mkdtemp(prefix='tracktable_dbscan_',
+                                 dir=working_directory)
+    try:
+        spooler = _TileSpooler(tile_root, half_span, tile_span, max_buffered_points)
+        num_points = spooler.add_points(feature_vectors)
+        spooler.flush()
+        logger.info('compute_cluster_labels_tiled: Sorted {} points into {} tiles.'.format(
+            num_points, spooler.num_tiles))
+
+        tasks = [(tile_number,
+                  spooler.ids_path(tile_number),
+                  spooler.coords_path(tile_number),
+                  spooler.labels_path(tile_number),
+                  spooler.dimension,
+                  half_span,
+                  min_cluster_size,
+                  n_threads,
+                  engine)
+                 for tile_number in range(spooler.num_tiles)]
+
+        boundary_records = [None] * spooler.num_tiles
+        if processes == 1 or len(tasks) <= 1:
+            for task in tasks:
+                (tile_number, records) = _cluster_tile(task)
+                boundary_records[tile_number] = records
+        else:
+            with multiprocessing.Pool(processes=min(processes, len(tasks))) as pool:
+                for (tile_number, records) in pool.imap_unordered(_cluster_tile, tasks):
+                    boundary_records[tile_number] = records
+
+        global_ids = _merge_tile_clusters(spooler, boundary_records)
+
+        labels = array.array('q', itertools.repeat(0, num_points))
+        for tile_number in range(spooler.num_tiles):
+            owned = _read_int64(spooler.labels_path(tile_number))
+            for i in range(0, len(owned), 2):
+                (vertex_id, local_label) = (owned[i], owned[i + 1])
+                if local_label != 0:
+                    labels[vertex_id] = global_ids[(tile_number, local_label)]
+    finally:
+        shutil.rmtree(tile_root, ignore_errors=True)
+
+    return enumerate(labels)
+
+
+# ----------------------------------------------------------------------
+
+class _TileSpooler(object):
+    """Sort points into tiles and append them to per-tile files.
+
+    Each tile has two files: ``tile_N.ids`` holds (vertex ID, kind)
+    pairs as 64-bit integers and ``tile_N.coords`` holds the
+    coordinates as doubles.  Points are buffered in memory and written
+    out in batches so that we never need one open file per tile.
+    """
+
+    def __init__(self, directory, half_span, tile_span, max_buffered_points):
+        self.directory = directory
+        self.half_span = half_span
+        self.tile_span = tile_span
+        self.max_buffered_points = max(1, max_buffered_points)
+        self.dimension = len(half_span)
+        self.tile_numbers = {}
+        self.buffers = {}
+        self.num_buffered = 0
+
+    @property
+    def num_tiles(self):
+        return len(self.tile_numbers)
+
+    def ids_path(self, tile_number):
+        return os.path.join(self.directory, 'tile_{}.ids'.format(tile_number))
+
+    def coords_path(self, tile_number):
+        return os.path.join(self.directory, 'tile_{}.coords'.format(tile_number))
+
+    def labels_path(self, tile_number):
+        return os.path.join(self.directory, 'tile_{}.labels'.format(tile_number))
+
+    def add_points(self, points):
+        num_points = 0
+        for (vertex_id, point) in enumerate(points):
+            coords = [float(value) for value in point]
+            if len(coords) != self.dimension:
+                raise ValueError(
+                    'compute_cluster_labels_tiled: Point {} has {} coordinates '
+                    'but the search box has {}.'.format(vertex_id, len(coords), self.dimension))
+            self._add_point(vertex_id, coords)
+            num_points += 1
+        return num_points
+
+    def _add_point(self, vertex_id, coords):
+        home = []
+        nearby_offsets = []
+        for (dimension, width) in enumerate(self.tile_span):
+            value = coords[dimension]
+            if not math.isfinite(value):
+                raise ValueError(
+                    'compute_cluster_labels_tiled: Point {} has a non-finite '
+                    'coordinate in dimension {}.'.format(vertex_id, dimension))
+            cell = int(math.floor(value / width))
+            home.append(cell)
+
+            # How far are we from the tiles on either side?  Anything
+            # within two search boxes belongs in that tile's halo.
+            reach = 2 * self.half_span[dimension] * (1 + _EDGE_SLACK)
+            offsets = [(0, 0.0)]
+            below = value - cell * width
+            above = (cell + 1) * width - value
+            if below < reach:
+                offsets.append((-1, below))
+            if above < reach:
+                offsets.append((1, above))
+            nearby_offsets.append(offsets)
+
+        inner_reach = [span * (1 + _EDGE_SLACK) for span in self.half_span]
+        kind = _OWNED
+        for combination in itertools.product(*nearby_offsets):
+            if all(offset == 0 for (offset, _) in combination):
+                continue
+            tile = tuple(cell + offset for (cell, (offset, _)) in zip(home, combination))
+            inner = all(offset == 0 or distance < inner_reach[dimension]
+                        for (dimension, (offset, distance)) in enumerate(combination))
+            if inner:
+                kind = _OWNED_BOUNDARY
+            self._buffer(tile, vertex_id, _INNER_HALO if inner else _OUTER_HALO, coords)
+
+        self._buffer(tuple(home), vertex_id, kind, coords)
+
+    def _buffer(self, tile, vertex_id, kind, coords):
+        tile_number = self.tile_numbers.setdefault(tile, len(self.tile_numbers))
+        (ids, values) = self.buffers.setdefault(tile_number,
+                                                (array.array('q'), array.array('d')))
+        ids.append(vertex_id)
+        ids.append(kind)
+        values.extend(coords)
+        self.num_buffered += 1
+        if self.num_buffered >= self.max_buffered_points:
+            self.flush()
+
+    def flush(self):
+        for (tile_number, (ids, values)) in self.buffers.items():
+            with open(self.ids_path(tile_number), 'ab') as outfile:
+                ids.tofile(outfile)
+            with open(self.coords_path(tile_number), 'ab') as outfile:
+                values.tofile(outfile)
+        self.buffers = {}
+        self.num_buffered = 0
+
+
+# ----------------------------------------------------------------------
+
+def _read_int64(filename):
+    values = array.array('q')
+    with open(filename, 'rb') as infile:
+        values.frombytes(infile.read())
+    return values
+
+
+def _read_float64(filename):
+    values = array.array('d')
+    with open(filename, 'rb') as infile:
+        values.frombytes(infile.read())
+    return values
+
+
+def _cluster_tile(task):
+    """Run DBSCAN on one tile.
+
+    This runs in a worker process when there is more than one.  It
+    writes (vertex ID, local cluster ID) for the tile's own points to
+    the tile's label file and returns (vertex ID, local cluster ID) for
+    the core points that might be shared with other tiles.
+    """
+
+    (tile_number, ids_path, coords_path, labels_path, dimension,
+     half_span, min_cluster_size, n_threads, engine) = task
+
+    ids = _read_int64(ids_path)
+    coords = _read_float64(coords_path)
+    num_points = len(ids) // 2
+
+    points = [convert_to_feature_vector(coords[i * dimension:(i + 1) * dimension])
+              for i in range(num_points)]
+
+    learn_clusters = getattr(_dbscan_clustering,
+                             'dbscan_learn_cluster_ids_and_core_flags_{}'.format(dimension))
+    (local_labels, core_flags) = learn_clusters(points,
+                                                convert_to_feature_vector(half_span),
+                                                min_cluster_size,
+                                                int(n_threads),
+                                                DBSCAN_ENGINES[engine])
+    del points
+
+    owned_labels = array.array('q')
+    boundary_records = []
+    for i in range(num_points):
+        (vertex_id, kind) = (ids[2 * i], ids[2 * i + 1])
+        if kind == _OWNED or kind == _OWNED_BOUNDARY:
+            owned_labels.append(vertex_id)
+            owned_labels.append(local_labels[i])
+        if core_flags[i] and (kind == _OWNED_BOUNDARY or kind == _INNER_HALO):
+            boundary_records.append((vertex_id, local_labels[i]))
+
+    with open(labels_path, 'wb') as outfile:
+        owned_labels.tofile(outfile)
+
+    return (tile_number, boundary_records)
+
+
+def _merge_tile_clusters(spooler, boundary_records):
+    """Join clusters from different tiles that share a core point.
+
+    Returns a dictionary mapping (tile number, local cluster ID) to a
+    global cluster ID.  Global IDs start at 1 and are handed out in
+    order of tile number and then local cluster ID.
+    """
+
+    parent = {}
+
+    def find(key):
+        root = key
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while key != root:
+            (key, parent[key]) = (parent[key], root)
+        return root
+
+    def union(first, second):
+        first_root = find(first)
+        second_root = find(second)
+        if first_root != second_root:
+            if second_root < first_root:
+                (first_root, second_root) = (second_root, first_root)
+            parent[second_root] = first_root
+
+    first_cluster_for_point = {}
+    for (tile_number, records) in enumerate(boundary_records):
+        for (vertex_id, local_label) in records:
+            key = (tile_number, local_label)
+            other = first_cluster_for_point.setdefault(vertex_id, key)
+            if other != key:
+                union(other, key)
+
+    global_ids = {}
+    root_ids = {}
+    for tile_number in range(spooler.num_tiles):
+        for local_label in _local_cluster_ids(spooler.labels_path(tile_number)):
+            key = (tile_number, local_label)
+            root = find(key)
+            global_ids[key] = root_ids.setdefault(root, len(root_ids) + 1)
+    return global_ids
+
+
+def _local_cluster_ids(labels_path):
+    owned = _read_int64(labels_path)
+    return sorted(set(owned[1::2]) - set([0]))
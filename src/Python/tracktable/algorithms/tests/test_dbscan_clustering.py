@@ -185,9 +185,71 @@ def test_cluster_dictionary():
 
 # ----------------------------------------------------------------------
 
+def test_threaded_clusters():
+    random.seed(0)
+
+    corner_points = place_corner_clusters()
+    noise_points = place_noise_points([0.5, 0.5, 0.5], [10, 10, 10], 100)
+    all_points = corner_points + noise_points
+
+    print("Learning cluster IDs with one thread.")
+    serial_ids = compute_cluster_labels(all_points,
+                                        [0.05, 0.05, 0.05],
+                                        4)
+
+    num_errors = 0
+    for n_threads in [2, 0]:
+        print("Learning cluster IDs with n_threads={}.".format(n_threads))
+        threaded_ids = compute_cluster_labels(all_points,
+                                              [0.05, 0.05, 0.05],
+                                              4,
+                                              n_threads=n_threads)
+        if threaded_ids != serial_ids:
+            print("ERROR: Cluster IDs with n_threads={} do not match cluster IDs with one thread.".format(n_threads))
+            num_errors += 1
+
+    return num_errors
+
+# ----------------------------------------------------------------------
+
+def test_engines():
+    random.seed(0)
+
+    corner_points = place_corner_clusters()
+    noise_points = place_noise_points([0.5, 0.5, 0.5], [10, 10, 10], 100)
+    all_points = corner_points + noise_points
+
+    num_errors = 0
+    rtree_ids = compute_cluster_labels(all_points,
+                                       [0.05, 0.05, 0.05],
+                                       4,
+                                       engine='rtree')
+    for engine in ['grid', 'auto']:
+        print("Learning cluster IDs with engine={}.".format(engine))
+        engine_ids = compute_cluster_labels(all_points,
+                                            [0.05, 0.05, 0.05],
+                                            4,
+                                            engine=engine)
+        if engine_ids != rtree_ids:
+            print("ERROR: Cluster IDs with engine={} do not match cluster IDs from the R-tree.".format(engine))
+            num_errors += 1
+
+    try:
+        compute_cluster_labels(all_points, [0.05, 0.05, 0.05], 4, engine='kdtree')
+        print("ERROR: Unknown engine name did not raise ValueError.")
+        num_errors += 1
+    except ValueError:
+        pass
+
+    return num_errors
+
+# ----------------------------------------------------------------------
+
 def main():
     num_errors = test_clusters()
     num_errors += test_cluster_dictionary()
+    num_errors += test_threaded_clusters()
+    num_errors += test_engines()
     return num_errors
 
 # ----------------------------------------------------------------------
@@ -0,0 +1,133 @@
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+from __future__ import absolute_import, division, print_function
+
+import random
+import sys
+
+from tracktable.algorithms.dbscan import compute_cluster_labels
+from tracktable.algorithms.dbscan_tiled import compute_cluster_labels_tiled
+
+# Tiled DBSCAN should find the same clusters as the in-memory version.
+# The blobs here are far enough apart that no point is near two
+# clusters, so the labels must match exactly up to renumbering.
+
+def blob(center, radius, count):
+    return [tuple(c + random.uniform(-radius, radius) for c in center)
+            for i in range(count)]
+
+# ----------------------------------------------------------------------
+
+def make_points():
+    random.seed(0)
+    points = []
+    # Blobs centered on tile corners and edges so that they get split
+    # across two or four tiles
+    for center in [(1, 1, 0.5), (2, 1.5, 0.5), (0.5, 3, 0.5), (3, 3, 0.5), (4.2, 0.3, 0.5)]:
+        points.extend(blob(center, 0.2, 150))
+    # A long thin cluster that crosses several tiles
+    for i in range(300):
+        points.append((0.1 + 0.015 * i, 4.5, 0.5))
+    # Scattered noise
+    for i in range(100):
+        points.append((random.uniform(0, 5), random.uniform(0, 5), random.uniform(2, 10)))
+    random.shuffle(points)
+    return points
+
+# ----------------------------------------------------------------------
+
+def same_clusters(expected, actual):
+    """Are two labelings the same up to renumbering the clusters?"""
+    if len(expected) != len(actual):
+        return False
+    forward = {}
+    backward = {}
+    for (e, a) in zip(expected, actual):
+        if (e == 0) != (a == 0):
+            return False
+        if forward.setdefault(e, a) != a or backward.setdefault(a, e) != e:
+            return False
+    return True
+
+# ----------------------------------------------------------------------
+
+def test_tiled_matches_in_memory():
+    points = make_points()
+    search_box = [0.05, 0.05, 0.05]
+
+    expected = [label for (_, label) in compute_cluster_labels(points, search_box, 4)]
+    num_clusters = len(set(expected)) - 1
+    print("In-memory DBSCAN found {} clusters.".format(num_clusters))
+
+    num_errors = 0
+    for (tile_span, processes) in [([1.0, 1.0], 1),
+                                   ([0.5], 1),
+                                   ([1.0, 1.0, 1.0], 2)]:
+        # Feed the points through a generator to make sure a single pass
+        # is enough.
+        result = list(compute_cluster_labels_tiled((p for p in points),
+                                                   search_box,
+                                                   4,
+                                                   tile_span,
+                                                   processes=processes,
+                                                   max_buffered_points=1000))
+        if [vertex_id for (vertex_id, _) in result] != list(range(len(points))):
+            print("ERROR: Tiled DBSCAN with tile span {} returned vertex IDs out of order.".format(tile_span))
+            num_errors += 1
+        actual = [label for (_, label) in result]
+        if not same_clusters(expected, actual):
+            print("ERROR: Tiled DBSCAN with tile span {} and {} processes found different clusters.".format(
+                tile_span, processes))
+            num_errors += 1
+
+    return num_errors
+
+# ----------------------------------------------------------------------
+
+def test_tile_span_too_small():
+    try:
+        compute_cluster_labels_tiled([(0, 0), (1, 1)], [0.5, 0.5], 2, [0.9])
+        print("ERROR: Tile span smaller than two search boxes did not raise ValueError.")
+        return 1
+    except ValueError:
+        return 0
+
+# ----------------------------------------------------------------------
+
+def main():
+    num_errors = test_tiled_matches_in_memory()
+    num_errors += test_tile_span_too_small()
+    return num_errors
+
+# ----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -35,8 +35,12 @@ The anomaly_detection() and R-Tree related functions
 are the primary driver functions for anomaly detection.
 """
 
+import array
+import io
 import logging
+import multiprocessing
 
+import numpy
 from tqdm import tqdm
 from tracktable.core.geomath import (ECEF_from_feet, compute_bounding_box,
                                      intersects, point_at_length_fraction)
@@ -64,7 +68,8 @@ def anomaly_detection(trajectories_to_analyze,
                       anomaly_threshold=0,
                       include_segments=False,
                       ram_limited=False,
-                      filename=None):
+                      filename=None,
+                      processors=1):
     """
     Analyzes a list of trajectories against a list of historical trajectories
     to detect anomalies. Anomalies are any trajectories with no historical
@@ -113,6 +118,9 @@ def anomaly_detection(trajectories_to_analyze,
         ram_limited (bool): Create an rtree from points WITHOUT creating a points list by adding points to the
             tree one at a time, helps build rtrees on resource constrained systems. (Default: False)
         filename (bool): CURRENTLY UNABLE TO OUTPUT ANOMALIES TO FILE. File to output anomalies to. (Default: False)
+        processors (int): Number of worker processes to score trajectories with. Zero means one per CPU.
+            Workers are forked so that they share the historical R-tree with this process instead of
+            receiving a copy. On platforms without fork() the trajectories are scored serially. (Default: 1)
 
     Returns:
         List that contains the index for every trajectory index that passes by the given trajectory.
@@ -141,45 +149,43 @@ def anomaly_detection(trajectories_to_analyze,
 
     logger.debug('Analyzing Each Trajectory for Anomalousness')
 
-    nearby_trajectories = []
-
-    anomalies_detected_with_points = 0
-    anomalies_detected_with_segments = 0
+    # The segment search falls back to every historical trajectory, so
+    #  index their segments once up front.
+    historical_segment_rtree = None
+    segment_idx_to_traj_idx = None
+    if include_segments:
+        historical_segment_rtree, segment_idx_to_traj_idx = create_segment_rtree(historical_trajectories)
+
+    score_kwargs = dict(historical_trajectories=historical_trajectories,
+                        historical_points_rtree=historical_points_rtree,
+                        point_idx_to_traj_idx=point_idx_to_traj_idx,
+                        num_historical_trajectories=num_historical_trajectories,
+                        nearness_radius=nearness_radius,
+                        consider_direction=consider_direction,
+                        num_control_points=num_control_points,
+                        start_fraction=start_fraction,
+                        end_fraction=end_fraction,
+                        anomaly_threshold=anomaly_threshold,
+                        include_segments=include_segments,
+                        historical_segment_rtree=historical_segment_rtree,
+                        segment_idx_to_traj_idx=segment_idx_to_traj_idx)
 
     # Finding any historical trajectories that pass by each trajectory we
     #  are analyzing.
-    for i, trajectory in enumerate(tqdm(trajectories_to_analyze, position=0, leave=True)):
-        nearby_trajs = _find_passersby(trajectory,
-                                          point_idx_to_traj_idx,
-                                          historical_points_rtree,
-                                          num_historical_trajectories,
-                                          nearness_radius,
-                                          consider_direction=consider_direction,
-                                          num_control_points=num_control_points,
-                                          start_fraction=start_fraction,
-                                          end_fraction=end_fraction,
-                                          anomaly_threshold=anomaly_threshold)
-
-        if len(nearby_trajs) == 0:
-            anomalies_detected_with_points += 1
-
-            if include_segments:
-
-                logger.debug(f'{i}: Point search found {len(nearby_trajs)} nearby trajectories.')
-
-                nearby_trajs = _find_passersby_using_segments(trajectory,
-                                                             historical_trajectories,
-                                                             nearness_radius,
-                                                             num_control_points=num_control_points,
-                                                             start_fraction=start_fraction,
-                                                             end_fraction=end_fraction,
-                                                             anomaly_threshold=anomaly_threshold)
-                if len(nearby_trajs) == 0:
-                    anomalies_detected_with_segments += 1
-
-                logger.debug(f'***Segment search found {len(nearby_trajs)} nearby trajectories.')
-
-        nearby_trajectories.append(nearby_trajs)
+    if processors != 1 and 'fork' in multiprocessing.get_all_start_methods():
+        scores = _score_trajectories_in_parallel(trajectories_to_analyze,
+                                                 processors,
+                                                 score_kwargs)
+    else:
+        if processors != 1:
+            logger.warning('Parallel anomaly detection requires fork(). '
+                           'Scoring trajectories serially.')
+        scores = [_score_trajectory(i, trajectory, **score_kwargs)
+                  for i, trajectory in enumerate(tqdm(trajectories_to_analyze, position=0, leave=True))]
+
+    nearby_trajectories = [nearby_trajs for (nearby_trajs, _, _) in scores]
+    anomalies_detected_with_points = sum(1 for (_, found_with_points, _) in scores if found_with_points)
+    anomalies_detected_with_segments = sum(1 for (_, _, found_with_segments) in scores if found_with_segments)
 
     logger.debug(f'Detected {anomalies_detected_with_points} anomalies ')
 
@@ -191,6 +197,99 @@ def anomaly_detection(trajectories_to_analyze,
     return nearby_trajectories
 
 
+# Worker processes inherit this through fork() so that the historical
+# R-tree and trajectories are shared rather than pickled for every task.
+_PARALLEL_SCORING_STATE = None
+
+
+def _score_trajectory(i,
+                      trajectory,
+                      historical_trajectories,
+                      historical_points_rtree,
+                      point_idx_to_traj_idx,
+                      num_historical_trajectories,
+                      nearness_radius,
+                      consider_direction,
+                      num_control_points,
+                      start_fraction,
+                      end_fraction,
+                      anomaly_threshold,
+                      include_segments,
+                      historical_segment_rtree,
+                      segment_idx_to_traj_idx):
+    """Find the historical passersby of a single trajectory.
+
+    Returns:
+        Tuple of (passersby, anomalous using points, anomalous using segments)
+    """
+
+    nearby_trajs = _find_passersby(trajectory,
+                                   point_idx_to_traj_idx,
+                                   historical_points_rtree,
+                                   num_historical_trajectories,
+                                   nearness_radius,
+                                   consider_direction=consider_direction,
+                                   num_control_points=num_control_points,
+                                   start_fraction=start_fraction,
+                                   end_fraction=end_fraction,
+                                   anomaly_threshold=anomaly_threshold)
+
+    anomalous_with_points = (len(nearby_trajs) == 0)
+    anomalous_with_segments = False
+
+    if anomalous_with_points and include_segments:
+
+        logger.debug(f'{i}: Point search found {len(nearby_trajs)} nearby trajectories.')
+
+        nearby_trajs = _find_passersby_using_segments(trajectory,
+                                                     historical_trajectories,
+                                                     nearness_radius,
+                                                     num_control_points=num_control_points,
+                                                     start_fraction=start_fraction,
+                                                     end_fraction=end_fraction,
+                                                     anomaly_threshold=anomaly_threshold,
+                                                     historical_segment_rtree=historical_segment_rtree,
+                                                     segment_idx_to_traj_idx=segment_idx_to_traj_idx)
+        anomalous_with_segments = (len(nearby_trajs) == 0)
+
+        logger.debug(f'***Segment search found {len(nearby_trajs)} nearby trajectories.')
+
+    return nearby_trajs, anomalous_with_points, anomalous_with_segments
+
+
+def _score_trajectory_by_index(i):
+    trajectories_to_analyze, score_kwargs = _PARALLEL_SCORING_STATE
+    return _score_trajectory(i, trajectories_to_analyze[i], **score_kwargs)
+
+
+def _score_trajectories_in_parallel(trajectories_to_analyze, processors, score_kwargs):
+    """Score trajectories across forked worker processes.
+
+    Only trajectory indices and results cross process boundaries.
+    Results come back in the same order as trajectories_to_analyze.
+    """
+
+    global _PARALLEL_SCORING_STATE
+    trajectories_to_analyze = list(trajectories_to_analyze)
+    _PARALLEL_SCORING_STATE = (trajectories_to_analyze, score_kwargs)
+
+    if processors == 0:
+        processors = multiprocessing.cpu_count()
+
+    try:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(processes=processors) as pool:
+            chunksize = max(1, len(trajectories_to_analyze) // (processors * 16))
+            return list(tqdm(pool.imap(_score_trajectory_by_index,
+                                       range(len(trajectories_to_analyze)),
+                                       chunksize=chunksize),
+                             total=len(trajectories_to_analyze),
+                             position=0,
+                             leave=True))
+    finally:
+        _PARALLEL_SCORING_STATE = None
+
+
 # TODO: Test if this is faster/slower than Tracktable's compute_bounding_box with buffer, then ECEF conversion to corners.
 def _create_rtree_bounding_box(center_point,
                               buffer,
@@ -233,69 +332,59 @@ def _create_rtree_bounding_box(center_point,
     return min_corner_fv, max_corner_fv
 
 
-def _add_nearby_historical_points(traj_indices_near_all_control_points,
-                                 control_point,
-                                 nearness_radius,
-                                 point_idx_to_traj_idx,
-                                 num_historical_trajs,
-                                 historical_points_rtree,
-                                 i):
-    """Given a set of historical trajectory indices that have been near all of the
-       control points thus far, reduce this set to include only trajectories that
-       are also near the given control point.
+def _traj_indices_near_control_points(trajectory,
+                                      control_point_fractions,
+                                      nearness_radius,
+                                      point_idx_to_traj_idx,
+                                      num_historical_trajs,
+                                      historical_points_rtree):
+    """Find the historical trajectories near each of several control points.
+
+    All of the search boxes go to the R-tree in a single batch query
+    instead of one query per control point.
 
     Arguments:
-        traj_indices_near_all_control_points (list): List that contains
-            the index for every trajectory that passes by the given trajectory.
-        control_point (Tracktable point): Point along the trajectory equally-spaced
-            from the previous and next points.
+        trajectory (Tracktable Trajectory): Trajectory to sample control points from.
+        control_point_fractions (list): Fractions along the trajectory
+            where the control points lie.
         nearness_radius (float): The inradius, in km, of the cubes
-            centered at each control point. Only trajectories within all of
-            these cubes will be considered passersby.
+            centered at each control point.
         point_idx_to_traj_idx (dict): A quick lookup to check what
-            trajectory index a point index from the
-            rtree corresponds to. If not specified, will be created.
+            trajectory index a point index from the rtree corresponds to.
+            If empty, the trajectory index is read from the rtree's points.
         num_historical_trajs (int): The total number of historical trajectories.
-        historical_points_rtree (Tracktable RTree object): We will compare
-            each trajectory in trajectories_to_analyze to these
-            trajectory points to determine anomalous behavior. If not specified,
-            historical_trajectories must be given so that an rtree can be
-            created.
-        i (int): Index of current control point along the trajectory.
+        historical_points_rtree (Tracktable RTree object): R-tree of
+            historical trajectory points.
 
     Returns:
-        The min and max corner values of the bounding box.
+        A list with one set of trajectory indices per control point.
     """
 
-    # If we don't have a quick lookup dict, we'll need to use the rtree's list.
-    if len(point_idx_to_traj_idx) == 0:
-        points = historical_points_rtree.points
-
-    # Create a search box around this control point to use in the rtree.
-    min_corner, max_corner = _create_rtree_bounding_box(control_point,
-                                                       nearness_radius,
-                                                       num_historical_trajs)
+    # Create a search box around each control point to use in the rtree.
+    min_corners = []
+    max_corners = []
+    for fraction in control_point_fractions:
+        control_point = point_at_length_fraction(trajectory, fraction)
+        min_corner, max_corner = _create_rtree_bounding_box(control_point,
+                                                           nearness_radius,
+                                                           num_historical_trajs)
+        min_corners.append(min_corner)
+        max_corners.append(max_corner)
 
     # Find points from the historical trajectories that are within
-    #  our bounding box.
-    point_indices_near_control_point = historical_points_rtree.find_points_in_box(min_corner=min_corner,
-                                                                                 max_corner=max_corner)
+    #  each bounding box.
+    (offsets, point_indices) = historical_points_rtree.find_points_in_boxes(min_corners, max_corners)
 
-    # Identify unique trajectories near this control point.
+    # Identify unique trajectories near each control point.  Column 3
+    #  of the points array holds the trajectory index as a float.
     if len(point_idx_to_traj_idx) == 0:
-        traj_indices_near_control_point = {points[point_index][3]
-                                           for point_index in point_indices_near_control_point}
-    else:
-        traj_indices_near_control_point = {point_idx_to_traj_idx[point_index]
-                                           for point_index in point_indices_near_control_point}
-
-    # Identify unique trajectories near ALL control points.
-    if i == 0:
-        traj_indices_near_all_control_points = traj_indices_near_control_point
+        points = historical_points_rtree.points
+        return [set(points[point_indices[offsets[i]:offsets[i+1]], 3].astype(numpy.int64).tolist())
+                for i in range(len(control_point_fractions))]
     else:
-        traj_indices_near_all_control_points = traj_indices_near_control_point.intersection(traj_indices_near_all_control_points)
-
-    return traj_indices_near_all_control_points
+        return [{point_idx_to_traj_idx[point_index]
+                 for point_index in point_indices[offsets[i]:offsets[i+1]].tolist()}
+                for i in range(len(control_point_fractions))]
 
 
 def _find_passersby(trajectory,
@@ -352,24 +441,24 @@ def _find_passersby(trajectory,
     List that contains the index for every trajectory that passes by the given trajectory.
     """
 
-    # If we don't have a quick lookup dict, we'll need to use the rtree's list.
-    if len(point_idx_to_traj_idx) == 0:
-        points = historical_points_rtree.points
-
-    traj_indices_near_all_control_points = set()
+    # Get points along the trajectory (equally-spaced from the previous and next points).
+    control_point_fractions = [start_fraction + (end_fraction - start_fraction) * i / (num_control_points - 1)
+                               for i in range(num_control_points)]
 
-    for i in range(num_control_points):
-        # Get a point along the trajectory (equally-spaced from the previous and next points).
-        control_point = point_at_length_fraction(trajectory,
-                                                 start_fraction + (end_fraction - start_fraction) * i / (num_control_points - 1))
+    traj_indices_near_each_control_point = _traj_indices_near_control_points(trajectory,
+                                                                             control_point_fractions,
+                                                                             nearness_radius,
+                                                                             point_idx_to_traj_idx,
+                                                                             num_historical_trajs,
+                                                                             historical_points_rtree)
 
-        traj_indices_near_all_control_points = _add_nearby_historical_points(traj_indices_near_all_control_points,
-                                                                            control_point,
-                                                                            nearness_radius,
-                                                                            point_idx_to_traj_idx,
-                                                                            num_historical_trajs,
-                                                                            historical_points_rtree,
-                                                                            i)
+    traj_indices_near_all_control_points = set()
+    for i, traj_indices_near_control_point in enumerate(traj_indices_near_each_control_point):
+        # Identify unique trajectories near ALL control points.
+        if i == 0:
+            traj_indices_near_all_control_points = traj_indices_near_control_point
+        else:
+            traj_indices_near_all_control_points = traj_indices_near_control_point.intersection(traj_indices_near_all_control_points)
 
         # If there are not enough unique trajectories near all control points so far, this trajectory must be anomalous.
         if len(traj_indices_near_all_control_points) == anomaly_threshold:
@@ -385,7 +474,9 @@ def _find_passersby_using_segments(trajectory,
                                   start_fraction=0,
                                   end_fraction=1,
                                   num_control_points=4,
-                                  anomaly_threshold=0):
+                                  anomaly_threshold=0,
+                                  historical_segment_rtree=None,
+                                  segment_idx_to_traj_idx=None):
 
     """
     Determines what vehicles from the historical dataset have passed by the
@@ -426,25 +517,49 @@ def _find_passersby_using_segments(trajectory,
             control points when looking for passersby. (Default: 1)
         anomaly_threshold (int): Trajectories with total passersby equal to or less than this number
             will be considered anomalous. (Default: 0)
+        historical_segment_rtree (Tracktable R-Tree): R-tree of historical segment
+            bounding boxes from create_segment_rtree(). If not specified, one will be
+            built from historical_trajectories. (Default: None)
+        segment_idx_to_traj_idx (array): Trajectory index for each segment in
+            historical_segment_rtree. (Default: None)
 
     Returns
     -------
     List that contains the index for every trajectory that passes by the given trajectory.
     """
 
-    traj_indices_near_all_control_points = set()
+    if historical_segment_rtree is None:
+        historical_segment_rtree, segment_idx_to_traj_idx = create_segment_rtree(historical_trajectories)
 
+    # Create a search box around each control point (equally-spaced from
+    #  the previous and next points).
+    search_boxes = []
     for i in range(num_control_points):
-        # Get a point along the trajectory (equally-spaced from the previous
-        #  and next points).
         control_point = point_at_length_fraction(trajectory,
                                                  start_fraction + (end_fraction - start_fraction) * i / (num_control_points - 1))
+        search_boxes.append(compute_bounding_box([control_point], buffer=(nearness_radius,)*2))
+
+    # A segment's bounding box overlaps a search box exactly when its
+    #  (min corner, max corner) feature vector lies in this query region.
+    dimension = len(search_boxes[0].min_corner)
+    unbounded = numpy.finfo(numpy.float64).max
+    min_corners = [[-unbounded] * dimension + [box.min_corner[d] for d in range(dimension)]
+                   for box in search_boxes]
+    max_corners = [[box.max_corner[d] for d in range(dimension)] + [unbounded] * dimension
+                   for box in search_boxes]
+    (offsets, segment_indices) = historical_segment_rtree.find_points_in_boxes(min_corners, max_corners)
+
+    traj_indices_near_all_control_points = set()
+
+    for i, search_box in enumerate(search_boxes):
+        # Only trajectories with a segment near the control point can
+        #  intersect the search box.
+        candidates = set(segment_idx_to_traj_idx[segment_indices[offsets[i]:offsets[i+1]]].tolist())
 
         traj_indices_near_control_point = set()
 
-        for traj_index, hist_trajectory in enumerate(historical_trajectories):
-            if intersects(hist_trajectory,
-                          compute_bounding_box([control_point], buffer=(nearness_radius,)*2)):
+        for traj_index in candidates:
+            if intersects(historical_trajectories[traj_index], search_box):
                 traj_indices_near_control_point.add(traj_index)
 
         # Identify unique trajectories near ALL control points.
@@ -522,6 +637,9 @@ def points_to_rtree(points):
 
     """Put points into R-Tree.
 
+    The tree is bulk-loaded from a single array of feature vectors,
+    which is much faster than inserting the points one at a time.
+
     Arguments:
         points (list): List of points to put into an R-Tree.
 
@@ -531,7 +649,7 @@ def points_to_rtree(points):
 
     logger.debug('Create Points R-Tree (no bar)')
 
-    return RTree(points=points)
+    return RTree.from_array(numpy.asarray(points, dtype=numpy.float64))
 
 
 def trajectories_to_rtree(trajectories, create_lookup=True):
@@ -571,46 +689,133 @@ def traj_reader_to_rtree(reader):
         R-Tree of points and trajectory index
     """
 
-    points_rtree = RTree()
-    for traj_index, trajectory in enumerate(tqdm(reader)):
+    points, num_trajectories = _trajectories_to_ecef_array(reader)
+    return RTree.from_array(points), num_trajectories
+
+
+def _trajectories_to_ecef_array(trajectories, first_traj_index=0):
+    """Convert trajectory points to an (N, 4) array of ECEF coordinates.
+
+    Each row is (x, y, z, trajectory_index).  This works for readers as
+    well as lists since the number of points does not need to be known
+    in advance.
+
+    Arguments:
+        trajectories (iterable): Trajectories (or a trajectory reader) to convert.
+
+    Keyword Arguments:
+        first_traj_index (int): Trajectory index to assign to the first trajectory. (Default: 0)
+
+    Returns:
+        Array of points and the number of trajectories converted
+    """
+
+    # The number of points is not known in advance, so accumulate the
+    # coordinates in a compact array of doubles.
+    coordinates = array.array('d')
+    num_trajectories = 0
+    for trajectory in tqdm(trajectories):
+        traj_index = first_traj_index + num_trajectories
         for point in trajectory:
             # Convert this point to ECEF for more exact distance calculations.
             point.set_property("altitude", 0)
             ecef_point = ECEF_from_feet(point, "altitude")
-            # Add the point (and its trajectory index) to our r-tree.
-            points_rtree.insert_point(convert_to_feature_vector([ecef_point[0],
-                                                                 ecef_point[1],
-                                                                 ecef_point[2],
-                                                                 traj_index]))
+            # Record the point (and its trajectory index) for the r-tree.
+            coordinates.extend((ecef_point[0], ecef_point[1], ecef_point[2], traj_index))
+        num_trajectories += 1
 
-    return points_rtree, traj_index+1
+    points = numpy.frombuffer(coordinates, dtype=numpy.float64).reshape(-1, 4)
+    return points, num_trajectories
 
 
 def trajectories_to_rtree_ram_limited(trajectories):
     """
-    Create an rtree from points WITHOUT creating a points list by adding points to the
-    tree one at a time.
+    Create an rtree from points WITHOUT creating a points list.
+
+    The ECEF coordinates of every point are written straight into a
+    single preallocated array, which is then bulk-loaded into the tree.
+    No per-point Python objects are kept.
 
     Arguments:
         trajectories (list): trajectories to create an rtree from.
 
     Returns:
-        R-Tree of points and trajectory index
+        R-Tree of points and an empty trajectory index lookup.  The
+        trajectory index for a point is stored in column 3 of
+        the tree's points array.
     """
 
-    points_rtree = RTree()
+    num_points = sum(len(trajectory) for trajectory in trajectories)
+    points = numpy.empty((num_points, 4), dtype=numpy.float64)
+    point_index = 0
     for traj_index, trajectory in enumerate(tqdm(trajectories)):
         for point in trajectory:
             # Convert this point to ECEF for more exact distance calculations.
             point.set_property("altitude", 0)
             ecef_point = ECEF_from_feet(point, "altitude")
-            # Add the point (and its trajectory index) to our r-tree.
-            points_rtree.insert_point(convert_to_feature_vector([ecef_point[0],
-                                                                 ecef_point[1],
-                                                                 ecef_point[2],
-                                                                 traj_index]))
+            # Record the point (and its trajectory index) for the r-tree.
+            points[point_index] = (ecef_point[0], ecef_point[1], ecef_point[2], traj_index)
+            point_index += 1
+
+    return RTree.from_array(points), {}
+
+
+def create_segment_rtree(trajectories):
+
+    """Put the segments of trajectories into an R-tree.
+
+    Each segment is stored as a feature vector holding the min and max
+    corners of its bounding box, so a box overlap query becomes a
+    range query on the tree.  Terrestrial segments are great circle
+    arcs and can bulge past the latitudes of their endpoints, so their
+    boxes are padded enough to contain the whole arc.
+
+    Arguments:
+        trajectories (list): trajectories to index.
 
-    return points_rtree
+    Returns:
+        R-Tree of segment boxes and an array with the trajectory index for each segment
+    """
+
+    logger.debug('Create Segment R-Tree')
+
+    boxes = []
+    segment_idx_to_traj_idx = []
+    for traj_index, trajectory in enumerate(tqdm(trajectories)):
+        if len(trajectory) == 0:
+            continue
+        coordinates = trajectory.coordinates_as_array()
+        if len(coordinates) == 1:
+            starts = ends = coordinates
+        else:
+            starts = coordinates[:-1]
+            ends = coordinates[1:]
+        min_corners = numpy.minimum(starts, ends)
+        max_corners = numpy.maximum(starts, ends)
+        if trajectory.domain == 'terrestrial':
+            _pad_great_circle_boxes(starts, ends, min_corners, max_corners)
+        boxes.append(numpy.hstack((min_corners, max_corners)))
+        segment_idx_to_traj_idx.append(numpy.full(len(min_corners), traj_index, dtype=numpy.int64))
+
+    if len(boxes) == 0:
+        return RTree(), numpy.zeros(0, dtype=numpy.int64)
+    return RTree.from_array(numpy.concatenate(boxes)), numpy.concatenate(segment_idx_to_traj_idx)
+
+
+def _pad_great_circle_boxes(starts, ends, min_corners, max_corners):
+    # Segments that cross the antimeridian get the full longitude range.
+    delta_lon = numpy.abs(ends[:, 0] - starts[:, 0])
+    wraps = delta_lon > 180
+    min_corners[wraps, 0] = -180
+    max_corners[wraps, 0] = 180
+    delta_lon = numpy.where(wraps, 360 - delta_lon, delta_lon)
+
+    # Every point on an arc is within half the arc's length of one of
+    #  its endpoints, and the arc is no longer than delta_lat + delta_lon
+    #  degrees.
+    bulge = (delta_lon + numpy.abs(ends[:, 1] - starts[:, 1])) / 2
+    min_corners[:, 1] = numpy.maximum(min_corners[:, 1] - bulge, -90)
+    max_corners[:, 1] = numpy.minimum(max_corners[:, 1] + bulge, 90)
 
 
 def create_rtree(trajectories=None, reader=None, ram_limited=False):
@@ -637,6 +842,169 @@ def create_rtree(trajectories=None, reader=None, ram_limited=False):
             return trajectories_to_rtree(trajectories)
 
 
+##############################################################################
+# PERSISTENT HISTORICAL INDEX
+##############################################################################
+
+# A historical index file is an ordinary NumPy .npy file holding the
+# (N, 4) array of (x, y, z, trajectory_index) rows that the R-tree is
+# built from.  Converting the historical points to ECEF is by far the
+# most expensive part of building the tree, so we store the converted
+# points and rebuild the packed tree from a memory-mapped view of the
+# file when it is opened.  The trajectory index lookup is column 3 of
+# the array, so no separate lookup table needs to be stored.
+#
+# The first row is not a point.  It holds (NaN, NaN, NaN,
+# num_trajectories).  The number of trajectories cannot be recovered
+# from the points because a trajectory with no points has no rows.
+
+
+def save_historical_index(filename, trajectories=None, reader=None):
+    """Convert historical trajectories and save them as an index file.
+
+    The file can be reopened with load_historical_index() and extended
+    with append_to_historical_index().  Any existing file is overwritten.
+
+    Arguments:
+        filename (str): Path to the index file.
+
+    Keyword Arguments:
+        trajectories (list): trajectories to index. (Default: None)
+        reader (Tracktable trajectory reader): Trajectory reader to index. (Default: None)
+
+    Returns:
+        Number of trajectories in the index
+    """
+
+    source = _historical_index_source(trajectories, reader)
+    points, num_trajectories = _trajectories_to_ecef_array(source)
+    with open(filename, 'wb') as outfile:
+        numpy.save(outfile, numpy.concatenate((_index_header_row(num_trajectories), points)))
+    return num_trajectories
+
+
+def append_to_historical_index(filename, trajectories=None, reader=None):
+    """Add more historical trajectories to an existing index file.
+
+    Only the new trajectories are converted.  They are numbered after
+    the trajectories that are already in the index.  The new rows are
+    appended to the file in place whenever the array header has room
+    for the new shape; otherwise the file is rewritten.
+
+    Arguments:
+        filename (str): Path to an index file written by save_historical_index().
+
+    Keyword Arguments:
+        trajectories (list): trajectories to add. (Default: None)
+        reader (Tracktable trajectory reader): Trajectory reader to add. (Default: None)
+
+    Returns:
+        Number of trajectories in the index after appending
+    """
+
+    source = _historical_index_source(trajectories, reader)
+    num_existing = _num_trajectories_in_index(filename, numpy.load(filename, mmap_mode='r'))
+
+    new_points, num_new = _trajectories_to_ecef_array(source,
+                                                      first_traj_index=num_existing)
+    if len(new_points) > 0:
+        _append_rows_to_npy_file(filename, new_points)
+
+    index_rows = numpy.load(filename, mmap_mode='r+')
+    index_rows[0, 3] = num_existing + num_new
+    index_rows.flush()
+    del index_rows
+    return num_existing + num_new
+
+
+def load_historical_index(filename, memory_map=True):
+    """Open a historical index file and build its R-tree.
+
+    The R-tree is bulk-loaded from the stored ECEF points.  The result
+    can be passed straight to anomaly_detection() as
+    historical_points_rtree and num_historical_trajectories.
+
+    Arguments:
+        filename (str): Path to an index file written by save_historical_index().
+
+    Keyword Arguments:
+        memory_map (bool): Memory-map the points instead of reading them into RAM. (Default: True)
+
+    Returns:
+        R-Tree of points and number of trajectories.  The trajectory
+        index for a point is stored in column 3 of the tree's points array.
+    """
+
+    index_rows = numpy.load(filename, mmap_mode=('r' if memory_map else None))
+    num_trajectories = _num_trajectories_in_index(filename, index_rows)
+    return RTree.from_array(index_rows[1:]), num_trajectories
+
+
+def _historical_index_source(trajectories, reader):
+    if trajectories is None:
+        if reader is None:
+            raise Exception('Either a trajectory list or TrajectoryReader object must be given.')
+        return reader
+    return trajectories
+
+
+def _index_header_row(num_trajectories):
+    return numpy.array([[numpy.nan, numpy.nan, numpy.nan, num_trajectories]],
+                       dtype=numpy.float64)
+
+
+def _num_trajectories_in_index(filename, index_rows):
+    # The count is stored in the header row.  Anything without one is
+    # not an index file.
+    if (index_rows.ndim != 2 or index_rows.shape[0] == 0 or index_rows.shape[1] != 4
+            or not numpy.isnan(index_rows[0, :3]).all()):
+        raise ValueError(('{} is not a historical index: expected a header row '
+                          'followed by an array of shape (N, 4), got an array '
+                          'of shape {}').format(filename, index_rows.shape))
+    return int(index_rows[0, 3])
+
+
+def _append_rows_to_npy_file(filename, rows):
+    """Append rows to the 2D float64 array stored in a .npy file."""
+
+    rows = numpy.ascontiguousarray(rows, dtype=numpy.float64)
+    with open(filename, 'r+b') as npy_file:
+        version = numpy.lib.format.read_magic(npy_file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(npy_file)
+            write_header = numpy.lib.format.write_array_header_1_0
+        else:
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(npy_file)
+            write_header = numpy.lib.format.write_array_header_2_0
+        header_length = npy_file.tell()
+
+        if fortran_order or dtype != rows.dtype or shape[1:] != rows.shape[1:]:
+            raise ValueError('Cannot append rows of shape {} to {} with shape {}'.format(
+                rows.shape, filename, shape))
+
+        new_header = {
+            'descr': numpy.lib.format.dtype_to_descr(dtype),
+            'fortran_order': False,
+            'shape': (shape[0] + rows.shape[0],) + tuple(shape[1:])
+            }
+        header_buffer = io.BytesIO()
+        write_header(header_buffer, new_header)
+
+        if len(header_buffer.getvalue()) == header_length:
+            # The header grows in place and the new rows go at the end.
+            npy_file.seek(header_length + shape[0] * rows.shape[1] * rows.itemsize)
+            npy_file.truncate()
+            npy_file.write(rows.tobytes())
+            npy_file.seek(0)
+            npy_file.write(header_buffer.getvalue())
+            return
+
+    # The header has no room for the new shape.  Rewrite the whole file.
+    existing_rows = numpy.load(filename)
+    with open(filename, 'wb') as outfile:
+        numpy.save(outfile, numpy.concatenate((existing_rows, rows)))
+
+
 ##############################################################################
 # HELPER FUNCTIONS
 ##############################################################################
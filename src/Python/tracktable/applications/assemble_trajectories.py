@@ -32,10 +32,24 @@ tracktable.applications.assemble_trajectories - Sources that turn a sequence of
 """
 
 import datetime
+import heapq
+import itertools
 import logging
+import multiprocessing
+import queue
+import sys
+import traceback
 
+from tracktable.core import Timestamp
 from tracktable.core.geomath import distance
 
+#: Version number written into assembler checkpoints.  Bump this when
+#: the layout of the checkpoint dictionary changes.
+CHECKPOINT_VERSION = 2
+
+#: Number of points handed to the compiled assembler at a time
+NATIVE_BATCH_SIZE = 10000
+
 
 class AssembleTrajectoryFromPoints(object):
     """Turn a sequence of points into a set of trajectories
@@ -57,6 +71,15 @@ class AssembleTrajectoryFromPoints(object):
             distance (in KM) between adjacent points in a trajectory
        minimum_length (integer): Complete trajectories with fewer
             than this many points will be discarded
+       reorder_window (datetime.timedelta): If set, points may arrive
+            up to this far out of timestamp order.  See below.
+       late_point_count (integer): Number of points discarded because
+            they arrived after the reorder window had closed on them
+       watermark (datetime.datetime): Latest time passed to
+            advance_watermark(), or None if it has never been called
+       use_native (bool): Let trajectories() hand the work to the
+            compiled TrajectoryAssembler from the point's domain.
+            Defaults to True.  The results are the same either way.
 
     Example:
 
@@ -74,6 +97,37 @@ class AssembleTrajectoryFromPoints(object):
         for trajectory in t_source.trajectories():
             # (do whatever you want)
 
+    The assembler can also run incrementally on a live feed.  Hand it
+    each micro-batch of points with add_points(), then call
+    advance_watermark() with the time up to which the feed is
+    complete to finish trajectories that have gone quiet.  The
+    trajectories still in progress can be saved with checkpoint() and
+    picked up again with restore(), so a restart does not lose any
+    open tracks:
+
+    .. code-block:: python
+
+        assembler = AssembleTrajectoryFromPoints()
+        if saved_state is not None:
+            assembler.restore(saved_state)
+
+        for (batch, batch_end_time) in feed:
+            for trajectory in assembler.add_points(batch):
+                # (do whatever you want)
+            for trajectory in assembler.advance_watermark(batch_end_time):
+                # (do whatever you want)
+            saved_state = assembler.checkpoint()
+
+    Live feeds seldom arrive in perfect timestamp order.  Set
+    'reorder_window' to the largest delay you expect and points will
+    be held in a buffer, ordered by timestamp, until the newest
+    timestamp seen is more than reorder_window past them.  Only then
+    are they assembled.  A point that shows up after that has
+    happened is too late: it is discarded and counted in
+    'late_point_count'.  The buffer holds at most reorder_window's
+    worth of points, so memory stays bounded no matter how long the
+    feed runs.  advance_watermark() and flush() also empty the buffer
+    up to the watermark and completely, respectively.
     """
 
     def __init__(self):
@@ -88,8 +142,19 @@ class AssembleTrajectoryFromPoints(object):
         self.separation_time = datetime.timedelta(minutes=30)
         self.separation_distance = None
         self.minimum_length = 2
+        self.reorder_window = None
+        self.use_native = True
         self.points_processed_count = 0
         self.valid_trajectory_count = 0
+        self.invalid_trajectory_count = 0
+        self.late_point_count = 0
+        self.watermark = None
+        self._trajectory_class = None
+        self._trajectories_in_progress = {}
+        self._reorder_buffer = []
+        self._reorder_sequence = itertools.count()
+        self._release_time = None
+        self._logger = logging.getLogger(__name__ + "AssembleTrajectoryFromPoints")
 
 
     def trajectories(self):
@@ -110,17 +175,19 @@ class AssembleTrajectoryFromPoints(object):
         The input sequence of trajectories will only be traversed
         once.
 
+        This call starts from scratch: any state left over from
+        add_points() or restore() is discarded first.
+
+        Unless 'use_native' is False, the points are assembled by the
+        compiled TrajectoryAssembler for their domain, which is much
+        faster than doing the same work in Python.
+
         Yields:
           Trajectories built from input points
         """
 
-        logger = logging.getLogger(__name__ + "AssembleTrajectoryFromPoints")
-        trajectory_class = None
-        trajectories_in_progress = {}
-
-        self.valid_trajectory_count = 0
-        self.invalid_trajectory_count = 0
-        self.points_processed_count = 0
+        logger = self._logger
+        self.reset()
 
         logger.info(("New trajectories will be declared after a separation "
                      "of {} distance units between two points or a time lapse "
@@ -130,56 +197,110 @@ class AssembleTrajectoryFromPoints(object):
         logger.info(("Trajectories with fewer than {} points will "
                      "be discarded.").format(self.minimum_length))
 
-        for point in self.input:
+        points = iter(self.input)
+        native_assembler = None
+        if self.use_native:
+            # Peek at the first point to find out which domain we're in.
+            for first_point in points:
+                points = itertools.chain([first_point], points)
+                native_assembler = self._make_native_assembler(first_point)
+                break
+
+        if native_assembler is not None:
+            for trajectory in self._native_trajectories(native_assembler, points):
+                yield trajectory
+        else:
+            if self.reorder_window:
+                points = self._reorder_points(points)
+            for trajectory in self._assemble_points(points):
+                yield trajectory
+
+            # We've finished iterating over all the position updates in
+            # the window. Go through all the position updates we're still
+            # hanging onto and make trajectories out of them.
+            for trajectory in self.flush():
+                yield trajectory
+
+        logger.info(
+            ("Done assembling trajectories. {} trajectories produced and "
+             "{} discarded for having fewer than {} points.").format(
+                 self.valid_trajectory_count,
+                 self.invalid_trajectory_count,
+                 self.minimum_length))
+
+        if self.valid_trajectory_count == 0:
+            logger.warning(
+                ("Perplexity: No trajectories produced. Are you sure your "
+                 "delimiters and your column assignments are correct?"))
+        return
+
+
+    def __iter__(self):
+        return self.trajectories()
+
+
+    def reset(self):
+        """Discard all trajectories in progress and zero the counters."""
+
+        self.points_processed_count = 0
+        self.valid_trajectory_count = 0
+        self.invalid_trajectory_count = 0
+        self.late_point_count = 0
+        self.watermark = None
+        self._trajectory_class = None
+        self._trajectories_in_progress = {}
+        self._reorder_buffer = []
+        self._reorder_sequence = itertools.count()
+        self._release_time = None
+
+
+    def add_points(self, points):
+        """Add a batch of points to the trajectories in progress.
+
+        Points must arrive sorted by increasing timestamp, both within
+        a batch and from one batch to the next, unless
+        'reorder_window' is set.  All of the points are consumed
+        before this returns.  Trajectories that they complete
+        (because of a time or distance gap) are returned.  Everything
+        else stays in progress until a later batch,
+        advance_watermark() or flush() finishes it.
+
+        Arguments:
+           points (iterable): TrajectoryPoint objects sorted by timestamp
+
+        Returns:
+           List of trajectories completed by the new points
+        """
+
+        if self.reorder_window:
+            points = self._reorder_points(points)
+        return list(self._assemble_points(points))
+
+
+    def _assemble_points(self, points):
+        """Add points in timestamp order to the trajectories in progress."""
+
+        for point in points:
             self.points_processed_count += 1
+            trajectories_in_progress = self._trajectories_in_progress
 
-            if trajectory_class is None:
-                trajectory_class = point.domain_classes['Trajectory']
+            if self._trajectory_class is None:
+                self._trajectory_class = point.domain_classes['Trajectory']
 
             object_id = point.object_id
-            if object_id not in trajectories_in_progress:
+            updates_so_far = trajectories_in_progress.get(object_id, None)
+            if updates_so_far is None:
+                trajectories_in_progress[object_id] = [ point ]
+            elif self._is_separated(updates_so_far[-1], point):
+                # We've passed our threshold for declaring a new
+                # trajectory
+                new_trajectory = self._finish_trajectory(updates_so_far)
+                if new_trajectory is not None:
+                    yield new_trajectory
                 trajectories_in_progress[object_id] = [ point ]
             else:
-                updates_so_far = trajectories_in_progress[object_id]
-                time_since_last_update = point.timestamp - updates_so_far[-1].timestamp
-                distance_since_last_update = distance(point, updates_so_far[-1])
-
-                if ((self.separation_time and
-                     time_since_last_update > self.separation_time)
-                    or
-                    (self.separation_distance and
-                     distance_since_last_update > self.separation_distance)):
-
-                    # We've passed our threshold for declaring a new
-                    # trajectory
-                    if len(updates_so_far) >= self.minimum_length:
-                        new_trajectory = trajectory_class.from_position_list(updates_so_far)
-                        self.valid_trajectory_count += 1
-                        yield(new_trajectory)
-
-                        if self.valid_trajectory_count > 0 and self.valid_trajectory_count % 100 == 0:
-                            logger.debug(
-                                ("(1) {} trajectories announced and {} "
-                                 "discarded for having fewer than {} "
-                                 "points").format(
-                                     self.valid_trajectory_count,
-                                     self.invalid_trajectory_count,
-                                     self.minimum_length))
-                    else:
-                        self.invalid_trajectory_count += 1
-                        if self.invalid_trajectory_count > 0 and self.invalid_trajectory_count % 100 == 0:
-                            logger.debug(
-                                ("(2) STATUS: {} trajectories announced and {} "
-                                 "discarded for having fewer than {} "
-                                 "points").format(
-                                     self.valid_trajectory_count,
-                                     self.invalid_trajectory_count,
-                                     self.minimum_length))
-                    trajectories_in_progress[object_id] = [ point ]
-
-                else:
-                    # This is a continuation of an existing trajectory
-                    updates_so_far.append(point)
+                # This is a continuation of an existing trajectory
+                updates_so_far.append(point)
 
             # Every so often we need to go through and flush out
             # trajectories that are in progress. We can only do this
@@ -189,80 +310,607 @@ class AssembleTrajectoryFromPoints(object):
             # TODO: Make this run based on the number of points
             # currently being stored rather than the number of
             # trajectories announced
-            if self.valid_trajectory_count > 0 and self.valid_trajectory_count % 1000 == 0:
-                if self.separation_time:
-                    old_trajectories = trajectories_in_progress
-                    trajectories_in_progress = dict()
-
-                    now = point.timestamp
-                    for (object_id, update_list) in old_trajectories.items():
-                        if (now - update_list[-1].timestamp) > self.separation_time:
-                            if len(update_list) >= self.minimum_length:
-                                new_trajectory = trajectory_class.from_position_list(update_list)
-                                self.valid_trajectory_count += 1
-                                yield(new_trajectory)
-
-                                if self.valid_trajectory_count > 0 and self.valid_trajectory_count % 100 == 0:
-                                    logger.debug(
-                                        ("(3) {} trajectories "
-                                         "announced and {} discarded for "
-                                         "having fewer than {} points").format(
-                                            self.valid_trajectory_count,
-                                            self.invalid_trajectory_count,
-                                            self.minimum_length))
-                            else:
-                                self.invalid_trajectory_count += 1
-                                if self.invalid_trajectory_count > 0 and self.invalid_trajectory_count % 100 == 0:
-                                    logger.debug(
-                                        ("(4) {} trajectories"
-                                         "announced and {} discarded for "
-                                         "having fewer than {} points").format(
-                                             self.valid_trajectory_count,
-                                             self.invalid_trajectory_count,
-                                             self.minimum_length))
-
-                        else:
-                            trajectories_in_progress[object_id] = update_list
-
-        # We've finished iterating over all the position updates in
-        # the window. Go through all the position updates we're still
-        # hanging onto and make trajectories out of them.
-        for (object_id, update_list) in trajectories_in_progress.items():
-            if len(update_list) >= self.minimum_length:
-                new_trajectory = trajectory_class.from_position_list(update_list)
-                self.valid_trajectory_count += 1
-                yield(new_trajectory)
-                if self.valid_trajectory_count > 0 and self.valid_trajectory_count % 100 == 0:
-                    logger.debug(
-                        ("{} trajectories announced and {} discarded for "
-                         "having fewer than {} points").format(
-                            self.valid_trajectory_count,
-                            self.invalid_trajectory_count,
-                            self.minimum_length))
-            else:
-                self.invalid_trajectory_count += 1
-                if self.invalid_trajectory_count > 0 and self.invalid_trajectory_count % 100 == 0:
-                    logger.debug(
-                        ("{} trajectories announced and {} discarded for "
-                         "having fewer than {} points").format(
-                             self.valid_trajectory_count,
-                             self.invalid_trajectory_count,
-                             self.minimum_length))
+            if (self.separation_time and
+                    self.valid_trajectory_count > 0 and
+                    self.valid_trajectory_count % 1000 == 0):
+                for new_trajectory in self._finish_idle_trajectories(point.timestamp):
+                    yield new_trajectory
 
 
-        logger.info(
+    def advance_watermark(self, watermark):
+        """Finish trajectories that have been idle for too long.
+
+        The watermark is a promise that every point with an earlier
+        timestamp has already been passed to add_points().  Any
+        trajectory whose last point is more than separation_time
+        before the watermark can never be extended, so we finish it
+        now instead of holding onto it until the end of the input.
+
+        A watermark earlier than the current one is ignored.  If no
+        separation time is set, nothing is ever idle and this call
+        only records the watermark.
+
+        Arguments:
+           watermark (datetime.datetime or str): Time up to which the input is complete
+
+        Returns:
+           List of trajectories that can no longer grow
+        """
+
+        watermark = Timestamp.from_any(watermark)
+        if self.watermark is not None and watermark < self.watermark:
+            return []
+        self.watermark = watermark
+
+        finished = list(self._assemble_points(self._release_buffered_points(watermark)))
+        if self.separation_time:
+            finished.extend(self._finish_idle_trajectories(watermark))
+        return finished
+
+
+    def flush(self):
+        """Finish every trajectory still in progress.
+
+        Call this when the input has come to an end.  Points still
+        in the reorder buffer are assembled first.  The assembler is
+        empty afterward but keeps its counters and watermark.
+
+        Returns:
+           List of all remaining trajectories with at least minimum_length points
+        """
+
+        finished = list(self._assemble_points(self._release_buffered_points(None)))
+
+        trajectories_in_progress = self._trajectories_in_progress
+        self._trajectories_in_progress = {}
+        for update_list in trajectories_in_progress.values():
+            new_trajectory = self._finish_trajectory(update_list)
+            if new_trajectory is not None:
+                finished.append(new_trajectory)
+        return finished
+
+
+    @property
+    def num_trajectories_in_progress(self):
+        """Number of object IDs with a trajectory still being built"""
+        return len(self._trajectories_in_progress)
+
+
+    @property
+    def num_buffered_points(self):
+        """Number of points waiting in the reorder buffer"""
+        return len(self._reorder_buffer)
+
+
+    def checkpoint(self):
+        """Capture the assembler's state so that it can be resumed later.
+
+        The result is a dictionary of plain Python values, points and
+        lists that can be pickled and handed to restore() on a fresh
+        assembler, possibly in another process.  It holds the
+        configuration, the counters, the watermark, the reorder
+        buffer and every trajectory still in progress.  The 'input' attribute is not
+        included.
+
+        Returns:
+           Dictionary describing the assembler's state
+        """
+
+        return {
+            'version': CHECKPOINT_VERSION,
+            'separation_time': self.separation_time,
+            'separation_distance': self.separation_distance,
+            'minimum_length': self.minimum_length,
+            'reorder_window': self.reorder_window,
+            'points_processed_count': self.points_processed_count,
+            'valid_trajectory_count': self.valid_trajectory_count,
+            'invalid_trajectory_count': self.invalid_trajectory_count,
+            'late_point_count': self.late_point_count,
+            'watermark': self.watermark,
+            'release_time': self._release_time,
+            'reorder_buffer': [
+                point for (_, _, point) in sorted(self._reorder_buffer)
+                ],
+            'trajectories_in_progress': dict(
+                (object_id, list(update_list))
+                for (object_id, update_list)
+                in self._trajectories_in_progress.items()
+                )
+            }
+
+
+    def restore(self, state):
+        """Resume from a dictionary returned by checkpoint().
+
+        All current state, including the configuration, is replaced
+        by what was saved.
+
+        Arguments:
+           state (dict): Result of an earlier call to checkpoint()
+
+        Raises:
+           ValueError: the checkpoint was written by an incompatible version
+        """
+
+        version = state.get('version', None)
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(
+                ("AssembleTrajectoryFromPoints: Cannot restore checkpoint "
+                 "with version {}. Expected version {}.").format(
+                     version, CHECKPOINT_VERSION))
+
+        self.separation_time = state['separation_time']
+        self.separation_distance = state['separation_distance']
+        self.minimum_length = state['minimum_length']
+        self.reorder_window = state['reorder_window']
+        self.points_processed_count = state['points_processed_count']
+        self.valid_trajectory_count = state['valid_trajectory_count']
+        self.invalid_trajectory_count = state['invalid_trajectory_count']
+        self.late_point_count = state['late_point_count']
+        self.watermark = state['watermark']
+        self._release_time = state['release_time']
+        # The saved buffer is already in timestamp order, which is a
+        # valid heap.
+        self._reorder_sequence = itertools.count()
+        self._reorder_buffer = [
+            (point.timestamp, next(self._reorder_sequence), point)
+            for point in state['reorder_buffer']
+            ]
+        self._trajectories_in_progress = dict(
+            (object_id, list(update_list))
+            for (object_id, update_list)
+            in state['trajectories_in_progress'].items()
+            )
+
+        self._trajectory_class = None
+        if self._trajectories_in_progress:
+            some_point = next(iter(self._trajectories_in_progress.values()))[0]
+            self._trajectory_class = some_point.domain_classes['Trajectory']
+
+
+    def _reorder_points(self, points):
+        """Pass points through the reorder buffer.
+
+        Each incoming point goes onto a heap keyed by timestamp.
+        Whenever the newest timestamp seen moves forward, every point
+        more than reorder_window older than it is released in
+        timestamp order.
+
+        Yields:
+           Points in timestamp order, delayed by up to reorder_window
+        """
+
+        buffer = self._reorder_buffer
+        for point in points:
+            timestamp = point.timestamp
+            if self._release_time is not None and timestamp < self._release_time:
+                self.late_point_count += 1
+                if self.late_point_count % 100 == 1:
+                    self._logger.warning(
+                        ("Discarded point for object {} at {}: it arrived "
+                         "after the reorder window closed at {}. {} late "
+                         "points so far.").format(
+                             point.object_id, timestamp,
+                             self._release_time, self.late_point_count))
+                continue
+
+            heapq.heappush(buffer, (timestamp, next(self._reorder_sequence), point))
+            release_time = timestamp - self.reorder_window
+            if self._release_time is None or release_time > self._release_time:
+                self._release_time = release_time
+                while buffer and buffer[0][0] <= release_time:
+                    yield heapq.heappop(buffer)[2]
+
+
+    def _release_buffered_points(self, until):
+        """Empty the reorder buffer up to and including a time.
+
+        Arguments:
+           until (datetime.datetime): Release points no later than
+              this.  If None, release everything.
+
+        Yields:
+           Points in timestamp order
+        """
+
+        buffer = self._reorder_buffer
+        if until is not None and (self._release_time is None or until > self._release_time):
+            self._release_time = until
+        while buffer and (until is None or buffer[0][0] <= until):
+            yield heapq.heappop(buffer)[2]
+
+
+    def _make_native_assembler(self, point):
+        """Create and configure a compiled assembler for a point's domain.
+
+        Returns:
+           TrajectoryAssembler instance or None if the domain has none
+        """
+
+        assembler_class = getattr(point, 'domain_classes', {}).get('TrajectoryAssembler', None)
+        if assembler_class is None:
+            return None
+
+        assembler = assembler_class()
+        assembler.separation_time = self.separation_time or None
+        assembler.separation_distance = self.separation_distance or None
+        assembler.minimum_length = self.minimum_length
+        assembler.reorder_window = self.reorder_window or None
+        return assembler
+
+
+    def _native_trajectories(self, native_assembler, points):
+        """Assemble points with a compiled assembler.
+
+        Points are handed over in batches so that memory use stays
+        bounded no matter how long the input is.  The counters are
+        brought up to date after every batch.
+        """
+
+        while True:
+            batch = list(itertools.islice(points, NATIVE_BATCH_SIZE))
+            if not batch:
+                break
+            finished = native_assembler.add_points(batch)
+            self._copy_native_counters(native_assembler)
+            for trajectory in finished:
+                yield trajectory
+
+        finished = native_assembler.flush()
+        self._copy_native_counters(native_assembler)
+        for trajectory in finished:
+            yield trajectory
+
+
+    def _copy_native_counters(self, native_assembler):
+        self.points_processed_count = native_assembler.points_processed_count
+        self.valid_trajectory_count = native_assembler.valid_trajectory_count
+        self.invalid_trajectory_count = native_assembler.invalid_trajectory_count
+        self.late_point_count = native_assembler.late_point_count
+
+
+    def _is_separated(self, last_point, next_point):
+        """Does the gap between two points start a new trajectory?"""
+
+        if self.separation_time:
+            if next_point.timestamp - last_point.timestamp > self.separation_time:
+                return True
+        if self.separation_distance:
+            if distance(next_point, last_point) > self.separation_distance:
+                return True
+        return False
+
+
+    def _finish_trajectory(self, update_list):
+        """Turn a list of points into a trajectory if it is long enough.
+
+        Updates the valid and invalid trajectory counts.
+
+        Returns:
+           New trajectory or None if the list is too short
+        """
+
+        if len(update_list) >= self.minimum_length:
+            new_trajectory = self._trajectory_class.from_position_list(update_list)
+            self.valid_trajectory_count += 1
+            if self.valid_trajectory_count % 100 == 0:
+                self._logger.debug(
+                    ("{} trajectories announced and {} discarded for "
+                     "having fewer than {} points").format(
+                        self.valid_trajectory_count,
+                        self.invalid_trajectory_count,
+                        self.minimum_length))
+            return new_trajectory
+        else:
+            self.invalid_trajectory_count += 1
+            if self.invalid_trajectory_count % 100 == 0:
+                self._logger.debug(
+                    ("{} trajectories announced and {} discarded for "
+                     "having fewer than {} points").format(
+                         self.valid_trajectory_count,
+                         self.invalid_trajectory_count,
+                         self.minimum_length))
+            return None
+
+
+    def _finish_idle_trajectories(self, now):
+        """Finish trajectories whose last point is more than separation_time before 'now'."""
+
+        trajectories_in_progress = self._trajectories_in_progress
+        idle_object_ids = [
+            object_id for (object_id, update_list)
+            in trajectories_in_progress.items()
+            if (now - update_list[-1].timestamp) > self.separation_time
+            ]
+
+        for object_id in idle_object_ids:
+            new_trajectory = self._finish_trajectory(trajectories_in_progress.pop(object_id))
+            if new_trajectory is not None:
+                yield new_trajectory
+
+
+class ParallelAssembleTrajectoryFromPoints(object):
+    """Assemble trajectories across several worker processes
+
+    Points with different object IDs never end up in the same
+    trajectory, so assembly splits cleanly by object ID.  This class
+    reads the input once, deals each point to one of 'processes'
+    workers according to a hash of its object ID, and runs an
+    ordinary AssembleTrajectoryFromPoints in each worker.  Finished
+    trajectories are sent back as soon as they are found and merged
+    into a single stream.
+
+    The configuration attributes and counters are the same as those
+    of AssembleTrajectoryFromPoints.  The set of trajectories
+    produced is also the same, but the order in which they come out
+    is not: trajectories from different workers are interleaved in
+    whatever order they arrive.  When 'reorder_window' is set, each
+    worker judges lateness against the newest point in its own share
+    of the input.
+
+    Attributes:
+       processes (integer): Number of worker processes.  Zero means
+            one per CPU.
+       batch_size (integer): Number of points sent to a worker at a
+            time.  Larger batches cost less to send but take more
+            memory.
+
+    Worker processes are started with fork().  On platforms without
+    it, a warning is logged and assembly runs in a single process.
+
+    Example:
+
+    .. code-block:: python
+
+        assembler = ParallelAssembleTrajectoryFromPoints()
+        assembler.input = point_reader
+        assembler.separation_time = datetime.timedelta(minutes=20)
+        assembler.processes = 8
+
+        for trajectory in assembler.trajectories():
+            # (do whatever you want)
+
+    """
+
+    def __init__(self):
+        """Initialize a parallel assembler
+
+        Settings are the same as for AssembleTrajectoryFromPoints.  By
+        default there is one worker process per CPU.
+        """
+
+        self.input = None
+        self.separation_time = datetime.timedelta(minutes=30)
+        self.separation_distance = None
+        self.minimum_length = 2
+        self.reorder_window = None
+        self.processes = 0
+        self.batch_size = 10000
+        self.points_processed_count = 0
+        self.valid_trajectory_count = 0
+        self.invalid_trajectory_count = 0
+        self.late_point_count = 0
+        self._logger = logging.getLogger(__name__ + "ParallelAssembleTrajectoryFromPoints")
+
+
+    def trajectories(self):
+        """Return trajectories assembled from input points.
+
+        The input is traversed once, in the main process.
+
+        Yields:
+          Trajectories built from input points
+        """
+
+        processes = self.processes
+        if not processes:
+            processes = multiprocessing.cpu_count()
+
+        if processes > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            self._logger.warning('Parallel trajectory assembly requires fork(). '
+                                 'Assembling trajectories in a single process.')
+            processes = 1
+
+        self.points_processed_count = 0
+        self.valid_trajectory_count = 0
+        self.invalid_trajectory_count = 0
+        self.late_point_count = 0
+
+        if processes == 1:
+            assembler = self._make_assembler()
+            assembler.input = self.input
+            for trajectory in assembler.trajectories():
+                yield trajectory
+            self._add_counters(_assembler_counters(assembler))
+        else:
+            for trajectory in self._parallel_trajectories(processes):
+                yield trajectory
+
+        self._logger.info(
             ("Done assembling trajectories. {} trajectories produced and "
              "{} discarded for having fewer than {} points.").format(
                  self.valid_trajectory_count,
                  self.invalid_trajectory_count,
                  self.minimum_length))
 
-        if self.valid_trajectory_count == 0:
-            logger.warning(
-                ("Perplexity: No trajectories produced. Are you sure your "
-                 "delimiters and your column assignments are correct?"))
-        return
-
 
     def __iter__(self):
         return self.trajectories()
+
+
+    def _make_assembler(self):
+        assembler = AssembleTrajectoryFromPoints()
+        assembler.separation_time = self.separation_time
+        assembler.separation_distance = self.separation_distance
+        assembler.minimum_length = self.minimum_length
+        assembler.reorder_window = self.reorder_window
+        return assembler
+
+
+    def _add_counters(self, counters):
+        (points, valid, invalid, late) = counters
+        self.points_processed_count += points
+        self.valid_trajectory_count += valid
+        self.invalid_trajectory_count += invalid
+        self.late_point_count += late
+
+
+    def _parallel_trajectories(self, processes):
+        """Deal points out to workers and collect their trajectories."""
+
+        context = multiprocessing.get_context('fork')
+        # The work queues are bounded so that a fast reader cannot
+        # pile up the whole input in memory ahead of the workers.
+        work_queues = [context.Queue(maxsize=4) for i in range(processes)]
+        result_queue = context.Queue()
+        workers = [
+            context.Process(target=_assembly_worker,
+                            args=(self._make_assembler(), work_queues[i], result_queue),
+                            daemon=True)
+            for i in range(processes)
+            ]
+        for worker in workers:
+            worker.start()
+
+        batches = [[] for i in range(processes)]
+        workers_running = processes
+        pending_trajectories = []
+
+        def handle_result(kind, payload):
+            nonlocal workers_running
+            if kind == 'trajectories':
+                pending_trajectories.extend(payload)
+            elif kind == 'done':
+                self._add_counters(payload)
+                workers_running -= 1
+            else:
+                raise RuntimeError(
+                    'Trajectory assembly worker failed:\n{}'.format(payload))
+
+        def drain_results():
+            """Handle every result that is ready without waiting."""
+            while True:
+                try:
+                    (kind, payload) = result_queue.get(block=False)
+                except queue.Empty:
+                    return
+                handle_result(kind, payload)
+
+        def check_workers():
+            # A worker that failed posts its traceback before exiting.
+            # Read it first so that it ends up in the exception.
+            drain_results()
+            for worker in workers:
+                if worker.exitcode not in (None, 0):
+                    raise RuntimeError(
+                        ('Trajectory assembly worker exited with code {}.').format(
+                            worker.exitcode))
+
+        def send(shard, batch):
+            # Keep reading results while we wait for room.  Otherwise
+            # a worker that failed (or one that is itself blocked on a
+            # full result pipe) would leave us waiting forever.
+            while True:
+                try:
+                    work_queues[shard].put(batch, timeout=1)
+                    return
+                except queue.Full:
+                    check_workers()
+
+        def wait_for_results():
+            try:
+                (kind, payload) = result_queue.get(timeout=1)
+            except queue.Empty:
+                check_workers()
+                return
+            handle_result(kind, payload)
+
+        def take_pending_trajectories():
+            trajectories = list(pending_trajectories)
+            del pending_trajectories[:]
+            return trajectories
+
+        try:
+            for point in self.input:
+                shard = hash(point.object_id) % processes
+                batch = batches[shard]
+                batch.append(point)
+                if len(batch) >= self.batch_size:
+                    send(shard, batch)
+                    batches[shard] = []
+
+                    # Pass along whatever the workers have finished so far.
+                    drain_results()
+                    for trajectory in take_pending_trajectories():
+                        yield trajectory
+
+            for (shard, batch) in enumerate(batches):
+                if batch:
+                    send(shard, batch)
+                send(shard, None)
+
+            while workers_running > 0 or pending_trajectories:
+                for trajectory in take_pending_trajectories():
+                    yield trajectory
+                if workers_running > 0:
+                    wait_for_results()
+
+            for worker in workers:
+                worker.join()
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+
+
+def _assembler_counters(assembler):
+    return (assembler.points_processed_count,
+            assembler.valid_trajectory_count,
+            assembler.invalid_trajectory_count,
+            getattr(assembler, 'late_point_count', 0))
+
+
+def _assembly_worker(assembler, work_queue, result_queue):
+    """Run one shard of a parallel assembly.
+
+    Reads batches of points from work_queue until it gets None, then
+    flushes.  Finished trajectories go to result_queue after each
+    batch, followed by a final ('done', counters) message.
+    """
+
+    reorder_window = assembler.reorder_window
+    first_batch = True
+    try:
+        while True:
+            batch = work_queue.get()
+            if batch is None:
+                break
+
+            # The compiled assembler has the same interface.  Switch
+            # to it as soon as we know the domain.
+            if first_batch:
+                first_batch = False
+                if assembler.use_native:
+                    assembler = assembler._make_native_assembler(batch[0]) or assembler
+
+            finished = assembler.add_points(batch)
+
+            # Everything this worker will see later is newer than this
+            # batch, so idle trajectories can be let go right away.
+            watermark = max(point.timestamp for point in batch)
+            if reorder_window:
+                watermark -= reorder_window
+            finished.extend(assembler.advance_watermark(watermark))
+
+            if finished:
+                result_queue.put(('trajectories', finished))
+
+        finished = assembler.flush()
+        if finished:
+            result_queue.put(('trajectories', finished))
+        result_queue.put(('done', _assembler_counters(assembler)))
+    except Exception:
+        result_queue.put(('error', traceback.format_exc()))
+        # Exit with a nonzero code as well so that the main process
+        # notices the failure even before it reads the message.
+        sys.exit(1)
@@ -52,6 +52,8 @@ def cluster_trajectories(trajectories,
                          search_box_span,
                          *args,
                          min_cluster_size=2,
+                         engine='auto',
+                         n_threads=1,
                          **kwargs):
     """Create a cotravel feature vector for each trajectory and use box-DBSCAN
     to cluster the trajectories.
@@ -65,6 +67,11 @@ def cluster_trajectories(trajectories,
     Keyword Arguments:
         min_cluster_size (int): The minimum number of points that you're willing to call a
             cluster. (Default: 2)
+        engine (str): Neighbor search engine for DBSCAN. See
+            tracktable.algorithms.dbscan.compute_cluster_labels. (Default: 'auto')
+        n_threads (int): Number of threads for DBSCAN's neighbor searches.
+            Use 0 or None for one thread per CPU core. The clusters are the
+            same regardless of this setting. (Default: 1)
 
     Returns:
         list of ordered pairs. The first value of each ordered pair corresponds to trajectory index
@@ -82,7 +89,9 @@ def cluster_trajectories(trajectories,
 
     return group_clusters(compute_cluster_labels(feature_vectors,
                                                  search_box_span,
-                                                 min_cluster_size),
+                                                 min_cluster_size,
+                                                 n_threads=n_threads,
+                                                 engine=engine),
                                                  trajectories)
 
 
@@ -93,7 +102,9 @@ def cluster_trajectories_rendezvous(trajectories,
                                     epsilon_longitude=0.02,
                                     epsilon_latitude=0.02,
                                     epsilon_timestamp=3000,
-                                    min_cluster_size=2):
+                                    min_cluster_size=2,
+                                    engine='grid',
+                                    n_threads=1):
     """Create a cotravel feature vector for each trajectory and use box-DBSCAN
     to cluster the trajectories.
 
@@ -112,6 +123,13 @@ def cluster_trajectories_rendezvous(trajectories,
         epsilon_timestamp (int): The timestamp in seconds to bound the DBSCAN clsutering (Default: 3000)
         min_cluster_size (int): The minimum number of points that you're willing to call a
             cluster. (Default: 2)
+        engine (str): Neighbor search engine for DBSCAN. The grid only
+            looks at the first control point (longitude, latitude and
+            time) plus the next longitude, which is usually enough to
+            rule out nearly every other trajectory. (Default: 'grid')
+        n_threads (int): Number of threads for DBSCAN's neighbor searches.
+            Use 0 or None for one thread per CPU core. The clusters are the
+            same regardless of this setting. (Default: 1)
 
     Returns:
         list of ordered pairs. The first value of each ordered pair corresponds to trajectory index
@@ -136,13 +154,16 @@ def cluster_trajectories_rendezvous(trajectories,
                                 _rendezvous_signature,
                                 search_box_span,
                                 control_time_fractions,
-                                min_cluster_size=min_cluster_size)
+                                min_cluster_size=min_cluster_size,
+                                engine=engine,
+                                n_threads=n_threads)
 
 
 def cluster_trajectories_shape(trajectories,
                                depth=4,
                                epsilon=0.05,
-                               min_cluster_size=2):
+                               min_cluster_size=2,
+                               n_threads=1):
     """Create a cotravel feature vector for each trajectory and use box-DBSCAN
     to cluster the trajectories.
 
@@ -154,6 +175,9 @@ def cluster_trajectories_shape(trajectories,
         epsilon (float): The epsilon value to generate the search box span. (Default: 0.05)
         min_cluster_size (int): The minimum number of points that you're willing to call a
             cluster. (Default: 2)
+        n_threads (int): Number of threads for DBSCAN's neighbor searches.
+            Use 0 or None for one thread per CPU core. The clusters are the
+            same regardless of this setting. (Default: 1)
 
     Returns:
         list of ordered pairs. The first value of each ordered pair corresponds to trajectory index
@@ -167,6 +191,7 @@ def cluster_trajectories_shape(trajectories,
                                 distance_geometry_by_distance,
                                 search_box_span,
                                 min_cluster_size=min_cluster_size,
+                                n_threads=n_threads,
                                 depth=depth)
 
 def _rendezvous_signature(trajectory,
@@ -43,11 +43,13 @@ behave like anything else).  The exact success rate depends on the
 quality of the match between the new trajectory and history.
 """
 
+import collections.abc
 import datetime
+import json
 import logging
+import multiprocessing
 import os
 import random
-from math import acos, cos
 
 import folium
 import matplotlib.colors
@@ -59,16 +61,24 @@ from tqdm import tqdm
 from tracktable.applications.assemble_trajectories import \
     AssembleTrajectoryFromPoints
 from tracktable.core.geomath import (ECEF_from_feet, distance, interpolate,
-                                     km_to_radians, length,
+                                     length,
                                      point_at_length_fraction, point_at_time)
 from tracktable.domain.cartesian3d import BasePoint as CartesianPoint3D
 from tracktable.domain.feature_vectors import convert_to_feature_vector
 from tracktable.domain.rtree import RTree
-from tracktable.domain.terrestrial import (Trajectory, TrajectoryPointReader,
+from tracktable.domain.terrestrial import (BinaryTrajectoryReader,
+                                           BinaryTrajectoryWriter, Trajectory,
+                                           TrajectoryPointReader,
                                            TrajectoryReader, TrajectoryWriter)
 from tracktable.render.map_decoration.coloring import matplotlib_cmap_to_dict
 from tracktable.render.render_trajectories import render_trajectories
 
+try:
+    import pandas
+    pandas_installed = True
+except ImportError:
+    pandas_installed = False
+
 logger = logging.getLogger(__name__)
 
 ###############################################################################
@@ -293,78 +303,330 @@ def _linear_weights(x):
 
     return lambda d: 1 - d / x
 
-def _represent_trajectory_with_segments(trajectory):
-    """Represents a trajectory by a list of segments
+#: Radius of the sphere used for great circle distances, in km.  This
+#: matches tracktable.core.geomath.distance().
+EARTH_RADIUS_KM = 6371.0
+
+
+def _unit_vectors(longitudes, latitudes):
+    """Convert longitude/latitude in degrees to unit vectors
 
     Arguments:
-        trajectory (Tracktable tracjectory): Trajectory
+        longitudes (array): longitudes in degrees
+        latitudes (array): latitudes in degrees
 
     Returns:
-        a list of trajectories (segments)
+        array of shape (N, 3)
     """
 
-    segments = []
+    longitudes = np.radians(np.asarray(longitudes, dtype=np.float64))
+    latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    cos_latitudes = np.cos(latitudes)
+    return np.column_stack((cos_latitudes * np.cos(longitudes),
+                            cos_latitudes * np.sin(longitudes),
+                            np.sin(latitudes)))
 
-    for point in range(len(trajectory) - 1):
-        segment = Trajectory.from_position_list([trajectory[point], trajectory[point + 1]])
-        segments.append(segment)
 
-    return segments
+def _angles_between(u, v):
+    """Angles in radians between corresponding rows of u and v
 
+    The vectors do not have to be normalized.
+    """
 
-def _find_best_segment(segments, point):
-    """Finds the closest segment to the point
+    return np.arctan2(np.linalg.norm(np.cross(u, v), axis=1),
+                      np.einsum('ij,ij->i', u, v))
+
+
+class SegmentStore(object):
+    """Segments of many trajectories in flat arrays
+
+    Prediction needs the point on a historical trajectory that is
+    closest to a query point.  Rather than making a two-point Trajectory
+    for every segment, a SegmentStore keeps every point of every
+    trajectory as a unit vector and a timestamp in contiguous arrays,
+    precomputes the great circle through each segment and puts the
+    segment bounding boxes into an R-tree.  Queries are vectorized
+    over all the trajectories they ask about.
+
+    Distances are great circle distances in km, the same as
+    tracktable.core.geomath.distance() for terrestrial points and
+    trajectories.
+
+    Attributes:
+        trajectories (list): the trajectories in the store.  These are
+            not copied.
+        point_offsets (array): the points of trajectory i are rows
+            point_offsets[i] to point_offsets[i+1] of the point arrays
+        segment_offsets (array): the segments of trajectory i are
+            segment_offsets[i] to segment_offsets[i+1]
+        unit_vectors (array): one row (x, y, z) per point
+        timestamps (array): one int64 timestamp per point, in
+            microseconds since the Unix epoch
+        segment_starts (array): index of the first point of each segment
+        tree (RTree): R-tree over the segment bounding boxes in km
+    """
 
-    Arguments:
-        segments (list): list of segments (which are trajectories made up of two
-            points)
-        point (Tracktable point): point object
+    def __init__(self, trajectories):
+        """Put the segments of a list of trajectories into the store
 
-    Returns:
-        a tuple where the first element is the distance to the closest
-        segment and the second is the segment
-    """
+        Arguments:
+            trajectories (list): terrestrial trajectories
+        """
+
+        self.trajectories = trajectories
 
-    closest_distance = float('inf')
-    closest_seg = None
-    for segment in segments:
-        d = distance(point, segment)
-        # need to account for if two consecutive points are at the same location
-        if d < closest_distance and distance(segment[0], segment[1]) > 0:
-            closest_distance = d
-            closest_seg = segment
-    # note that we want spherical distance here, convert to radians
-    return km_to_radians(closest_distance), closest_seg
+        counts = np.array([len(trajectory) for trajectory in trajectories], dtype=np.int64)
+        self.point_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.point_offsets[1:])
+        self.segment_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(np.maximum(counts - 1, 0), out=self.segment_offsets[1:])
+
+        nonempty = [trajectory for trajectory in trajectories if len(trajectory) > 0]
+        if len(nonempty) > 0:
+            coordinates = np.concatenate([trajectory.coordinates_as_array()
+                                          for trajectory in nonempty])
+            timestamps = np.concatenate([trajectory.timestamps_as_array()
+                                         for trajectory in nonempty])
+        else:
+            coordinates = np.zeros((0, 2))
+            timestamps = np.zeros(0, dtype='datetime64[us]')
+        self.unit_vectors = _unit_vectors(coordinates[:, 0], coordinates[:, 1])
+        self.timestamps = timestamps.astype('datetime64[us]').view(np.int64)
+
+        # Every point except the last one in its trajectory starts a segment.
+        starts_segment = np.ones(len(self.unit_vectors), dtype=bool)
+        starts_segment[self.point_offsets[1:][counts > 0] - 1] = False
+        self.segment_starts = np.flatnonzero(starts_segment)
+
+        starts = self.unit_vectors[self.segment_starts]
+        ends = self.unit_vectors[self.segment_starts + 1]
+        normals = np.cross(starts, ends)
+        sin_lengths = np.linalg.norm(normals, axis=1)
+        self._segment_lengths = np.arctan2(sin_lengths, np.einsum('ij,ij->i', starts, ends))
+        # Segments whose endpoints coincide have no great circle.
+        self._degenerate = (sin_lengths == 0)
+        normals[~self._degenerate] /= sin_lengths[~self._degenerate, np.newaxis]
+        self._normals = normals
+
+        self.tree = self._create_segment_rtree(starts, ends)
+
+    def __len__(self):
+        return len(self.segment_starts)
+
+    def _create_segment_rtree(self, starts, ends):
+        # Each box is stored as one feature vector holding its min and
+        # max corners.  The arc between two points bulges away from the
+        # chord by at most R * (1 - cos(length / 2)), so pad by that much.
+        bulge = EARTH_RADIUS_KM * (1 - np.cos(self._segment_lengths / 2))
+        min_corners = EARTH_RADIUS_KM * np.minimum(starts, ends) - bulge[:, np.newaxis]
+        max_corners = EARTH_RADIUS_KM * np.maximum(starts, ends) + bulge[:, np.newaxis]
+        return RTree.from_array(np.hstack((min_corners, max_corners)))
+
+    def _segments_near(self, point_vector, radius):
+        # Any segment within radius km of the point has a box that
+        # overlaps the cube of half-width radius around it.
+        if len(self.tree) == 0:
+            return np.zeros(0, dtype=np.int64)
+        center = EARTH_RADIUS_KM * point_vector
+        unbounded = np.finfo(np.float64).max
+        min_corner = np.concatenate(([-unbounded] * 3, center - radius))
+        max_corner = np.concatenate((center + radius, [unbounded] * 3))
+        (_, segments) = self.tree.find_points_in_boxes([min_corner], [max_corner])
+        return segments
+
+    def _measure(self, point_vector, segments):
+        """Distances in radians from a point to segments and the
+        fraction of the way along each segment where the closest point is
+        """
+
+        starts = self.unit_vectors[self.segment_starts[segments]]
+        ends = self.unit_vectors[self.segment_starts[segments] + 1]
+        normals = self._normals[segments]
+        point_vectors = np.broadcast_to(point_vector, starts.shape)
+
+        to_start = _angles_between(starts, point_vectors)
+        to_end = _angles_between(ends, point_vectors)
+
+        # Project the point onto each segment's great circle.  The
+        # cross-track distance applies when the projection lies between
+        # the endpoints; otherwise the closer endpoint is nearest.
+        heights = normals.dot(point_vector)
+        feet = point_vectors - heights[:, np.newaxis] * normals
+        inside = ((~self._degenerate[segments])
+                  & (np.einsum('ij,ij->i', np.cross(starts, feet), normals) >= 0)
+                  & (np.einsum('ij,ij->i', np.cross(feet, ends), normals) >= 0))
+
+        distances = np.where(inside,
+                             np.abs(np.arcsin(np.clip(heights, -1, 1))),
+                             np.minimum(to_start, to_end))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fractions = np.where(inside,
+                                 _angles_between(starts, feet) / self._segment_lengths[segments],
+                                 np.where(to_start <= to_end, 0.0, 1.0))
+        return distances, np.clip(fractions, 0, 1)
+
+    def nearest(self, trajectory_indices, point, search_radius=None):
+        """Find the closest point on each of several trajectories
+
+        Arguments:
+            trajectory_indices (array-like): indices of the trajectories to search
+            point (Tracktable point): query point
+
+        Keyword Arguments:
+            search_radius (float): Look for segments within this many km
+                of the point using the R-tree first.  Trajectories with no
+                segment that close are searched exhaustively, so this only
+                affects speed, never the result. (Default: None)
+
+        Returns:
+            Tuple (point_indices, fractions, distances) of arrays with one
+            entry per trajectory.  The closest point is fractions[i] of the
+            way from point point_indices[i] to the next one.  distances are
+            in km.
+
+        Raises:
+            ValueError: one of the trajectories is empty
+        """
+
+        trajectory_indices = np.asarray(trajectory_indices, dtype=np.int64).reshape(-1)
+        point_vector = _unit_vectors([point[0]], [point[1]])[0]
+
+        point_indices = np.full(len(trajectory_indices), -1, dtype=np.int64)
+        fractions = np.zeros(len(trajectory_indices))
+        distances = np.full(len(trajectory_indices), np.inf)
+
+        if search_radius is not None and len(trajectory_indices) > 0:
+            candidates = self._segments_near(point_vector, search_radius)
+            owners = np.searchsorted(self.segment_offsets, candidates, side='right') - 1
+            order = np.argsort(trajectory_indices, kind='stable')
+            sorted_indices = trajectory_indices[order]
+            where = np.minimum(np.searchsorted(sorted_indices, owners),
+                               len(sorted_indices) - 1)
+            wanted = (sorted_indices[where] == owners)
+            self._keep_closest(point_vector, order[where[wanted]], candidates[wanted],
+                               point_indices, fractions, distances)
+
+        # Anything whose closest candidate was farther away than the
+        # search radius might have a closer segment outside it.
+        if search_radius is None:
+            unresolved = np.arange(len(trajectory_indices))
+        else:
+            unresolved = np.flatnonzero(~(distances * EARTH_RADIUS_KM <= search_radius))
+        if len(unresolved) > 0:
+            first_segments = self.segment_offsets[trajectory_indices[unresolved]]
+            counts = self.segment_offsets[trajectory_indices[unresolved] + 1] - first_segments
+            group_starts = np.cumsum(counts) - counts
+            segments = (np.arange(counts.sum())
+                        + np.repeat(first_segments - group_starts, counts))
+            point_indices[unresolved] = -1
+            distances[unresolved] = np.inf
+            self._keep_closest(point_vector, np.repeat(unresolved, counts), segments,
+                               point_indices, fractions, distances)
+
+            # Trajectories with a single point have no segments.
+            lone = unresolved[counts == 0]
+            if len(lone) > 0:
+                lone_points = self.point_offsets[trajectory_indices[lone]]
+                if np.any(self.point_offsets[trajectory_indices[lone] + 1] == lone_points):
+                    raise ValueError('SegmentStore.nearest: Cannot search an empty trajectory.')
+                point_indices[lone] = lone_points
+                fractions[lone] = 0
+                distances[lone] = _angles_between(
+                    self.unit_vectors[lone_points],
+                    np.broadcast_to(point_vector, (len(lone), 3)))
+
+        return point_indices, fractions, distances * EARTH_RADIUS_KM
+
+    def _keep_closest(self, point_vector, positions, segments,
+                      point_indices, fractions, distances):
+        if len(segments) == 0:
+            return
+        (segment_distances, segment_fractions) = self._measure(point_vector, segments)
+        # Closest segment first; on ties prefer segments with nonzero
+        # length and then earlier segments.
+        order = np.lexsort((segments, self._degenerate[segments],
+                            segment_distances, positions))
+        (groups, first) = np.unique(positions[order], return_index=True)
+        best = order[first]
+        closer = segment_distances[best] < distances[groups]
+        groups = groups[closer]
+        best = best[closer]
+        point_indices[groups] = self.segment_starts[segments[best]]
+        fractions[groups] = segment_fractions[best]
+        distances[groups] = segment_distances[best]
+
+    def distances(self, trajectory_indices, point, search_radius=None):
+        """Distance in km from a point to each of several trajectories
+
+        See nearest() for the arguments.
+
+        Returns:
+            array of distances
+        """
+
+        return self.nearest(trajectory_indices, point, search_radius=search_radius)[2]
+
+    def nearest_timestamps(self, trajectory_indices, point, search_radius=None):
+        """Timestamp of the closest point on each of several trajectories
+
+        Timestamps are interpolated linearly along the closest segment.
+        See nearest() for the arguments.
+
+        Returns:
+            array of datetime64[us]
+        """
+
+        (point_indices, fractions, _) = self.nearest(trajectory_indices, point,
+                                                     search_radius=search_radius)
+        start_times = self.timestamps[point_indices]
+        next_points = np.minimum(point_indices + 1, len(self.timestamps) - 1)
+        elapsed = np.where(fractions > 0, self.timestamps[next_points] - start_times, 0)
+        return (start_times + np.round(fractions * elapsed).astype(np.int64)).view('datetime64[us]')
+
+    def nearest_point(self, trajectory_index, point, search_radius=None):
+        """Closest point on one trajectory
+
+        Arguments:
+            trajectory_index (int): index of the trajectory to search
+            point (Tracktable point): query point
+
+        Keyword Arguments:
+            search_radius (float): see nearest() (Default: None)
+
+        Returns:
+            a point on the trajectory, interpolated if it lies between
+            two of its points
+        """
+
+        (point_indices, fractions, _) = self.nearest([trajectory_index], point,
+                                                     search_radius=search_radius)
+        trajectory = self.trajectories[trajectory_index]
+        index = int(point_indices[0] - self.point_offsets[trajectory_index])
+        fraction = float(fractions[0])
+        if fraction <= 0:
+            return trajectory[index]
+        elif fraction >= 1:
+            return trajectory[index + 1]
+        else:
+            return interpolate(trajectory[index], trajectory[index + 1], fraction)
 
 
 def _nearest_trajectory_point(trajectory, point, segments):
     """Finds the closest point on a trajectory (trajectory) to a point (point)
 
     Arguments:
-        trajectory (Tracktable trajectory): index of the trajectory in the list of all historical trajectories
+        trajectory (int): index of the trajectory in the list of all historical trajectories
         point (Tracktable point): point object
-        segments (list): list of all historical trajectories represented as segments
+        segments (SegmentStore): all historical trajectories as segments
 
     Returns:
         the closest point
     """
 
-    traj_as_segs = segments[trajectory]
-    # Find the segment in the trajectory that the point is nearest
-    min_distance, segment = _find_best_segment(traj_as_segs, point)
-    # Nearest point could be nearest to either of the endpoints of the segments
-    if distance(segment[0], point) == min_distance:
-        return segment[0]
-    elif distance(segment[1], point) == min_distance:
-        return segment[1]
-    else:
-        # note that we want spherical distance here, convert to radians
-        interpolant = acos(cos(km_to_radians(distance(segment[0], point)))
-                           / cos(min_distance)) \
-                      / km_to_radians(distance(segment[0], segment[1]))
-        return interpolate(segment[0], segment[1], interpolant)
+    return segments.nearest_point(trajectory, point)
 
-def _predict_helper(prediction_dictionary, observed_trajectory, neighbor_distance, group_origin_destination):
+def _predict_helper(prediction_dictionary, observed_trajectory, neighbor_distance, group_origin_destination,
+                    quiet=False):
     """Will find historical trajectories that are well aligned with the
     observed trajectory and assign weights to these trajectories by
     origin/destination pair or individual historical trajectory.
@@ -377,6 +639,7 @@ def _predict_helper(prediction_dictionary, observed_trajectory, neighbor_distanc
             are considered close to it/nearby
         group_origin_destination (bool): If true weight by origin/destination pair, if false
             weight by individual historical trajectory
+        quiet (bool): produce no output, no tqdm output (Default: False)
 
     Returns:
         a list whose contents depend on which function is used to assign
@@ -388,12 +651,15 @@ def _predict_helper(prediction_dictionary, observed_trajectory, neighbor_distanc
     # find well-aligned trajectories
     well_aligned_trajs = find_well_aligned_trajectories(observed_trajectory,
                                                         prediction_dictionary,
-                                                        neighbor_distance)
+                                                        neighbor_distance,
+                                                        quiet=quiet)
 
     # find historical trajectories that go in the same direction as observed trajectory
     same_direction_trajs = find_same_direction_trajectories(observed_trajectory,
                                                             well_aligned_trajs,
-                                                            prediction_dictionary)
+                                                            prediction_dictionary,
+                                                            quiet=quiet,
+                                                            neighbor_distance=neighbor_distance)
 
     # results in terms of od pairs
     if group_origin_destination:
@@ -456,6 +722,30 @@ def process_historical_trajectories(data_file, raw_data=None, separation_time=20
         A dictionary of data structures which will be used in the prediction algorithm.
     """
 
+    trajectories = _read_historical_trajectories(data_file,
+                                                 raw_data=raw_data,
+                                                 separation_time=separation_time,
+                                                 separation_distance=separation_distance,
+                                                 minimum_length=minimum_length,
+                                                 minimum_total_distance=minimum_total_distance,
+                                                 only_commercial=only_commercial,
+                                                 quiet=quiet)
+
+    return dict(PredictionModel(trajectories, quiet=quiet))
+
+
+def _read_historical_trajectories(data_file, raw_data=None, separation_time=20,
+                                  separation_distance=100, minimum_length=20,
+                                  minimum_total_distance=200,
+                                  only_commercial=True, quiet=False):
+    """Read and filter historical trajectories for prediction.
+
+    See process_historical_trajectories() for the arguments.
+
+    Returns:
+        list of trajectories
+    """
+
     # reading in points
     if raw_data:
         reader = TrajectoryReader()
@@ -512,37 +802,311 @@ def process_historical_trajectories(data_file, raw_data=None, separation_time=20
         logger.error("Improper file type")
         raise IOError
 
-    prediction_dictionary = {}
-    prediction_dictionary['trajectories'] = trajectories
+    return trajectories
+
 
-    # Set up RTree with all the points we are looking at and which trajectory
-    # each point belongs to
-    all_points = []
+def _create_feature_points(trajectories, quiet=False):
+    """Convert every point of every trajectory to an R-tree feature point.
+
+    Arguments:
+        trajectories (list): historical trajectories
+
+    Keyword Arguments:
+        quiet (bool): produce no output, no tqdm output
+
+    Returns:
+        array with one row (x, y, z, trajectory index) per point, where
+        x, y and z are ECEF coordinates
+    """
+
+    all_points = np.empty((sum(len(t) for t in trajectories), 4))
     if not quiet:
         logger.info('Begin constructing feature vectors from all points')
+    point_index = 0
     for i in tqdm(range(0, len(trajectories)), disable=quiet):
         for point in trajectories[i]:
-            all_points.append(_create_feature_vector(point, i))
-    if not quiet:
-        logger.info('Begin constructing RTree')
-    tree = RTree(points=tqdm(all_points, disable=quiet))
+            all_points[point_index] = _create_feature_vector(point, i)
+            point_index += 1
+    return all_points
 
-    prediction_dictionary['all_points'] = all_points
-    prediction_dictionary['tree'] = tree
 
-    segments = []
-    if not quiet:
-        logger.info('Begin creating segment representation for all trajectories')
-    for trajectory in tqdm(trajectories, disable=quiet):
-        segments.append(_represent_trajectory_with_segments(trajectory))
+class PredictionModel(collections.abc.Mapping):
+    """Historical trajectories prepared for prediction
+
+    A PredictionModel holds everything the prediction functions need:
+    the historical trajectories, the ECEF feature points and R-tree
+    built from them, the segment representation of each trajectory
+    and a map from trajectory ID to index.  Build it once, save it
+    with save() and open it again with load() instead of processing
+    the historical data in every process.
+
+    The model behaves like the dictionary returned by
+    process_historical_trajectories(), so it can be passed anywhere a
+    prediction dictionary is expected.  It can also make predictions
+    itself, one at a time or for many observed trajectories in a row.
+
+    Attributes:
+        trajectories (list): historical trajectories
+        all_points (array): one row (x, y, z, trajectory index) per
+            historical point
+        tree (RTree): R-tree over all_points
+        id_to_index (dict): map from trajectory_id to index in trajectories
+        segments (SegmentStore): the segments of all trajectories.
+            Built the first time it is needed.
+
+    Example:
+
+    .. code-block:: python
 
-    prediction_dictionary['segments'] = segments
+        model = PredictionModel.from_historical_data('flights.tsv')
+        model.save('flights_model')
 
-    id_to_index = _create_id_to_index(trajectories)
+        # ... later, in another process ...
+        model = PredictionModel.load('flights_model')
+        for results in model.predict_origin_destinations(observed_trajectories):
+            # (do whatever you want)
 
-    prediction_dictionary['id_to_index'] = id_to_index
+    """
+
+    #: Version number written into saved models
+    FORMAT_VERSION = 1
+
+    _KEYS = ('trajectories', 'all_points', 'tree', 'segments', 'id_to_index')
+
+    def __init__(self, trajectories, all_points=None, quiet=True):
+        """Build a model from historical trajectories
+
+        Arguments:
+            trajectories (list): historical trajectories
+
+        Keyword Arguments:
+            all_points (array): feature points for the trajectories as
+                made by a previous model.  Computed if not supplied. (Default: None)
+            quiet (bool): produce no output, no tqdm output (Default: True)
+        """
+
+        self.trajectories = list(trajectories)
+        if all_points is None:
+            all_points = _create_feature_points(self.trajectories, quiet=quiet)
+        self.all_points = all_points
+        self.quiet = quiet
+
+        if not quiet:
+            logger.info('Begin constructing RTree')
+        self.tree = RTree.from_array(all_points)
+        self.id_to_index = _create_id_to_index(self.trajectories)
+        self._segments = None
+
+    @classmethod
+    def from_historical_data(cls, data_file, raw_data=None, separation_time=20,
+                             separation_distance=100, minimum_length=20,
+                             minimum_total_distance=200,
+                             only_commercial=True, quiet=False):
+        """Read, filter and prepare historical trajectories
+
+        Takes the same arguments as process_historical_trajectories().
+
+        Returns:
+            new PredictionModel
+        """
+
+        trajectories = _read_historical_trajectories(data_file,
+                                                     raw_data=raw_data,
+                                                     separation_time=separation_time,
+                                                     separation_distance=separation_distance,
+                                                     minimum_length=minimum_length,
+                                                     minimum_total_distance=minimum_total_distance,
+                                                     only_commercial=only_commercial,
+                                                     quiet=quiet)
+        return cls(trajectories, quiet=quiet)
+
+    @property
+    def segments(self):
+        if self._segments is None:
+            if not self.quiet:
+                logger.info('Begin creating segment representation for all trajectories')
+            self._segments = SegmentStore(self.trajectories)
+        return self._segments
+
+    # Mapping interface so that the model can stand in for a
+    # prediction dictionary.
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def save(self, directory):
+        """Save the model to a directory
+
+        The trajectories go into a binary trajectory file and the
+        feature points into a .npy array, so loading needs neither
+        parsing nor coordinate conversion.  The directory is created
+        if necessary and any model already in it is overwritten.
+
+        Arguments:
+            directory (str): where to save the model
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        with BinaryTrajectoryWriter(os.path.join(directory, _MODEL_TRAJECTORY_FILE)) as writer:
+            writer.write(self.trajectories)
+        with open(os.path.join(directory, _MODEL_POINTS_FILE), 'wb') as outfile:
+            np.save(outfile, np.ascontiguousarray(self.all_points, dtype=np.float64))
+        with open(os.path.join(directory, _MODEL_METADATA_FILE), 'w') as outfile:
+            json.dump({'format_version': self.FORMAT_VERSION,
+                       'num_trajectories': len(self.trajectories),
+                       'num_points': len(self.all_points)},
+                      outfile)
+
+    @classmethod
+    def load(cls, directory, memory_map=True, quiet=True):
+        """Open a model written by save()
+
+        Arguments:
+            directory (str): directory the model was saved to
+
+        Keyword Arguments:
+            memory_map (bool): Memory-map the feature points instead of
+                reading them into RAM. (Default: True)
+            quiet (bool): produce no output, no tqdm output (Default: True)
+
+        Returns:
+            PredictionModel
+
+        Raises:
+            ValueError: the directory holds an incompatible or damaged model
+        """
+
+        with open(os.path.join(directory, _MODEL_METADATA_FILE), 'r') as infile:
+            metadata = json.load(infile)
+        if metadata.get('format_version', None) != cls.FORMAT_VERSION:
+            raise ValueError(('{}: Cannot load prediction model with format '
+                              'version {}. Expected version {}.').format(
+                                  directory, metadata.get('format_version', None),
+                                  cls.FORMAT_VERSION))
+
+        trajectories = list(BinaryTrajectoryReader(os.path.join(directory, _MODEL_TRAJECTORY_FILE)))
+        all_points = np.load(os.path.join(directory, _MODEL_POINTS_FILE),
+                             mmap_mode=('r' if memory_map else None))
+
+        if (len(trajectories) != metadata['num_trajectories']
+                or all_points.shape != (metadata['num_points'], 4)):
+            raise ValueError(('{}: Prediction model files do not match: expected '
+                              '{} trajectories and {} points, found {} and {}').format(
+                                  directory, metadata['num_trajectories'],
+                                  metadata['num_points'], len(trajectories),
+                                  all_points.shape[0]))
+
+        return cls(trajectories, all_points=all_points, quiet=quiet)
+
+    def predict_location(self, observed_trajectory, minutes, neighbor_distance=5,
+                         samples=4):
+        """Predict where an observed trajectory will be
+
+        See the module-level predict_location() for details.
+        """
+
+        return predict_location(observed_trajectory, self, minutes,
+                                neighbor_distance=neighbor_distance,
+                                samples=samples, quiet=self.quiet)
+
+    def predict_origin_destination(self, observed_trajectory, neighbor_distance=5,
+                                   samples=4, printResults=False):
+        """Predict the origin and destination of an observed trajectory
+
+        See the module-level predict_origin_destination() for details.
+        """
+
+        return predict_origin_destination(observed_trajectory, self,
+                                          neighbor_distance=neighbor_distance,
+                                          samples=samples,
+                                          printResults=printResults,
+                                          quiet=self.quiet)
+
+    def predict_locations(self, observed_trajectories, minutes, neighbor_distance=5,
+                          samples=4):
+        """Predict locations for many observed trajectories
+
+        Arguments:
+            observed_trajectories (iterable): trajectories to make predictions for
+            minutes (int): Number of minutes forward to predict
+
+        Keyword Arguments:
+            neighbor_distance (int): points within this distance (km) to the
+                observed trajectory are considered close to it/nearby. (Default: 5)
+            samples (int): the number of points to represent each observed
+                trajectory with. (Default: 4)
+
+        Yields:
+            result of predict_location() for each observed trajectory, in order
+        """
+
+        for observed_trajectory in observed_trajectories:
+            yield self.predict_location(observed_trajectory, minutes,
+                                        neighbor_distance=neighbor_distance,
+                                        samples=samples)
+
+    def predict_origin_destinations(self, observed_trajectories, neighbor_distance=5,
+                                    samples=4):
+        """Predict origins and destinations for many observed trajectories
+
+        Arguments:
+            observed_trajectories (iterable): trajectories to make predictions for
+
+        Keyword Arguments:
+            neighbor_distance (int): points within this distance (km) to the
+                observed trajectory are considered close to it/nearby. (Default: 5)
+            samples (int): the number of points to represent each observed
+                trajectory with. (Default: 4)
+
+        Yields:
+            result of predict_origin_destination() for each observed
+            trajectory, in order
+        """
+
+        for observed_trajectory in observed_trajectories:
+            yield self.predict_origin_destination(observed_trajectory,
+                                                  neighbor_distance=neighbor_distance,
+                                                  samples=samples)
+
+    def predict_location_batch(self, observed_trajectories, minutes, neighbor_distance=5,
+                               samples=4, processors=1, as_dataframe=False):
+        """Predict locations for many observed trajectories as one table
+
+        See the module-level predict_location_batch() for details.
+        """
+
+        return predict_location_batch(observed_trajectories, self, minutes,
+                                      neighbor_distance=neighbor_distance,
+                                      samples=samples, processors=processors,
+                                      as_dataframe=as_dataframe, quiet=self.quiet)
+
+    def predict_origin_destination_batch(self, observed_trajectories, neighbor_distance=5,
+                                         samples=4, processors=1, as_dataframe=False):
+        """Predict origins and destinations for many observed trajectories
+        as one table
+
+        See the module-level predict_origin_destination_batch() for details.
+        """
+
+        return predict_origin_destination_batch(observed_trajectories, self,
+                                                neighbor_distance=neighbor_distance,
+                                                samples=samples, processors=processors,
+                                                as_dataframe=as_dataframe,
+                                                quiet=self.quiet)
 
-    return prediction_dictionary
+
+# Files that make up a saved PredictionModel
+_MODEL_METADATA_FILE = 'model.json'
+_MODEL_TRAJECTORY_FILE = 'trajectories.trajbin'
+_MODEL_POINTS_FILE = 'points.npy'
 
 def align(rtree, all_points, trajectories, observed_trajectory,
           neighbor_distance, quiet=False):
@@ -552,7 +1116,8 @@ def align(rtree, all_points, trajectories, observed_trajectory,
     Arguments:
         rtree (R-Tree): an rtree containing all of the points from historical
             trajectories
-        all_points (list): a list of all the points in the rtree
+        all_points (array): array of all the points in the rtree, one
+            row per point
         trajectories (list): a list of all the historical trajectories
         observed_trajectory (Tracktable trajectory): Trajectory
         neighbor_distance (int): points within this distance to the observed trajectory
@@ -565,8 +1130,8 @@ def align(rtree, all_points, trajectories, observed_trajectory,
         sample points the historical trajectory is close to
     """
 
-    results0 = []
-    aligning_trajs = {}
+    min_corners = []
+    max_corners = []
     for point in tqdm(observed_trajectory, disable=quiet):
         point.set_property('altitude', 0)
         # convert to ECEF for more exact distance calculations
@@ -579,23 +1144,28 @@ def align(rtree, all_points, trajectories, observed_trajectory,
             max_corner[j] += neighbor_distance
         # account for points being stored as feature vectors with last point
         # being its index in list of trajectories
-        min_corner_fv = [min_corner[0], min_corner[1], min_corner[2], 0]
-        max_corner_fv = [max_corner[0], max_corner[1], max_corner[2],
-                         len(trajectories)]
-        # perform a search in the rtree for points from other trajectories
-        results0 = rtree.find_points_in_box(min_corner=min_corner_fv,
-                                            max_corner=max_corner_fv)
+        min_corners.append([min_corner[0], min_corner[1], min_corner[2], 0])
+        max_corners.append([max_corner[0], max_corner[1], max_corner[2],
+                            len(trajectories)])
+
+    # perform one batch search in the rtree for points from other
+    # trajectories near every sample point
+    (offsets, indices) = rtree.find_points_in_boxes(min_corners, max_corners)
+
+    aligning_trajs = {}
+    for i, point in enumerate(observed_trajectory):
         # ensure trajectory is in neighbor_distance of sample point
         # remember that we searched a box, but we really want points in a
         # sphere ensure that each trajectory is only added to the dictionary
         # once
         already_added = set()
-        for t_index in results0:
+        for t_index in indices[offsets[i]:offsets[i+1]]:
             trajectory = int(all_points[t_index][3])
+            if trajectory in already_added:
+                continue
             # calculate distance from point to trajectory
             traj_to_point = distance(trajectories[trajectory], point)
-            if (not (trajectory in already_added)) \
-                    and (traj_to_point < neighbor_distance):
+            if traj_to_point < neighbor_distance:
                 already_added.add(trajectory)
                 if trajectory in aligning_trajs.keys():
                     aligning_trajs[trajectory] = aligning_trajs[trajectory] + 1
@@ -640,7 +1210,8 @@ def find_well_aligned_trajectories(observed_trajectory, prediction_dictionary,
 
 
 def find_same_direction_trajectories(observed_trajectory, historical_trajectories,
-                                     prediction_dictionary, quiet=False):
+                                     prediction_dictionary, quiet=False,
+                                     neighbor_distance=None):
     """Find the historical trajectories that go in the same direction as the
     observed trajectory
 
@@ -650,6 +1221,9 @@ def find_same_direction_trajectories(observed_trajectory, historical_trajectorie
         prediction_dictionary (dict): prediction dictionary object returned from
             process_historical data
         quiet (bool): produce no output, no tqdm output
+        neighbor_distance (int): Search this far (km) around the ends of
+            the observed trajectory with the segment R-tree first.  Only
+            affects speed. (Default: None)
 
     Returns:
         a list of trajectory indices of trajectories that go in the
@@ -657,20 +1231,32 @@ def find_same_direction_trajectories(observed_trajectory, historical_trajectorie
     """
 
     segments = prediction_dictionary['segments']
-    correct_direction = []
-    for trajectory in tqdm(historical_trajectories, disable=quiet):
-        # closest point to beginning of observed trajectory
-        nearest_front = _nearest_trajectory_point(trajectory, observed_trajectory[0], segments)
-        # closest point to end of observed trajectory
-        nearest_back = _nearest_trajectory_point(trajectory, observed_trajectory[
-            len(observed_trajectory) - 1], segments)
-        # t2-t1
-        duration = nearest_back.timestamp - nearest_front.timestamp
-        # only add the trajectory if the direction is the same
-        if duration >= datetime.timedelta(0):
-            correct_direction.append(trajectory)
-
-    return correct_direction
+    historical_trajectories = list(historical_trajectories)
+    # closest points to the beginning and end of the observed trajectory
+    front_times = segments.nearest_timestamps(historical_trajectories, observed_trajectory[0],
+                                              search_radius=neighbor_distance)
+    back_times = segments.nearest_timestamps(historical_trajectories,
+                                             observed_trajectory[len(observed_trajectory) - 1],
+                                             search_radius=neighbor_distance)
+    # only keep the trajectory if the direction is the same (t2-t1 >= 0)
+    return [trajectory for (trajectory, same_direction)
+            in zip(historical_trajectories, back_times >= front_times)
+            if same_direction]
+
+
+def _distances_to_observed_points(observed_trajectory, historical_trajectories,
+                                  prediction_dictionary):
+    """Distance from every observed point to every historical trajectory
+
+    Returns:
+        array with one row per observed point and one column per
+        historical trajectory
+    """
+
+    segments = prediction_dictionary['segments']
+    return np.array([segments.distances(historical_trajectories, point)
+                     for point in observed_trajectory]).reshape(
+                         len(observed_trajectory), len(historical_trajectories))
 
 
 def find_weights_origin_destination(observed_trajectory, historical_trajectories,
@@ -694,18 +1280,19 @@ def find_weights_origin_destination(observed_trajectory, historical_trajectories
     """
 
     trajectories = prediction_dictionary['trajectories']
+    historical_trajectories = list(historical_trajectories)
+    distances = _distances_to_observed_points(observed_trajectory,
+                                              historical_trajectories,
+                                              prediction_dictionary)
     weights = {}
     pairs_to_trajs = {}
-    for trajectory in historical_trajectories:
+    for (column, trajectory) in enumerate(historical_trajectories):
         # assume consistent origin/destination
         origin = trajectories[trajectory][0].properties['orig']
         destination = trajectories[trajectory][0].properties['dest']
         pair = (origin, destination)
-        add_weight = []
-        for point in observed_trajectory:
-            new_distance = distance(trajectories[trajectory], point)
-            new_weight = weight_function(new_distance)
-            add_weight.append(new_weight)
+        add_weight = [weight_function(float(new_distance))
+                      for new_distance in distances[:, column]]
 
         # pick the worst performing weight/point that is the farthest
         # away
@@ -751,14 +1338,15 @@ def find_weights_trajectories(observed_trajectory, historical_trajectories, pred
     """
 
     trajectories = prediction_dictionary['trajectories']
+    historical_trajectories = list(historical_trajectories)
+    distances = _distances_to_observed_points(observed_trajectory,
+                                              historical_trajectories,
+                                              prediction_dictionary)
     weights = {}
-    for trajectory in historical_trajectories:
+    for (column, trajectory) in enumerate(historical_trajectories):
         name = trajectories[trajectory].trajectory_id
-        add_weight = []
-        for point in observed_trajectory:
-            new_distance = distance(trajectories[trajectory], point)
-            new_weight = weight_function(new_distance)
-            add_weight.append(new_weight)
+        add_weight = [weight_function(float(new_distance))
+                      for new_distance in distances[:, column]]
 
         # choose the worst weight
         weight = min(add_weight)
@@ -777,7 +1365,7 @@ def find_weights_trajectories(observed_trajectory, historical_trajectories, pred
 
 
 def predict_location(observed_trajectory, prediction_dictionary, minutes, neighbor_distance=5,
-                     samples=4):
+                     samples=4, quiet=False):
     """Predicts the location of the trajectory in the specified amount of
     minutes
 
@@ -792,6 +1380,7 @@ def predict_location(observed_trajectory, prediction_dictionary, minutes, neighb
             observed trajectory are considered close to it/nearby. (Default: 5)
         samples (int): the number of points to represent the observed
             trajectory with. (Default: 4)
+        quiet (bool): produce no output, no tqdm output (Default: False)
 
     Returns:
         a list. The first element is a dictionary of predicted points, the
@@ -804,7 +1393,7 @@ def predict_location(observed_trajectory, prediction_dictionary, minutes, neighb
     observed_trajectory = sample_trajectory(observed_trajectory, samples)
 
     predictions, _, weights = _predict_helper(prediction_dictionary, observed_trajectory,
-                                             neighbor_distance, False)
+                                             neighbor_distance, False, quiet=quiet)
 
     points = {}
     paths = {}
@@ -829,7 +1418,7 @@ def predict_location(observed_trajectory, prediction_dictionary, minutes, neighb
 
 
 def predict_origin_destination(observed_trajectory, prediction_dictionary, neighbor_distance=5,
-                               samples=4, printResults=True):
+                               samples=4, printResults=True, quiet=False):
     """Predicts the origin and destination of an observed trajectory
 
     Arguments:
@@ -844,6 +1433,7 @@ def predict_origin_destination(observed_trajectory, prediction_dictionary, neigh
             it/nearby. (Default: 5)
         samples (int): the number of points to represent the observed
             trajectory with. (Default: 4)
+        quiet (bool): produce no output, no tqdm output (Default: False)
 
     Returns:
         a dictionary of results
@@ -854,7 +1444,8 @@ def predict_origin_destination(observed_trajectory, prediction_dictionary, neigh
 
     predictions, pairs_to_trajs, weights = _predict_helper(prediction_dictionary,
                                                           observed_trajectory,
-                                                          neighbor_distance, True)
+                                                          neighbor_distance, True,
+                                                          quiet=quiet)
 
     sum_weights = 0
     integrated_weights = {}
@@ -884,6 +1475,239 @@ def predict_origin_destination(observed_trajectory, prediction_dictionary, neigh
     return results
 
 
+###############################################################################
+########################### BATCH PREDICTION ##################################
+###############################################################################
+
+# Worker processes inherit this through fork() so that the prediction
+# model is shared rather than pickled for every task.
+_BATCH_PREDICTION_STATE = None
+
+
+def predict_origin_destination_batch(observed_trajectories, prediction_dictionary,
+                                     neighbor_distance=5, samples=4, processors=1,
+                                     as_dataframe=False, quiet=False):
+    """Predict the origins and destinations of many observed trajectories
+
+    Each observed trajectory is scored exactly as predict_origin_destination()
+    would.  The results are returned as one table with a row for every
+    possible origin/destination pair of every observed trajectory.
+
+    Arguments:
+        observed_trajectories (iterable): trajectories to make predictions for
+        prediction_dictionary (dict): prediction dictionary object returned from
+            process_historical data, or a PredictionModel
+
+    Keyword Arguments:
+        neighbor_distance (int): points within this distance (km) to the
+            observed trajectory are considered close to it/nearby. (Default: 5)
+        samples (int): the number of points to represent each observed
+            trajectory with. (Default: 4)
+        processors (int): Number of worker processes to score trajectories with.
+            Zero means one per CPU.  Workers are forked so that they share the
+            prediction model with this process instead of receiving a copy.
+            On platforms without fork() the trajectories are scored
+            serially. (Default: 1)
+        as_dataframe (bool): Return a pandas DataFrame instead of a dictionary
+            of arrays.  Requires pandas. (Default: False)
+        quiet (bool): produce no output, no tqdm output (Default: False)
+
+    Returns:
+        A dictionary of NumPy arrays (or a DataFrame) with the columns
+        'observation' (index into observed_trajectories), 'rank' (0 for the
+        most likely pair), 'origin', 'destination' and 'weight'.  Observed
+        trajectories with no prediction have no rows.
+    """
+
+    scores = _score_batch(observed_trajectories, prediction_dictionary,
+                          _score_origin_destination,
+                          dict(neighbor_distance=neighbor_distance, samples=samples),
+                          processors, quiet)
+
+    columns = [('origin', object), ('destination', object), ('weight', np.float64)]
+    return _batch_results_table(scores, columns, as_dataframe)
+
+
+def predict_location_batch(observed_trajectories, prediction_dictionary, minutes,
+                           neighbor_distance=5, samples=4, processors=1,
+                           as_dataframe=False, quiet=False):
+    """Predict where many observed trajectories will be
+
+    Each observed trajectory is scored exactly as predict_location() would.
+    The results are returned as one table with a row for every historical
+    trajectory that contributed a predicted location.  The paths to the
+    predicted points are not included; call predict_location() for a
+    single trajectory when you need them.
+
+    Arguments:
+        observed_trajectories (iterable): trajectories to make predictions for
+        prediction_dictionary (dict): prediction dictionary object returned from
+            process_historical data, or a PredictionModel
+        minutes (int): Number of minutes forward to predict
+
+    Keyword Arguments:
+        neighbor_distance (int): points within this distance (km) to the
+            observed trajectory are considered close to it/nearby. (Default: 5)
+        samples (int): the number of points to represent each observed
+            trajectory with. (Default: 4)
+        processors (int): Number of worker processes to score trajectories with.
+            Zero means one per CPU.  See predict_origin_destination_batch().
+            (Default: 1)
+        as_dataframe (bool): Return a pandas DataFrame instead of a dictionary
+            of arrays.  Requires pandas. (Default: False)
+        quiet (bool): produce no output, no tqdm output (Default: False)
+
+    Returns:
+        A dictionary of NumPy arrays (or a DataFrame) with the columns
+        'observation' (index into observed_trajectories), 'rank' (0 for the
+        highest weight), 'trajectory_id' (historical trajectory the
+        prediction came from), 'longitude', 'latitude', 'timestamp'
+        (datetime64[us], UTC) and 'weight'.  Observed trajectories with no
+        prediction have no rows.
+    """
+
+    scores = _score_batch(observed_trajectories, prediction_dictionary,
+                          _score_location,
+                          dict(minutes=minutes, neighbor_distance=neighbor_distance,
+                               samples=samples),
+                          processors, quiet)
+
+    columns = [('trajectory_id', object), ('longitude', np.float64),
+               ('latitude', np.float64), ('timestamp', 'datetime64[us]'),
+               ('weight', np.float64)]
+    return _batch_results_table(scores, columns, as_dataframe)
+
+
+def _score_origin_destination(observed_trajectory, prediction_dictionary,
+                              neighbor_distance, samples, quiet):
+    """Rows (origin, destination, weight) for one observed trajectory, best first"""
+
+    results = predict_origin_destination(observed_trajectory, prediction_dictionary,
+                                         neighbor_distance=neighbor_distance,
+                                         samples=samples, printResults=False,
+                                         quiet=quiet)
+    return [(origin, destination, float(results['weights'][(origin, destination)]))
+            for (origin, destination) in results['predictions']]
+
+
+def _score_location(observed_trajectory, prediction_dictionary, minutes,
+                    neighbor_distance, samples, quiet):
+    """Rows (trajectory_id, longitude, latitude, timestamp, weight) for
+    one observed trajectory, best first
+    """
+
+    (points, _, weights) = predict_location(observed_trajectory, prediction_dictionary,
+                                            minutes,
+                                            neighbor_distance=neighbor_distance,
+                                            samples=samples, quiet=quiet)
+    rows = []
+    for (trajectory_id, weight) in sorted(weights.items(), key=lambda x: x[1], reverse=True):
+        point = points[trajectory_id]
+        timestamp = point.timestamp
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        rows.append((trajectory_id, point[0], point[1],
+                     np.datetime64(timestamp, 'us'), float(weight)))
+    return rows
+
+
+def _score_batch(observed_trajectories, prediction_dictionary, score_function,
+                 score_kwargs, processors, quiet):
+    """Score every observed trajectory, in parallel if requested.
+
+    Returns:
+        list with the rows for each observed trajectory, in order
+    """
+
+    observed_trajectories = list(observed_trajectories)
+    # The batch draws one progress bar of its own.  One per observed
+    # trajectory would be far too many, so the scoring itself is quiet.
+    score_kwargs = dict(score_kwargs, quiet=True)
+    if processors != 1 and 'fork' in multiprocessing.get_all_start_methods():
+        return _score_batch_in_parallel(observed_trajectories, prediction_dictionary,
+                                        score_function, score_kwargs, processors, quiet)
+
+    if processors != 1:
+        logger.warning('Parallel prediction requires fork(). '
+                       'Scoring trajectories serially.')
+    return [score_function(observed_trajectory, prediction_dictionary, **score_kwargs)
+            for observed_trajectory in tqdm(observed_trajectories, disable=quiet)]
+
+
+def _score_observation_by_index(i):
+    (observed_trajectories, prediction_dictionary,
+     score_function, score_kwargs) = _BATCH_PREDICTION_STATE
+    return score_function(observed_trajectories[i], prediction_dictionary, **score_kwargs)
+
+
+def _score_batch_in_parallel(observed_trajectories, prediction_dictionary,
+                             score_function, score_kwargs, processors, quiet):
+    """Score observed trajectories across forked worker processes.
+
+    Only indices and result rows cross process boundaries.  Results
+    come back in the same order as observed_trajectories.
+    """
+
+    global _BATCH_PREDICTION_STATE
+
+    # Build the segment store before forking so that the workers
+    # share it instead of each building their own.
+    prediction_dictionary['segments']
+
+    _BATCH_PREDICTION_STATE = (observed_trajectories, prediction_dictionary,
+                               score_function, score_kwargs)
+
+    if processors == 0:
+        processors = multiprocessing.cpu_count()
+
+    try:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(processes=processors) as pool:
+            chunksize = max(1, len(observed_trajectories) // (processors * 16))
+            return list(tqdm(pool.imap(_score_observation_by_index,
+                                       range(len(observed_trajectories)),
+                                       chunksize=chunksize),
+                             total=len(observed_trajectories),
+                             disable=quiet))
+    finally:
+        _BATCH_PREDICTION_STATE = None
+
+
+def _batch_results_table(scores, columns, as_dataframe):
+    """Flatten per-observation rows into columns
+
+    Arguments:
+        scores (list): list of rows for each observation, best first
+        columns (list): (name, dtype) for each value in a row
+        as_dataframe (bool): return a DataFrame instead of a dictionary
+
+    Returns:
+        dictionary of arrays or DataFrame
+    """
+
+    counts = np.array([len(rows) for rows in scores], dtype=np.int64)
+    table = {'observation': np.repeat(np.arange(len(scores), dtype=np.int64), counts),
+             'rank': np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)}
+    for (column, (name, dtype)) in enumerate(columns):
+        values = [row[column] for rows in scores for row in rows]
+        if dtype is object:
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+        else:
+            array = np.array(values, dtype=dtype)
+        table[name] = array
+
+    if as_dataframe:
+        if not pandas_installed:
+            raise ImportError(
+                'Returning prediction results as a DataFrame requires pandas.  '
+                'Install it with "pip install pandas" or '
+                '"conda install pandas".')
+        return pandas.DataFrame(table)
+    return table
+
+
+
 ###############################################################################
 ########################### SAVE RELEVANT TRAJS ###############################
 ###############################################################################
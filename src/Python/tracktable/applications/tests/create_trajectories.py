@@ -0,0 +1,60 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Build small terrestrial trajectories for the tests in this directory.
+
+import datetime
+
+from tracktable.core import Timestamp
+from tracktable.domain.terrestrial import Trajectory, TrajectoryPoint
+
+
+def trajectory_from_lonlats(lonlats, object_id=''):
+    """Make a trajectory through the given (longitude, latitude) pairs.
+
+    The points share 'object_id' and are 10 minutes apart, starting
+    at midnight on 2020-01-01.
+    """
+
+    start_time = Timestamp.from_any('2020-01-01 00:00:00')
+    points = []
+    for (i, (lon, lat)) in enumerate(lonlats):
+        point = TrajectoryPoint(lon, lat)
+        point.object_id = object_id
+        point.timestamp = start_time + datetime.timedelta(minutes=10 * i)
+        points.append(point)
+    return Trajectory.from_position_list(points)
+
+
+def diagonal_trajectory(start_lon, start_lat, num_points):
+    """Make a trajectory that steps 0.1 degree north and east per point."""
+
+    return trajectory_from_lonlats([(start_lon + 0.1 * i, start_lat + 0.1 * i)
+                                    for i in range(num_points)])
@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Test saving, appending to and reopening the persistent historical
+# index used by tracktable.applications.anomaly_detection.
+
+import os.path
+import sys
+import tempfile
+
+import numpy
+from tracktable.applications import anomaly_detection
+from tracktable.domain.terrestrial import Trajectory
+
+from .create_trajectories import diagonal_trajectory
+
+
+def test_round_trip(index_filename):
+    error_count = 0
+
+    first_batch = [diagonal_trajectory(-106.5, 35.0, 5),
+                   diagonal_trajectory(-117.0, 32.5, 3)]
+    # A trajectory with no points still counts.
+    second_batch = [diagonal_trajectory(-122.0, 47.5, 4), Trajectory()]
+
+    num_saved = anomaly_detection.save_historical_index(index_filename,
+                                                        trajectories=first_batch)
+    if num_saved != 2:
+        print('ERROR: save_historical_index reported {} trajectories, expected 2.'.format(num_saved))
+        error_count += 1
+
+    num_total = anomaly_detection.append_to_historical_index(index_filename,
+                                                             trajectories=second_batch)
+    if num_total != 4:
+        print('ERROR: append_to_historical_index reported {} trajectories, expected 4.'.format(num_total))
+        error_count += 1
+
+    for memory_map in (True, False):
+        tree, num_loaded = anomaly_detection.load_historical_index(index_filename,
+                                                                   memory_map=memory_map)
+        expected_tree, _ = anomaly_detection.create_rtree(first_batch + second_batch,
+                                                          ram_limited=True)
+
+        if num_loaded != 4:
+            print('ERROR: load_historical_index found {} trajectories, expected 4.'.format(num_loaded))
+            error_count += 1
+        if len(tree) != 12:
+            print('ERROR: Loaded index has {} points, expected 12.'.format(len(tree)))
+            error_count += 1
+        if not numpy.allclose(tree.points, expected_tree.points):
+            print('ERROR: Loaded index points do not match a freshly built R-tree.')
+            error_count += 1
+
+    return error_count
+
+
+def test_anomaly_detection_with_index(index_filename):
+    historical = [diagonal_trajectory(-106.5, 35.0, 5)]
+    anomaly_detection.save_historical_index(index_filename, trajectories=historical)
+    tree, num_trajectories = anomaly_detection.load_historical_index(index_filename)
+
+    to_analyze = [diagonal_trajectory(-106.5, 35.0, 5),
+                  diagonal_trajectory(10.0, 50.0, 5)]
+    nearby = anomaly_detection.anomaly_detection(to_analyze,
+                                                 historical_points_rtree=tree,
+                                                 num_historical_trajectories=num_trajectories)
+    if len(nearby[0]) != 1 or len(nearby[1]) != 0:
+        print('ERROR: Expected one passerby for the first trajectory and none '
+              'for the second.  Got {}.'.format(nearby))
+        return 1
+    if not all(type(index) is int for index in nearby[0]):
+        print('ERROR: Expected passerby indices to be ints.  Got {}.'.format(
+            [type(index) for index in nearby[0]]))
+        return 1
+    return 0
+
+
+def main():
+    error_count = 0
+    with tempfile.TemporaryDirectory() as tempdir:
+        index_filename = os.path.join(tempdir, 'historical_index.npy')
+        error_count += test_round_trip(index_filename)
+        error_count += test_anomaly_detection_with_index(index_filename)
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
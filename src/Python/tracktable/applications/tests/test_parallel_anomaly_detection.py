@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Test that anomaly_detection() gives the same answers, in the same
+# order, whether it runs serially or across worker processes.
+
+import sys
+
+from tracktable.applications import anomaly_detection
+
+from .create_trajectories import diagonal_trajectory
+
+
+def main():
+    historical = [diagonal_trajectory(-106.5 + i, 35.0, 5) for i in range(5)]
+    # Every other trajectory to analyze follows a historical one.  The
+    # rest are far away from all of them.
+    to_analyze = []
+    for i in range(20):
+        if i % 2 == 0:
+            to_analyze.append(diagonal_trajectory(-106.5 + (i // 2) % 5, 35.0, 5))
+        else:
+            to_analyze.append(diagonal_trajectory(10.0 + i, 50.0, 5))
+
+    serial = anomaly_detection.anomaly_detection(to_analyze,
+                                                 historical_trajectories=historical)
+    parallel = anomaly_detection.anomaly_detection(to_analyze,
+                                                   historical_trajectories=historical,
+                                                   processors=4)
+
+    error_count = 0
+    if len(parallel) != len(to_analyze):
+        print('ERROR: Expected {} results from parallel anomaly detection, got {}.'.format(
+            len(to_analyze), len(parallel)))
+        return 1
+    for i, (expected, actual) in enumerate(zip(serial, parallel)):
+        if set(expected) != set(actual):
+            print('ERROR: Trajectory {}: serial passersby {}, parallel passersby {}.'.format(
+                i, sorted(expected), sorted(actual)))
+            error_count += 1
+    if anomaly_detection.count_anomalies(parallel) != 10:
+        print('ERROR: Expected 10 anomalies, found {}.'.format(
+            anomaly_detection.count_anomalies(parallel)))
+        error_count += 1
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
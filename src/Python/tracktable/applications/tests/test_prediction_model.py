@@ -0,0 +1,211 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+# Test building, saving and reloading a PredictionModel and making
+# predictions with it.
+
+import contextlib
+import datetime
+import io
+import json
+import os.path
+import sys
+import tempfile
+
+import numpy
+from tracktable.applications.prediction import (PredictionModel,
+                                                predict_origin_destination_batch)
+from tracktable.core import Timestamp
+from tracktable.domain.terrestrial import Trajectory, TrajectoryPoint
+
+
+def make_flight(object_id, origin, destination, start_lon, start_lat, num_points):
+    start_time = Timestamp.from_any('2020-01-01 12:00:00')
+    points = []
+    for i in range(num_points):
+        point = TrajectoryPoint(start_lon + 0.05 * i, start_lat + 0.05 * i)
+        point.object_id = object_id
+        point.timestamp = start_time + datetime.timedelta(minutes=i)
+        point.properties['orig'] = origin
+        point.properties['dest'] = destination
+        points.append(point)
+    return Trajectory.from_position_list(points)
+
+
+def make_historical_flights():
+    return [make_flight('FLT001', 'ABQ', 'DEN', -106.5, 35.0, 20),
+            make_flight('FLT002', 'ABQ', 'DEN', -106.5, 35.01, 20),
+            make_flight('FLT003', 'SAN', 'SEA', -117.0, 32.5, 20)]
+
+
+def test_round_trip(model_directory):
+    error_count = 0
+
+    model = PredictionModel(make_historical_flights())
+    model.save(model_directory)
+
+    for memory_map in (True, False):
+        loaded = PredictionModel.load(model_directory, memory_map=memory_map)
+
+        if len(loaded.trajectories) != len(model.trajectories):
+            print('ERROR: Loaded model has {} trajectories, expected {}.'.format(
+                len(loaded.trajectories), len(model.trajectories)))
+            error_count += 1
+        if not numpy.array_equal(loaded.all_points, model.all_points):
+            print('ERROR: Loaded feature points do not match the saved model.')
+            error_count += 1
+        if len(loaded.tree) != len(model.all_points):
+            print('ERROR: Loaded R-tree has {} points, expected {}.'.format(
+                len(loaded.tree), len(model.all_points)))
+            error_count += 1
+        if loaded.id_to_index != model.id_to_index:
+            print('ERROR: Loaded trajectory ID map does not match the saved model.')
+            error_count += 1
+        if sorted(loaded.keys()) != sorted(model.keys()):
+            print('ERROR: Loaded model has keys {}, expected {}.'.format(
+                sorted(loaded.keys()), sorted(model.keys())))
+            error_count += 1
+
+    return error_count
+
+
+def test_predictions(model_directory):
+    error_count = 0
+
+    model = PredictionModel(make_historical_flights())
+    model.save(model_directory)
+    loaded = PredictionModel.load(model_directory)
+
+    observed = [make_flight('OBS001', '', '', -106.5, 35.005, 10),
+                make_flight('OBS002', '', '', -117.0, 32.5, 10)]
+
+    expected_pairs = [('ABQ', 'DEN'), ('SAN', 'SEA')]
+    results = list(loaded.predict_origin_destinations(observed))
+    if len(results) != len(observed):
+        print('ERROR: Got {} origin/destination results, expected {}.'.format(
+            len(results), len(observed)))
+        return error_count + 1
+
+    for (result, pair) in zip(results, expected_pairs):
+        if not result['predictions'] or result['predictions'][0] != pair:
+            print('ERROR: Expected best origin/destination {}, got {}.'.format(
+                pair, result['predictions']))
+            error_count += 1
+
+    fresh_result = model.predict_origin_destination(observed[0])
+    if fresh_result['weights'] != results[0]['weights']:
+        print('ERROR: Loaded model weights {} do not match fresh model weights {}.'.format(
+            results[0]['weights'], fresh_result['weights']))
+        error_count += 1
+
+    locations = list(loaded.predict_locations(observed, 5))
+    if len(locations) != len(observed):
+        print('ERROR: Got {} location results, expected {}.'.format(
+            len(locations), len(observed)))
+        error_count += 1
+
+    return error_count
+
+
+def test_batch_predictions():
+    error_count = 0
+
+    model = PredictionModel(make_historical_flights())
+    observed = [make_flight('OBS001', '', '', -106.5, 35.005, 10),
+                make_flight('OBS002', '', '', 50.0, 10.0, 10),
+                make_flight('OBS003', '', '', -117.0, 32.5, 10)]
+
+    expected_rows = []
+    for (i, result) in enumerate(model.predict_origin_destinations(observed)):
+        for (rank, pair) in enumerate(result['predictions']):
+            expected_rows.append((i, rank, pair[0], pair[1], result['weights'][pair]))
+
+    for processors in (1, 2):
+        progress_output = io.StringIO()
+        with contextlib.redirect_stderr(progress_output):
+            table = predict_origin_destination_batch(observed, model,
+                                                     processors=processors,
+                                                     quiet=True)
+        # Forked workers keep their own sys.stderr, so only the serial
+        # run can be checked for stray progress bars.
+        if processors == 1 and progress_output.getvalue():
+            print('ERROR: Quiet batch prediction wrote progress output: {!r}'.format(
+                progress_output.getvalue()))
+            error_count += 1
+        rows = list(zip(table['observation'].tolist(), table['rank'].tolist(),
+                        table['origin'].tolist(), table['destination'].tolist(),
+                        table['weight'].tolist()))
+        if rows != expected_rows:
+            print('ERROR: Batch origin/destination rows with {} processors are {}, expected {}.'.format(
+                processors, rows, expected_rows))
+            error_count += 1
+
+        locations = model.predict_location_batch(observed, 5, processors=processors)
+        if set(locations['observation'].tolist()) != {0, 2}:
+            print('ERROR: Expected location predictions for observations 0 and 2, got {}.'.format(
+                sorted(set(locations['observation'].tolist()))))
+            error_count += 1
+        if locations['timestamp'].dtype != numpy.dtype('datetime64[us]'):
+            print('ERROR: Location timestamps have dtype {}, expected datetime64[us].'.format(
+                locations['timestamp'].dtype))
+            error_count += 1
+
+    return error_count
+
+
+def test_version_mismatch(model_directory):
+    PredictionModel(make_historical_flights()).save(model_directory)
+    metadata_filename = os.path.join(model_directory, 'model.json')
+    with open(metadata_filename, 'r') as infile:
+        metadata = json.load(infile)
+    metadata['format_version'] = PredictionModel.FORMAT_VERSION + 1
+    with open(metadata_filename, 'w') as outfile:
+        json.dump(metadata, outfile)
+
+    try:
+        PredictionModel.load(model_directory)
+    except ValueError:
+        return 0
+    print('ERROR: Loading a model with the wrong format version did not raise ValueError.')
+    return 1
+
+
+def main():
+    error_count = 0
+    with tempfile.TemporaryDirectory() as tempdir:
+        error_count += test_round_trip(os.path.join(tempdir, 'round_trip'))
+        error_count += test_predictions(os.path.join(tempdir, 'predictions'))
+        error_count += test_version_mismatch(os.path.join(tempdir, 'version'))
+    error_count += test_batch_predictions()
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+# Test that the SegmentStore used by prediction finds the same
+# distances and closest points as geomath does on whole trajectories.
+
+import datetime
+import sys
+
+from tracktable.applications.prediction import SegmentStore
+from tracktable.core.geomath import distance
+from tracktable.domain.terrestrial import TrajectoryPoint
+
+from .create_trajectories import trajectory_from_lonlats
+
+
+def make_historical_trajectories():
+    return [
+        trajectory_from_lonlats(
+            [(-106.5, 35.0), (-104.0, 36.0), (-101.0, 36.5), (-98.0, 38.0)],
+            object_id='A'),
+        # Repeated point in the middle
+        trajectory_from_lonlats(
+            [(-103.0, 30.0), (-103.0, 33.0), (-103.0, 33.0), (-103.0, 40.0)],
+            object_id='B'),
+        trajectory_from_lonlats(
+            [(10.0, 50.0), (11.0, 51.0), (12.0, 50.0)],
+            object_id='C'),
+        # Single point
+        trajectory_from_lonlats(
+            [(-100.0, 35.0)],
+            object_id='D'),
+        trajectory_from_lonlats(
+            [(179.0, 0.0), (-179.0, 0.5)],
+            object_id='E')
+        ]
+
+
+def test_distances(store, historical):
+    error_count = 0
+    queries = [TrajectoryPoint(lon, lat) for (lon, lat) in
+               [(-105.0, 35.5), (-103.1, 34.0), (11.0, 50.5), (-100.0, 35.2),
+                (179.9, 0.1), (-50.0, -20.0)]]
+    all_trajectories = list(range(len(historical)))
+
+    for query in queries:
+        for search_radius in (None, 1, 100):
+            distances = store.distances(all_trajectories, query, search_radius=search_radius)
+            for (i, trajectory) in enumerate(historical):
+                if len(trajectory) > 1:
+                    expected = distance(trajectory, query)
+                else:
+                    expected = distance(trajectory[0], query)
+                if abs(distances[i] - expected) > 1e-3:
+                    print(('ERROR: Distance from {} to trajectory {} is {} with '
+                           'search radius {}, expected {}.').format(
+                               query, i, distances[i], search_radius, expected))
+                    error_count += 1
+
+            # The closest point must be as far away as the trajectory itself.
+            for (i, trajectory) in enumerate(historical):
+                closest = store.nearest_point(i, query, search_radius=search_radius)
+                if abs(distance(closest, query) - distances[i]) > 1e-3:
+                    print(('ERROR: Closest point {} on trajectory {} is {} km from {}, '
+                           'expected {}.').format(closest, i, distance(closest, query),
+                                                  query, distances[i]))
+                    error_count += 1
+
+    return error_count
+
+
+def test_timestamps(store, historical):
+    error_count = 0
+
+    # Halfway between the first two points of trajectory A
+    query = TrajectoryPoint(-105.25, 35.6)
+    (timestamp,) = store.nearest_timestamps([0], query)
+    closest = store.nearest_point(0, query)
+    expected = closest.timestamp.replace(tzinfo=None)
+    if abs(timestamp.astype(datetime.datetime) - expected) > datetime.timedelta(seconds=1):
+        print('ERROR: Closest timestamp is {}, expected {}.'.format(timestamp, expected))
+        error_count += 1
+
+    # Moving along trajectory A gets later, not earlier
+    front = store.nearest_timestamps([0], historical[0][0])
+    back = store.nearest_timestamps([0], historical[0][-1])
+    if not back[0] > front[0]:
+        print('ERROR: Timestamp near the end ({}) is not after the one near the start ({}).'.format(
+            back[0], front[0]))
+        error_count += 1
+
+    return error_count
+
+
+def main():
+    historical = make_historical_trajectories()
+    store = SegmentStore(historical)
+
+    error_count = 0
+    expected_segments = sum(len(trajectory) - 1 for trajectory in historical)
+    if len(store) != expected_segments:
+        print('ERROR: Expected {} segments in the store, found {}.'.format(
+            expected_segments, len(store)))
+        error_count += 1
+
+    error_count += test_distances(store, historical)
+    error_count += test_timestamps(store, historical)
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
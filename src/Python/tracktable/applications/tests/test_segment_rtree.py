@@ -0,0 +1,97 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Test that the segment R-tree used by anomaly detection finds the
+# same passersby as checking every historical trajectory directly.
+
+import sys
+
+from tracktable.applications import anomaly_detection
+from tracktable.core.geomath import compute_bounding_box, intersects
+
+from .create_trajectories import trajectory_from_lonlats
+
+
+def brute_force_passersby(control_point, historical_trajectories, nearness_radius):
+    box = compute_bounding_box([control_point], buffer=(nearness_radius,)*2)
+    return {i for (i, trajectory) in enumerate(historical_trajectories)
+            if intersects(trajectory, box)}
+
+
+def main():
+    historical = [
+        trajectory_from_lonlats([(-106.5, 35.0), (-100.0, 35.0)]),
+        trajectory_from_lonlats([(-103.0, 30.0), (-103.0, 40.0)]),
+        trajectory_from_lonlats([(10.0, 50.0), (11.0, 51.0), (12.0, 50.0)]),
+        # Long east-west arc: the great circle bulges north of 60 degrees
+        trajectory_from_lonlats([(-60.0, 60.0), (60.0, 60.0)]),
+        trajectory_from_lonlats([(179.0, 0.0), (-179.0, 0.0)])
+        ]
+
+    tree, segment_idx_to_traj_idx = anomaly_detection.create_segment_rtree(historical)
+
+    error_count = 0
+    if len(tree) != 6:
+        print('ERROR: Expected 6 segments in the segment R-tree, found {}.'.format(len(tree)))
+        error_count += 1
+
+    queries = [
+        trajectory_from_lonlats([(-106.5, 35.0), (-100.0, 35.0)]),
+        trajectory_from_lonlats([(-103.0, 30.0), (-103.0, 40.0)]),
+        trajectory_from_lonlats([(11.0, 51.0), (12.0, 50.0)]),
+        trajectory_from_lonlats([(0.0, 70.0), (0.0, 75.0)]),
+        trajectory_from_lonlats([(179.5, 0.0), (-179.5, 0.0)]),
+        trajectory_from_lonlats([(-50.0, -50.0), (-40.0, -40.0)])
+        ]
+
+    for query in queries:
+        indexed = anomaly_detection._find_passersby_using_segments(
+            query, historical, nearness_radius=5, num_control_points=4,
+            historical_segment_rtree=tree,
+            segment_idx_to_traj_idx=segment_idx_to_traj_idx)
+
+        # Reproduce the result of the unindexed algorithm
+        expected = None
+        for i in range(4):
+            control_point = anomaly_detection.point_at_length_fraction(query, i / 3)
+            near = brute_force_passersby(control_point, historical, 5)
+            expected = near if expected is None else expected.intersection(near)
+            if len(expected) == 0:
+                break
+
+        if set(indexed) != expected:
+            print('ERROR: Segment R-tree passersby {} do not match brute force result {}.'.format(
+                sorted(indexed), sorted(expected)))
+            error_count += 1
+
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
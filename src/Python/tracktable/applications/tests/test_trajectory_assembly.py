@@ -30,11 +30,13 @@
 from __future__ import division, print_function
 
 import itertools
+import pickle
+import random
 import sys
 from datetime import timedelta
 
 from tracktable.applications.assemble_trajectories import \
-    AssembleTrajectoryFromPoints
+    AssembleTrajectoryFromPoints, ParallelAssembleTrajectoryFromPoints
 from tracktable.core import Timestamp, geomath
 from tracktable.feature.interpolated_points import TrajectoryPointSource
 
@@ -177,7 +179,405 @@ def run_test():
 
 # ----------------------------------------------------------------------
 
+def make_incremental_test_points():
+    from tracktable.domain.terrestrial import TrajectoryPoint
+
+    start_time = Timestamp.from_string('2010-01-01 12:00:00')
+    all_points = []
+    for minute in range(0, 300, 2):
+        for (object_id, latitude) in [('plane1', 30), ('plane2', 35), ('plane3', 40)]:
+            # plane2 goes quiet for an hour halfway through and plane3
+            # stops reporting after 100 minutes
+            if object_id == 'plane2' and 140 <= minute < 200:
+                continue
+            if object_id == 'plane3' and minute >= 100:
+                continue
+            point = TrajectoryPoint(-100 + 0.01 * minute, latitude)
+            point.object_id = object_id
+            point.timestamp = start_time + timedelta(minutes=minute)
+            all_points.append(point)
+
+    return all_points
+
+# ----------------------------------------------------------------------
+
+def configure_incremental_assembler(assembler):
+    assembler.separation_time = timedelta(minutes=30)
+    assembler.separation_distance = 100
+    assembler.minimum_length = 5
+
+# ----------------------------------------------------------------------
+
+def trajectory_signature(trajectory):
+    return (trajectory.object_id, len(trajectory),
+            trajectory[0].timestamp, trajectory[-1].timestamp)
+
+# ----------------------------------------------------------------------
+
+def test_incremental_assembly():
+    # Feed the same points to one assembler all at once and to a
+    # series of assemblers in micro-batches, saving and restoring
+    # through a pickled checkpoint between batches.  Both should
+    # produce the same trajectories.
+
+    print("Beginning test_incremental_assembly()")
+
+    all_points = make_incremental_test_points()
+
+    batch_assembler = AssembleTrajectoryFromPoints()
+    configure_incremental_assembler(batch_assembler)
+    batch_assembler.input = all_points
+    expected = list(batch_assembler.trajectories())
+
+    error_count = 0
+    actual = []
+    saved_state = None
+    batch_size = 25
+    for batch_start in range(0, len(all_points), batch_size):
+        assembler = AssembleTrajectoryFromPoints()
+        if saved_state is None:
+            configure_incremental_assembler(assembler)
+        else:
+            assembler.restore(pickle.loads(saved_state))
+
+        batch = all_points[batch_start:batch_start+batch_size]
+        actual.extend(assembler.add_points(batch))
+        actual.extend(assembler.advance_watermark(batch[-1].timestamp))
+        saved_state = pickle.dumps(assembler.checkpoint())
+
+    # plane3 went quiet long ago so the watermark should have flushed it
+    if assembler.num_trajectories_in_progress != 2:
+        sys.stdout.write('ERROR: test_incremental_assembly: Expected 2 trajectories in progress before the final flush but found {}\n'.format(assembler.num_trajectories_in_progress))
+        error_count += 1
+
+    assembler = AssembleTrajectoryFromPoints()
+    assembler.restore(pickle.loads(saved_state))
+    actual.extend(assembler.flush())
+
+    if sorted(trajectory_signature(t) for t in expected) != sorted(trajectory_signature(t) for t in actual):
+        sys.stdout.write('ERROR: test_incremental_assembly: Incremental assembly produced {} but batch assembly produced {}\n'.format(
+            sorted(trajectory_signature(t) for t in actual), sorted(trajectory_signature(t) for t in expected)))
+        error_count += 1
+
+    if assembler.valid_trajectory_count != batch_assembler.valid_trajectory_count:
+        sys.stdout.write('ERROR: test_incremental_assembly: Expected {} valid trajectories after restore but counted {}\n'.format(
+            batch_assembler.valid_trajectory_count, assembler.valid_trajectory_count))
+        error_count += 1
+
+    if assembler.points_processed_count != len(all_points):
+        sys.stdout.write('ERROR: test_incremental_assembly: Expected {} points processed after restore but counted {}\n'.format(
+            len(all_points), assembler.points_processed_count))
+        error_count += 1
+
+    return error_count
+
+# ----------------------------------------------------------------------
+
+def test_out_of_order_assembly():
+    # Delay every point by a random amount of up to 5 minutes and feed
+    # them in arrival order.  With a 6-minute reorder window the
+    # assembler should recover exactly the trajectories it builds
+    # from sorted input.
+
+    print("Beginning test_out_of_order_assembly()")
+
+    all_points = make_incremental_test_points()
+    random.seed(1234)
+    arrival_times = [point.timestamp + timedelta(seconds=random.uniform(0, 300))
+                     for point in all_points]
+    arrival_order = [point for (_, point) in sorted(zip(arrival_times, all_points),
+                                                    key=lambda pair: pair[0])]
+    error_count = 0
+    if arrival_order == all_points:
+        sys.stdout.write('ERROR: test_out_of_order_assembly: Shuffling did not change the point order\n')
+        error_count += 1
+
+    sorted_assembler = AssembleTrajectoryFromPoints()
+    configure_incremental_assembler(sorted_assembler)
+    sorted_assembler.input = all_points
+    expected = sorted(trajectory_signature(t) for t in sorted_assembler.trajectories())
+
+    assembler = AssembleTrajectoryFromPoints()
+    configure_incremental_assembler(assembler)
+    assembler.reorder_window = timedelta(minutes=6)
+    actual = []
+    for batch_start in range(0, len(arrival_order), 40):
+        actual.extend(assembler.add_points(arrival_order[batch_start:batch_start+40]))
+        if assembler.num_buffered_points > 3 * 6:
+            sys.stdout.write('ERROR: test_out_of_order_assembly: Reorder buffer holds {} points, more than 6 minutes\' worth\n'.format(assembler.num_buffered_points))
+            error_count += 1
+        # Round-trip through a checkpoint partway through
+        if batch_start == 200:
+            restored = AssembleTrajectoryFromPoints()
+            restored.restore(pickle.loads(pickle.dumps(assembler.checkpoint())))
+            assembler = restored
+
+    # A point from the distant past is too late to use
+    straggler = all_points[0]
+    actual.extend(assembler.add_points([straggler]))
+    if assembler.late_point_count != 1:
+        sys.stdout.write('ERROR: test_out_of_order_assembly: Expected 1 late point but counted {}\n'.format(assembler.late_point_count))
+        error_count += 1
+
+    actual.extend(assembler.flush())
+    actual = sorted(trajectory_signature(t) for t in actual)
+    if actual != expected:
+        sys.stdout.write('ERROR: test_out_of_order_assembly: Reordered assembly produced {} but sorted assembly produced {}\n'.format(actual, expected))
+        error_count += 1
+
+    return error_count
+
+# ----------------------------------------------------------------------
+
+def test_unconsumed_results():
+    # add_points(), advance_watermark() and flush() must do their work
+    # even if the caller ignores what they return.
+
+    print("Beginning test_unconsumed_results()")
+
+    all_points = make_incremental_test_points()
+    start_time = all_points[0].timestamp
+    early_points = [point for point in all_points
+                    if point.timestamp < start_time + timedelta(minutes=70)]
+    later_points = [point for point in all_points
+                    if start_time + timedelta(minutes=70) <= point.timestamp < start_time + timedelta(minutes=150)]
+
+    error_count = 0
+    assembler = AssembleTrajectoryFromPoints()
+    configure_incremental_assembler(assembler)
+    assembler.reorder_window = timedelta(minutes=6)
+
+    assembler.add_points(early_points)
+    if assembler.num_buffered_points == 0 or assembler.points_processed_count == 0:
+        sys.stdout.write('ERROR: test_unconsumed_results: add_points() did not consume its input\n')
+        error_count += 1
+
+    assembler.advance_watermark(start_time + timedelta(minutes=70))
+    if (assembler.watermark != start_time + timedelta(minutes=70)
+            or assembler.num_buffered_points != 0
+            or assembler.points_processed_count != len(early_points)):
+        sys.stdout.write('ERROR: test_unconsumed_results: advance_watermark() did not release the reorder buffer\n')
+        error_count += 1
+
+    # plane3 stops reporting after 100 minutes, so by 140 minutes it
+    # has been idle for longer than the separation time.
+    assembler.add_points(later_points)
+    assembler.advance_watermark(start_time + timedelta(minutes=140))
+    if assembler.num_trajectories_in_progress != 2 or assembler.valid_trajectory_count != 1:
+        sys.stdout.write('ERROR: test_unconsumed_results: Expected 2 trajectories in progress and 1 finished after advance_watermark() but found {} and {}\n'.format(
+            assembler.num_trajectories_in_progress, assembler.valid_trajectory_count))
+        error_count += 1
+
+    assembler.flush()
+    if (assembler.num_trajectories_in_progress != 0
+            or assembler.num_buffered_points != 0
+            or assembler.valid_trajectory_count != 3):
+        sys.stdout.write('ERROR: test_unconsumed_results: Expected flush() to finish every trajectory but {} remain and {} were finished\n'.format(
+            assembler.num_trajectories_in_progress, assembler.valid_trajectory_count))
+        error_count += 1
+
+    return error_count
+
+# ----------------------------------------------------------------------
+
+def make_many_plane_points():
+    from tracktable.domain.terrestrial import TrajectoryPoint
+
+    random.seed(5678)
+    start_time = Timestamp.from_string('2010-01-01 12:00:00')
+    all_points = []
+    for minute in range(0, 240):
+        for plane in range(50):
+            # Each plane reports irregularly and takes a long break
+            # somewhere in the middle
+            if random.random() < 0.3 or (plane + 60) <= minute < (plane + 100):
+                continue
+            point = TrajectoryPoint(-100 + 0.005 * minute, 20 + 0.5 * plane)
+            point.object_id = 'plane{}'.format(plane)
+            point.timestamp = start_time + timedelta(minutes=minute)
+            all_points.append(point)
+    return all_points
+
+# ----------------------------------------------------------------------
+
+def test_native_assembly():
+    # The compiled assembler must give the same trajectories and
+    # counters as the Python one, including for a gap of exactly the
+    # separation time.
+
+    print("Beginning test_native_assembly()")
+
+    from tracktable.domain.terrestrial import TrajectoryAssembler, TrajectoryPoint
+
+    all_points = make_many_plane_points()
+    for minute in [0, 30, 60, 95]:
+        point = TrajectoryPoint(-80, 40)
+        point.object_id = 'exactly_on_the_boundary'
+        point.timestamp = all_points[0].timestamp + timedelta(minutes=minute)
+        all_points.append(point)
+    all_points.sort(key=lambda point: point.timestamp)
+
+    error_count = 0
+    results = {}
+    for use_native in [False, True]:
+        assembler = AssembleTrajectoryFromPoints()
+        configure_incremental_assembler(assembler)
+        assembler.minimum_length = 3
+        assembler.use_native = use_native
+        assembler.input = (point for point in all_points)
+        results[use_native] = (
+            sorted(trajectory_signature(t) for t in assembler.trajectories()),
+            assembler.points_processed_count,
+            assembler.valid_trajectory_count,
+            assembler.invalid_trajectory_count
+            )
+
+    if results[True] != results[False]:
+        sys.stdout.write('ERROR: test_native_assembly: Native assembly gave {} trajectories and counters {} but Python assembly gave {} and {}\n'.format(
+            len(results[True][0]), results[True][1:],
+            len(results[False][0]), results[False][1:]))
+        error_count += 1
+
+    # Out-of-order input with a reorder window must also give the
+    # same answer either way.
+    random.seed(4321)
+    arrival_order = sorted(all_points,
+                           key=lambda point: point.timestamp + timedelta(seconds=random.uniform(0, 300)))
+    arrival_order.append(all_points[0])
+    results = {}
+    for use_native in [False, True]:
+        assembler = AssembleTrajectoryFromPoints()
+        configure_incremental_assembler(assembler)
+        assembler.minimum_length = 3
+        assembler.reorder_window = timedelta(minutes=6)
+        assembler.use_native = use_native
+        assembler.input = arrival_order
+        results[use_native] = (
+            sorted(trajectory_signature(t) for t in assembler.trajectories()),
+            assembler.points_processed_count,
+            assembler.valid_trajectory_count,
+            assembler.invalid_trajectory_count,
+            assembler.late_point_count
+            )
+
+    if results[True] != results[False] or results[True][-1] != 1:
+        sys.stdout.write('ERROR: test_native_assembly: With a reorder window, native assembly gave {} trajectories and counters {} but Python assembly gave {} and {}\n'.format(
+            len(results[True][0]), results[True][1:],
+            len(results[False][0]), results[False][1:]))
+        error_count += 1
+
+    native = TrajectoryAssembler()
+    if native.separation_time != timedelta(minutes=30) or native.separation_distance is not None:
+        sys.stdout.write('ERROR: test_native_assembly: Expected default separation of 30 minutes and no distance but got {} and {}\n'.format(
+            native.separation_time, native.separation_distance))
+        error_count += 1
+
+    native.separation_time = None
+    native.minimum_length = 1
+    finished = native.add_points(all_points[:100])
+    finished.extend(native.advance_watermark(all_points[0].timestamp + timedelta(days=1)))
+    if finished or native.num_trajectories_in_progress == 0:
+        sys.stdout.write('ERROR: test_native_assembly: Expected no finished trajectories without a separation time\n')
+        error_count += 1
+    if len(native.flush()) != native.valid_trajectory_count or native.num_trajectories_in_progress != 0:
+        sys.stdout.write('ERROR: test_native_assembly: flush() did not return every trajectory in progress\n')
+        error_count += 1
+
+    return error_count
+
+# ----------------------------------------------------------------------
+
+def test_parallel_assembly():
+    # Many objects spread across worker processes should produce the
+    # same trajectories as a single assembler.
+
+    print("Beginning test_parallel_assembly()")
+
+    all_points = make_many_plane_points()
+
+    serial_assembler = AssembleTrajectoryFromPoints()
+    serial_assembler.use_native = False
+    configure_incremental_assembler(serial_assembler)
+    serial_assembler.input = all_points
+    expected = sorted(trajectory_signature(t) for t in serial_assembler.trajectories())
+
+    error_count = 0
+    for processes in [1, 3]:
+        assembler = ParallelAssembleTrajectoryFromPoints()
+        configure_incremental_assembler(assembler)
+        assembler.input = iter(all_points)
+        assembler.processes = processes
+        assembler.batch_size = 100
+        actual = sorted(trajectory_signature(t) for t in assembler.trajectories())
+
+        if actual != expected:
+            sys.stdout.write('ERROR: test_parallel_assembly: Assembly with {} processes produced {} trajectories but serial assembly produced {}\n'.format(
+                processes, len(actual), len(expected)))
+            error_count += 1
+
+        if (assembler.points_processed_count != len(all_points) or
+                assembler.valid_trajectory_count != serial_assembler.valid_trajectory_count or
+                assembler.invalid_trajectory_count != serial_assembler.invalid_trajectory_count):
+            sys.stdout.write('ERROR: test_parallel_assembly: Counters with {} processes were ({}, {}, {}) but expected ({}, {}, {})\n'.format(
+                processes,
+                assembler.points_processed_count,
+                assembler.valid_trajectory_count,
+                assembler.invalid_trajectory_count,
+                len(all_points),
+                serial_assembler.valid_trajectory_count,
+                serial_assembler.invalid_trajectory_count))
+            error_count += 1
+
+    return error_count
+
+# ----------------------------------------------------------------------
+
+class FailingAssembler(AssembleTrajectoryFromPoints):
+    def add_points(self, points):
+        raise ValueError('deliberate failure in worker')
+
+
+class FailingParallelAssembler(ParallelAssembleTrajectoryFromPoints):
+    def _make_assembler(self):
+        assembler = FailingAssembler()
+        assembler.use_native = False
+        return assembler
+
+
+def test_parallel_assembly_worker_error():
+    # A worker that raises must stop the main process with the
+    # worker's traceback, even when the main process is blocked
+    # waiting for room in that worker's queue.
+
+    print("Beginning test_parallel_assembly_worker_error()")
+
+    assembler = FailingParallelAssembler()
+    configure_incremental_assembler(assembler)
+    assembler.input = iter(make_many_plane_points())
+    assembler.processes = 2
+    assembler.batch_size = 10
+
+    try:
+        for trajectory in assembler.trajectories():
+            pass
+    except RuntimeError as e:
+        if 'deliberate failure in worker' not in str(e):
+            sys.stdout.write('ERROR: test_parallel_assembly_worker_error: Error does not contain the worker traceback: {}\n'.format(e))
+            return 1
+        return 0
+
+    sys.stdout.write('ERROR: test_parallel_assembly_worker_error: Worker failure was not reported\n')
+    return 1
+
+# ----------------------------------------------------------------------
+
 if __name__ == '__main__':
     print("About to call run_test()")
-    sys.exit(run_test())
+    sys.exit(run_test()
+             + test_incremental_assembly()
+             + test_out_of_order_assembly()
+             + test_unconsumed_results()
+             + test_native_assembly()
+             + test_parallel_assembly()
+             + test_parallel_assembly_worker_error())
 
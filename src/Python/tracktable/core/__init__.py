@@ -40,7 +40,7 @@ imported from the small C extension libraries.
 from . import core_types
 from .core_types import BoostPythonArgumentError, set_default_timezone
 from .core_types import current_memory_use, peak_memory_use
-from .timestamp import Timestamp
+from .timestamp import Timestamp, parse_timestamps
 
 
 def data_directory():
@@ -39,6 +39,8 @@ from six.moves import range
 import copy
 import math
 
+import numpy
+
 import tracktable.core.log
 
 from tracktable.lib._domain_algorithm_overloads import distance as _distance
@@ -67,6 +69,12 @@ from tracktable.lib._domain_algorithm_overloads import radius_of_gyration as _ra
 from tracktable.lib._domain_algorithm_overloads import current_length as _current_length
 from tracktable.lib._domain_algorithm_overloads import current_length_fraction as _current_length_fraction
 from tracktable.lib._domain_algorithm_overloads import current_time_fraction as _current_time_fraction
+from tracktable.lib._domain_algorithm_overloads import batch_length as _batch_length
+from tracktable.lib._domain_algorithm_overloads import batch_end_to_end_distance as _batch_end_to_end_distance
+from tracktable.lib._domain_algorithm_overloads import batch_radius_of_gyration as _batch_radius_of_gyration
+from tracktable.lib._domain_algorithm_overloads import batch_convex_hull_area as _batch_convex_hull_area
+from tracktable.lib._domain_algorithm_overloads import batch_point_at_time_fraction as _batch_point_at_time_fraction
+from tracktable.lib._domain_algorithm_overloads import batch_recompute_speed as _batch_recompute_speed
 
 import logging
 LOGGER = logging.getLogger(__name__)
@@ -995,6 +1003,163 @@ def convex_hull_centroid(trajectory):
 
 # ----------------------------------------------------------------------
 
+def batch_length(trajectories):
+    """Return the lengths of many trajectories at once
+
+    This computes the same value as length() for every trajectory in
+    a sequence.  All of the work happens in a single C++ loop with the
+    Python interpreter lock released.  All trajectories must belong to
+    the same domain.
+
+    Args:
+      trajectories (sequence of Trajectory): Paths whose lengths we want
+
+    Returns:
+      NumPy array of lengths in domain-dependent units
+
+    """
+
+    return _call_batch_function(_batch_length, trajectories)
+
+# ----------------------------------------------------------------------
+
+def batch_end_to_end_distance(trajectories):
+    """Return the end-to-end distances of many trajectories at once
+
+    This computes the same value as end_to_end_distance() for every
+    trajectory in a sequence in a single C++ loop.  All trajectories
+    must belong to the same domain.
+
+    Args:
+      trajectories (sequence of Trajectory): Paths to measure
+
+    Returns:
+      NumPy array of distances in domain-dependent units
+
+    """
+
+    return _call_batch_function(_batch_end_to_end_distance, trajectories)
+
+# ----------------------------------------------------------------------
+
+def batch_radius_of_gyration(trajectories):
+    """Return the radius of gyration of many trajectories at once
+
+    This computes the same value as radius_of_gyration() for every
+    trajectory in a sequence in a single C++ loop.  Only the
+    terrestrial and 2D Cartesian domains are supported.
+
+    Args:
+      trajectories (sequence of Trajectory): Trajectories to measure
+
+    Returns:
+      NumPy array of radii of gyration
+
+    """
+
+    return _call_batch_function(_batch_radius_of_gyration, trajectories)
+
+# ----------------------------------------------------------------------
+
+def batch_convex_hull_area(trajectories):
+    """Return the convex hull area of many trajectories at once
+
+    This computes the same value as convex_hull_area() for every
+    trajectory in a sequence in a single C++ loop.  Only the
+    terrestrial and 2D Cartesian domains are supported.
+
+    Args:
+      trajectories (sequence of Trajectory): Trajectories to measure
+
+    Returns:
+      NumPy array of areas in the native area units of the domain
+
+    """
+
+    return _call_batch_function(_batch_convex_hull_area, trajectories)
+
+# ----------------------------------------------------------------------
+
+def batch_point_at_time_fraction(trajectories, time_fraction, dimension=2):
+    """Sample many trajectories at a fraction of their duration
+
+    This evaluates point_at_time_fraction() for every trajectory in a
+    sequence in a single C++ loop.  Instead of returning point objects
+    we return the coordinates and timestamps of the sampled points as
+    arrays.  Empty trajectories produce NaN coordinates and NaT.
+
+    Args:
+      trajectories (sequence of Trajectory): Paths to sample
+      time_fraction (float or array): Value between 0 and 1, either
+          one value for all trajectories or one per trajectory
+
+    Keyword Arguments:
+      dimension (int): Number of coordinates per point.  This is only
+          used to shape the result when there are no trajectories;
+          otherwise it comes from the trajectories themselves.
+          (Default: 2)
+
+    Returns:
+      Tuple (coordinates, timestamps) where coordinates is an (N, D)
+      float64 array and timestamps is a datetime64[us] array in UTC
+
+    """
+
+    trajectories = list(trajectories)
+    fractions = numpy.broadcast_to(
+        numpy.asarray(time_fraction, dtype=numpy.float64),
+        (len(trajectories),)
+        )
+    if len(trajectories) == 0:
+        return (numpy.zeros((0, dimension)), numpy.zeros(0, dtype='datetime64[us]'))
+    return _batch_point_at_time_fraction(trajectories[0], trajectories, fractions)
+
+# ----------------------------------------------------------------------
+
+def batch_recompute_speed(trajectories, target_attribute_name="speed"):
+    """Use points and timestamps to compute speed for many trajectories
+
+    This does the same thing as recompute_speed() for every trajectory
+    in a sequence, all in a single C++ loop.  The trajectories are
+    modified in place.
+
+    Args:
+      trajectories (sequence of Trajectory): Trajectories to update
+
+    Keyword Arguments:
+      target_attribute_name (str): Speed will be stored in this property at
+          each point. (Default: "speed")
+
+    """
+
+    trajectories = list(trajectories)
+    if len(trajectories) > 0:
+        _batch_recompute_speed(trajectories[0], trajectories, target_attribute_name)
+
+# ----------------------------------------------------------------------
+
+def _call_batch_function(function, trajectories):
+    """Dispatch a batch measurement to the right domain
+
+    The C++ batch functions take the first trajectory as their first
+    argument so that Boost.Python can resolve the overload.
+
+    Args:
+      function (callable): One of the _batch_* functions
+      trajectories (sequence of Trajectory): Input to that function
+
+    Returns:
+      Whatever the batch function returns, or an empty array if there
+      are no trajectories
+    """
+
+    trajectories = list(trajectories)
+    if len(trajectories) == 0:
+        return numpy.zeros(0)
+    return function(trajectories[0], trajectories)
+
+# ----------------------------------------------------------------------
+
 def latitude_degree_size(latitude):
     """
     latitude_degree_size(latitude: float between -90 and 90) -> float (in km)
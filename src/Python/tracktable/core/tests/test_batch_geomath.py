@@ -0,0 +1,144 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Check batch geomath functions against their one-at-a-time versions
+
+Each batch_* function in tracktable.core.geomath should return exactly
+what we get by calling the corresponding scalar function on every
+trajectory in turn.
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+
+import numpy
+
+from tracktable.core import geomath
+from tracktable.domain import terrestrial, cartesian2d, cartesian3d
+from tracktable.domain.tests import create_points_and_trajectories as tt_generators
+
+
+def make_trajectories(trajectory_class, how_many):
+    # Include an empty trajectory and a single point to exercise the
+    # special cases
+    trajectories = [trajectory_class()]
+    for i in range(how_many):
+        trajectories.append(
+            tt_generators.generate_random_trajectory(trajectory_class, 1 + i % 7, 0)
+            )
+    return trajectories
+
+
+def compare_arrays(expected, actual, description):
+    expected = numpy.asarray(expected, dtype=numpy.float64)
+    if actual.shape != expected.shape or not numpy.allclose(expected, actual, equal_nan=True):
+        sys.stderr.write('ERROR: {} does not match. Expected {}, got {}.\n'.format(
+            description, expected, actual))
+        return 1
+    return 0
+
+
+def test_batch_measurements(trajectory_class, include_shape):
+    error_count = 0
+    trajectories = make_trajectories(trajectory_class, 12)
+    name = trajectory_class.__name__
+
+    functions = [('length', geomath.length, geomath.batch_length),
+                 ('end_to_end_distance', geomath.end_to_end_distance,
+                  geomath.batch_end_to_end_distance)]
+    if include_shape:
+        functions.extend([
+            ('radius_of_gyration', geomath.radius_of_gyration,
+             geomath.batch_radius_of_gyration),
+            ('convex_hull_area', geomath.convex_hull_area,
+             geomath.batch_convex_hull_area)])
+
+    for (function_name, scalar_function, batch_function) in functions:
+        expected = [scalar_function(t) for t in trajectories]
+        error_count += compare_arrays(expected, batch_function(trajectories),
+                                      '{} {}'.format(name, function_name))
+
+    (coordinates, timestamps) = geomath.batch_point_at_time_fraction(trajectories, 0.5)
+    for (i, trajectory) in enumerate(trajectories):
+        if len(trajectory) == 0:
+            if not (numpy.all(numpy.isnan(coordinates[i])) and numpy.isnat(timestamps[i])):
+                sys.stderr.write('ERROR: {} batch_point_at_time_fraction: '
+                                 'Expected NaN/NaT for empty trajectory.\n'.format(name))
+                error_count += 1
+            continue
+        point = geomath.point_at_time_fraction(trajectory, 0.5)
+        expected_time = numpy.datetime64(point.timestamp.replace(tzinfo=None), 'us')
+        error_count += compare_arrays([point[d] for d in range(len(point))],
+                                      coordinates[i],
+                                      '{} batch_point_at_time_fraction'.format(name))
+        if timestamps[i] != expected_time:
+            sys.stderr.write('ERROR: {} batch_point_at_time_fraction: Expected '
+                             'timestamp {}, got {}.\n'.format(name, expected_time,
+                                                             timestamps[i]))
+            error_count += 1
+
+    batch_copies = [trajectory_class.from_position_list(list(t)) for t in trajectories]
+    geomath.batch_recompute_speed(batch_copies, 'batch_speed')
+    for (original, updated) in zip(trajectories, batch_copies):
+        geomath.recompute_speed(original, 'batch_speed')
+        error_count += compare_arrays(
+            [p.properties['batch_speed'] for p in original],
+            numpy.array([p.properties['batch_speed'] for p in updated]),
+            '{} batch_recompute_speed'.format(name))
+
+    if len(geomath.batch_length([])) != 0:
+        sys.stderr.write('ERROR: batch_length of an empty list should be empty.\n')
+        error_count += 1
+
+    dimension = len(trajectories[-1][0])
+    (coordinates, timestamps) = geomath.batch_point_at_time_fraction(
+        [], 0.5, dimension=dimension)
+    if coordinates.shape != (0, dimension) or timestamps.shape != (0,):
+        sys.stderr.write('ERROR: {} batch_point_at_time_fraction of an empty list: '
+                         'Expected shapes {} and (0,), got {} and {}.\n'.format(
+                             name, (0, dimension), coordinates.shape, timestamps.shape))
+        error_count += 1
+
+    return error_count
+
+
+def main():
+    random.seed(0)
+    error_count = 0
+    error_count += test_batch_measurements(terrestrial.Trajectory, True)
+    error_count += test_batch_measurements(cartesian2d.Trajectory, True)
+    error_count += test_batch_measurements(cartesian3d.Trajectory, False)
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Check the integer epoch-microsecond timestamp accessors
+
+Points and trajectories expose their times as plain integers so that
+time-window filters can compare them without building datetimes.
+Those integers must agree with the datetime-valued accessors.
+"""
+
+from __future__ import print_function
+
+import datetime
+import sys
+
+from tracktable.core import Timestamp
+from tracktable.core.timestamp import NO_TIMESTAMP_MICROSECONDS
+from tracktable.domain import terrestrial
+from tracktable.filter.trajectory import ClipToTimeWindow
+
+
+def check(description, actual, expected):
+    if actual != expected:
+        print('ERROR: {}: expected {}, got {}'.format(description, expected, actual))
+        return 1
+    return 0
+
+
+def make_trajectory(start_time, num_points):
+    points = []
+    for i in range(num_points):
+        point = terrestrial.TrajectoryPoint(float(i), 0.0)
+        point.object_id = 'epoch_test'
+        point.timestamp = start_time + datetime.timedelta(minutes=i)
+        points.append(point)
+    return terrestrial.Trajectory.from_position_list(points)
+
+
+def test_timestamp_conversions():
+    error_count = 0
+    when = Timestamp.from_any('2014-04-05 12:34:56')
+    usec = 1396701296000000
+
+    error_count += check('to_epoch_microseconds(datetime)',
+                         Timestamp.to_epoch_microseconds(when), usec)
+    error_count += check('to_epoch_microseconds(str)',
+                         Timestamp.to_epoch_microseconds('2014-04-05 12:34:56'), usec)
+    error_count += check('to_epoch_microseconds(int)',
+                         Timestamp.to_epoch_microseconds(usec), usec)
+    error_count += check('from_epoch_microseconds()',
+                         Timestamp.from_epoch_microseconds(usec), when)
+    error_count += check('from_epoch_microseconds(NO_TIMESTAMP_MICROSECONDS)',
+                         Timestamp.from_epoch_microseconds(NO_TIMESTAMP_MICROSECONDS), None)
+    return error_count
+
+
+def test_point_and_trajectory_accessors():
+    error_count = 0
+    start_time = Timestamp.from_any('2014-04-05 12:00:00')
+    trajectory = make_trajectory(start_time, 10)
+
+    for (i, point) in enumerate(trajectory):
+        error_count += check('point {} timestamp_epoch_microseconds'.format(i),
+                             point.timestamp_epoch_microseconds,
+                             Timestamp.to_epoch_microseconds(point.timestamp))
+
+    point = terrestrial.TrajectoryPoint()
+    point.timestamp_epoch_microseconds = 1396701296789000
+    error_count += check('timestamp after setting epoch microseconds',
+                         point.timestamp,
+                         Timestamp.from_any('2014-04-05 12:34:56') + datetime.timedelta(microseconds=789000))
+
+    error_count += check('start_time_epoch_microseconds()',
+                         trajectory.start_time_epoch_microseconds(),
+                         Timestamp.to_epoch_microseconds(trajectory[0].timestamp))
+    error_count += check('end_time_epoch_microseconds()',
+                         trajectory.end_time_epoch_microseconds(),
+                         Timestamp.to_epoch_microseconds(trajectory[-1].timestamp))
+
+    empty = terrestrial.Trajectory()
+    error_count += check('empty start_time_epoch_microseconds()',
+                         empty.start_time_epoch_microseconds(), NO_TIMESTAMP_MICROSECONDS)
+    return error_count
+
+
+def test_clip_to_time_window():
+    error_count = 0
+    start_time = Timestamp.from_any('2014-04-05 12:00:00')
+    trajectories = [make_trajectory(start_time + datetime.timedelta(hours=h), 10)
+                    for h in range(4)]
+    trajectories.append(terrestrial.Trajectory())
+
+    clipper = ClipToTimeWindow()
+    clipper.input = trajectories
+    clipper.start_time = start_time + datetime.timedelta(hours=1, minutes=5)
+    clipper.end_time = start_time + datetime.timedelta(hours=2, minutes=5)
+
+    clipped = list(clipper.trajectories())
+    error_count += check('number of clipped trajectories', len(clipped), 2)
+    if len(clipped) == 2:
+        error_count += check('first clipped trajectory start',
+                             clipped[0][0].timestamp, clipper.start_time)
+        error_count += check('second clipped trajectory end',
+                             clipped[1][-1].timestamp, clipper.end_time)
+    return error_count
+
+
+def main():
+    error_count = 0
+    error_count += test_timestamp_conversions()
+    error_count += test_point_and_trajectory_accessors()
+    error_count += test_clip_to_time_window()
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Check bulk timestamp parsing against Timestamp.from_any()
+
+parse_timestamps() should return the same instants that parsing the
+strings one at a time does, in epoch microseconds.
+"""
+
+from __future__ import print_function
+
+import datetime
+import random
+import sys
+
+import numpy
+
+from tracktable.core import Timestamp, parse_timestamps
+from tracktable.core.timestamp import NO_TIMESTAMP_MICROSECONDS
+
+EPOCH = Timestamp.from_any(datetime.datetime(1970, 1, 1))
+
+
+def epoch_microseconds(timestamp):
+    return (timestamp - EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def check(description, actual, expected):
+    if list(actual) != list(expected):
+        print('ERROR: {}: expected {}, got {}'.format(description, list(expected), list(actual)))
+        return 1
+    return 0
+
+
+def test_matches_from_any():
+    random.seed(1234)
+    strings = []
+    for i in range(1000):
+        when = datetime.datetime(1900, 1, 1) + datetime.timedelta(
+            seconds=random.randint(0, 200 * 365 * 86400))
+        separator = ' ' if i % 2 == 0 else 'T'
+        strings.append(when.strftime('%Y-%m-%d{}%H:%M:%S'.format(separator)))
+    # Slow-path formats and time zones that Timestamp.from_any understands
+    strings.extend(['2013-04-05 11:23:45-05', '2013-04-05T11:23:45+03',
+                    '20130405112345', '04-05-2013 11:23:45'])
+
+    expected = [epoch_microseconds(Timestamp.from_any(s)) for s in strings]
+
+    error_count = 0
+    error_count += check('list of str', parse_timestamps(strings), expected)
+    error_count += check('array of str', parse_timestamps(numpy.array(strings)), expected)
+    error_count += check('array of bytes',
+                         parse_timestamps(numpy.array([s.encode('ascii') for s in strings])),
+                         expected)
+    error_count += check('array of objects',
+                         parse_timestamps(numpy.array(strings, dtype=object)), expected)
+    return error_count
+
+
+def test_fractions_and_offsets():
+    base = epoch_microseconds(Timestamp.from_any('2013-04-05 11:23:45'))
+    hour = 3600 * 1000000
+    strings = ['2013-04-05 11:23:45.5',
+               '2013-04-05T11:23:45.123456Z',
+               '2013-04-05 11:23:45+0530',
+               '2013-04-05 11:23:45-05:30',
+               '2013-04-05 11:23:45.25-01']
+    expected = [base + 500000,
+                base + 123456,
+                base - 5 * hour - hour // 2,
+                base + 5 * hour + hour // 2,
+                base + 250000 + hour]
+    return check('fractions and offsets', parse_timestamps(strings), expected)
+
+
+def test_format_string():
+    expected = epoch_microseconds(Timestamp.from_any('2013-04-05 10:23:45')) + 250000
+    error_count = 0
+    error_count += check('fixed-width format',
+                         parse_timestamps(['05/04/2013 11:23:45.25 +0100'],
+                                          format_string='%d/%m/%Y %H:%M:%S.%f %z'),
+                         [expected])
+    error_count += check('strptime format',
+                         parse_timestamps(['Apr 05 2013'], format_string='%b %d %Y'),
+                         [epoch_microseconds(Timestamp.from_any('2013-04-05 00:00:00'))])
+    return error_count
+
+
+def test_errors():
+    error_count = 0
+    bad = ['2013-02-30 00:00:00', 'not a timestamp', '']
+    error_count += check('coerced errors', parse_timestamps(bad, errors='coerce'),
+                         [NO_TIMESTAMP_MICROSECONDS] * len(bad))
+
+    try:
+        parse_timestamps(['not a timestamp'])
+        print('ERROR: parse_timestamps did not raise ValueError on a bad string')
+        error_count += 1
+    except ValueError:
+        pass
+
+    as_datetimes = parse_timestamps(['2013-04-05 11:23:45', ''], errors='coerce').view('datetime64[us]')
+    if not numpy.isnat(as_datetimes[1]) or as_datetimes[0] != numpy.datetime64('2013-04-05T11:23:45'):
+        print('ERROR: Expected [2013-04-05T11:23:45, NaT], got {}'.format(as_datetimes))
+        error_count += 1
+    return error_count
+
+
+def main():
+    error_count = 0
+    error_count += test_matches_from_any()
+    error_count += test_fractions_and_offsets()
+    error_count += test_format_string()
+    error_count += test_errors()
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
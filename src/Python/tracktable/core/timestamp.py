@@ -37,6 +37,8 @@ import re
 import sys
 import time
 
+import numpy
+
 from .simple_timezone import SimpleTimeZone
 
 try:
@@ -320,6 +322,48 @@ class Timestamp(object):
         else:
             return None
 
+    @staticmethod
+    def to_epoch_microseconds(thing):
+        """Convert a timestamp to microseconds since the Unix epoch
+
+        This is the same representation as the
+        ``timestamp_epoch_microseconds`` property on trajectory points.
+        Convert a time window once with this function and you can
+        compare it against many points without building a datetime
+        for each of them.
+
+        Args:
+           thing (datetime, string or int): Anything from_any() can
+             handle.  Integers are assumed to be epoch microseconds
+             already and are returned unchanged.
+
+        Returns:
+           Integer microseconds since 1970-01-01 00:00:00 UTC
+        """
+
+        if isinstance(thing, (int, numpy.integer)):
+            return int(thing)
+        timestamp = Timestamp.from_any(thing)
+        return (timestamp - _EPOCH) // datetime.timedelta(microseconds=1)
+
+    @staticmethod
+    def from_epoch_microseconds(usec):
+        """Convert microseconds since the Unix epoch to a timestamp
+
+        This is the inverse of to_epoch_microseconds().
+
+        Args:
+           usec (int): Microseconds since 1970-01-01 00:00:00 UTC
+
+        Returns:
+           Timezone-aware datetime in UTC, or None if usec is
+           NO_TIMESTAMP_MICROSECONDS
+        """
+
+        if usec == NO_TIMESTAMP_MICROSECONDS:
+            return None
+        return (_EPOCH + datetime.timedelta(microseconds=int(usec))).astimezone(DEFAULT_TIMEZONE)
+
     @staticmethod
     def to_string(dt, format_string='%Y-%m-%d %H:%M:%S', include_tz=True):
         """Convert a datetime to a string
@@ -442,6 +486,289 @@ class Timestamp(object):
 
 # ----------------------------------------------------------------------
 
+#: Value that parse_timestamps() uses for strings it cannot parse when
+#: errors='coerce'.  This is the same bit pattern as numpy.datetime64('NaT').
+NO_TIMESTAMP_MICROSECONDS = numpy.iinfo(numpy.int64).min
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=SimpleTimeZone(hours=0))
+
+_FIXED_WIDTH_DIRECTIVES = {'Y': 4, 'm': 2, 'd': 2, 'H': 2, 'M': 2, 'S': 2}
+
+
+def parse_timestamps(timestamps, format_string=None, errors='raise'):
+    """Parse many timestamp strings into epoch microseconds
+
+    This is the bulk counterpart of Timestamp.from_any() and
+    Timestamp.from_string().  Instead of building one datetime per
+    string, it parses every string at once with NumPy array operations
+    and returns int64 microseconds since 1970-01-01 00:00:00 UTC.
+    Call ``.view('datetime64[us]')`` on the result if you want NumPy
+    datetimes.
+
+    With no format string, each timestamp must look like
+    '2013-04-05 11:23:45' or '2013-04-05T11:23:45', optionally
+    followed by fractional seconds ('.123456') and a UTC offset
+    ('Z', '+05', '-0530' or '+05:30').  Timestamps without an offset
+    are in UTC.  Strings that do not fit that layout are handed to
+    Timestamp.from_any() one at a time, so every format that it accepts
+    still works, only more slowly.
+
+    With a format string, the fast path handles formats made of %Y, %m,
+    %d, %H, %M, %S and literal characters, optionally ending in %f
+    and/or %z.  Anything else (or any string that does not match) is
+    parsed with datetime.strptime().
+
+    Args:
+      timestamps (iterable): Timestamp strings.  A list, a NumPy array
+        of str, bytes or objects, or a pandas Series all work.
+
+    Keyword Args:
+      format_string (str): Format in datetime.strptime() notation.
+        (Default: None, meaning the ISO-like layout above)
+      errors (str): What to do with strings that cannot be parsed.
+        'raise' raises ValueError; 'coerce' stores
+        NO_TIMESTAMP_MICROSECONDS instead. (Default: 'raise')
+
+    Returns:
+      int64 NumPy array with one entry per input string
+
+    Raises:
+      ValueError: A string could not be parsed and errors='raise', or
+        errors is not 'raise' or 'coerce'
+    """
+
+    if errors not in ('raise', 'coerce'):
+        raise ValueError("parse_timestamps: errors must be 'raise' or 'coerce', not {}".format(errors))
+
+    strings = numpy.asarray(timestamps)
+    if strings.ndim != 1:
+        strings = strings.reshape(-1)
+    result = numpy.full(len(strings), NO_TIMESTAMP_MICROSECONDS, dtype=numpy.int64)
+    parsed = numpy.zeros(len(strings), dtype=bool)
+
+    layout = _fixed_timestamp_layout(format_string)
+    chars = _as_character_matrix(strings) if layout is not None else None
+    if chars is not None and len(strings) > 0:
+        (result, parsed) = _parse_fixed_layout(chars[0], chars[1], layout)
+
+    for i in numpy.flatnonzero(~parsed):
+        result[i] = _parse_one_timestamp(strings[i], format_string, errors)
+
+    return result
+
+
+def _parse_one_timestamp(text, format_string, errors):
+    """Slow path for parse_timestamps(): one string at a time"""
+
+    if isinstance(text, bytes):
+        text = text.decode('utf-8')
+    text = str(text)
+    try:
+        if format_string is None:
+            timestamp = Timestamp.from_any(text)
+        else:
+            timestamp = Timestamp.from_string(text, format_string=format_string)
+    except (ValueError, TypeError, IndexError):
+        timestamp = None
+
+    if timestamp is None or not text:
+        if errors == 'raise':
+            raise ValueError('parse_timestamps: Cannot parse timestamp {!r}'.format(text))
+        return NO_TIMESTAMP_MICROSECONDS
+    return (timestamp - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def _fixed_timestamp_layout(format_string):
+    """Work out where each field sits in a fixed-width timestamp
+
+    Returns:
+      A dictionary with the start column of each field, the literal
+      characters allowed at other columns, the width of the fixed part
+      and how to treat fractional seconds and UTC offsets after it.
+      None if the format cannot be parsed by column position.
+    """
+
+    if format_string is None:
+        return {'fields': {'Y': 0, 'm': 5, 'd': 8, 'H': 11, 'M': 14, 'S': 17},
+                'literals': [(4, b'-'), (7, b'-'), (10, b' T'), (13, b':'), (16, b':')],
+                'width': 19,
+                'fraction': 'optional',
+                'offset': 'optional'}
+
+    fields = {}
+    literals = []
+    position = 0
+    fraction = None
+    offset = None
+    i = 0
+    while i < len(format_string):
+        character = format_string[i]
+        if character == '%' and i + 1 < len(format_string) and format_string[i + 1] != '%':
+            directive = format_string[i + 1]
+            if directive in _FIXED_WIDTH_DIRECTIVES and fraction is None and offset is None \
+                    and directive not in fields:
+                fields[directive] = position
+                position += _FIXED_WIDTH_DIRECTIVES[directive]
+            elif directive == 'f' and fraction is None and offset is None:
+                fraction = 'required'
+            elif directive == 'z' and offset is None:
+                offset = 'required'
+            else:
+                return None
+            i += 2
+        else:
+            if character == '%':
+                i += 1
+            if fraction is not None or offset is not None or ord(character) > 127:
+                return None
+            literals.append((position, character.encode('ascii')))
+            position += 1
+            i += 1
+
+    if not all(field in fields for field in 'Ymd'):
+        return None
+    return {'fields': fields, 'literals': literals, 'width': position,
+            'fraction': fraction, 'offset': offset}
+
+
+def _as_character_matrix(strings):
+    """View an array of ASCII strings as a 2D array of bytes
+
+    Returns:
+      (characters, lengths) or None if the strings are not all ASCII
+    """
+
+    try:
+        if strings.dtype.kind == 'S':
+            encoded = strings
+        elif strings.dtype.kind in 'UO':
+            encoded = strings.astype(numpy.bytes_)
+        else:
+            return None
+    except (UnicodeEncodeError, ValueError, TypeError):
+        return None
+
+    lengths = numpy.char.str_len(encoded).astype(numpy.int64)
+    if encoded.dtype.itemsize == 0:
+        return (numpy.zeros((len(encoded), 1), dtype=numpy.uint8), lengths)
+    characters = numpy.frombuffer(numpy.ascontiguousarray(encoded).tobytes(),
+                                  dtype=numpy.uint8)
+    return (characters.reshape(len(encoded), encoded.dtype.itemsize), lengths)
+
+
+def _parse_fixed_layout(characters, lengths, layout):
+    """Vectorized parser behind parse_timestamps()
+
+    Returns:
+      (microseconds, ok) arrays.  Rows where ok is False did not match
+      the layout and must be parsed some other way.
+    """
+
+    num_rows = characters.shape[0]
+    if characters.shape[1] < layout['width']:
+        return (numpy.full(num_rows, NO_TIMESTAMP_MICROSECONDS, dtype=numpy.int64),
+                numpy.zeros(num_rows, dtype=bool))
+    rows = numpy.arange(num_rows)
+    ok = lengths >= layout['width']
+
+    def char_at(columns):
+        # Characters past the end of a string read as NUL.
+        inside = columns < lengths
+        columns = numpy.minimum(columns, characters.shape[1] - 1)
+        return numpy.where(inside, characters[rows, columns], 0)
+
+    def number(start, width):
+        digits = characters[:, start:start + width].astype(numpy.int64) - ord('0')
+        ok[:] &= numpy.all((digits >= 0) & (digits <= 9), axis=1)
+        return digits.dot(10 ** numpy.arange(width - 1, -1, -1, dtype=numpy.int64))
+
+    for (column, allowed) in layout['literals']:
+        ok &= numpy.isin(characters[:, column], numpy.frombuffer(allowed, dtype=numpy.uint8))
+
+    values = {}
+    for (directive, start) in layout['fields'].items():
+        values[directive] = number(start, _FIXED_WIDTH_DIRECTIVES[directive])
+    (year, month, day) = (values['Y'], values['m'], values['d'])
+    (hour, minute, second) = (values.get('H', 0), values.get('M', 0), values.get('S', 0))
+
+    leap_year = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    days_in_month = numpy.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    valid_month = (month >= 1) & (month <= 12)
+    month_length = days_in_month[numpy.where(valid_month, month - 1, 0)] \
+        + ((month == 2) & leap_year)
+    ok &= (valid_month & (year >= 1) & (day >= 1) & (day <= month_length)
+           & (hour < 24) & (minute < 60) & (second < 60))
+
+    position = numpy.full(num_rows, layout['width'], dtype=numpy.int64)
+
+    # Fractional seconds: up to 6 digits, after a '.' in the default layout
+    fraction = numpy.zeros(num_rows, dtype=numpy.int64)
+    if layout['fraction'] is not None:
+        if layout['fraction'] == 'optional':
+            has_fraction = (char_at(position) == ord('.'))
+            position += has_fraction
+        else:
+            has_fraction = numpy.ones(num_rows, dtype=bool)
+        num_digits = numpy.zeros(num_rows, dtype=numpy.int64)
+        still_digits = has_fraction.copy()
+        for i in range(7):
+            digit = char_at(position + i).astype(numpy.int64) - ord('0')
+            still_digits &= (digit >= 0) & (digit <= 9)
+            if i < 6:
+                fraction += numpy.where(still_digits, digit * 10 ** (5 - i), 0)
+            num_digits += still_digits
+        ok &= ~has_fraction | ((num_digits >= 1) & (num_digits <= 6))
+        position += num_digits
+
+    # UTC offset: Z, +HH, +HHMM or +HH:MM
+    offset_minutes = numpy.zeros(num_rows, dtype=numpy.int64)
+    remaining = lengths - position
+    if layout['offset'] is not None:
+        sign_character = char_at(position)
+        is_zulu = (sign_character == ord('Z')) & (remaining == 1)
+        sign = numpy.where(sign_character == ord('-'), -1, 1)
+        has_sign = (sign_character == ord('+')) | (sign_character == ord('-'))
+
+        def offset_digits(offsets):
+            digits = [char_at(position + offset).astype(numpy.int64) - ord('0') for offset in offsets]
+            valid = numpy.all([(d >= 0) & (d <= 9) for d in digits], axis=0)
+            return (digits[0] * 10 + digits[1], valid)
+
+        (offset_hours, hours_valid) = offset_digits((1, 2))
+        (minutes_compact, compact_valid) = offset_digits((3, 4))
+        (minutes_colon, colon_valid) = offset_digits((4, 5))
+        colon_valid &= (char_at(position + 3) == ord(':'))
+
+        offset_valid = has_sign & hours_valid & (
+            (remaining == 3)
+            | ((remaining == 5) & compact_valid)
+            | ((remaining == 6) & colon_valid))
+        offset_minutes = sign * (60 * offset_hours
+                                 + numpy.where(remaining == 5, minutes_compact, 0)
+                                 + numpy.where(remaining == 6, minutes_colon, 0))
+        offset_minutes = numpy.where(offset_valid, offset_minutes, 0)
+
+        if layout['offset'] == 'optional':
+            ok &= (remaining == 0) | is_zulu | offset_valid
+        else:
+            ok &= is_zulu | offset_valid
+    else:
+        ok &= (remaining == 0)
+
+    # Days since the epoch from the proleptic Gregorian calendar
+    shifted_year = year - (month <= 2)
+    era = numpy.floor_divide(shifted_year, 400)
+    year_of_era = shifted_year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    days = era * 146097 + day_of_era - 719468
+
+    seconds = ((days * 24 + hour) * 60 + minute - offset_minutes) * 60 + second
+    microseconds = seconds * 1000000 + fraction
+    return (numpy.where(ok, microseconds, NO_TIMESTAMP_MICROSECONDS), ok)
+
+# ----------------------------------------------------------------------
+
 def _fastparse(text):
     """INTERNAL METHOD
 
@@ -42,6 +42,9 @@ from tracktable.lib._cartesian2d import TrajectoryReaderCartesian2D as Trajector
 from tracktable.lib._cartesian2d import BasePointWriterCartesian2D as BasePointWriter
 from tracktable.lib._cartesian2d import TrajectoryPointWriterCartesian2D as TrajectoryPointWriter
 from tracktable.lib._cartesian2d import TrajectoryWriterCartesian2D
+from tracktable.lib._cartesian2d import BinaryTrajectoryReaderCartesian2D as BinaryTrajectoryReader
+from tracktable.lib._cartesian2d import BinaryTrajectoryWriterCartesian2D as BinaryTrajectoryWriter
+from tracktable.lib._cartesian2d import TrajectoryAssemblerCartesian2D as TrajectoryAssembler
 DIMENSION = 2
 
 domain_classes = {
@@ -54,7 +57,10 @@ domain_classes = {
     'BoundingBox': BoundingBox,
     'BasePointWriter': BasePointWriter,
     'TrajectoryPointWriter': TrajectoryPointWriter,
-    'TrajectoryWriter': TrajectoryWriterCartesian2D
+    'TrajectoryWriter': TrajectoryWriterCartesian2D,
+    'BinaryTrajectoryReader': BinaryTrajectoryReader,
+    'BinaryTrajectoryWriter': BinaryTrajectoryWriter,
+    'TrajectoryAssembler': TrajectoryAssembler
 }
 
 
@@ -68,6 +74,9 @@ for domain_class in [
         BasePointWriter,
         TrajectoryPointWriter,
         TrajectoryWriterCartesian2D,
+        BinaryTrajectoryReader,
+        BinaryTrajectoryWriter,
+        TrajectoryAssembler,
         BoundingBox ]:
     domain_class.domain_classes = domain_classes
     domain_class.DOMAIN = "cartesian2d"
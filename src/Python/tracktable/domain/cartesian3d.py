@@ -43,6 +43,9 @@ from tracktable.lib._cartesian3d import TrajectoryReaderCartesian3D as Trajector
 from tracktable.lib._cartesian3d import BasePointWriterCartesian3D as BasePointWriter
 from tracktable.lib._cartesian3d import TrajectoryPointWriterCartesian3D as TrajectoryPointWriter
 from tracktable.lib._cartesian3d import TrajectoryWriterCartesian3D
+from tracktable.lib._cartesian3d import BinaryTrajectoryReaderCartesian3D as BinaryTrajectoryReader
+from tracktable.lib._cartesian3d import BinaryTrajectoryWriterCartesian3D as BinaryTrajectoryWriter
+from tracktable.lib._cartesian3d import TrajectoryAssemblerCartesian3D as TrajectoryAssembler
 
 DIMENSION = 3
 
@@ -56,7 +59,10 @@ domain_classes = {
     'BoundingBox': BoundingBox,
     'BasePointWriter': BasePointWriter,
     'TrajectoryPointWriter': TrajectoryPointWriter,
-    'TrajectoryWriter': TrajectoryWriterCartesian3D
+    'TrajectoryWriter': TrajectoryWriterCartesian3D,
+    'BinaryTrajectoryReader': BinaryTrajectoryReader,
+    'BinaryTrajectoryWriter': BinaryTrajectoryWriter,
+    'TrajectoryAssembler': TrajectoryAssembler
 }
 
 for domain_class in [
@@ -69,6 +75,9 @@ for domain_class in [
         BasePointWriter,
         TrajectoryPointWriter,
         TrajectoryWriterCartesian3D,
+        BinaryTrajectoryReader,
+        BinaryTrajectoryWriter,
+        TrajectoryAssembler,
         BoundingBox ]:
     domain_class.domain_classes = domain_classes
     domain_class.DOMAIN = "cartesian3d"
@@ -33,6 +33,8 @@ tracktable.domain.rtree - Find points in boxes and nearest neighbors with an R-t
 
 from __future__ import absolute_import, division, print_function
 
+import numpy
+
 from tracktable.domain.feature_vectors import convert_to_feature_vector
 from tracktable.lib import _rtree
 
@@ -42,11 +44,53 @@ class RTree(object):
     def __init__(self, points=None):
         self._tree = None
         self._original_points = None
+        self._feature_vectors = None
         self._feature_vector_length = None
 
         if points is not None:
             self.insert_points(points)
 
+    @classmethod
+    def from_array(cls, points):
+        """Build a packed R-tree from an array of points
+
+        This uses Boost.Geometry's packing (bulk-loading) algorithm to
+        build the whole tree at once.  That is much faster than
+        inserting points one at a time and the resulting tree answers
+        queries faster as well.
+
+        Unlike the constructor, this does not make Python copies of
+        the points or their feature vectors.  The ``points`` property
+        of the new tree returns the array you supplied and query results
+        are row indices into that array.
+
+        Args:
+           points (array-like): Array of shape (N, D) with 1 <= D <= 30.
+               Anything that numpy.asarray() can turn into such an array
+               (including a list of feature vectors) is accepted.
+
+        Returns:
+           New RTree containing all of the points
+
+        Raises:
+           ValueError: The array is not two-dimensional.
+        """
+
+        array = numpy.asarray(points, dtype=numpy.float64)
+        tree = cls()
+        if array.size == 0:
+            return tree
+        if array.ndim != 2:
+            raise ValueError((
+                'RTree.from_array: Expected an array of shape (N, D), '
+                'got an array of shape {}').format(array.shape))
+
+        tree._feature_vector_length = array.shape[1]
+        tree._original_points = points
+        tree._setup_tree()
+        tree._tree.bulk_load(array)
+        return tree
+
     @property
     def points(self):
         """Return the points currently held in the r-tree
@@ -54,7 +98,8 @@ class RTree(object):
         Note:
             This will return the points as originally supplied by
             the user, not the feature vectors that actually populate the
-            tree.
+            tree.  For a tree built with from_array() this is the array
+            that was passed in; points inserted later are not included.
 
         Returns: Sequence of points originally supplied
         """
@@ -77,7 +122,7 @@ class RTree(object):
            new_points (list): List of points to use
         """
 
-        if new_points != self._original_points:
+        if new_points is not self._original_points:
             self._tree = None
             self._feature_vector_length = None
             self._original_points = None
@@ -124,9 +169,11 @@ class RTree(object):
                         self._feature_vector_length
                     ))
 
-        self._original_points.append(point)
-        self._feature_vectors.append(convert_to_feature_vector(point))
-        self._tree.insert_point(self._feature_vectors[-1])
+        feature_vector = convert_to_feature_vector(point)
+        if self._feature_vectors is not None:
+            self._original_points.append(point)
+            self._feature_vectors.append(feature_vector)
+        self._tree.insert_point(feature_vector)
 
     # --------------------------------------------------------------------
 
@@ -138,32 +185,25 @@ class RTree(object):
                 R-tree.
         """
 
+        new_points = list(points)
+        if len(new_points) == 0:
+            return
+
         if self._tree is None:
-            # Since the input sequence might be a generator or other
-            # traverse-once-only sequence, we pick the first point and use
-            # that to configure the tree, then insert the others as a batch.
-
-            point_iter = iter(points)
-            try:
-                first_point = next(point_iter)
-                self.insert_point(first_point)
-            except StopIteration:
-                # If we're here, the sequence was empty and there are
-                # no points to insert.
-                return
-
-            # At this point the tree definitely exists and has one point
-            # in it.  Insert the rest of the points as a batch.
-            self.insert_points(point_iter)
+            # Use the first point to configure the tree.  The tree is
+            # still empty when the batch goes in below, so the points
+            # are bulk-loaded with the packing algorithm instead of
+            # being inserted one at a time.
+            self._feature_vector_length = len(new_points[0])
+            self._original_points = []
+            self._feature_vectors = []
+            self._setup_tree()
 
-        else:
-            # The tree already exists and has at least one point in it.
-            # Add the rest of the points as a batch.
-            new_points = list(points)
-            new_fv = [convert_to_feature_vector(p) for p in new_points]
+        new_fv = [convert_to_feature_vector(p) for p in new_points]
+        if self._feature_vectors is not None:
             self._original_points.extend(new_points)
             self._feature_vectors.extend(new_fv)
-            self._tree.insert_points(new_fv)
+        self._tree.insert_points(new_fv)
 
     # --------------------------------------------------------------------
 
@@ -206,6 +246,74 @@ class RTree(object):
 
     # ----------------------------------------------------------------------
 
+    def find_points_in_boxes(self, min_corners, max_corners, n_threads=1):
+        """Find points inside many boxes with one call
+
+        This answers the same question as find_points_in_box() for
+        every box at once.  The queries run in C++ without holding the
+        Python interpreter lock and can be spread across several threads.
+
+        Args:
+           min_corners (array-like): Array of shape (N, D) with the
+               minimum corner of each box
+           max_corners (array-like): Array of shape (N, D) with the
+               maximum corner of each box
+
+        Keyword Args:
+           n_threads (int): Number of threads to use.  Zero or a negative
+               number means one thread per CPU. (Default: 1)
+
+        Returns:
+           Tuple (offsets, indices) of int64 arrays in compressed sparse
+           row layout.  The points in box i are
+           indices[offsets[i]:offsets[i+1]].
+        """
+
+        min_corners = numpy.asarray(min_corners, dtype=numpy.float64)
+        max_corners = numpy.asarray(max_corners, dtype=numpy.float64)
+        if self._tree is None:
+            return self._empty_batch_result(len(min_corners))
+        return self._tree.find_points_in_boxes(min_corners, max_corners, n_threads)
+
+    # ----------------------------------------------------------------------
+
+    def find_nearest_neighbors_batch(self, seed_points, num_neighbors, n_threads=1):
+        """Find the nearest neighbors of many search points with one call
+
+        This answers the same question as find_nearest_neighbors() for
+        every seed point at once.  The queries run in C++ without
+        holding the Python interpreter lock and can be spread across
+        several threads.
+
+        Args:
+           seed_points (array-like): Array of shape (N, D) with one
+               search point per row
+           num_neighbors (int): How many neighbors to find for each point
+
+        Keyword Args:
+           n_threads (int): Number of threads to use.  Zero or a negative
+               number means one thread per CPU. (Default: 1)
+
+        Returns:
+           Tuple (offsets, indices) of int64 arrays in compressed sparse
+           row layout.  The neighbors of seed point i are
+           indices[offsets[i]:offsets[i+1]].
+        """
+
+        seed_points = numpy.asarray(seed_points, dtype=numpy.float64)
+        if self._tree is None:
+            return self._empty_batch_result(len(seed_points))
+        return self._tree.find_nearest_neighbors_batch(seed_points, num_neighbors, n_threads)
+
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def _empty_batch_result(num_queries):
+        return (numpy.zeros(num_queries + 1, dtype=numpy.int64),
+                numpy.zeros(0, dtype=numpy.int64))
+
+    # ----------------------------------------------------------------------
+
     def intersects(self, min_corner, max_corner):
         """Find points/objects that intersect a box
 
@@ -42,6 +42,9 @@ from tracktable.lib._terrestrial import BoundingBoxTerrestrial as BoundingBox
 from tracktable.lib._terrestrial import BasePointWriterTerrestrial as BasePointWriter
 from tracktable.lib._terrestrial import TrajectoryPointWriterTerrestrial as TrajectoryPointWriter
 from tracktable.lib._terrestrial import TrajectoryWriterTerrestrial
+from tracktable.lib._terrestrial import BinaryTrajectoryReaderTerrestrial as BinaryTrajectoryReader
+from tracktable.lib._terrestrial import BinaryTrajectoryWriterTerrestrial as BinaryTrajectoryWriter
+from tracktable.lib._terrestrial import TrajectoryAssemblerTerrestrial as TrajectoryAssembler
 
 # We need this in order to get the converters for ECEF coordinates
 import tracktable.domain.cartesian3d
@@ -58,7 +61,10 @@ domain_classes = {
     'BoundingBox': BoundingBox,
     'BasePointWriter': BasePointWriter,
     'TrajectoryPointWriter': TrajectoryPointWriter,
-    'TrajectoryWriter': TrajectoryWriterTerrestrial
+    'TrajectoryWriter': TrajectoryWriterTerrestrial,
+    'BinaryTrajectoryReader': BinaryTrajectoryReader,
+    'BinaryTrajectoryWriter': BinaryTrajectoryWriter,
+    'TrajectoryAssembler': TrajectoryAssembler
 }
 
 for domain_class in [
@@ -71,6 +77,9 @@ for domain_class in [
         BasePointWriter,
         TrajectoryPointWriter,
         TrajectoryWriterTerrestrial,
+        BinaryTrajectoryReader,
+        BinaryTrajectoryWriter,
+        TrajectoryAssembler,
         BoundingBox ]:
     domain_class.domain_classes = domain_classes
     domain_class.DOMAIN = "terrestrial"
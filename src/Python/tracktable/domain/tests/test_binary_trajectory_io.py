@@ -0,0 +1,183 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Round-trip trajectories through the binary trajectory format.
+
+Trajectories are written to a path and to an in-memory file, then read
+back by iteration, by index and through the index queries.
+"""
+
+from __future__ import print_function, division
+
+import io
+import os.path
+import sys
+import tempfile
+
+from . import create_points_and_trajectories as tt_generators
+
+from tracktable.domain import terrestrial, cartesian2d, cartesian3d
+
+
+def make_trajectories(domain, howmany):
+    prototype = domain.Trajectory()
+    trajectories = []
+    for i in range(howmany):
+        trajectory = tt_generators.generate_random_trajectory(prototype, 3, 2)
+        for point in trajectory:
+            point.object_id = 'binary_object_{}'.format(i)
+        trajectories.append(trajectory)
+    return trajectories
+
+
+def compare_trajectories(expected, actual, label):
+    if len(expected) != len(actual):
+        print("ERROR: {}: Expected {} trajectories but got {}.".format(
+            label, len(expected), len(actual)))
+        return 1
+    for (i, (expected_traj, actual_traj)) in enumerate(zip(expected, actual)):
+        if expected_traj != actual_traj:
+            print("ERROR: {}: Trajectory {} differs after round trip.".format(
+                label, i))
+            return 1
+    return 0
+
+
+def check_reader(reader, trajectories, label):
+    error_count = 0
+
+    if len(reader) != len(trajectories):
+        print("ERROR: {}: len(reader) is {}, expected {}.".format(
+            label, len(reader), len(trajectories)))
+        return 1
+
+    error_count += compare_trajectories(trajectories, list(reader),
+                                        "{} iteration".format(label))
+    error_count += compare_trajectories(trajectories, list(reader),
+                                        "{} second iteration".format(label))
+    error_count += compare_trajectories(
+        trajectories, [reader[i] for i in range(len(reader))],
+        "{} indexing".format(label))
+
+    if reader[-1] != trajectories[-1]:
+        print("ERROR: {}: reader[-1] is not the last trajectory.".format(label))
+        error_count += 1
+
+    try:
+        reader[len(reader)]
+        print("ERROR: {}: Indexing past the end did not raise IndexError.".format(label))
+        error_count += 1
+    except IndexError:
+        pass
+
+    for (i, trajectory) in enumerate(trajectories):
+        if reader.object_id(i) != trajectory.object_id:
+            print("ERROR: {}: object_id({}) is {}, expected {}.".format(
+                label, i, reader.object_id(i), trajectory.object_id))
+            error_count += 1
+        if reader.num_points(i) != len(trajectory):
+            print("ERROR: {}: num_points({}) is {}, expected {}.".format(
+                label, i, reader.num_points(i), len(trajectory)))
+            error_count += 1
+        if reader.find_object_id(trajectory.object_id) != [i]:
+            print("ERROR: {}: find_object_id({}) returned {}.".format(
+                label, trajectory.object_id,
+                reader.find_object_id(trajectory.object_id)))
+            error_count += 1
+        if i not in reader.find_in_time_range(trajectory[0].timestamp,
+                                              trajectory[-1].timestamp):
+            print("ERROR: {}: find_in_time_range did not find trajectory {}.".format(
+                label, i))
+            error_count += 1
+        if i not in reader.find_in_box(reader.bounding_box(i)):
+            print("ERROR: {}: find_in_box did not find trajectory {}.".format(
+                label, i))
+            error_count += 1
+
+    return error_count
+
+
+def test_domain(domain):
+    error_count = 0
+    domain_name = domain.Trajectory.DOMAIN
+    trajectories = make_trajectories(domain, 10)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filename = os.path.join(temp_dir, 'trajectories.trajbin')
+        with domain.BinaryTrajectoryWriter(filename) as writer:
+            writer.write(trajectories)
+        if writer.num_trajectories != len(trajectories):
+            print("ERROR: {}: Writer reports {} trajectories, expected {}.".format(
+                domain_name, writer.num_trajectories, len(trajectories)))
+            error_count += 1
+
+        reader = domain.BinaryTrajectoryReader(filename)
+        error_count += check_reader(reader, trajectories,
+                                    "{} path".format(domain_name))
+        del reader
+
+    buffer = io.BytesIO()
+    writer = domain.BinaryTrajectoryWriter(buffer)
+    for trajectory in trajectories:
+        writer.write(trajectory)
+    writer.close()
+
+    buffer.seek(0)
+    reader = domain.BinaryTrajectoryReader()
+    reader.input = buffer
+    error_count += check_reader(reader, trajectories,
+                                "{} file-like object".format(domain_name))
+    return error_count
+
+
+def test_wrong_domain():
+    buffer = io.BytesIO()
+    with cartesian2d.BinaryTrajectoryWriter(buffer) as writer:
+        writer.write(make_trajectories(cartesian2d, 1))
+    buffer.seek(0)
+
+    try:
+        cartesian3d.BinaryTrajectoryReader(buffer)
+    except (OSError, RuntimeError):
+        return 0
+    print("ERROR: Reading a cartesian2d file as cartesian3d did not fail.")
+    return 1
+
+
+def main():
+    error_count = 0
+    for domain in [terrestrial, cartesian2d, cartesian3d]:
+        error_count += test_domain(domain)
+    error_count += test_wrong_domain()
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Read points and trajectories straight from a file name.
+
+Readers given a path (str or pathlib.Path) map the file into memory
+instead of pulling it through a Python file object.  Both routes
+must produce the same points.
+"""
+
+from __future__ import print_function, division
+
+import os.path
+import pathlib
+import sys
+import tempfile
+
+from tracktable.domain.terrestrial import TrajectoryPointReader
+from tracktable.domain.terrestrial import TrajectoryReader
+from tracktable.domain.terrestrial import TrajectoryWriter
+from tracktable.domain.terrestrial import Trajectory
+
+
+def read_points(source, parser_threads=1):
+    reader = TrajectoryPointReader()
+    reader.input = source
+    reader.field_delimiter = ","
+    reader.parser_threads = parser_threads
+    return list(reader)
+
+
+def compare_point_lists(expected, actual, label):
+    if len(expected) != len(actual):
+        print("ERROR: {}: Expected {} points but got {}.".format(
+            label, len(expected), len(actual)))
+        return 1
+    for (i, (expected_point, actual_point)) in enumerate(zip(expected, actual)):
+        if expected_point != actual_point:
+            print("ERROR: {}: Point {} differs. Expected {}, got {}.".format(
+                label, i, expected_point, actual_point))
+            return 1
+    return 0
+
+
+def test_point_reader(filename, expected_num_points):
+    error_count = 0
+
+    with open(filename, 'rb') as infile:
+        file_points = read_points(infile)
+
+    if len(file_points) != expected_num_points:
+        print("ERROR: Expected to see {} points but saw {} instead.".format(
+            expected_num_points, len(file_points)))
+        error_count += 1
+
+    error_count += compare_point_lists(file_points, read_points(filename),
+                                       "str path")
+    error_count += compare_point_lists(file_points,
+                                       read_points(pathlib.Path(filename)),
+                                       "pathlib.Path")
+    error_count += compare_point_lists(file_points,
+                                       read_points(filename, parser_threads=4),
+                                       "str path, 4 parser threads")
+    return error_count
+
+
+def test_trajectory_reader(filename):
+    error_count = 0
+
+    with open(filename, 'rb') as infile:
+        points = read_points(infile)
+    object_id = points[0].object_id
+    trajectory = Trajectory.from_position_list(
+        [point for point in points if point.object_id == object_id])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        traj_filename = os.path.join(temp_dir, 'trajectory.traj')
+        with open(traj_filename, 'wb') as outfile:
+            writer = TrajectoryWriter(outfile)
+            writer.write(trajectory)
+
+        reader = TrajectoryReader()
+        reader.input = traj_filename
+        trajectories = list(reader)
+
+    if len(trajectories) != 1:
+        print("ERROR: Expected 1 trajectory from mapped file but got {}.".format(
+            len(trajectories)))
+        return 1
+
+    error_count += compare_point_lists(list(trajectory), list(trajectories[0]),
+                                       "trajectory from str path")
+    return error_count
+
+
+def test_missing_file(filename, expected_num_points):
+    error_count = 0
+    for reader_class in [TrajectoryPointReader, TrajectoryReader]:
+        reader = reader_class()
+        reader.input = filename
+        try:
+            reader.input = "this_file_does_not_exist.csv"
+            print("ERROR: {}: Setting a missing file as input did not raise OSError.".format(
+                reader_class.__name__))
+            error_count += 1
+        except OSError:
+            pass
+
+        # A failed open must leave the previous input in place.
+        if reader.input != filename:
+            print("ERROR: {}: Input changed to {} after a failed open.".format(
+                reader_class.__name__, reader.input))
+            error_count += 1
+        if reader_class is TrajectoryPointReader:
+            reader.field_delimiter = ","
+            num_points = len(list(reader))
+            if num_points != expected_num_points:
+                print("ERROR: Expected {} points from the previous input after a "
+                      "failed open but got {}.".format(expected_num_points, num_points))
+                error_count += 1
+    return error_count
+
+
+def main():
+    filename = sys.argv[1]
+    expected_num_points = int(sys.argv[2])
+
+    error_count = 0
+    error_count += test_point_reader(filename, expected_num_points)
+    error_count += test_trajectory_reader(filename)
+    error_count += test_missing_file(filename, expected_num_points)
+    return error_count
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -32,6 +32,7 @@ from __future__ import absolute_import, division, print_function
 import enum
 import sys
 
+import numpy
 from six.moves import range
 from tracktable.domain.rtree import RTree
 from tracktable.domain import feature_vectors as fv
@@ -78,6 +79,25 @@ def test_nearest_neighbors(point_type,
     else:
         return 0
 
+def test_nearest_neighbors_batch(dimension, n_threads):
+    points = numpy.repeat(numpy.arange(10, dtype=numpy.float64), dimension).reshape(10, dimension)
+    tree = RTree.from_array(points)
+
+    # Seeds at 0.5, 1.5, ..., 8.5.  The 2 nearest neighbors of seed i
+    # are points i and i+1.
+    seeds = points[:-1] + 0.5
+    (offsets, indices) = tree.find_nearest_neighbors_batch(seeds, 2, n_threads=n_threads)
+
+    error_count = 0
+    for i in range(len(seeds)):
+        actual = set(indices[offsets[i]:offsets[i+1]])
+        if actual != set([i, i + 1]):
+            print("ERROR: Batch nearest neighbors for seed {} returned {}, expected {}.".format(
+                i, sorted(actual), [i, i + 1]))
+            error_count += 1
+    return error_count
+
+
 def main():
     error_count = 0
 
@@ -95,6 +115,8 @@ def main():
             point_type,
             rtree_creation=CreationMethod.ONE_POINT_AT_A_TIME
             )
+        error_count += test_nearest_neighbors_batch(dimension, 1)
+        error_count += test_nearest_neighbors_batch(dimension, 3)
 
     return error_count
 
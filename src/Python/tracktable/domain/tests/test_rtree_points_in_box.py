@@ -32,6 +32,7 @@ from __future__ import absolute_import, division, print_function
 import enum
 import sys
 
+import numpy
 from six.moves import range
 from tracktable.domain.rtree import RTree
 from tracktable.domain import feature_vectors as fv
@@ -41,6 +42,7 @@ class CreationMethod(enum.Enum):
     CONSTRUCTOR = 1
     ONE_POINT_AT_A_TIME = 2
     ALL_POINTS_AT_ONCE = 3
+    BULK_LOAD_FROM_ARRAY = 4
 
 
 def test_points_in_box(point_type, rtree_creation=CreationMethod.CONSTRUCTOR):
@@ -68,6 +70,13 @@ def test_points_in_box(point_type, rtree_creation=CreationMethod.CONSTRUCTOR):
         tree = RTree()
         for point in points:
             tree.insert_point(point)
+    elif rtree_creation == CreationMethod.BULK_LOAD_FROM_ARRAY:
+        tree = RTree.from_array(
+            numpy.array([[point[d] for d in range(len(point))] for point in points])
+            )
+        if len(tree) != len(points):
+            print("ERROR: Expected bulk-loaded tree to contain {} points.  Instead it has {}.".format(len(points), len(tree)))
+            return 1
     else:
         raise ValueError('Unknown RTree construction type {}'.format(rtree_creation))
 
@@ -81,12 +90,92 @@ def test_points_in_box(point_type, rtree_creation=CreationMethod.CONSTRUCTOR):
         return 0
 
 
+def test_points_in_boxes_batch(dimension, n_threads):
+    points = numpy.repeat(numpy.arange(100, dtype=numpy.float64), dimension).reshape(100, dimension)
+    tree = RTree.from_array(points)
+
+    # Box i covers points i, i+1 and i+2 (clipped at the end)
+    min_corners = numpy.arange(100, dtype=numpy.float64).repeat(dimension).reshape(100, dimension) - 0.5
+    max_corners = min_corners + 3
+
+    (offsets, indices) = tree.find_points_in_boxes(min_corners, max_corners, n_threads=n_threads)
+
+    error_count = 0
+    if len(offsets) != 101:
+        print("ERROR: Expected 101 offsets for 100 boxes.  Instead we got {}.".format(len(offsets)))
+        return 1
+    for i in range(100):
+        expected = tree.find_points_in_box(min_corners[i], max_corners[i])
+        actual = indices[offsets[i]:offsets[i+1]]
+        if set(expected) != set(actual):
+            print("ERROR: Batch query for box {} returned {}, expected {}.".format(i, sorted(actual), sorted(expected)))
+            error_count += 1
+    return error_count
+
+
+class RecordingTree(object):
+    """Pass calls through to a compiled R-tree and remember how points arrived"""
+
+    def __init__(self, tree):
+        self._tree = tree
+        self.single_inserts = 0
+        self.batch_sizes = []
+
+    def insert_point(self, point):
+        self.single_inserts += 1
+        self._tree.insert_point(point)
+
+    def insert_points(self, points):
+        self.batch_sizes.append(len(points))
+        self._tree.insert_points(points)
+
+    def __len__(self):
+        return len(self._tree)
+
+    def __getattr__(self, name):
+        return getattr(self._tree, name)
+
+
+class RecordingRTree(RTree):
+    def _setup_tree(self):
+        super(RecordingRTree, self)._setup_tree()
+        self._tree = RecordingTree(self._tree)
+
+
+def test_insert_points_into_empty_tree(point_type):
+    # The whole batch must reach the compiled tree while it is still
+    # empty so that it can be bulk-loaded.  This must also work for
+    # a sequence that can only be traversed once.
+    points = []
+    for i in range(10):
+        point = point_type()
+        for d in range(len(point)):
+            point[d] = i
+        points.append(point)
+
+    tree = RecordingRTree()
+    tree.insert_points(point for point in [])
+    tree.insert_points(point for point in points)
+    if tree._tree.single_inserts != 0 or tree._tree.batch_sizes != [len(points)]:
+        print("ERROR: Expected one batch of {} points in an empty tree.  Instead we got {} single inserts and batches of {}.".format(
+            len(points), tree._tree.single_inserts, tree._tree.batch_sizes))
+        return 1
+    if len(tree) != len(points) or len(tree.points) != len(points):
+        print("ERROR: Expected tree to contain {} points.  Instead it has {}.".format(len(points), len(tree)))
+        return 1
+    return 0
+
+
 def main():
     error_count = 0
 
     for dimension in range(1, 30):
         point_type = fv.POINT_TYPES[dimension]
-        error_count += test_points_in_box(point_type)
+        for creation_method in CreationMethod:
+            error_count += test_points_in_box(point_type, creation_method)
+        error_count += test_insert_points_into_empty_tree(point_type)
+        error_count += test_points_in_boxes_batch(dimension, 1)
+        error_count += test_points_in_boxes_batch(dimension, 4)
 
     return error_count
 
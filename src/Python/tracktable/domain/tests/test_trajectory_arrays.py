@@ -0,0 +1,228 @@
+#
+# Copyright (c) 2014-2023 National Technology and Engineering
+# Solutions of Sandia, LLC. Under the terms of Contract DE-NA0003525
+# with National Technology and Engineering Solutions of Sandia, LLC,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Check the columnar NumPy accessors on the trajectory classes.
+
+We compare coordinates_as_array(), timestamps_as_array() and
+real_property_as_array() against the same values retrieved one point
+at a time, then rebuild the trajectory with Trajectory.from_arrays().
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import logging
+import math
+import random
+import sys
+
+import numpy
+
+from . import create_points_and_trajectories as tt_generators
+
+from tracktable.domain import terrestrial, cartesian2d, cartesian3d
+
+
+def test_trajectory_arrays(trajectory_class):
+    """Compare columnar arrays with per-point values
+
+    Args:
+        trajectory_class {class}: Which trajectory class to instantiate
+
+    Returns:
+        Number of errors encountered (also logs error messages)
+    """
+
+    logger = logging.getLogger(__name__)
+    trajectory = tt_generators.generate_random_trajectory(
+        trajectory_class, 6, 0
+        )
+    error_count = 0
+
+    coordinates = trajectory.coordinates_as_array()
+    expected_shape = (len(trajectory), len(trajectory[0]))
+    if coordinates.shape != expected_shape or coordinates.dtype != numpy.float64:
+        logger.error(('coordinates_as_array: Expected float64 array with '
+                      'shape {}, got {} array with shape {}').format(
+                          expected_shape, coordinates.dtype, coordinates.shape))
+        error_count += 1
+    else:
+        for (i, point) in enumerate(trajectory):
+            if list(coordinates[i]) != [point[d] for d in range(len(point))]:
+                logger.error(('coordinates_as_array: Row {} is {}, expected '
+                              'point {}').format(i, coordinates[i], point))
+                error_count += 1
+
+    timestamps = trajectory.timestamps_as_array()
+    if timestamps.dtype != numpy.dtype('datetime64[us]'):
+        logger.error('timestamps_as_array: Expected datetime64[us], got {}'.format(
+            timestamps.dtype))
+        error_count += 1
+    else:
+        for (i, point) in enumerate(trajectory):
+            expected = numpy.datetime64(point.timestamp.replace(tzinfo=None), 'us')
+            if timestamps[i] != expected:
+                logger.error(('timestamps_as_array: Entry {} is {}, '
+                              'expected {}').format(i, timestamps[i], expected))
+                error_count += 1
+
+    real_values = trajectory.real_property_as_array('real_0')
+    for (i, point) in enumerate(trajectory):
+        if real_values[i] != point.properties['real_0']:
+            logger.error(('real_property_as_array: Entry {} is {}, '
+                          'expected {}').format(i, real_values[i],
+                                                point.properties['real_0']))
+            error_count += 1
+
+    for name in ['string_1', 'no_such_property']:
+        values = trajectory.real_property_as_array(name)
+        if len(values) != len(trajectory) or not all(math.isnan(v) for v in values):
+            logger.error(('real_property_as_array: Expected all NaN for '
+                          'property {}, got {}').format(name, values))
+            error_count += 1
+
+    empty = trajectory_class()
+    if (empty.coordinates_as_array().shape != (0, len(trajectory[0]))
+            or len(empty.timestamps_as_array()) != 0):
+        logger.error('Arrays from an empty trajectory should be empty')
+        error_count += 1
+
+    return error_count
+
+
+def test_trajectory_from_arrays(trajectory_class):
+    """Rebuild a trajectory from its columns and compare
+
+    Args:
+        trajectory_class {class}: Which trajectory class to instantiate
+
+    Returns:
+        Number of errors encountered (also logs error messages)
+    """
+
+    logger = logging.getLogger(__name__)
+    original = tt_generators.generate_random_trajectory(
+        trajectory_class, 6, 0
+        )
+    error_count = 0
+
+    coordinates = original.coordinates_as_array()
+    columns = [coordinates[:, d] for d in range(coordinates.shape[1])]
+    properties = {
+        'real_0': original.real_property_as_array('real_0'),
+        'string_1': [point.properties['string_1'] for point in original],
+        'timestamp_2': numpy.array(
+            [numpy.datetime64(point.properties['timestamp_2'].replace(tzinfo=None), 'us')
+             for point in original]
+            )
+        }
+
+    rebuilt = trajectory_class.from_arrays(
+        original.object_id, original.timestamps_as_array(), *columns,
+        **properties
+        )
+
+    if len(rebuilt) != len(original):
+        logger.error('from_arrays: Expected {} points, got {}'.format(
+            len(original), len(rebuilt)))
+        return error_count + 1
+
+    for (expected, actual) in zip(original, rebuilt):
+        if (expected.object_id != actual.object_id
+                or expected.timestamp != actual.timestamp
+                or [expected[d] for d in range(len(expected))] !=
+                   [actual[d] for d in range(len(actual))]):
+            logger.error('from_arrays: Expected point {}, got {}'.format(
+                expected, actual))
+            error_count += 1
+        for name in properties.keys():
+            if expected.properties[name] != actual.properties[name]:
+                logger.error(('from_arrays: Property {} is {}, '
+                              'expected {}').format(name,
+                                                    actual.properties[name],
+                                                    expected.properties[name]))
+                error_count += 1
+
+    if abs(rebuilt[-1].current_length - original[-1].current_length) > 1e-6:
+        logger.error('from_arrays: current_length was not computed')
+        error_count += 1
+
+    # Plain datetimes and integer microseconds are accepted as timestamps
+    from_datetimes = trajectory_class.from_arrays(
+        'test', [point.timestamp for point in original], *columns
+        )
+    microseconds = original.timestamps_as_array().astype('int64')
+    from_integers = trajectory_class.from_arrays('test', microseconds, *columns)
+    if ([p.timestamp for p in from_datetimes] != [p.timestamp for p in original]
+            or [p.timestamp for p in from_integers] != [p.timestamp for p in original]):
+        logger.error('from_arrays: Timestamps did not survive conversion')
+        error_count += 1
+
+    # A missing value turns a numeric column into dtype object.  The
+    # numbers must still become real properties.
+    speeds = [1.5, None, numpy.int64(2), float('nan')] + [2.5] * (len(original) - 4)
+    with_missing = trajectory_class.from_arrays(
+        'test', original.timestamps_as_array(), *columns, speed=speeds
+        )
+    expected_speeds = [1.5, None, 2.0, None] + [2.5] * (len(original) - 4)
+    actual_speeds = [point.properties['speed'] if 'speed' in point.properties else None
+                     for point in with_missing]
+    if (actual_speeds != expected_speeds
+            or not all(isinstance(speed, float) for speed in actual_speeds if speed is not None)):
+        logger.error(('from_arrays: Numeric column with missing values became {}, '
+                      'expected {}').format(actual_speeds, expected_speeds))
+        error_count += 1
+
+    try:
+        trajectory_class.from_arrays(
+            'test', original.timestamps_as_array(), *[c[:-1] for c in columns]
+            )
+        logger.error('from_arrays: Expected ValueError for mismatched columns')
+        error_count += 1
+    except ValueError:
+        pass
+
+    return error_count
+
+# ----------------------------------------------------------------------
+
+def main():
+    random.seed(0)
+    num_errors = 0
+    num_errors += test_trajectory_arrays(terrestrial.Trajectory)
+    num_errors += test_trajectory_arrays(cartesian2d.Trajectory)
+    num_errors += test_trajectory_arrays(cartesian3d.Trajectory)
+    num_errors += test_trajectory_from_arrays(terrestrial.Trajectory)
+    num_errors += test_trajectory_from_arrays(cartesian2d.Trajectory)
+    num_errors += test_trajectory_from_arrays(cartesian3d.Trajectory)
+
+    return num_errors
+
+if __name__ == '__main__':
+    sys.exit(main())
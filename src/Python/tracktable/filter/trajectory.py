@@ -35,6 +35,7 @@ import logging
 from shapely.geometry import Polygon
 from tracktable.core.geomath import (compute_bounding_box, intersects,
                                      subset_during_interval)
+from tracktable.core.timestamp import Timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -81,7 +82,16 @@ class ClipToTimeWindow(object):
         if self.start_time is None or self.end_time is None:
             raise ValueError("ClipToTimeWindow: Incomplete time window!  You must set both 'start_time' and 'end_time'. The current time window is ({}, {}).".format(self.start_time, self.end_time))
 
+        # Trajectories that miss the window entirely are rejected by
+        # comparing integer endpoint times instead of datetimes.
+        start_usec = Timestamp.to_epoch_microseconds(self.start_time)
+        end_usec = Timestamp.to_epoch_microseconds(self.end_time)
+
         for trajectory in self.input:
+            if (len(trajectory) == 0 or
+                    trajectory.start_time_epoch_microseconds() > end_usec or
+                    trajectory.end_time_epoch_microseconds() < start_usec):
+                continue
             subset = subset_during_interval(trajectory,
                 self.start_time,
                 self.end_time)
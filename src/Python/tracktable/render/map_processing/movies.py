@@ -46,6 +46,7 @@ import numpy
 import tracktable.domain
 from matplotlib import pyplot
 from tracktable.core import geomath
+from tracktable.core.timestamp import Timestamp
 from tracktable.render.map_processing import paths
 
 matplotlib.use('Agg')
@@ -54,9 +55,12 @@ matplotlib.use('Agg')
 
 
 def clip_trajectories_to_interval(trajectories, start_time, end_time):
+    # Convert the interval once so the overlap test can compare integers
+    start_usec = Timestamp.to_epoch_microseconds(start_time)
+    end_usec = Timestamp.to_epoch_microseconds(end_time)
     trajectories_this_frame = [
         t for t in trajectories if trajectory_overlaps_interval(
-            t, start_time, end_time)
+            t, start_usec, end_usec)
     ]
 
     clipped_trajectories = (
@@ -458,16 +462,24 @@ def trajectory_overlaps_interval(trajectory, start_time, end_time):
     that it begins after the interval ends or ends before the interval
     begins.
 
+    The comparison uses integer epoch microseconds so that no Python
+    datetimes are created for the trajectory's endpoints.  Callers
+    testing many trajectories against the same interval can pass the
+    bounds in that form already (see
+    Timestamp.to_epoch_microseconds()).
+
     Arguments:
         trajectory {Tracktable trajectory}: trajectory to test
-        start_time {datetime.datetime}: Beginning of interval
-        end_time {datetime.datetime}: End of interval
+        start_time {datetime.datetime or int}: Beginning of interval
+        end_time {datetime.datetime or int}: End of interval
 
     Returns:
         Boolean: true if overlap, false if disjoint
     """
-    return not (trajectory[0].timestamp > end_time or
-                trajectory[-1].timestamp < start_time)
+    start_usec = Timestamp.to_epoch_microseconds(start_time)
+    end_usec = Timestamp.to_epoch_microseconds(end_time)
+    return not (trajectory.start_time_epoch_microseconds() > end_usec or
+                trajectory.end_time_epoch_microseconds() < start_usec)
 
 # ---------------------------------------------------------------------
 
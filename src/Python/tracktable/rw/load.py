@@ -31,19 +31,26 @@
 """tracktable.rw.load: Load in trajectories or trajectory points from a file
 
 This file will intelligently load in trajectory or trajectory point files for
-supported file types (.csv, .tsv, .traj). This includes automatic trajectory assembly if
-the file being loaded is a .csv or .tsv file as well as automatically utilizing the correct
+supported file types (.csv, .tsv, .traj, .trajbin, .parquet). This includes automatic trajectory assembly if
+the file being loaded is a .csv or .tsv file or a Parquet file of points as well as automatically utilizing the correct
 domain readers so points or trajectories are correctly associated with the
 Terrestrial or Cartesian domains.
+
+For files larger than memory, stream_trajectories() reads the same
+file types in a single pass and yields them in bounded batches.
 """
 
+import collections
 import logging
 from datetime import timedelta
 import os
+import threading
+import time
 
 from tracktable.applications.assemble_trajectories import \
     AssembleTrajectoryFromPoints
 from tracktable.domain import domain_module_from_name
+from tracktable.rw import read_write_parquet
 
 try:
     from tqdm import tqdm
@@ -74,7 +81,14 @@ def load_trajectories(infile,
         return_list=True
         ):
 
-    """Load trajectories or trajectory points from .csv, .tsv and .traj files
+    """Load trajectories or trajectory points from .csv, .tsv, .traj, .trajbin and .parquet files
+
+    Parquet sources may be a single .parquet (or .pq) file or a directory
+    of partitioned Parquet files.  Their columns may be given by name as
+    well as by position.  If no real, string or time fields are given,
+    every other column of a Parquet source becomes a point property.
+    Parquet files written by ParquetTrajectoryWriter are read as
+    trajectories without reassembly.
 
     Arguments:
         infile (file-like object): File path for trajectory data
@@ -122,10 +136,11 @@ def load_trajectories(infile,
         separation_time (int): Time in minutes between seperated points signifying the need
             to generate a new trajectory. (20)
         return_trajectory_points (boolean): When loading a .csv or .tsv file return the points in the
-            file and don't generate trajectories. When loading a .traj return a list of lists of the points
+            file and don't generate trajectories. When loading a .traj or .trajbin return a list of lists of the points
             that make up the given trajectory for all trajectories in the file. (default: False)
         return_list (boolean): When returning the reader or assembler object have the loader
             automatically pull all of the yielded trajectories into a list for further processing. (default: False)
+            Use stream_trajectories() instead to process files that do not fit in memory.
 
     Returns:
         List of trajectory points or trajectories depending on input file and params.
@@ -135,80 +150,142 @@ def load_trajectories(infile,
         ValueError: Unsupported domain or comment character
     """
 
+    (source, description, unit) = _open_source(
+        infile, infile,
+        comment_character=comment_character,
+        domain=domain,
+        field_delimiter=field_delimiter,
+        object_id_column=object_id_column,
+        timestamp_column=timestamp_column,
+        longitude_column=longitude_column,
+        latitude_column=latitude_column,
+        x_column=x_column,
+        y_column=y_column,
+        z_column=z_column,
+        real_fields=real_fields,
+        string_fields=string_fields,
+        time_fields=time_fields,
+        separation_distance=separation_distance,
+        separation_time=separation_time,
+        minimum_length=minimum_length,
+        return_trajectory_points=return_trajectory_points)
+
+    # Trajectory files decomposed into points have always come back as
+    # a list of point lists, whatever return_list says.  Only
+    # stream_trajectories() hands them out lazily.
+    if not return_list and not (return_trajectory_points and _is_trajectory_file(infile)):
+        return source
+    if tqdm_installed:
+        return list(tqdm(source, desc=description, unit=unit))
+    return list(source)
+
+# ----------------------------------------------------------------------
+
+def _open_source(infile,
+        input_object,
+        comment_character="#",
+        domain='terrestrial',
+        field_delimiter=',',
+        object_id_column=0,
+        timestamp_column=1,
+        longitude_column=2,
+        latitude_column=3,
+        x_column=2,
+        y_column=3,
+        z_column=4,
+        real_fields = dict(),
+        string_fields = dict(),
+        time_fields = dict(),
+        separation_distance = None,
+        separation_time = 30,
+        minimum_length=2,
+        return_trajectory_points = False
+        ):
+    """Set up the lazy reader (and assembler) for a file
+
+    The arguments are the same as for load_trajectories().  The file
+    type is chosen by the name in `infile`.  The readers for text
+    and .trajbin files read from `input_object` instead, which can
+    be the same path or a file-like object opened in binary mode.
+
+    Returns:
+        Tuple of (iterable, progress description, progress unit).
+        Nothing is read until the iterable is iterated.
+    """
+
     if len(comment_character) != 1:
         raise ValueError('Unsupported comment character `{}`, comment character must be 1 character long.'.format(comment_character))
 
     domain_module = domain_module_from_name(domain)
 
-    if infile.endswith('.traj'):
-        # Read in the trajectories from the traj file
-        reader = domain_module.TrajectoryReader()
-        reader.input = open(infile, 'r')
+    is_parquet = _is_parquet_file(infile)
 
-        if return_list:
-            if tqdm_installed:
-                trajectories = list(tqdm(reader, desc="Loading Trajectories", unit=" trajectory"))
-            else:
-                trajectories = list(reader)
+    if _is_trajectory_file(infile):
+        # Read in the trajectories from the traj, binary or Parquet file
+        if is_parquet:
+            reader = read_write_parquet.read_trajectories_from_parquet(
+                infile, domain=domain)
+        elif infile.endswith('.trajbin'):
+            reader = domain_module.BinaryTrajectoryReader()
+            reader.input = input_object
         else:
-            trajectories = reader
+            reader = domain_module.TrajectoryReader()
+            reader.input = input_object
 
         if return_trajectory_points:
-            trajectory_points = []
-            if tqdm_installed:
-                for trajectory in tqdm(trajectories, desc="Decomposing Trajectories Into Trajectory Points", unit=" trajectory"):
-                    point_list = []
-                    for point in trajectory:
-                        point_list.append(point)
-                    trajectory_points.append(point_list)
-            else:
-                for trajectory in trajectories:
-                    point_list = []
-                    for point in trajectory:
-                        point_list.append(point)
-                    trajectory_points.append(point_list)
-            return trajectory_points
+            # Decompose each trajectory as it is read instead of
+            # holding a second copy of the whole file
+            return ((list(trajectory) for trajectory in reader),
+                    "Loading Trajectories And Decomposing Them Into Trajectory Points",
+                    " trajectory")
         else:
-            return trajectories
-    elif infile.endswith('.csv') or infile.endswith('.tsv'):
-        # Read in the points from the CSV file
-        reader = domain_module.TrajectoryPointReader()
-        reader.input = open(infile, 'r')
-        reader.comment_character = comment_character
-        if infile.endswith('.tsv') and field_delimiter != '\t':
-            field_delimiter = '\t'
-        reader.field_delimiter = field_delimiter
-        reader.object_id_column = object_id_column
-        reader.timestamp_column = timestamp_column
+            return (reader, "Loading Trajectories", " trajectory")
+    elif infile.endswith('.csv') or infile.endswith('.tsv') or is_parquet:
         if domain == 'terrestrial':
-            reader.coordinates[0] = longitude_column
-            reader.coordinates[1] = latitude_column
+            coordinate_columns = [longitude_column, latitude_column]
         elif domain in ['cartesian2d', 'cartesian3d']:
-            reader.coordinates[0] = x_column
-            reader.coordinates[1] = y_column
+            coordinate_columns = [x_column, y_column]
             if domain == 'cartesian3d':
-                reader.coordinates[2] = z_column
+                coordinate_columns.append(z_column)
         else:
             raise ValueError('Unsupported domain: `{}`, supported domains are terrestrial, cartesian2d and cartesian3d'.format(domain))
 
-        for name, column_num in real_fields.items():
-            reader.set_real_field_column(name, column_num)
+        if is_parquet:
+            # Read in the points from the Parquet file or dataset
+            any_fields = real_fields or string_fields or time_fields
+            reader = read_write_parquet.read_points_from_parquet(
+                infile,
+                domain=domain,
+                object_id_column=object_id_column,
+                timestamp_column=timestamp_column,
+                coordinate_columns=coordinate_columns,
+                real_fields=real_fields if any_fields else None,
+                string_fields=string_fields if any_fields else None,
+                time_fields=time_fields if any_fields else None)
+        else:
+            # Read in the points from the CSV file
+            reader = domain_module.TrajectoryPointReader()
+            reader.input = input_object
+            reader.comment_character = comment_character
+            if infile.endswith('.tsv') and field_delimiter != '\t':
+                field_delimiter = '\t'
+            reader.field_delimiter = field_delimiter
+            reader.object_id_column = object_id_column
+            reader.timestamp_column = timestamp_column
+            for (i, column) in enumerate(coordinate_columns):
+                reader.coordinates[i] = column
+
+            for name, column_num in real_fields.items():
+                reader.set_real_field_column(name, column_num)
 
-        for name, column_num in string_fields.items():
-            reader.set_string_field_column(name, column_num)
+            for name, column_num in string_fields.items():
+                reader.set_string_field_column(name, column_num)
 
-        for name, column_num in time_fields.items():
-            reader.set_time_field_column(name, column_num)
+            for name, column_num in time_fields.items():
+                reader.set_time_field_column(name, column_num)
 
         if return_trajectory_points:
-            if return_list:
-                if tqdm_installed:
-                    trajectory_points = list(tqdm(reader, desc="Loading Trajectory Points", unit=" point"))
-                else:
-                    trajectory_points = list(reader)
-            else:
-                trajectory_points = reader
-            return trajectory_points
+            return (reader, "Loading Trajectory Points", " point")
         else:
             # Assemble the points into trajectories
             assembler = AssembleTrajectoryFromPoints()
@@ -216,15 +293,456 @@ def load_trajectories(infile,
             assembler.separation_distance = separation_distance
             assembler.separation_time = timedelta(minutes=separation_time)
             assembler.minimum_length = minimum_length
-            if return_list:
-                if tqdm_installed:
-                    trajectories = list(tqdm(assembler.trajectories(), desc="Loading Trajectory Points And Assembling Points Into Trajectories", unit=" trajectory"))
-                else:
-                    trajectories = list(assembler.trajectories())
-            else:
-                trajectories = assembler
-            return trajectories
+            return (assembler,
+                    "Loading Trajectory Points And Assembling Points Into Trajectories",
+                    " trajectory")
     else:
         filename, file_extension = os.path.splitext(infile)
-        logger.error("Unsupported file type: `{}`, supported file types are .csv, .tsv and .traj.".format(file_extension))
+        logger.error("Unsupported file type: `{}`, supported file types are .csv, .tsv, .traj, .trajbin and .parquet.".format(file_extension))
         raise IOError
+
+# ----------------------------------------------------------------------
+
+def _is_parquet_file(infile):
+    return (infile.endswith('.parquet') or infile.endswith('.pq')
+            or os.path.isdir(infile))
+
+
+def _is_trajectory_file(infile):
+    return (infile.endswith('.traj') or infile.endswith('.trajbin')
+            or (_is_parquet_file(infile) and read_write_parquet.contains_trajectories(infile)))
+
+# ----------------------------------------------------------------------
+
+# Rough per-object costs used to estimate how much memory a batch of
+# points or trajectories holds.  These only need to be in the right
+# ballpark: they decide when a batch is full, not how it is stored.
+_POINT_OVERHEAD_BYTES = 128
+_PROPERTY_OVERHEAD_BYTES = 96
+_TRAJECTORY_OVERHEAD_BYTES = 256
+
+
+def stream_trajectories(infile,
+        batch_size=1000,
+        max_buffered_bytes=256 * 1024 * 1024,
+        prefetch_batches=1,
+        report_interval=10,
+        progress_callback=None,
+        **kwargs
+        ):
+    """Stream trajectories or trajectory points from a file in batches
+
+    This reads the same file types as load_trajectories() and takes
+    the same keyword arguments (except `return_list`), but it never
+    holds the whole file.  Items come back in lists of at most
+    `batch_size` trajectories (or points, with
+    `return_trajectory_points`).  A batch is also cut short when its
+    estimated size would push the buffered data past
+    `max_buffered_bytes`.
+
+    With `prefetch_batches` greater than zero, a background thread
+    reads ahead by up to that many batches.  It blocks whenever the
+    batches waiting to be consumed would exceed `max_buffered_bytes`,
+    so a slow consumer throttles the reader instead of letting memory
+    grow.  With `prefetch_batches=0` everything happens on the
+    caller's thread.
+
+    The memory cap covers batches that are being built or are waiting
+    to be consumed.  It does not cover the batch the caller is
+    holding or the partial trajectories inside the assembler, whose
+    size depends on the separation settings and on how interleaved
+    the input points are.
+
+    Throughput is reported every `report_interval` seconds and once
+    more at the end.  Reports go to `progress_callback`, which
+    receives the LoadStatistics object, or are logged at INFO level
+    if there is no callback.  Bytes are counted exactly for .csv,
+    .tsv and .traj files.  For .trajbin and Parquet input they are
+    estimated from the fraction of points read so far.
+
+    Arguments:
+        infile (str): File path for trajectory data
+
+    Keyword arguments:
+        batch_size (int): Maximum number of items per batch (default: 1000)
+        max_buffered_bytes (int): Approximate cap on memory held by batches
+            that have not been consumed yet (default: 256 MiB)
+        prefetch_batches (int): Number of batches to read ahead on a
+            background thread. (default: 1)
+        report_interval (float): Seconds between throughput reports.
+            Use None to report only at the end. (default: 10)
+        progress_callback (callable): Function that receives a
+            LoadStatistics object with each report (default: None)
+        Any other keyword arguments are passed through as for load_trajectories().
+
+    Returns:
+        TrajectoryStream that yields lists of trajectories or trajectory points
+
+    Raises:
+        IOError: Unsupported filetype
+        ValueError: Unsupported domain or comment character, or a bad batch setting
+    """
+
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1, not {}.'.format(batch_size))
+    if max_buffered_bytes < 1:
+        raise ValueError('max_buffered_bytes must be positive, not {}.'.format(max_buffered_bytes))
+    if prefetch_batches < 0:
+        raise ValueError('prefetch_batches cannot be negative.')
+    if 'return_list' in kwargs:
+        raise ValueError('stream_trajectories() does not take return_list.')
+
+    if infile.endswith('.csv') or infile.endswith('.tsv') or infile.endswith('.traj'):
+        # Text readers pull through a file object so that we can count bytes
+        input_object = _CountingInput(open(infile, 'rb'))
+        try:
+            (source, _, _) = _open_source(infile, input_object, **kwargs)
+        except BaseException:
+            input_object.close()
+            raise
+        statistics = LoadStatistics(total_bytes=os.path.getsize(infile),
+                                    bytes_read=input_object.bytes_read)
+        close_input = input_object.close
+    else:
+        (source, _, _) = _open_source(infile, infile, **kwargs)
+        total_bytes = _input_size(infile)
+        total_points = _total_points(infile, kwargs.get('domain', 'terrestrial'))
+        statistics = LoadStatistics(total_bytes=total_bytes,
+                                    bytes_read=_estimated_bytes_read(total_bytes, total_points))
+        close_input = None
+
+    return TrajectoryStream(source,
+                            statistics,
+                            batch_size=batch_size,
+                            max_buffered_bytes=max_buffered_bytes,
+                            prefetch_batches=prefetch_batches,
+                            report_interval=report_interval,
+                            progress_callback=progress_callback,
+                            close_input=close_input)
+
+
+class LoadStatistics(object):
+    """Running totals and throughput for a streaming load
+
+    Attributes:
+        items (int): Trajectories (or points) produced so far
+        points (int): Points produced so far
+        batches (int): Batches handed to the caller so far
+        total_bytes (int): Size of the input, if known
+        buffered_bytes (int): Estimated bytes in batches not yet consumed
+        peak_buffered_bytes (int): Largest value of buffered_bytes seen
+        finished (bool): True once the whole input has been read
+    """
+
+    def __init__(self, total_bytes=None, bytes_read=None):
+        self.items = 0
+        self.points = 0
+        self.batches = 0
+        self.total_bytes = total_bytes
+        self.buffered_bytes = 0
+        self.peak_buffered_bytes = 0
+        self.finished = False
+        self._bytes_read = bytes_read
+        self._start_time = time.monotonic()
+        self._end_time = None
+
+    @property
+    def bytes_read(self):
+        """Bytes of input consumed so far (int)"""
+        if self._bytes_read is None:
+            return 0
+        return self._bytes_read(self)
+
+    @property
+    def elapsed_seconds(self):
+        """Seconds since the stream was opened (float)"""
+        end_time = self._end_time if self._end_time is not None else time.monotonic()
+        return end_time - self._start_time
+
+    @property
+    def points_per_second(self):
+        """Points produced per second (float)"""
+        return self.points / max(self.elapsed_seconds, 1e-9)
+
+    @property
+    def bytes_per_second(self):
+        """Bytes of input consumed per second (float)"""
+        return self.bytes_read / max(self.elapsed_seconds, 1e-9)
+
+    def _add_buffered(self, num_bytes):
+        self.buffered_bytes += num_bytes
+        self.peak_buffered_bytes = max(self.peak_buffered_bytes, self.buffered_bytes)
+
+    def _finish(self):
+        self.finished = True
+        self._end_time = time.monotonic()
+
+    def __str__(self):
+        if self.total_bytes:
+            progress = ' ({:.1f}%)'.format(100.0 * self.bytes_read / self.total_bytes)
+        else:
+            progress = ''
+        return ('{} items, {} points, {:.1f} MB read{} in {:.1f} s: '
+                '{:.0f} points/s, {:.2f} MB/s, {:.1f} MB buffered').format(
+                    self.items, self.points, self.bytes_read / 1e6, progress,
+                    self.elapsed_seconds, self.points_per_second,
+                    self.bytes_per_second / 1e6, self.buffered_bytes / 1e6)
+
+
+class TrajectoryStream(object):
+    """Iterable of bounded batches returned by stream_trajectories()
+
+    Iterate over the stream to get lists of trajectories (or points).
+    A stream can only be iterated once.  If you stop early, call
+    close() (or use the stream as a context manager) so that the
+    background reader and the input file are released.
+
+    Attributes:
+        statistics (LoadStatistics): Running totals and throughput
+    """
+
+    def __init__(self, source, statistics,
+                 batch_size=1000,
+                 max_buffered_bytes=256 * 1024 * 1024,
+                 prefetch_batches=1,
+                 report_interval=10,
+                 progress_callback=None,
+                 close_input=None):
+        self.statistics = statistics
+        self._source = source
+        self._batch_size = batch_size
+        self._max_buffered_bytes = max_buffered_bytes
+        self._prefetch_batches = prefetch_batches
+        self._report_interval = report_interval
+        self._progress_callback = progress_callback
+        self._close_input = close_input
+        self._queue = None
+        self._thread = None
+        self._started = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __iter__(self):
+        if self._started:
+            raise RuntimeError('A TrajectoryStream can only be iterated once.')
+        self._started = True
+
+        if self._prefetch_batches == 0:
+            batches = self._batches()
+        else:
+            batches = self._prefetched_batches()
+
+        last_report = time.monotonic()
+        try:
+            for (batch, num_bytes) in batches:
+                self.statistics.batches += 1
+                if self._prefetch_batches == 0:
+                    self.statistics._add_buffered(-num_bytes)
+                now = time.monotonic()
+                if (self._report_interval is not None and
+                        now - last_report >= self._report_interval):
+                    self._report()
+                    last_report = now
+                yield batch
+            self.statistics._finish()
+            self._report()
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop reading and release the input"""
+        if self._queue is not None:
+            self._queue.cancel()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+        if self._close_input is not None:
+            self._close_input()
+            self._close_input = None
+
+    def _report(self):
+        if self._progress_callback is not None:
+            self._progress_callback(self.statistics)
+        else:
+            logger.info('stream_trajectories: {}'.format(self.statistics))
+
+    def _batches(self):
+        # Producer side: cut the source into batches that respect
+        # both the item limit and this batch's share of the memory cap.
+        # Up to prefetch_batches are queued, one is being built and
+        # one is held by the caller.
+        batch_budget = max(1, self._max_buffered_bytes // (self._prefetch_batches + 2))
+        statistics = self.statistics
+        batch = []
+        batch_bytes = 0
+        for item in self._source:
+            (num_points, num_bytes) = _measure_item(item)
+            if batch and (len(batch) >= self._batch_size or
+                          batch_bytes + num_bytes > batch_budget):
+                yield (batch, batch_bytes)
+                batch = []
+                batch_bytes = 0
+            batch.append(item)
+            batch_bytes += num_bytes
+            statistics.items += 1
+            statistics.points += num_points
+            statistics._add_buffered(num_bytes)
+        if batch:
+            yield (batch, batch_bytes)
+
+    def _prefetched_batches(self):
+        self._queue = _BoundedBatchQueue(self._prefetch_batches,
+                                         self._max_buffered_bytes,
+                                         self.statistics)
+        self._thread = threading.Thread(target=self._produce,
+                                        name='stream_trajectories reader',
+                                        daemon=True)
+        self._thread.start()
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            yield entry
+
+    def _produce(self):
+        try:
+            for (batch, num_bytes) in self._batches():
+                if not self._queue.put(batch, num_bytes):
+                    return
+            self._queue.finish()
+        except BaseException as e:
+            self._queue.finish(error=e)
+
+
+class _BoundedBatchQueue(object):
+    """Hand batches from the reader thread to the caller
+
+    put() blocks while the queue already holds `max_batches` batches
+    or while adding the batch would go over `max_bytes`.  A single
+    batch is always accepted into an empty queue so that one
+    oversized trajectory cannot stall the stream.
+    """
+
+    def __init__(self, max_batches, max_bytes, statistics):
+        self._max_batches = max_batches
+        self._max_bytes = max_bytes
+        self._statistics = statistics
+        self._batches = collections.deque()
+        self._queued_bytes = 0
+        self._condition = threading.Condition()
+        self._finished = False
+        self._cancelled = False
+        self._error = None
+
+    def put(self, batch, num_bytes):
+        with self._condition:
+            while (not self._cancelled and self._batches and
+                   (len(self._batches) >= self._max_batches or
+                    self._queued_bytes + num_bytes > self._max_bytes)):
+                self._condition.wait()
+            if self._cancelled:
+                return False
+            self._batches.append((batch, num_bytes))
+            self._queued_bytes += num_bytes
+            self._condition.notify_all()
+            return True
+
+    def get(self):
+        with self._condition:
+            while not self._batches and not self._finished:
+                self._condition.wait()
+            if self._batches:
+                (batch, num_bytes) = self._batches.popleft()
+                self._queued_bytes -= num_bytes
+                self._statistics._add_buffered(-num_bytes)
+                self._condition.notify_all()
+                return (batch, num_bytes)
+            if self._error is not None:
+                raise self._error
+            return None
+
+    def finish(self, error=None):
+        with self._condition:
+            self._finished = True
+            self._error = error
+            self._condition.notify_all()
+
+    def cancel(self):
+        with self._condition:
+            self._cancelled = True
+            self._batches.clear()
+            self._statistics._add_buffered(-self._queued_bytes)
+            self._queued_bytes = 0
+            self._condition.notify_all()
+
+
+class _CountingInput(object):
+    """Binary file wrapper that counts the bytes handed to a reader"""
+
+    def __init__(self, infile):
+        self._infile = infile
+        self.count = 0
+
+    def read(self, size=-1):
+        data = self._infile.read(size)
+        self.count += len(data)
+        return data
+
+    def close(self):
+        self._infile.close()
+
+    def bytes_read(self, statistics):
+        return self.count
+
+
+def _measure_item(item):
+    """Return (number of points, estimated bytes) for a point or a sequence of points"""
+    if hasattr(item, 'timestamp'):
+        return (1, _estimated_point_bytes(item))
+    num_points = len(item)
+    if num_points == 0:
+        return (0, _TRAJECTORY_OVERHEAD_BYTES)
+    return (num_points,
+            _TRAJECTORY_OVERHEAD_BYTES + num_points * _estimated_point_bytes(item[0]))
+
+
+def _estimated_point_bytes(point):
+    size = _POINT_OVERHEAD_BYTES + 8 * len(point) + len(point.object_id)
+    for (name, value) in point.properties.items():
+        size += _PROPERTY_OVERHEAD_BYTES + len(name)
+        if isinstance(value, str):
+            size += len(value)
+    return size
+
+
+def _input_size(infile):
+    if os.path.isdir(infile):
+        return sum(os.path.getsize(os.path.join(directory, filename))
+                   for (directory, _, filenames) in os.walk(infile)
+                   for filename in filenames)
+    return os.path.getsize(infile)
+
+
+def _total_points(infile, domain):
+    """Count the points in a .trajbin or Parquet source without reading them"""
+    if infile.endswith('.trajbin'):
+        reader = domain_module_from_name(domain).BinaryTrajectoryReader(infile)
+        return sum(reader.num_points(i) for i in range(len(reader)))
+    if read_write_parquet.pyarrow_installed:
+        return read_write_parquet._open_dataset(infile).count_rows()
+    return None
+
+
+def _estimated_bytes_read(total_bytes, total_points):
+    def bytes_read(statistics):
+        if statistics.finished:
+            return total_bytes
+        if not total_points:
+            return 0
+        return int(total_bytes * min(1.0, statistics.points / total_points))
+    return bytes_read
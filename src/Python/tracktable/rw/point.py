@@ -52,7 +52,8 @@ def trajectory_point_reader(
     z_column=4,
     string_fields=dict(),
     real_fields=dict(),
-    time_fields=dict()
+    time_fields=dict(),
+    parser_threads=1
     ):
     """Instantiate and configure a trajectory point reader.
 
@@ -131,6 +132,11 @@ def trajectory_point_reader(
             the point's properties. The timestamps must be in the same
             format as for the point as a whole, namely `YYYY-mm-dd HH:MM:SS`.
             (default: empty)
+        parser_threads (int): How many threads to use when parsing the
+            input. Any value other than 1 makes the reader read the
+            input in large blocks and parse each block in parallel.
+            Points still come out in file order. Use 0 for one thread
+            per CPU. (default: 1)
 
     Returns:
         Trajectory point reader from the appropriate domain with all fields
@@ -141,6 +147,7 @@ def trajectory_point_reader(
     domain_module = domain_module_from_name(domain)
     reader = domain_module.TrajectoryPointReader()
     reader.input = infile
+    reader.parser_threads = parser_threads
 
     _configure_reader_coordinates(
         reader,
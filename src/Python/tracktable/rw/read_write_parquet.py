@@ -0,0 +1,641 @@
+# Copyright (c) 2014-2023, National Technology & Engineering Solutions of
+#   Sandia, LLC (NTESS).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+tracktable.rw.read_write_parquet - Read/Write points and trajectories from/to
+Parquet files
+
+Each point is one row.  The columns are ``object_id``, ``timestamp``,
+the coordinates (``longitude`` and ``latitude`` for the terrestrial
+domain, ``x``, ``y`` and ``z`` for the Cartesian domains) and then one
+column per point property.  Files of trajectories also have a
+``trajectory_index`` column that numbers the trajectories in the file
+and one ``trajectory.<name>`` column per trajectory property.  The
+domain is stored in the schema metadata.
+
+Rows move between points and Arrow record batches one batch at a
+time, so neither reading nor writing holds the whole file in memory.
+The readers also accept a directory of partitioned Parquet files.
+
+Everything in this module requires pyarrow.
+"""
+
+import datetime
+import json
+import logging
+
+from tracktable.core import Timestamp
+from tracktable.domain import domain_module_from_name
+
+try:
+    import pyarrow
+    import pyarrow.dataset
+    import pyarrow.parquet
+    pyarrow_installed = True
+except ImportError:
+    pyarrow_installed = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 65536
+
+TRAJECTORY_INDEX_COLUMN = 'trajectory_index'
+TRAJECTORY_PROPERTY_PREFIX = 'trajectory.'
+
+COORDINATE_COLUMNS = {
+    'terrestrial': ['longitude', 'latitude'],
+    'cartesian2d': ['x', 'y'],
+    'cartesian3d': ['x', 'y', 'z']
+}
+
+_DOMAIN_METADATA_KEY = b'tracktable.domain'
+_TRAJECTORY_PROPERTIES_METADATA_KEY = b'tracktable.trajectory_properties'
+
+_REAL = 'real'
+_STRING = 'string'
+_TIMESTAMP = 'timestamp'
+
+# ----------------------------------------------------------------------
+
+class ParquetPointWriter(object):
+    """Write trajectory points to a Parquet file.
+
+    Points are buffered and written as one record batch (and one row
+    group) every ``batch_size`` points.  The column types are taken
+    from the first batch.  A point property that first appears in a
+    later batch is an error, so choose a batch size large enough to
+    see every property.
+
+    Use the writer as a context manager or call close() when done.
+    Nothing is written if no points are written.
+
+    Attributes:
+        output (str): Filename to write
+        batch_size (int): Number of points per record batch
+        compression (str): Parquet compression codec
+        num_rows (int): Number of rows written so far
+    """
+
+    def __init__(self, output, batch_size=DEFAULT_BATCH_SIZE,
+                 compression='snappy'):
+        _require_pyarrow()
+        self.output = output
+        self.batch_size = batch_size
+        self.compression = compression
+        self.num_rows = 0
+        self._writer = None
+        self._schema = None
+        self._pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def write(self, points):
+        """Write one point or an iterable of points.
+
+        Args:
+            points (TrajectoryPoint or iterable of TrajectoryPoint): Points to write
+        """
+        if _is_point(points):
+            points = [points]
+        for point in points:
+            self._pending.append((point, None, None))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def close(self):
+        """Write any buffered rows and close the file."""
+        if self._pending:
+            self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _flush(self):
+        rows = self._pending
+        self._pending = []
+        if self._schema is None:
+            self._schema = _schema_for_rows(rows)
+            self._writer = pyarrow.parquet.ParquetWriter(
+                self.output, self._schema, compression=self.compression)
+        self._writer.write_batch(_record_batch_from_rows(rows, self._schema))
+        self.num_rows += len(rows)
+
+
+class ParquetTrajectoryWriter(ParquetPointWriter):
+    """Write trajectories to a Parquet file.
+
+    Each point of each trajectory is one row.  Trajectories are
+    numbered in the ``trajectory_index`` column and their properties
+    are repeated on every row in ``trajectory.<name>`` columns, which
+    Parquet's dictionary encoding stores compactly.  A trajectory may
+    span more than one record batch.
+
+    Attributes:
+        num_trajectories (int): Number of trajectories written so far
+    """
+
+    def __init__(self, output, batch_size=DEFAULT_BATCH_SIZE,
+                 compression='snappy'):
+        super(ParquetTrajectoryWriter, self).__init__(
+            output, batch_size=batch_size, compression=compression)
+        self.num_trajectories = 0
+
+    def write(self, trajectories):
+        """Write one trajectory or an iterable of trajectories.
+
+        Args:
+            trajectories (Trajectory or iterable of Trajectory): Trajectories to write
+        """
+        if _is_trajectory(trajectories):
+            trajectories = [trajectories]
+        for trajectory in trajectories:
+            trajectory_properties = dict(trajectory.properties.items())
+            for point in trajectory:
+                self._pending.append((point, self.num_trajectories,
+                                      trajectory_properties))
+                if len(self._pending) >= self.batch_size:
+                    self._flush()
+            self.num_trajectories += 1
+
+# ----------------------------------------------------------------------
+
+def write_points_to_parquet(points, output, batch_size=DEFAULT_BATCH_SIZE,
+                            compression='snappy'):
+    """Write trajectory points to a Parquet file.
+
+    Args:
+        points (iterable of TrajectoryPoint): Points to write
+        output (str): Filename to write
+
+    Keyword Args:
+        batch_size (int): Number of points per record batch (Default: 65536)
+        compression (str): Parquet compression codec (Default: 'snappy')
+
+    Returns:
+        Number of points written
+    """
+    with ParquetPointWriter(output, batch_size=batch_size,
+                            compression=compression) as writer:
+        writer.write(points)
+    return writer.num_rows
+
+
+def write_trajectories_to_parquet(trajectories, output,
+                                  batch_size=DEFAULT_BATCH_SIZE,
+                                  compression='snappy'):
+    """Write trajectories to a Parquet file.
+
+    Args:
+        trajectories (iterable of Trajectory): Trajectories to write
+        output (str): Filename to write
+
+    Keyword Args:
+        batch_size (int): Number of points per record batch (Default: 65536)
+        compression (str): Parquet compression codec (Default: 'snappy')
+
+    Returns:
+        Number of trajectories written
+    """
+    with ParquetTrajectoryWriter(output, batch_size=batch_size,
+                                 compression=compression) as writer:
+        writer.write(trajectories)
+    return writer.num_trajectories
+
+# ----------------------------------------------------------------------
+
+def contains_trajectories(source):
+    """Check whether a Parquet file holds trajectories or loose points.
+
+    Args:
+        source (str): Parquet file or directory of Parquet files
+
+    Returns:
+        True if the file was written by ParquetTrajectoryWriter, False otherwise
+    """
+    return TRAJECTORY_INDEX_COLUMN in _open_dataset(source).schema.names
+
+
+def read_points_from_parquet(source,
+                             domain=None,
+                             object_id_column='object_id',
+                             timestamp_column='timestamp',
+                             coordinate_columns=None,
+                             real_fields=None,
+                             string_fields=None,
+                             time_fields=None,
+                             batch_size=DEFAULT_BATCH_SIZE):
+    """Read trajectory points from Parquet files.
+
+    Columns can be given either by name or by position.  If none of
+    ``real_fields``, ``string_fields`` or ``time_fields`` is given then
+    every other numeric, string or timestamp column becomes a point
+    property with the column's name.  This includes the partition
+    columns of a partitioned dataset.  Rows with a missing coordinate
+    are skipped.
+
+    Args:
+        source (str): Parquet file or directory of Parquet files
+
+    Keyword Args:
+        domain (str): Point domain.  Defaults to the domain stored in the
+            file, or 'terrestrial' if there is none.
+        object_id_column (str or int): Column with object IDs (Default: 'object_id')
+        timestamp_column (str or int): Column with timestamps (Default: 'timestamp')
+        coordinate_columns (list of str or int): Columns with coordinates.
+            Defaults to the standard names for the domain.
+        real_fields (dict, string -> str or int): Point properties to read
+            as real numbers (Default: None)
+        string_fields (dict, string -> str or int): Point properties to read
+            as strings (Default: None)
+        time_fields (dict, string -> str or int): Point properties to read
+            as timestamps (Default: None)
+        batch_size (int): Number of rows to read at once (Default: 65536)
+
+    Returns:
+        Generator that yields TrajectoryPoint objects
+    """
+    _require_pyarrow()
+    dataset = _open_dataset(source)
+    layout = _RowLayout(dataset.schema, domain,
+                        object_id_column, timestamp_column,
+                        coordinate_columns, real_fields,
+                        string_fields, time_fields)
+    return (point for (_, _, point) in _read_rows(dataset, layout, batch_size))
+
+
+def read_trajectories_from_parquet(source,
+                                   domain=None,
+                                   batch_size=DEFAULT_BATCH_SIZE):
+    """Read trajectories from Parquet files written by ParquetTrajectoryWriter.
+
+    Args:
+        source (str): Parquet file or directory of Parquet files
+
+    Keyword Args:
+        domain (str): Point domain.  Defaults to the domain stored in the
+            file, or 'terrestrial' if there is none.
+        batch_size (int): Number of rows to read at once (Default: 65536)
+
+    Returns:
+        Generator that yields Trajectory objects
+
+    Raises:
+        ValueError: The file has no trajectory_index column
+    """
+    _require_pyarrow()
+    dataset = _open_dataset(source)
+    if TRAJECTORY_INDEX_COLUMN not in dataset.schema.names:
+        raise ValueError(
+            ('Parquet source {} has no {} column.  Use '
+             'read_points_from_parquet to read loose points.').format(
+                 source, TRAJECTORY_INDEX_COLUMN))
+
+    layout = _RowLayout(dataset.schema, domain,
+                        'object_id', 'timestamp', None, None, None, None,
+                        read_trajectories=True)
+    return _group_trajectories(_read_rows(dataset, layout, batch_size),
+                               layout.domain_module.Trajectory)
+
+# ----------------------------------------------------------------------
+
+def _require_pyarrow():
+    if not pyarrow_installed:
+        raise ImportError(
+            'Reading and writing Parquet files requires pyarrow.  '
+            'Install it with "pip install pyarrow" or '
+            '"conda install -c conda-forge pyarrow".')
+
+
+def _is_point(thing):
+    return hasattr(thing, 'timestamp') and hasattr(thing, 'object_id')
+
+
+def _is_trajectory(thing):
+    return hasattr(thing, 'trajectory_id')
+
+
+def _open_dataset(source):
+    _require_pyarrow()
+    return pyarrow.dataset.dataset(source, format='parquet',
+                                   partitioning='hive')
+
+
+def _group_trajectories(rows, trajectory_class):
+    current_index = None
+    current_properties = None
+    current_points = []
+    for (trajectory_index, trajectory_properties, point) in rows:
+        if trajectory_index != current_index and current_points:
+            yield _make_trajectory(trajectory_class, current_points,
+                                   current_properties)
+            current_points = []
+        current_index = trajectory_index
+        current_properties = trajectory_properties
+        current_points.append(point)
+    if current_points:
+        yield _make_trajectory(trajectory_class, current_points,
+                               current_properties)
+
+
+def _make_trajectory(trajectory_class, points, properties):
+    trajectory = trajectory_class.from_position_list(points)
+    for (name, value) in properties.items():
+        trajectory.set_property(name, value)
+    return trajectory
+
+# ----------------------------------------------------------------------
+# Writing
+
+def _property_kind(value):
+    if isinstance(value, datetime.datetime):
+        return _TIMESTAMP
+    elif isinstance(value, str):
+        return _STRING
+    else:
+        return _REAL
+
+
+def _arrow_type(kind):
+    if kind == _TIMESTAMP:
+        return pyarrow.timestamp('us', tz='UTC')
+    elif kind == _STRING:
+        return pyarrow.string()
+    else:
+        return pyarrow.float64()
+
+
+def _collect_property_kinds(property_maps, kinds):
+    for properties in property_maps:
+        for (name, value) in properties.items():
+            if value is None:
+                continue
+            kind = _property_kind(value)
+            if kinds.setdefault(name, kind) != kind:
+                raise ValueError(
+                    ('Property {} holds both {} and {} values.  Parquet '
+                     'columns must have a single type.').format(
+                         name, kinds[name], kind))
+
+
+def _schema_for_rows(rows):
+    first_point = rows[0][0]
+    domain = first_point.DOMAIN
+    has_trajectories = rows[0][1] is not None
+
+    point_kinds = {}
+    _collect_property_kinds((row[0].properties for row in rows), point_kinds)
+    trajectory_kinds = {}
+    if has_trajectories:
+        _collect_property_kinds((row[2] for row in rows), trajectory_kinds)
+
+    fields = []
+    if has_trajectories:
+        fields.append(pyarrow.field(TRAJECTORY_INDEX_COLUMN, pyarrow.int64()))
+    fields.append(pyarrow.field('object_id', pyarrow.string()))
+    fields.append(pyarrow.field('timestamp', _arrow_type(_TIMESTAMP)))
+    for name in COORDINATE_COLUMNS[domain]:
+        fields.append(pyarrow.field(name, pyarrow.float64()))
+    for name in sorted(point_kinds.keys()):
+        fields.append(pyarrow.field(name, _arrow_type(point_kinds[name])))
+    for name in sorted(trajectory_kinds.keys()):
+        fields.append(pyarrow.field(TRAJECTORY_PROPERTY_PREFIX + name,
+                                    _arrow_type(trajectory_kinds[name])))
+
+    metadata = {_DOMAIN_METADATA_KEY: domain.encode('utf-8')}
+    if has_trajectories:
+        metadata[_TRAJECTORY_PROPERTIES_METADATA_KEY] = json.dumps(
+            sorted(trajectory_kinds.keys())).encode('utf-8')
+    return pyarrow.schema(fields, metadata=metadata)
+
+
+def _record_batch_from_rows(rows, schema):
+    domain = schema.metadata[_DOMAIN_METADATA_KEY].decode('utf-8')
+    coordinate_names = COORDINATE_COLUMNS[domain]
+    trajectory_property_names = set()
+    if _TRAJECTORY_PROPERTIES_METADATA_KEY in schema.metadata:
+        trajectory_property_names = set(json.loads(
+            schema.metadata[_TRAJECTORY_PROPERTIES_METADATA_KEY].decode('utf-8')))
+
+    columns = dict((name, []) for name in schema.names)
+    for (point, trajectory_index, trajectory_properties) in rows:
+        if point.DOMAIN != domain:
+            raise ValueError(
+                'Cannot write a {} point to a Parquet file of {} points.'.format(
+                    point.DOMAIN, domain))
+        if trajectory_index is not None:
+            columns[TRAJECTORY_INDEX_COLUMN].append(trajectory_index)
+            _append_properties(columns, trajectory_properties,
+                               trajectory_property_names,
+                               TRAJECTORY_PROPERTY_PREFIX)
+        columns['object_id'].append(point.object_id)
+        columns['timestamp'].append(point.timestamp)
+        for (i, name) in enumerate(coordinate_names):
+            columns[name].append(point[i])
+        _append_properties(columns, point.properties, None, '')
+        num_rows = len(columns['object_id'])
+        for values in columns.values():
+            if len(values) < num_rows:
+                values.append(None)
+
+    arrays = [pyarrow.array(columns[field.name], type=field.type)
+              for field in schema]
+    return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _append_properties(columns, properties, expected_names, prefix):
+    for (name, value) in properties.items():
+        column_name = prefix + name
+        if column_name not in columns or (expected_names is not None and
+                                          name not in expected_names):
+            raise ValueError(
+                ('Property {} was not present in the first batch of rows, '
+                 'which fixed the columns of the Parquet file.  Increase '
+                 'batch_size so that the first batch sees every '
+                 'property.').format(name))
+        columns[column_name].append(value)
+
+# ----------------------------------------------------------------------
+# Reading
+
+class _RowLayout(object):
+    """Which columns of a dataset become which parts of a point."""
+
+    def __init__(self, schema, domain, object_id_column, timestamp_column,
+                 coordinate_columns, real_fields, string_fields, time_fields,
+                 read_trajectories=False):
+        metadata = schema.metadata or {}
+        if domain is None:
+            domain = metadata.get(_DOMAIN_METADATA_KEY, b'terrestrial').decode('utf-8')
+        domain = domain.lower()
+        if domain not in COORDINATE_COLUMNS:
+            raise ValueError(
+                ('Unsupported domain: `{}`, supported domains are '
+                 'terrestrial, cartesian2d and cartesian3d').format(domain))
+        self.domain_module = domain_module_from_name(domain)
+
+        names = schema.names
+        self.object_id = _column_name(names, object_id_column)
+        self.timestamp = _column_name(names, timestamp_column)
+        if coordinate_columns is None:
+            coordinate_columns = COORDINATE_COLUMNS[domain]
+        self.coordinates = [_column_name(names, column)
+                            for column in coordinate_columns]
+
+        self.trajectory_index = None
+        self.trajectory_properties = []
+        if read_trajectories:
+            self.trajectory_index = TRAJECTORY_INDEX_COLUMN
+            for name in names:
+                if name.startswith(TRAJECTORY_PROPERTY_PREFIX):
+                    kind = _kind_for_arrow_type(schema.field(name).type)
+                    if kind is not None:
+                        self.trajectory_properties.append(
+                            (name[len(TRAJECTORY_PROPERTY_PREFIX):], name, kind))
+
+        self.point_properties = []
+        if real_fields is None and string_fields is None and time_fields is None:
+            used = set([self.object_id, self.timestamp, TRAJECTORY_INDEX_COLUMN])
+            used.update(self.coordinates)
+            for name in names:
+                if name in used or name.startswith(TRAJECTORY_PROPERTY_PREFIX):
+                    continue
+                kind = _kind_for_arrow_type(schema.field(name).type)
+                if kind is None:
+                    logger.debug('Skipping Parquet column {} of type {}.'.format(
+                        name, schema.field(name).type))
+                else:
+                    self.point_properties.append((name, name, kind))
+        else:
+            for (fields, kind) in [(real_fields, _REAL),
+                                   (string_fields, _STRING),
+                                   (time_fields, _TIMESTAMP)]:
+                for (property_name, column) in (fields or {}).items():
+                    self.point_properties.append(
+                        (property_name, _column_name(names, column), kind))
+
+    def columns(self):
+        result = [self.object_id, self.timestamp] + self.coordinates
+        if self.trajectory_index is not None:
+            result.append(self.trajectory_index)
+        result.extend(column for (_, column, _) in self.point_properties)
+        result.extend(column for (_, column, _) in self.trajectory_properties)
+        # A column may feed more than one property
+        return list(dict.fromkeys(result))
+
+
+def _column_name(names, column):
+    if isinstance(column, int):
+        if column < 0 or column >= len(names):
+            raise ValueError(
+                'Column {} is out of range: the Parquet source has {} columns.'.format(
+                    column, len(names)))
+        return names[column]
+    if column not in names:
+        raise ValueError(
+            'Column {} is not present in the Parquet source.  Columns are: {}'.format(
+                column, ', '.join(names)))
+    return column
+
+
+def _kind_for_arrow_type(arrow_type):
+    if pyarrow.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if (pyarrow.types.is_floating(arrow_type) or
+            pyarrow.types.is_integer(arrow_type) or
+            pyarrow.types.is_boolean(arrow_type) or
+            pyarrow.types.is_decimal(arrow_type)):
+        return _REAL
+    elif pyarrow.types.is_string(arrow_type) or pyarrow.types.is_large_string(arrow_type):
+        return _STRING
+    elif pyarrow.types.is_timestamp(arrow_type) or pyarrow.types.is_date(arrow_type):
+        return _TIMESTAMP
+    return None
+
+
+def _convert(value, kind):
+    if value is None:
+        return None
+    if kind == _REAL:
+        return float(value)
+    elif kind == _STRING:
+        return str(value)
+    elif isinstance(value, datetime.datetime):
+        return Timestamp.from_any(value)
+    else:
+        return Timestamp.from_any(
+            datetime.datetime(value.year, value.month, value.day))
+
+
+def _read_rows(dataset, layout, batch_size):
+    point_class = layout.domain_module.TrajectoryPoint
+    skipped = 0
+    for batch in dataset.to_batches(columns=layout.columns(),
+                                    batch_size=batch_size):
+        values = dict((name, batch.column(i).to_pylist())
+                      for (i, name) in enumerate(batch.schema.names))
+        object_ids = values[layout.object_id]
+        timestamps = values[layout.timestamp]
+        coordinates = [values[name] for name in layout.coordinates]
+        trajectory_indices = None
+        if layout.trajectory_index is not None:
+            trajectory_indices = values[layout.trajectory_index]
+
+        for row in range(batch.num_rows):
+            position = tuple(column[row] for column in coordinates)
+            if None in position:
+                skipped += 1
+                continue
+            point = point_class(position)
+            if object_ids[row] is not None:
+                point.object_id = str(object_ids[row])
+            if timestamps[row] is not None:
+                point.timestamp = _convert(timestamps[row], _TIMESTAMP)
+            for (name, column, kind) in layout.point_properties:
+                value = _convert(values[column][row], kind)
+                if value is not None:
+                    point.set_property(name, value)
+
+            trajectory_index = None
+            trajectory_properties = None
+            if trajectory_indices is not None:
+                trajectory_index = trajectory_indices[row]
+                trajectory_properties = {}
+                for (name, column, kind) in layout.trajectory_properties:
+                    value = _convert(values[column][row], kind)
+                    if value is not None:
+                        trajectory_properties[name] = value
+            yield (trajectory_index, trajectory_properties, point)
+
+    if skipped > 0:
+        logger.warning(
+            'Skipped {} Parquet rows with missing coordinates.'.format(skipped))
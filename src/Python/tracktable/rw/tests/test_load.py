@@ -29,7 +29,10 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 import logging
+import os.path
 import sys
+import tempfile
+from tracktable.domain import terrestrial
 from tracktable.rw.load import load_trajectories
 
 logger = logging.getLogger(__name__)
@@ -55,6 +58,20 @@ def test_loader_traj(file):
     trajectories = load_trajectories(file)
     assert len(trajectories) > 0
 
+    # Trajectory points from a trajectory file come back as a list of
+    # lists even without return_list
+    unlisted_points = load_trajectories(file, return_trajectory_points=True, return_list=False)
+    assert isinstance(unlisted_points, list)
+    assert [len(points) for points in unlisted_points] == [len(points) for points in trajectory_points]
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        binary_file = os.path.join(tempdir, 'trajectories.trajbin')
+        with terrestrial.BinaryTrajectoryWriter(binary_file) as writer:
+            writer.write(trajectories)
+        binary_points = load_trajectories(binary_file, return_trajectory_points=True, return_list=False)
+        assert isinstance(binary_points, list)
+        assert [len(points) for points in binary_points] == [len(points) for points in trajectory_points]
+
 def main():
     test_loader_csv(sys.argv[1])
     test_loader_tsv(sys.argv[2])
@@ -0,0 +1,164 @@
+# Copyright (c) 2014-2023, National Technology & Engineering Solutions of
+#   Sandia, LLC (NTESS).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import importlib
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from tracktable.core import Timestamp
+from tracktable.rw import read_write_parquet
+from tracktable.rw.load import load_trajectories
+
+
+@unittest.skipUnless(read_write_parquet.pyarrow_installed,
+                     "pyarrow is not installed")
+class TestReadWriteParquet(unittest.TestCase):
+
+    domains = ['terrestrial', 'cartesian2d', 'cartesian3d']
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_trajectories(self, domain_name, howmany=4, length=5):
+        domain = importlib.import_module("tracktable.domain." + domain_name)
+        trajectories = []
+        for t in range(howmany):
+            points = []
+            for i in range(length):
+                point = domain.TrajectoryPoint()
+                for d in range(domain.DIMENSION):
+                    point[d] = 10.0 * t + 0.5 * i + d
+                point.object_id = 'object_{}'.format(t)
+                point.timestamp = Timestamp.from_string(
+                    '2004-12-07 11:{:02d}:{:02d}'.format(t, i))
+                point.set_property('altitude', 1000.0 * i)
+                if i % 2 == 0:
+                    point.set_property('note', 'even {}'.format(i))
+                point.set_property('time2', Timestamp.from_string(
+                    '2004-01-01 00:00:{:02d}'.format(i)))
+                points.append(point)
+            trajectory = domain.Trajectory.from_position_list(points)
+            trajectory.set_property('platform', 'Boeing 747')
+            trajectory.set_property('percent', 25.0 * t)
+            trajectories.append(trajectory)
+        return trajectories
+
+    def tst_trajectory_round_trip(self, domain):
+        print("Testing Parquet trajectory round trip in the {} domain.".format(domain))
+        trajectories = self.make_trajectories(domain)
+        filename = os.path.join(self.temp_dir, domain + '_trajectories.parquet')
+
+        # A small batch size makes trajectories span record batches
+        written = read_write_parquet.write_trajectories_to_parquet(
+            trajectories, filename, batch_size=3)
+        self.assertEqual(written, len(trajectories))
+        self.assertTrue(read_write_parquet.contains_trajectories(filename))
+
+        result = list(read_write_parquet.read_trajectories_from_parquet(
+            filename, batch_size=4))
+        self.assertEqual(result, trajectories,
+                         msg="Error: {} trajectories changed in a Parquet round trip".format(domain))
+
+        loaded = load_trajectories(filename, domain=domain)
+        self.assertEqual(loaded, trajectories,
+                         msg="Error: load_trajectories did not read {} trajectories back from Parquet".format(domain))
+
+    def tst_point_round_trip(self, domain):
+        print("Testing Parquet point round trip in the {} domain.".format(domain))
+        points = [point for trajectory in self.make_trajectories(domain)
+                  for point in trajectory]
+        filename = os.path.join(self.temp_dir, domain + '_points.parquet')
+
+        with read_write_parquet.ParquetPointWriter(filename, batch_size=7) as writer:
+            writer.write(points)
+        self.assertEqual(writer.num_rows, len(points))
+        self.assertFalse(read_write_parquet.contains_trajectories(filename))
+
+        result = list(read_write_parquet.read_points_from_parquet(filename))
+        self.assertEqual(result, points,
+                         msg="Error: {} points changed in a Parquet round trip".format(domain))
+
+        loaded = load_trajectories(filename, domain=domain,
+                                   return_trajectory_points=True)
+        self.assertEqual(loaded, points)
+
+    def tst_columns_by_name(self):
+        print("Testing Parquet columns selected by name")
+        points = [point for trajectory in self.make_trajectories('terrestrial')
+                  for point in trajectory]
+        filename = os.path.join(self.temp_dir, 'by_name.parquet')
+        read_write_parquet.write_points_to_parquet(points, filename)
+
+        result = list(read_write_parquet.read_points_from_parquet(
+            filename,
+            object_id_column='object_id',
+            timestamp_column=1,
+            coordinate_columns=['longitude', 'latitude'],
+            real_fields={'height': 'altitude'}))
+        self.assertEqual(len(result), len(points))
+        for (original, copy) in zip(points, result):
+            self.assertEqual(copy.object_id, original.object_id)
+            self.assertEqual(copy.property('height'), original.property('altitude'))
+            self.assertFalse(copy.has_property('note'))
+
+        with self.assertRaises(ValueError):
+            read_write_parquet.read_points_from_parquet(
+                filename, object_id_column='no_such_column')
+
+    def tst_partitioned_dataset(self):
+        print("Testing a directory of partitioned Parquet files")
+        trajectories = self.make_trajectories('terrestrial')
+        dataset_dir = os.path.join(self.temp_dir, 'partitioned')
+        for (i, trajectory) in enumerate(trajectories):
+            partition = os.path.join(dataset_dir, 'part={}'.format(i % 2))
+            if not os.path.isdir(partition):
+                os.makedirs(partition)
+            read_write_parquet.write_points_to_parquet(
+                list(trajectory), os.path.join(partition, '{}.parquet'.format(i)))
+
+        points = list(read_write_parquet.read_points_from_parquet(dataset_dir))
+        self.assertEqual(len(points), sum(len(t) for t in trajectories))
+        self.assertTrue(all(point.has_property('part') for point in points))
+
+        loaded = load_trajectories(dataset_dir, minimum_length=2)
+        self.assertEqual(len(loaded), len(trajectories))
+
+    def test_parquet(self):
+        for domain in self.domains:
+            self.tst_trajectory_round_trip(domain)
+            self.tst_point_round_trip(domain)
+        self.tst_columns_by_name()
+        self.tst_partitioned_dataset()
+
+if __name__ == '__main__':
+    unittest.main()
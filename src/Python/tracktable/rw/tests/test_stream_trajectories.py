@@ -0,0 +1,112 @@
+# Copyright (c) 2014-2023, National Technology & Engineering Solutions of
+#   Sandia, LLC (NTESS).
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from tracktable.rw.load import load_trajectories, stream_trajectories
+
+
+class TestStreamTrajectories(unittest.TestCase):
+
+    num_objects = 20
+    points_per_object = 12
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'points.csv')
+        with open(self.filename, 'w') as outfile:
+            outfile.write('# object_id,timestamp,longitude,latitude,speed\n')
+            for minute in range(self.points_per_object):
+                for obj in range(self.num_objects):
+                    outfile.write('obj{},2020-06-30 12:{:02d}:00,{},{},{}\n'.format(
+                        obj, minute, -74.0 + 0.01 * minute, 40.0 + 0.1 * obj,
+                        10.0 + minute))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_load_trajectories(self):
+        expected = load_trajectories(self.filename, real_fields={'speed': 4})
+
+        for prefetch_batches in [0, 1, 3]:
+            reports = []
+            stream = stream_trajectories(self.filename,
+                                         batch_size=3,
+                                         prefetch_batches=prefetch_batches,
+                                         progress_callback=reports.append,
+                                         real_fields={'speed': 4})
+            batches = list(stream)
+
+            self.assertTrue(all(0 < len(batch) <= 3 for batch in batches))
+            trajectories = [trajectory for batch in batches for trajectory in batch]
+            self.assertEqual(trajectories, expected)
+
+            statistics = stream.statistics
+            self.assertTrue(statistics.finished)
+            self.assertEqual(statistics.items, len(expected))
+            self.assertEqual(statistics.points, sum(len(t) for t in expected))
+            self.assertEqual(statistics.batches, len(batches))
+            self.assertEqual(statistics.bytes_read, os.path.getsize(self.filename))
+            self.assertEqual(statistics.buffered_bytes, 0)
+            self.assertGreater(statistics.points_per_second, 0)
+            self.assertTrue(reports)
+
+    def test_points(self):
+        stream = stream_trajectories(self.filename, batch_size=50,
+                                     return_trajectory_points=True)
+        points = [point for batch in stream for point in batch]
+        self.assertEqual(len(points), self.num_objects * self.points_per_object)
+
+    def test_memory_cap(self):
+        # A cap this small leaves room for one trajectory per batch
+        stream = stream_trajectories(self.filename, batch_size=100,
+                                     max_buffered_bytes=1000)
+        batches = list(stream)
+        self.assertEqual(len(batches), self.num_objects)
+        self.assertTrue(all(len(batch) == 1 for batch in batches))
+
+    def test_early_close(self):
+        with stream_trajectories(self.filename, batch_size=1) as stream:
+            for batch in stream:
+                break
+        self.assertFalse(stream.statistics.finished)
+        self.assertLess(stream.statistics.items, self.num_objects)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            stream_trajectories(self.filename, batch_size=0)
+        with self.assertRaises(ValueError):
+            stream_trajectories(self.filename, return_list=True)
+        with self.assertRaises(IOError):
+            stream_trajectories(os.path.join(self.temp_dir, 'points.unknown'))
+
+if __name__ == '__main__':
+    unittest.main()